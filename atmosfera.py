@@ -2,11 +2,18 @@
 Módulo para cálculos relacionados con la atmósfera terrestre.
 
 Este módulo contiene funciones para calcular la densidad del aire
-en función de la altura sobre el nivel del mar.
+en función de la altura sobre el nivel del mar:
+- calcular_densidad_aire: modelo de tres capas que usa la simulación.
+  Acepta alturas duales (duales.Dual) para propagar derivadas.
+- calcular_densidad_exponencial: capas exponenciales hasta 1000 km, para
+  el decaimiento orbital (ver vida_orbital.py)
 """
 
+import bisect
 import math
 
+import duales
+
 
 def calcular_densidad_aire(altura):
     """
@@ -30,7 +37,11 @@ def calcular_densidad_aire(altura):
     elif 11000 <= altura < 25000:
         # Estratosfera baja
         T = -56.46  # Temperatura en °C
-        P = 22.65 * math.exp(1.73 - 0.000157 * altura)  # Presión en kPa
+        try:
+            P = 22.65 * math.exp(1.73 - 0.000157 * altura)  # Presión en kPa
+        except TypeError:
+            # Altura con derivadas (duales.Dual)
+            P = 22.65 * duales.exp(1.73 - 0.000157 * altura)
     else:
         # Estratosfera alta
         T = -131.21 + 0.00299 * altura  # Temperatura en °C
@@ -39,3 +50,73 @@ def calcular_densidad_aire(altura):
     # Densidad usando ecuación de gas ideal
     rho = P / (0.2869 * (T + 273.1))  # Densidad en kg/m³
     return rho
+
+
+# Modelo exponencial por capas (Vallado, "Fundamentals of Astrodynamics and
+# Applications"): (altura base (m), densidad base (kg/m³), altura de
+# escala (m)). Es la atmósfera media hasta 1000 km, para el decaimiento
+# orbital; la simulación del ascenso sigue usando calcular_densidad_aire
+CAPAS_EXPONENCIALES = (
+    (0.0, 1.225, 7_249.0),
+    (25_000.0, 3.899e-2, 6_349.0),
+    (30_000.0, 1.774e-2, 6_682.0),
+    (40_000.0, 3.972e-3, 7_554.0),
+    (50_000.0, 1.057e-3, 8_382.0),
+    (60_000.0, 3.206e-4, 7_714.0),
+    (70_000.0, 8.770e-5, 6_549.0),
+    (80_000.0, 1.905e-5, 5_799.0),
+    (90_000.0, 3.396e-6, 5_382.0),
+    (100_000.0, 5.297e-7, 5_877.0),
+    (110_000.0, 9.661e-8, 7_263.0),
+    (120_000.0, 2.438e-8, 9_473.0),
+    (130_000.0, 8.484e-9, 12_636.0),
+    (140_000.0, 3.845e-9, 16_149.0),
+    (150_000.0, 2.070e-9, 22_523.0),
+    (180_000.0, 5.464e-10, 29_740.0),
+    (200_000.0, 2.789e-10, 37_105.0),
+    (250_000.0, 7.248e-11, 45_546.0),
+    (300_000.0, 2.418e-11, 53_628.0),
+    (350_000.0, 9.518e-12, 53_298.0),
+    (400_000.0, 3.725e-12, 58_515.0),
+    (450_000.0, 1.585e-12, 60_828.0),
+    (500_000.0, 6.967e-13, 63_822.0),
+    (600_000.0, 1.454e-13, 71_835.0),
+    (700_000.0, 3.614e-14, 88_667.0),
+    (800_000.0, 1.170e-14, 124_640.0),
+    (900_000.0, 5.245e-15, 181_050.0),
+    (1_000_000.0, 3.019e-15, 268_000.0),
+)
+
+_BASES_EXPONENCIALES = tuple(capa[0] for capa in CAPAS_EXPONENCIALES)
+
+
+def capa_exponencial(altura):
+    """
+    Capa del modelo exponencial que contiene una altura.
+
+    Por debajo de 0 m se usa la primera capa y por encima de 1000 km la
+    última.
+
+    Args:
+        altura (float): Altura sobre el nivel del mar (m)
+
+    Returns:
+        tuple: (altura base (m), densidad base (kg/m³), altura de
+            escala (m))
+    """
+    indice = bisect.bisect_right(_BASES_EXPONENCIALES, altura) - 1
+    return CAPAS_EXPONENCIALES[max(0, indice)]
+
+
+def calcular_densidad_exponencial(altura):
+    """
+    Densidad del aire con el modelo exponencial por capas.
+
+    Args:
+        altura (float): Altura sobre el nivel del mar (m)
+
+    Returns:
+        float: Densidad del aire (kg/m³)
+    """
+    base, densidad, escala = capa_exponencial(altura)
+    return densidad * math.exp((base - altura) / escala)
@@ -0,0 +1,153 @@
+"""
+Ejecución de muchas simulaciones, en el proceso o en un pool de procesos.
+
+Cada corrida queda definida por una ConfiguracionSimulacion, que es
+inmutable y se envía barata a los procesos trabajadores (ver
+configuracion.py). Los trabajadores devuelven el resumen de simular, no
+los historiales completos, así que el tráfico entre procesos es pequeño.
+
+Un presupuesto de memoria (ver presupuesto.py) es de toda la máquina: se
+reparte entre los trabajadores y cada corrida registra sus historiales
+dentro de su parte.
+
+Las configuraciones se reparten según su costo previsto (ver costos.py):
+primero las más largas, para que ningún núcleo quede ocioso esperando a
+una corrida grande al final, y las cortas agrupadas en lotes.
+
+Para traer las trayectorias completas sin serializarlas, ver
+trayectorias.recolectar_trayectorias.
+
+Uso:
+    configs = [replace(base, cd=cd) for cd in (0.3, 0.4, 0.5)]
+    resultados = ejecutar_barrido(configs, trabajadores=4)
+    resultados = ejecutar_barrido(configs, presupuesto_memoria="8G")
+"""
+
+import math
+import os
+from functools import partial
+
+from cohete import Cohete
+from configuracion import ConfiguracionSimulacion
+from costos import modelo_por_defecto, repartir_en_lotes
+from presupuesto import presupuesto_por_trabajador
+from telemetria import Telemetria
+
+
+def trabajadores_disponibles():
+    """
+    Cantidad de núcleos que puede usar este proceso.
+
+    Returns:
+        int: Núcleos disponibles (al menos 1)
+    """
+    try:
+        return max(1, len(os.sched_getaffinity(0)))
+    except AttributeError:
+        return max(1, os.cpu_count() or 1)
+
+
+def correr_configuracion(config, presupuesto_memoria=None,
+                         directorio_registro=None):
+    """
+    Simula una configuración sin telemetría y devuelve su resumen.
+
+    Es una función de módulo para que los procesos trabajadores puedan
+    recibirla por pickle.
+
+    Args:
+        config (ConfiguracionSimulacion): Configuración a simular
+        presupuesto_memoria (int | str): Memoria para los historiales de
+            esta corrida (ver Cohete.simular)
+        directorio_registro (str): Carpeta donde volcar los historiales
+            si no entran en el presupuesto
+
+    Returns:
+        dict: Resumen de Cohete.simular más masa_final y la huella de la
+            configuración
+    """
+    cohete = Cohete.desde_configuracion(config)
+    resumen = cohete.simular(telemetria=Telemetria.nula(),
+                             presupuesto_memoria=presupuesto_memoria,
+                             directorio_registro=directorio_registro)
+    resumen["masa_final"] = cohete.masa
+    resumen["huella"] = config.huella()
+    return resumen
+
+
+def ejecutar_barrido(configs, trabajadores=None, funcion=correr_configuracion,
+                     tamano_lote=None, presupuesto_memoria=None,
+                     directorio_registro=None, modelo_costo=None,
+                     costos=None):
+    """
+    Ejecuta una función sobre cada configuración, en paralelo si conviene.
+
+    Args:
+        configs (sequence): Configuraciones a simular
+        trabajadores (int): Procesos a usar (None = todos los núcleos;
+            1 = en este mismo proceso, sin pool)
+        funcion (callable): Función de módulo que recibe una configuración
+            (por defecto correr_configuracion)
+        tamano_lote (int): Configuraciones por envío a un trabajador
+            (None = lotes de costo parecido según modelo_costo, de mayor
+            a menor; si los elementos no son configuraciones, unas 4
+            tandas por trabajador)
+        presupuesto_memoria (int | str): Memoria de toda la máquina para
+            los historiales ("8G", "auto"...); se reparte entre los
+            trabajadores y se pasa a la función como presupuesto_memoria
+        directorio_registro (str): Carpeta donde volcar los historiales
+            que no entren (se pasa a la función como directorio_registro)
+        modelo_costo (ModeloCosto): Modelo con que se estima el costo de
+            cada configuración (None = costos.modelo_por_defecto())
+        costos (sequence): Costo previsto de cada elemento, para armar
+            los lotes cuando los elementos no son configuraciones (None
+            = estimarlo con modelo_costo)
+
+    Returns:
+        list: Resultado de la función para cada configuración, en orden
+    """
+    configs = list(configs)
+    if trabajadores is None:
+        trabajadores = trabajadores_disponibles()
+    trabajadores = max(1, min(trabajadores, len(configs)))
+
+    if presupuesto_memoria is not None:
+        funcion = partial(
+            funcion,
+            presupuesto_memoria=presupuesto_por_trabajador(
+                presupuesto_memoria, trabajadores
+            ),
+        )
+    if directorio_registro is not None:
+        funcion = partial(funcion, directorio_registro=directorio_registro)
+
+    if trabajadores == 1:
+        return [funcion(config) for config in configs]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    if tamano_lote is None and costos is None and all(
+            isinstance(config, ConfiguracionSimulacion) for config in configs):
+        if modelo_costo is None:
+            modelo_costo = modelo_por_defecto()
+        costos = [modelo_costo.segundos(config) for config in configs]
+    if tamano_lote is None and costos is not None:
+        lotes = repartir_en_lotes(list(costos), trabajadores)
+        resultados = [None] * len(configs)
+        with ProcessPoolExecutor(max_workers=trabajadores) as pool:
+            for lote, resultados_lote in zip(lotes, pool.map(
+                    _correr_lote, [funcion] * len(lotes),
+                    [[configs[i] for i in lote] for lote in lotes])):
+                for i, resultado in zip(lote, resultados_lote):
+                    resultados[i] = resultado
+        return resultados
+
+    if tamano_lote is None:
+        tamano_lote = max(1, math.ceil(len(configs) / (4 * trabajadores)))
+    with ProcessPoolExecutor(max_workers=trabajadores) as pool:
+        return list(pool.map(funcion, configs, chunksize=tamano_lote))
+
+
+def _correr_lote(funcion, configs):
+    """Aplica la función a un lote de configuraciones (en un trabajador)."""
+    return [funcion(config) for config in configs]
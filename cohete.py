@@ -3,17 +3,34 @@ Clase Cohete para la simulación de trayectoria orbital.
 
 Este módulo contiene la clase Cohete que modela el comportamiento
 dinámico del cohete usando ecuaciones de movimiento en coordenadas
-polares y métodos de integración numérica (Forward y Backward Euler).
+polares. La física está en dinamica.py y los métodos de integración
+numérica (Forward y Backward Euler, RK4, adaptativo, simplético) en
+integradores.py.
+
+Las constantes físicas, los perfiles de control y los ajustes de
+integración llegan en una ConfiguracionSimulacion (configuracion.py),
+así que cada cohete es independiente de las globales de constantes.py.
 """
 
 import math
-from constantes import (
-    G0, R_E, CD, MU, BETA_ALTURA
+import os
+from dataclasses import replace
+from configuracion import ConfiguracionSimulacion
+from dinamica import arrastre, fuerzas
+from historial import (
+    COLUMNAS, ColumnaHistorial, bytes_disco_columnas,
+    bytes_por_muestra_columnas, crear_columnas, crear_columnas_en_disco,
+    memoria_columnas
+)
+from integradores import crear_integrador
+from integracion_scipy import es_metodo_scipy, simular_scipy
+from observadores import GestorObservadores, Observador
+from planificador import (
+    CalendarioQuiebres, paso_con_quiebres, puntos_de_quiebre
 )
-from atmosfera import calcular_densidad_aire
-from utilidades import (
-    calcular_gravedad, calcular_velocidad, calcular_area_frontal_esfera,
-    calcular_beta_altura, calcular_beta_tiempo, calcular_mdot
+from presupuesto import planificar_registro, resolver_presupuesto
+from telemetria import (
+    DEPURACION, INFO, CambioFase, Evento, Progreso, Resumen, Telemetria
 )
 
 
@@ -39,14 +56,40 @@ class Cohete:
     
     Parámetros de guiado:
     - h_0, h_1, h_2: Alturas de transición para el perfil de beta
+
+    Configuración:
+    - config: ConfiguracionSimulacion con constantes, perfiles e
+      integración; sus campos de vehículo y condiciones iniciales
+      coinciden con los del cohete
+
+    Registro:
+    - pasos: Pasos integrados desde el despegue (el tiempo es pasos·dt)
+    - cada_registro: Pasos por muestra de los historiales (1 salvo que
+      un presupuesto de memoria obligue a diezmar, ver presupuesto.py)
+
+    El estado usa __slots__ para que cada instancia sea compacta; el
+    vector de estado empaquetado se obtiene con la propiedad estado.
     """
-    
+
+    __slots__ = (
+        "r", "q", "q_dot", "theta", "gamma", "gamma_dot", "masa",
+        "masa_cohete", "beta", "diametro", "m_dot", "isp",
+        "h_0", "h_1", "h_2", "config", "observadores", "pasos",
+        "cada_registro",
+        "r_hist", "q_hist", "q_dot_hist", "theta_hist", "gamma_hist",
+        "gamma_dot_hist", "masa_hist", "beta_hist",
+    )
+
     def __init__(self, r_0, q_0, q_dot_0, theta_0, gamma_0, gamma_dot_0,
                  masa_cohete, masa_fuel, beta, diametro, m_dot, isp,
-                 h_0, h_1, h_2):
+                 h_0, h_1, h_2, config=None):
         """
         Inicializa el cohete con condiciones iniciales y parámetros.
         
+        Los argumentos explícitos definen el vehículo y las condiciones
+        iniciales; config aporta el resto (constantes físicas, perfiles
+        de control e integración).
+        
         Args:
             r_0 (float): Posición radial inicial (m)
             q_0 (float): Velocidad radial inicial (m/s)
@@ -63,7 +106,20 @@ class Cohete:
             h_0 (float): Primera altura de transición (m)
             h_1 (float): Segunda altura de transición (m)
             h_2 (float): Tercera altura de transición (m)
+            config (ConfiguracionSimulacion): Configuración de la
+                simulación (None para los valores de constantes.py)
         """
+        # Configuración completa: la recibida, con el vehículo y las
+        # condiciones iniciales de este cohete
+        self.config = replace(
+            config if config is not None else ConfiguracionSimulacion(),
+            r_0=r_0, q_0=q_0, q_dot_0=q_dot_0, theta_0=theta_0,
+            gamma_0=gamma_0, gamma_dot_0=gamma_dot_0,
+            masa_cohete=masa_cohete, masa_fuel=masa_fuel, beta_0=beta,
+            diametro=diametro, m_dot_0=m_dot, isp=isp,
+            h_0=h_0, h_1=h_1, h_2=h_2,
+        )
+
         # Estado actual
         self.r = r_0
         self.q = q_0
@@ -85,15 +141,242 @@ class Cohete:
         self.h_1 = h_1
         self.h_2 = h_2
 
-        # Historiales para análisis posterior
-        self.r_hist = [r_0]
-        self.q_hist = [q_0]
-        self.q_dot_hist = [q_dot_0]
-        self.theta_hist = [theta_0]
-        self.gamma_hist = [gamma_0]
-        self.gamma_dot_hist = [gamma_dot_0]
-        self.masa_hist = [masa_cohete + masa_fuel]
-        self.beta_hist = [beta]
+        # Historiales para análisis posterior: listas de floats o, con
+        # config.historial, columnas compactas (ver historial.py)
+        columnas = crear_columnas(self.config.historial, {
+            "r": r_0, "q": q_0, "q_dot": q_dot_0, "theta": theta_0,
+            "gamma": gamma_0, "gamma_dot": gamma_dot_0,
+            "masa": masa_cohete + masa_fuel, "beta": beta,
+        })
+        self.r_hist = columnas["r"]
+        self.q_hist = columnas["q"]
+        self.q_dot_hist = columnas["q_dot"]
+        self.theta_hist = columnas["theta"]
+        self.gamma_hist = columnas["gamma"]
+        self.gamma_dot_hist = columnas["gamma_dot"]
+        self.masa_hist = columnas["masa"]
+        self.beta_hist = columnas["beta"]
+        self.pasos = 0
+        self.cada_registro = 1
+
+        # Funciones que se notifican durante simular (ver observadores.py)
+        self.observadores = []
+
+    @classmethod
+    def desde_configuracion(cls, config):
+        """
+        Crea un cohete con el vehículo y las condiciones iniciales de la
+        configuración.
+
+        Args:
+            config (ConfiguracionSimulacion): Configuración de la simulación
+
+        Returns:
+            Cohete: Cohete listo para simular
+        """
+        return cls(
+            r_0=config.r_0, q_0=config.q_0, q_dot_0=config.q_dot_0,
+            theta_0=config.theta_0, gamma_0=config.gamma_0,
+            gamma_dot_0=config.gamma_dot_0,
+            masa_cohete=config.masa_cohete, masa_fuel=config.masa_fuel,
+            beta=config.beta_0, diametro=config.diametro,
+            m_dot=config.m_dot_0, isp=config.isp,
+            h_0=config.h_0, h_1=config.h_1, h_2=config.h_2,
+            config=config,
+        )
+
+    @property
+    def estado(self):
+        """
+        Vector de estado empaquetado (r, q, theta, gamma, masa).
+
+        Returns:
+            tuple: Estado actual del cohete
+        """
+        return (self.r, self.q, self.theta, self.gamma, self.masa)
+
+    @estado.setter
+    def estado(self, y):
+        self.r, self.q, self.theta, self.gamma, self.masa = y
+
+    def historiales(self):
+        """
+        Historiales registrados, por columna.
+
+        Returns:
+            dict: Nombre de la columna (historial.COLUMNAS) -> lista o
+                ColumnaHistorial
+        """
+        return {nombre: getattr(self, f"{nombre}_hist") for nombre in COLUMNAS}
+
+    def _asignar_historiales(self, columnas):
+        """Reemplaza los historiales por las columnas dadas."""
+        for nombre in COLUMNAS:
+            setattr(self, f"{nombre}_hist", columnas[nombre])
+
+    def registrar_en(self, columnas):
+        """
+        Continúa el registro en las columnas dadas.
+
+        Copia en ellas las muestras ya registradas y desde ese momento
+        los historiales son esas columnas (p. ej. columnas en memoria
+        compartida, ver trayectorias.py).
+
+        Args:
+            columnas (dict): Nombre de la columna (historial.COLUMNAS) ->
+                columna vacía con append
+        """
+        actuales = self.historiales()
+        for nombre in COLUMNAS:
+            agregar = columnas[nombre].append
+            for valor in actuales[nombre]:
+                agregar(valor)
+        self._asignar_historiales(columnas)
+
+    def memoria_historial(self):
+        """
+        Memoria que ocupan los historiales.
+
+        Returns:
+            dict: muestras, bytes_por_muestra (según el tipo de las
+                columnas), bytes (ocupados en memoria por los valores
+                registrados), bytes_disco (volcados a archivos) y
+                cada_registro (pasos por muestra)
+        """
+        columnas = self.historiales()
+        return {
+            "muestras": len(self.r_hist),
+            "bytes_por_muestra": bytes_por_muestra_columnas(columnas),
+            "bytes": memoria_columnas(columnas),
+            "bytes_disco": bytes_disco_columnas(columnas),
+            "cada_registro": self.cada_registro,
+        }
+
+    def plan_registro(self, presupuesto, dt=None, t_max=None,
+                      directorio=None):
+        """
+        Plan de registro con el que simular() respetaría un presupuesto.
+
+        No modifica el cohete; sirve para conocer el costo en memoria de
+        una corrida antes de lanzarla.
+
+        Args:
+            presupuesto (int | str): Bytes, texto como "512M" o "auto"
+                (ver presupuesto.resolver_presupuesto)
+            dt (float): Paso de tiempo (None = config.dt)
+            t_max (float): Tiempo máximo (None = config.t_max)
+            directorio (str): Carpeta para volcar a disco (None = diezmar
+                si no entra)
+
+        Returns:
+            PlanRegistro: Estrategia elegida y memoria estimada
+        """
+        if dt is None:
+            dt = self.config.dt
+        if t_max is None:
+            t_max = self.config.t_max
+        columnas = self.historiales()
+        if all(isinstance(c, ColumnaHistorial) for c in columnas.values()):
+            esquema = tuple(columnas[n].formato for n in COLUMNAS)
+        else:
+            esquema = None
+        return planificar_registro(
+            presupuesto, max(1, int(t_max / dt)), esquema=esquema,
+            directorio=directorio, muestras_previas=len(self.r_hist),
+        )
+
+    def estimar_costo(self, dt=None, t_max=None, metodo=None,
+                      presupuesto_memoria=None, directorio_registro=None,
+                      modelo=None):
+        """
+        Tiempo de pared y memoria pico previstos de simular().
+
+        Los argumentos son los de simular() (None = los de self.config).
+        Los pasos son una cota superior: la corrida puede terminar antes
+        (por ejemplo al impactar).
+
+        Args:
+            dt (float): Paso de tiempo (s)
+            t_max (float): Tiempo máximo (s)
+            metodo (str): Integrador
+            presupuesto_memoria (int | str): Presupuesto del registro
+            directorio_registro (str): Carpeta para volcar a disco
+            modelo (ModeloCosto): Modelo a usar (None = calibrado con la
+                línea base, ver costos.modelo_por_defecto)
+
+        Returns:
+            EstimacionCosto: pasos, evaluaciones, segundos, bytes_pico y
+                el plan de registro supuesto
+        """
+        from costos import modelo_por_defecto  # diferido: solo para estimar
+
+        if modelo is None:
+            modelo = modelo_por_defecto()
+        return modelo.estimar(self.config, dt, t_max, metodo,
+                              presupuesto_memoria, directorio_registro)
+
+    def _aplicar_plan(self, plan):
+        """
+        Prepara los historiales para registrar según un plan.
+
+        Convierte las columnas al esquema del plan (o a columnas en disco
+        en una carpeta nueva dentro de plan.directorio) y fija el
+        diezmado.
+
+        Returns:
+            str | None: Carpeta de los archivos (estrategia disco)
+
+        Raises:
+            ValueError: Si el plan cambia el diezmado de un historial que
+                ya tiene muestras
+        """
+        columnas = self.historiales()
+        if plan.cada != self.cada_registro and len(self.r_hist) > 1:
+            raise ValueError(
+                "No se puede cambiar el diezmado de un historial que ya "
+                "tiene muestras"
+            )
+        carpeta = None
+        if plan.estrategia == "disco":
+            import tempfile  # diferido: solo hace falta para volcar a disco
+
+            os.makedirs(plan.directorio, exist_ok=True)
+            carpeta = tempfile.mkdtemp(prefix="historial_",
+                                       dir=plan.directorio)
+            nuevas = crear_columnas_en_disco(
+                plan.esquema, {n: columnas[n][0] for n in COLUMNAS},
+                carpeta, plan.capacidad,
+            )
+            for nombre in COLUMNAS:
+                for valor in columnas[nombre][1:]:
+                    nuevas[nombre].append(valor)
+            self._asignar_historiales(nuevas)
+        elif plan.estrategia != "completo":
+            self._asignar_historiales({
+                nombre: ColumnaHistorial(formato, columnas[nombre])
+                for nombre, formato in zip(COLUMNAS, plan.esquema)
+            })
+        self.cada_registro = plan.cada
+        return carpeta
+
+    def parametros(self):
+        """
+        Empaqueta los parámetros del vehículo para la dinámica.
+
+        Los parámetros del vehículo se toman de los atributos actuales
+        del cohete; el resto, de self.config.
+
+        Returns:
+            ParametrosDinamica: Parámetros inmutables del vehículo
+        """
+        return self.config.parametros_dinamica().reemplazar(
+            masa_cohete=self.masa_cohete,
+            isp=self.isp,
+            diametro=self.diametro,
+            h_0=self.h_0,
+            h_1=self.h_1,
+            h_2=self.h_2,
+        )
 
     def empuje(self):
         """
@@ -105,7 +388,7 @@ class Cohete:
         Returns:
             float: Fuerza de empuje (N)
         """
-        return self.isp * self.m_dot * G0
+        return self.isp * self.m_dot * self.config.g0
 
     def arrastre(self):
         """
@@ -120,91 +403,136 @@ class Cohete:
         Returns:
             float: Fuerza de arrastre (N)
         """
-        altura = self.r - R_E
-        rho = calcular_densidad_aire(altura)
-        v = calcular_velocidad(self.q, self.gamma, self.r)
-        area = calcular_area_frontal_esfera(self.diametro / 2)
-        return CD * 0.5 * rho * (v ** 2) * area
+        return arrastre(self.r, self.q, self.gamma, self.parametros())
 
-    def forward_euler(self, dt):
+    def fuerzas(self):
         """
-        Realiza un paso de integración usando el método Forward Euler.
-        
-        NOTA: Actualiza automáticamente todos los historiales.
-        
+        Evalúa todas las fuerzas en el estado actual.
+
+        Usa los controles actuales (self.m_dot, self.beta).
+
+        Returns:
+            Fuerzas: Componentes de empuje, arrastre y gravedad
+        """
+        return fuerzas(
+            self.r, self.q, self.gamma, self.masa, self.m_dot, self.beta,
+            self.parametros()
+        )
+
+    def observar(self, funcion, cada_pasos=None, cada_t=None,
+                 cada_segundos=None, fragmentos=False, fraccion_max=0.05,
+                 al_final=True):
+        """
+        Registra una función que se llama periódicamente durante simular.
+
         Args:
+            funcion (callable): funcion(vista) o funcion(vista, fragmento);
+                si devuelve True se cancela la simulación
+            cada_pasos (int): Llamar cada N pasos
+            cada_t (float): Llamar cada T segundos de tiempo simulado
+            cada_segundos (float): Llamar cada T segundos de tiempo de pared
+            fragmentos (bool): Pasar también las muestras nuevas
+            fraccion_max (float): Fracción máxima del tiempo de pared que
+                pueden consumir las llamadas (None = sin límite)
+            al_final (bool): Llamar una última vez al terminar
+
+        Returns:
+            Observador: El observador registrado (para dejar_de_observar)
+        """
+        observador = Observador(
+            funcion, cada_pasos=cada_pasos, cada_t=cada_t,
+            cada_segundos=cada_segundos, fragmentos=fragmentos,
+            fraccion_max=fraccion_max, al_final=al_final,
+        )
+        self.observadores.append(observador)
+        return observador
+
+    def dejar_de_observar(self, observador):
+        """
+        Quita un observador registrado con observar().
+
+        Args:
+            observador (Observador): Observador a quitar
+        """
+        self.observadores.remove(observador)
+
+    def avanzar(self, integrador, dt, params=None):
+        """
+        Avanza un paso con el integrador dado y actualiza los historiales.
+
+        El tiempo de vuelo se deduce de la cantidad de muestras registradas.
+
+        Args:
+            integrador (Integrador): Integrador a usar
             dt (float): Paso de tiempo (s)
-            
+            params (ParametrosDinamica): Parámetros del vehículo (si es
+                None se toman del cohete)
+
         Returns:
             tuple: (r, q, theta, gamma) - Estado actualizado
         """
-        tiempo_de_vuelo = dt * len(self.r_hist)
-        
-        # Actualizar tasa de consumo de combustible según el tiempo
-        altura = self.r - R_E
-        fuel_restante = self.masa - self.masa_cohete
-        m_dot_cmd = calcular_mdot(tiempo_de_vuelo)
-        
-        # Limitar m_dot por combustible disponible
-        if fuel_restante > 0:
-            self.m_dot = min(m_dot_cmd, fuel_restante / dt)
-        else:
-            self.m_dot = 0.0
-        
-        # Consumir combustible
-        self.masa = max(self.masa_cohete, self.masa - self.m_dot * dt)
-        
-        # Actualizar beta según configuración
-        if BETA_ALTURA:
-            self.beta = calcular_beta_altura(
-                self.r - R_E, self.h_0, self.h_1, self.h_2
-            )
-        else:
-            self.beta = calcular_beta_tiempo(tiempo_de_vuelo)
-
-        # Calcular aceleraciones
-        # Velocidades radial y tangencial
-        v_radial = self.q
-        v_tangencial = self.r * self.gamma
-        v_total = calcular_velocidad(self.q, self.gamma, self.r)
-        
-        # Componentes del arrastre (proyección sobre ejes radial y tangencial)
-        # El arrastre SIEMPRE se opone al movimiento
-        D_total = self.arrastre()
-        # IMPORTANTE: El signo del arrastre debe ser opuesto a la velocidad
-        # Si v_radial > 0 (subiendo): drag frena → drag < 0
-        # Si v_radial < 0 (cayendo): drag frena → drag > 0
-        drag_radial_magnitude = D_total * (abs(v_radial) / max(1e-9, v_total))
-        drag_radial = -math.copysign(drag_radial_magnitude, v_radial) if abs(v_radial) > 1e-9 else 0.0
-        
-        drag_tangencial_magnitude = D_total * (abs(v_tangencial) / max(1e-9, v_total))
-        drag_tangencial = -math.copysign(drag_tangencial_magnitude, v_tangencial) if abs(v_tangencial) > 1e-9 else 0.0
-        
-        # Aceleración radial: incluye gravedad, empuje, arrastre y centrífuga
-        self.q_dot = (
-            - calcular_gravedad(self.r)
-            + (self.empuje() * math.cos(self.beta)) / self.masa
-            + drag_radial / self.masa  # Ahora drag_radial ya tiene el signo correcto
-            + self.r * (self.gamma ** 2)
+        if params is None:
+            params = self.parametros()
+        t = dt * self.pasos
+        y, (q_dot, gamma_dot, beta, m_dot) = integrador.paso(
+            t, self.estado, dt, params
         )
-        
-        # Aceleración angular (ecuación: r·γ̇ + 2·q·γ = fuerzas_tangenciales)
-        # De la ecuación: r·γ̇ + 2·q·γ = (T·sin(β) + D_t) / m
-        # Ahora drag_tangencial ya tiene el signo correcto (opuesto al movimiento)
-        # Despejando: γ̇ = [(T·sin(β) + D_t) / m - 2·q·γ] / r
-        self.gamma_dot = (
-            (self.empuje() * math.sin(self.beta)) / self.masa
-            + drag_tangencial / self.masa
-            - 2 * self.q * self.gamma
-        ) / self.r
-
-        # Integración Forward Euler
-        self.gamma = self.gamma_dot * dt + self.gamma
-        self.q = self.q_dot * dt + self.q
-        self.theta = self.gamma * dt + self.theta
-        self.r = self.q * dt + self.r
-
-        # Actualizar historiales
+        self._registrar(y, q_dot, gamma_dot, beta, m_dot)
+        return (self.r, self.q, self.theta, self.gamma)
+
+    def _registrar(self, y, q_dot, gamma_dot, beta, m_dot):
+        """
+        Copia el resultado de un paso al estado y a los historiales.
+        """
+        self.estado = y
+        self.q_dot = q_dot
+        self.gamma_dot = gamma_dot
+        self.beta = beta
+        self.m_dot = m_dot
+        self.pasos += 1
+
+        self.r_hist.append(self.r)
+        self.q_hist.append(self.q)
+        self.q_dot_hist.append(q_dot)
+        self.theta_hist.append(self.theta)
+        self.gamma_hist.append(self.gamma)
+        self.gamma_dot_hist.append(gamma_dot)
+        self.masa_hist.append(self.masa)
+        self.beta_hist.append(beta)
+
+    def _registrador(self):
+        """
+        Función que registra cada paso según self.cada_registro.
+
+        Sin diezmado es _registrar; con diezmado se actualiza el estado
+        en todos los pasos pero solo se agregan a los historiales los
+        pasos múltiplos de cada_registro.
+
+        Returns:
+            callable: registrar(y, q_dot, gamma_dot, beta, m_dot)
+        """
+        cada = self.cada_registro
+        if cada == 1:
+            return self._registrar
+        agregar = self._agregar_muestra
+        restantes = cada - self.pasos % cada
+
+        def registrar(y, q_dot, gamma_dot, beta, m_dot):
+            nonlocal restantes
+            self.estado = y
+            self.q_dot = q_dot
+            self.gamma_dot = gamma_dot
+            self.beta = beta
+            self.m_dot = m_dot
+            self.pasos += 1
+            restantes -= 1
+            if restantes == 0:
+                agregar()
+                restantes = cada
+        return registrar
+
+    def _agregar_muestra(self):
+        """Agrega el estado actual a los historiales."""
         self.r_hist.append(self.r)
         self.q_hist.append(self.q)
         self.q_dot_hist.append(self.q_dot)
@@ -214,7 +542,19 @@ class Cohete:
         self.masa_hist.append(self.masa)
         self.beta_hist.append(self.beta)
 
-        return (self.r, self.q, self.theta, self.gamma)
+    def forward_euler(self, dt):
+        """
+        Realiza un paso de integración usando el método Forward Euler.
+        
+        NOTA: Actualiza automáticamente todos los historiales.
+        
+        Args:
+            dt (float): Paso de tiempo (s)
+            
+        Returns:
+            tuple: (r, q, theta, gamma) - Estado actualizado
+        """
+        return self.avanzar(crear_integrador("forward_euler"), dt)
 
     def backward_euler(self, dt):
         """
@@ -231,128 +571,54 @@ class Cohete:
         Args:
             dt (float): Paso de tiempo (s)
         """
-        # 1) Actualizar tasa de consumo de combustible
-        # IMPORTANTE: Ahora calcular_mdot usa TIEMPO en lugar de altura
-        altura = self.r - R_E  # Mantener para beta y densidad
-        tiempo_actual = len(self.r_hist) * dt  # Usar el dt correcto de la simulación
-        fuel_restante = self.masa - self.masa_cohete
-        m_dot_cmd = calcular_mdot(tiempo_actual)
-        
-        # Limitar m_dot por combustible disponible
-        if fuel_restante > 0:
-            self.m_dot = min(m_dot_cmd, fuel_restante / dt)
-        else:
-            self.m_dot = 0.0
-    
-        # Consumir combustible
-        self.masa = max(self.masa_cohete, self.masa - self.m_dot * dt)
-    
-        # 2) Actualizar beta
-        if BETA_ALTURA:
-            self.beta = calcular_beta_altura(
-                altura, self.h_0, self.h_1, self.h_2
-            )
-        else:
-            tiempo_de_vuelo = dt * len(self.r_hist)
-            self.beta = calcular_beta_tiempo(tiempo_de_vuelo)
-        
-        # 3) Calcular empuje
-        T = self.empuje()
-        
-        # Log periódico del empuje (cada 100,000 iteraciones)
-        if len(self.r_hist) % 100_000 == 1:
-            print(f"Empuje: {T:.2f} N")
-        
-        # 4) Calcular componentes de velocidad y arrastre
-        v_r = self.q
-        v_t = self.r * self.gamma
-        v = max(1e-9, math.hypot(v_r, v_t))
-    
-        rho = max(0.0, calcular_densidad_aire(altura))
-        A = calcular_area_frontal_esfera(self.diametro / 2)
-        D = 0.5 * CD * rho * (v ** 2) * A
-        # El arrastre se opone al movimiento
-        D_r_magnitude = D * (abs(v_r) / v)
-        D_r = -math.copysign(D_r_magnitude, v_r) if abs(v_r) > 1e-9 else 0.0
-        D_t_magnitude = D * (abs(v_t) / v)
-        D_t = -math.copysign(D_t_magnitude, v_t) if abs(v_t) > 1e-9 else 0.0
-    
-        # 5) Integración Backward Euler (iterativo para convergencia)
-        # Estimación inicial con Forward Euler
-        q_new = self.q
-        gamma_new = self.gamma
-        r_new = self.r
-        
-        # Iterar 3 veces para convergencia del método implícito
-        for _ in range(3):
-            # Predecir nueva posición radial
-            r_new = self.r + dt * q_new
-            
-            # Recalcular arrastre con nuevas velocidades
-            v_r_new = q_new
-            v_t_new = r_new * gamma_new
-            v_new = max(1e-9, math.hypot(v_r_new, v_t_new))
-            
-            rho_new = max(0.0, calcular_densidad_aire(r_new - R_E))
-            D_new = 0.5 * CD * rho_new * (v_new ** 2) * A
-            D_r_new_magnitude = D_new * (abs(v_r_new) / v_new)
-            D_r_new = -math.copysign(D_r_new_magnitude, v_r_new) if abs(v_r_new) > 1e-9 else 0.0
-            D_t_new_magnitude = D_new * (abs(v_t_new) / v_new)
-            D_t_new = -math.copysign(D_t_new_magnitude, v_t_new) if abs(v_t_new) > 1e-9 else 0.0
-            
-            # Aceleración radial (usando valores nuevos para implícito)
-            q_dot_new = (
-                (T * math.cos(self.beta) + D_r_new) / self.masa
-                - MU / (r_new ** 2)
-                + r_new * (gamma_new ** 2)  # Término centrífugo con gamma_new
-            )
-            q_new = self.q + dt * q_dot_new
-            
-            # Aceleración angular (usando valores nuevos)
-            # De la ecuación: r·γ̇ + 2·q·γ = (T·sin(β) + D_t) / m
-            # Ahora D_t ya tiene el signo correcto (opuesto a v_t)
-            gamma_dot_new = (
-                (T * math.sin(self.beta) + D_t_new) / self.masa
-                - 2 * q_new * gamma_new  # Término de Coriolis con q_new y gamma_new
-            ) / r_new
-            gamma_new = self.gamma + dt * gamma_dot_new
-        
-        # Actualizar theta con gamma final
-        theta_new = self.theta + dt * gamma_new
-
-        # 6) Actualizar historiales
-        self.r_hist.append(r_new)
-        self.q_hist.append(q_new)
-        self.q_dot_hist.append(q_dot_new)
-        self.gamma_hist.append(gamma_new)
-        self.gamma_dot_hist.append(gamma_dot_new)
-        self.theta_hist.append(theta_new)
-        self.masa_hist.append(self.masa)
-        self.beta_hist.append(self.beta)
-        
-        # 7) Actualizar estado
-        self.r = r_new
-        self.q = q_new
-        self.gamma = gamma_new
-        self.theta = theta_new
-        self.q_dot = q_dot_new
-        self.gamma_dot = gamma_dot_new
+        self.avanzar(crear_integrador("backward_euler"), dt)
 
-    def simular(self, dt: float, t_max: float, usar_backward: bool = True,
-                log_cada: int = 0):
+    def simular(self, dt: float = None, t_max: float = None,
+                usar_backward: bool = None, log_cada: int = 0,
+                metodo: str = None, rtol: float = None, atol: float = None,
+                respetar_quiebres: bool = None, perfil=None,
+                telemetria=None, presupuesto_memoria=None,
+                directorio_registro=None):
         """
         Ejecuta la simulación completa hasta t_max.
         
+        Los argumentos que se dejan en None toman el valor de self.config.
+        
         Criterios de parada:
         - Tiempo máximo alcanzado
-        - Cohete colisiona con la Tierra (r <= R_E)
+        - Cohete colisiona con la Tierra (r <= r_e)
         - Valores numéricos inválidos (NaN/inf)
+        - Un observador pide cancelar (ver observar())
         
         Args:
             dt (float): Paso de tiempo (s)
             t_max (float): Tiempo máximo de simulación (s)
-            usar_backward (bool): True para Backward Euler, False para Forward
+            usar_backward (bool): True para Backward Euler, False para
+                Forward (None para usar config.metodo)
             log_cada (int): Frecuencia de logging (0 para silenciar)
+            metodo (str): Nombre de un integrador registrado (ver
+                integradores.INTEGRADORES) o "scipy:<método>" para delegar
+                en scipy.integrate.solve_ivp (RK45, DOP853, Radau, LSODA,
+                BDF). Si se indica, tiene prioridad sobre usar_backward.
+            rtol (float): Tolerancia relativa (métodos adaptativos)
+            atol (float): Tolerancia absoluta (métodos adaptativos)
+            respetar_quiebres (bool): Si es True, los pasos que atraviesan
+                un quiebre de los perfiles de consumo o de guiado se
+                parten para terminar exactamente en él (ver planificador.py)
+            perfil (Perfilador): Si se indica, acumula tiempos por
+                componente y contadores de la corrida (ver perfilado.py).
+                Sin perfil no se instrumenta nada.
+            telemetria (Telemetria): Destino de los registros de progreso,
+                fases, eventos y resumen (None = texto por stdout, ver
+                telemetria.py; Telemetria.nula() para desactivarla)
+            presupuesto_memoria (int | str): Memoria máxima para los
+                historiales, en bytes, como texto ("512M", "2G") o
+                "auto" (ver presupuesto.py). Si el registro completo no
+                entra, se pasa a arreglos float64, se vuelca a disco o se
+                diezma (None = registrar todo sin límite)
+            directorio_registro (str): Carpeta donde volcar los
+                historiales si no entran en el presupuesto (None =
+                diezmar en su lugar)
             
         Returns:
             dict: Resumen de la simulación con:
@@ -361,88 +627,251 @@ class Cohete:
                 - t_final: Tiempo final (s)
                 - h_final_m: Altura final (m)
                 - theta_final: Ángulo final (rad)
+                - evaluaciones: Evaluaciones de la dinámica
+                - perfil: Informe del perfilado (solo si se pasó perfil)
+                - registro: Plan de registro elegido, con la carpeta de
+                  los archivos si se volcó a disco (solo si se pasó
+                  presupuesto_memoria)
+        """
+        if perfil is not None:
+            with perfil.instrumentar():
+                perfil.entrar("simular")
+                try:
+                    resumen = self._simular(
+                        dt, t_max, usar_backward, log_cada, metodo, rtol,
+                        atol, respetar_quiebres, perfil, telemetria,
+                        presupuesto_memoria, directorio_registro
+                    )
+                finally:
+                    perfil.salir()
+            resumen["perfil"] = perfil.informe()
+            return resumen
+        return self._simular(dt, t_max, usar_backward, log_cada, metodo,
+                             rtol, atol, respetar_quiebres, None, telemetria,
+                             presupuesto_memoria, directorio_registro)
+
+    def _simular(self, dt, t_max, usar_backward, log_cada, metodo, rtol,
+                 atol, respetar_quiebres, perfil, telemetria,
+                 presupuesto_memoria, directorio_registro):
+        """
+        Cuerpo de simular(); ver su documentación.
         """
+        config = self.config
+        if dt is None:
+            dt = config.dt
+        if t_max is None:
+            t_max = config.t_max
+        if rtol is None:
+            rtol = config.rtol
+        if atol is None:
+            atol = config.atol
+        if respetar_quiebres is None:
+            respetar_quiebres = config.respetar_quiebres
+        if telemetria is None:
+            telemetria = Telemetria()
+
+        # Plan de registro para el presupuesto de memoria
+        informe_registro = None
+        presupuesto = resolver_presupuesto(presupuesto_memoria)
+        if presupuesto is not None:
+            plan = self.plan_registro(presupuesto, dt, t_max,
+                                      directorio_registro)
+            carpeta = self._aplicar_plan(plan)
+            informe_registro = plan.informe()
+            if carpeta is not None:
+                informe_registro["carpeta"] = carpeta
+            if log_cada != 0 and telemetria.acepta(INFO):
+                telemetria.emitir(
+                    Evento(0.0, "plan_registro", informe_registro)
+                )
+
         # Seleccionar método de integración
-        paso = self.backward_euler if usar_backward else self.forward_euler
-        nombre_metodo = "Backward Euler" if usar_backward else "Forward Euler"
+        if metodo is None:
+            if usar_backward is None:
+                metodo = config.metodo
+            else:
+                metodo = "backward_euler" if usar_backward else "forward_euler"
+        tolerancias = {}
+        if rtol is not None:
+            tolerancias["rtol"] = rtol
+        if atol is not None:
+            tolerancias["atol"] = atol
+        if es_metodo_scipy(metodo):
+            if perfil is not None:
+                perfil.entrar("integrador")
+            try:
+                resumen = simular_scipy(self, dt, t_max, metodo,
+                                        log_cada=log_cada,
+                                        telemetria=telemetria,
+                                        registrar=self._registrador(),
+                                        **tolerancias)
+            finally:
+                if perfil is not None:
+                    perfil.salir()
+            if perfil is not None:
+                perfil.contar("pasos", resumen["iter"])
+                perfil.contar("evaluaciones", resumen["evaluaciones"])
+            if informe_registro is not None:
+                resumen["registro"] = informe_registro
+            return resumen
+        integrador = crear_integrador(metodo, **tolerancias)
+        params = self.parametros()
     
+        # El tiempo se lleva en ticks enteros (t = tick·dt) para que no
+        # se desvíe de la grilla ni de los quiebres
         t = 0.0
         iter_max = max(1, int(t_max / dt))
+        tick_0 = self.pasos
+        if respetar_quiebres:
+            quiebres = puntos_de_quiebre(tick_0 * dt,
+                                         (tick_0 + iter_max) * dt, params)
+        else:
+            quiebres = ()
+        calendario = CalendarioQuiebres(quiebres, dt)
+
+        # Con perfil, cada componente del bucle se reemplaza por su
+        # versión cronometrada; sin perfil no hay costo adicional
+        paso = integrador.paso
+        paso_quiebres = paso_con_quiebres
+        cercanos_a = calendario.cercanos
+        registrar = self._registrador()
+        perfilando = perfil is not None
+        if perfilando:
+            paso = perfil.envolver("integrador", paso)
+            paso_quiebres = perfil.envolver("integrador", paso_quiebres)
+            cercanos_a = perfil.envolver("quiebres", cercanos_a)
+            registrar = perfil.envolver("registro", registrar)
+            subpasos = 0
     
-        # Log inicial
-        if log_cada != 0:
-            print(f"Simulando con dt = {dt} s usando {nombre_metodo}")
-            print(
-                f"Iter 0: altura = {max(0.0, self.r - R_E)/1000:.3f} km, "
-                f"v_r = {self.q:.3f} m/s, omega = {self.gamma:.3e} rad/s, "
-                f"masa = {self.masa:.0f} kg, beta = {self.beta:.3f} rad, "
-                f"t = {t:.1f} s"
-            )
+        # Log inicial (los registros solo se construyen si se emiten)
+        informar = log_cada != 0 and telemetria.acepta(INFO)
+        progreso = log_cada > 0 and informar
+        depurar = telemetria.acepta(DEPURACION)
+        if informar:
+            telemetria.emitir(Evento(t, "inicio", {"dt": dt, "metodo": metodo}))
+            self._progreso(telemetria, 0, t)
     
         end_reason = "t_max"
         i_fin = 0
         flag_combustible_agotado = True
 
+        # Observadores: en cada paso solo se compara con el próximo
+        # paso de consulta
+        gestor = None
+        proximo = math.inf
+        if self.observadores:
+            gestor = GestorObservadores(self.observadores, dt,
+                                        len(self.r_hist) - 1,
+                                        cada=self.cada_registro)
+            proximo = gestor.proximo
+
         for i in range(1, iter_max + 1):
             # 1) Manejar agotamiento de combustible
             if self.masa <= self.masa_cohete:
                 self.masa = self.masa_cohete
                 if flag_combustible_agotado:
-                    altura_km = max(0.0, self.r - R_E) / 1000
-                    print(f"*** COMBUSTIBLE AGOTADO en t={t:.1f}s, altura={altura_km:.1f}km ***")
+                    if telemetria.acepta(INFO):
+                        telemetria.emitir(CambioFase(
+                            t, "combustible_agotado",
+                            max(0.0, self.r - params.r_e)
+                        ))
                     flag_combustible_agotado = False
                 self.m_dot = 0.0
     
             # 2) Ejecutar un paso del método de integración
-            if usar_backward:
-                paso(dt)  # backward_euler actualiza automáticamente
+            t_a = (tick_0 + i - 1) * dt
+            cercanos = cercanos_a(t_a, dt)
+            if cercanos:
+                y, registro = paso_quiebres(
+                    integrador, t_a, dt, self.estado, params, cercanos
+                )
+                if perfilando:
+                    subpasos += 1
             else:
-                # NOTA: forward_euler no actualiza historiales automáticamente
-                # Habría que agregarlo si se usa forward_euler
-                paso(dt)
+                y, registro = paso(t_a, self.estado, dt, params)
+            registrar(y, *registro)
+
+            # Empuje periódico (cada 100,000 iteraciones, depuración)
+            if depurar and (tick_0 + i) % 100_000 == 1:
+                telemetria.emitir(Evento(
+                    i * dt, "empuje", {"empuje": self.empuje()}, DEPURACION
+                ))
     
-            t += dt
+            t = i * dt
             i_fin = i
-    
+
             # 3) Criterios de parada
+            if perfilando:
+                perfil.entrar("eventos")
             # a) Colisión con la Tierra
-            if self.r <= R_E:
+            if self.r <= params.r_e:
                 end_reason = "hit_ground"
-                break
-            
             # b) Valores numéricos inválidos
-            if not (math.isfinite(self.r) and math.isfinite(self.q) and
-                    math.isfinite(self.theta) and math.isfinite(self.gamma)):
+            elif not (math.isfinite(self.r) and math.isfinite(self.q) and
+                      math.isfinite(self.theta) and math.isfinite(self.gamma)):
                 end_reason = "numerical_error"
+            if perfilando:
+                perfil.salir()
+            if end_reason != "t_max":
                 break
             
             # 4) Logging periódico
-            if log_cada > 0 and (i % log_cada == 0):
-                altura_km = max(0.0, self.r - R_E) / 1000.0
-                print(
-                    f"Iter {i}: altura = {altura_km:.3f} km, "
-                    f"v_r = {self.q:.3f} m/s, omega = {self.gamma:.3e} rad/s, "
-                    f"masa = {self.masa:.0f} kg, beta = {self.beta:.3f} rad, "
-                    f"t = {t:.1f} s"
-                )
+            if progreso and i % log_cada == 0:
+                self._progreso(telemetria, i, t)
+
+            # 5) Observadores
+            if i >= proximo:
+                if gestor.notificar(self, i, t):
+                    end_reason = "cancelled"
+                    break
+                proximo = gestor.proximo
     
-            # 5) Corte por tiempo máximo
+            # 6) Corte por tiempo máximo
             if t >= t_max:
                 end_reason = "t_max"
                 break
             
-        # Resumen final
-        if log_cada != 0:
-            altura_km = max(0.0, self.r - R_E) / 1000.0
-            print(
-                f"FIN: {end_reason} | iter: {i_fin} | t: {t:.1f} s | "
-                f"h: {altura_km:.2f} km | theta: {self.theta:.4f} rad"
-            )
-    
-        return {
+        if gestor is not None and end_reason != "cancelled":
+            gestor.finalizar(self, i_fin, t)
+
+        if perfilando:
+            perfil.contar("pasos", i_fin)
+            perfil.contar("pasos_partidos_en_quiebres", subpasos)
+            perfil.contar("evaluaciones", integrador.evaluaciones)
+            perfil.contar("iteraciones_implicitas",
+                          getattr(integrador, "iteraciones_implicitas", 0))
+            perfil.contar("pasos_rechazados",
+                          getattr(integrador, "rechazos", 0))
+
+        resumen = {
             "end_reason": end_reason,
             "iter": i_fin,
             "t_final": t,
-            "h_final_m": max(0.0, self.r - R_E),
+            "h_final_m": max(0.0, self.r - params.r_e),
             "theta_final": self.theta,
+            "evaluaciones": integrador.evaluaciones,
         }
+        if informar:
+            telemetria.emitir(Resumen(**resumen))
+        if informe_registro is not None:
+            resumen["registro"] = informe_registro
+        return resumen
+
+    def _progreso(self, telemetria, iteracion, t):
+        """
+        Emite un registro de progreso con el estado actual.
+
+        Args:
+            telemetria (Telemetria): Destino del registro
+            iteracion (int): Número de paso
+            t (float): Tiempo de simulación (s)
+        """
+        telemetria.emitir(Progreso(
+            iteracion=iteracion,
+            t=t,
+            altura_m=max(0.0, self.r - self.config.r_e),
+            q=self.q,
+            gamma=self.gamma,
+            masa=self.masa,
+            beta=self.beta,
+        ))
@@ -0,0 +1,184 @@
+"""
+Configuración inmutable de una simulación.
+
+ConfiguracionSimulacion reúne todo lo que define una corrida: constantes
+físicas, vehículo, condiciones iniciales, guiado, perfil de consumo y
+ajustes de integración. Se pasa explícitamente a Cohete, en lugar de que
+la física lea las constantes globales de constantes.py, de modo que
+varias configuraciones distintas pueden correr a la vez en un mismo
+proceso (hilos, lotes o procesos trabajadores).
+
+Es un dataclass congelado y hasheable:
+- Se envía barato a otros procesos (pickle de unos pocos números)
+- Sirve como clave de caché (hash() en memoria, huella() en disco)
+- Las variantes se crean con dataclasses.replace(config, campo=valor)
+
+Los valores por defecto son los de constantes.py y utilidades.py.
+"""
+
+from dataclasses import dataclass, fields
+from typing import Optional, Tuple
+
+from constantes import (
+    MU, R_E, G0, CD,
+    MASA_COHETE, MASA_FUEL, DIAMETRO_COHETE, ISP,
+    R_0, Q_0, Q_DOT_0, THETA_0, GAMMA_0, GAMMA_DOT_0, BETA_0, M_DOT_0,
+    H_0, H_1, H_2, BETA_ALTURA,
+    DT, T_MAX, USAR_BACKWARD
+)
+from dinamica import ParametrosDinamica
+from historial import EsquemaHistorial, esquema_por_nombre
+from utilidades import FASES_MDOT, TIEMPOS_BETA, BETAS_BETA
+
+
+@dataclass(frozen=True)
+class ConfiguracionSimulacion:
+    """
+    Configuración completa e inmutable de una simulación.
+
+    Constantes físicas:
+    - mu: Parámetro gravitacional de la Tierra (m³/s²)
+    - r_e: Radio de la Tierra (m)
+    - g0: Gravedad en la superficie (m/s²)
+    - cd: Coeficiente de arrastre
+
+    Vehículo:
+    - masa_cohete, masa_fuel (kg), diametro (m), isp (s)
+
+    Condiciones iniciales:
+    - r_0, q_0, q_dot_0, theta_0, gamma_0, gamma_dot_0, beta_0, m_dot_0
+
+    Guiado y perfil de consumo:
+    - beta_altura: True si beta depende de la altura
+    - h_0, h_1, h_2: Alturas de transición del guiado por altura (m)
+    - tiempos_beta, betas_tiempo: Puntos de control del guiado por
+      tiempo (s, rad)
+    - fases_mdot: Pares (tiempo de fin de fase, mdot)
+
+    Integración:
+    - metodo: Nombre del integrador (ver integradores.INTEGRADORES) o
+      "scipy:<método>"
+    - dt, t_max: Paso y tiempo máximo (s)
+    - rtol, atol: Tolerancias de los métodos adaptativos (None = las
+      del integrador)
+    - respetar_quiebres: Partir los pasos en los quiebres de los perfiles
+
+    Registro:
+    - historial: EsquemaHistorial con el formato de cada columna del
+      historial, o su nombre en historial.ESQUEMAS (None = listas de
+      floats, ver historial.py)
+    """
+
+    # Constantes físicas
+    mu: float = MU
+    r_e: float = R_E
+    g0: float = G0
+    cd: float = CD
+
+    # Vehículo
+    masa_cohete: float = MASA_COHETE
+    masa_fuel: float = MASA_FUEL
+    diametro: float = DIAMETRO_COHETE
+    isp: float = ISP
+
+    # Condiciones iniciales
+    r_0: float = R_0
+    q_0: float = Q_0
+    q_dot_0: float = Q_DOT_0
+    theta_0: float = THETA_0
+    gamma_0: float = GAMMA_0
+    gamma_dot_0: float = GAMMA_DOT_0
+    beta_0: float = BETA_0
+    m_dot_0: float = M_DOT_0
+
+    # Guiado y perfil de consumo
+    beta_altura: bool = BETA_ALTURA
+    h_0: float = H_0
+    h_1: float = H_1
+    h_2: float = H_2
+    tiempos_beta: Tuple[float, ...] = TIEMPOS_BETA
+    betas_tiempo: Tuple[float, ...] = BETAS_BETA
+    fases_mdot: Tuple[Tuple[float, float], ...] = FASES_MDOT
+
+    # Integración
+    metodo: str = "backward_euler" if USAR_BACKWARD else "forward_euler"
+    dt: float = DT
+    t_max: float = T_MAX
+    rtol: Optional[float] = None
+    atol: Optional[float] = None
+    respetar_quiebres: bool = True
+
+    # Registro
+    historial: Optional[EsquemaHistorial] = None
+
+    def __post_init__(self):
+        # Normalizar secuencias a tuplas para que la configuración sea
+        # hasheable aunque se pasen listas o arreglos
+        object.__setattr__(
+            self, "tiempos_beta", tuple(float(t) for t in self.tiempos_beta)
+        )
+        object.__setattr__(
+            self, "betas_tiempo", tuple(float(b) for b in self.betas_tiempo)
+        )
+        object.__setattr__(
+            self, "fases_mdot",
+            tuple((float(t), float(m)) for t, m in self.fases_mdot)
+        )
+        object.__setattr__(
+            self, "historial", esquema_por_nombre(self.historial)
+        )
+
+        if self.dt <= 0:
+            raise ValueError(f"dt debe ser positivo (dt = {self.dt})")
+        if self.t_max <= 0:
+            raise ValueError(f"t_max debe ser positivo (t_max = {self.t_max})")
+        if self.masa_cohete <= 0:
+            raise ValueError(
+                f"masa_cohete debe ser positiva ({self.masa_cohete})"
+            )
+        if len(self.tiempos_beta) != len(self.betas_tiempo):
+            raise ValueError(
+                "tiempos_beta y betas_tiempo deben tener la misma longitud"
+            )
+
+    def parametros_dinamica(self):
+        """
+        Parámetros que usa la física (dinamica.derivada).
+
+        Returns:
+            ParametrosDinamica: Parámetros del vehículo, constantes y
+                perfiles, con las constantes derivadas ya calculadas
+        """
+        return ParametrosDinamica.crear(
+            masa_cohete=self.masa_cohete,
+            isp=self.isp,
+            diametro=self.diametro,
+            h_0=self.h_0,
+            h_1=self.h_1,
+            h_2=self.h_2,
+            mu=self.mu,
+            r_e=self.r_e,
+            g0=self.g0,
+            cd=self.cd,
+            beta_altura=self.beta_altura,
+            tiempos_beta=self.tiempos_beta,
+            betas_tiempo=self.betas_tiempo,
+            fases_mdot=self.fases_mdot,
+        )
+
+    def huella(self):
+        """
+        Huella estable de la configuración, igual entre procesos.
+
+        hash() de Python cambia entre procesos para cadenas; esta huella
+        no, así que sirve como clave de caché en disco.
+
+        Returns:
+            str: Resumen SHA-256 en hexadecimal
+        """
+        import hashlib  # diferido: solo hace falta para la huella
+
+        texto = repr(tuple(
+            (campo.name, getattr(self, campo.name)) for campo in fields(self)
+        ))
+        return hashlib.sha256(texto.encode("utf-8")).hexdigest()
@@ -0,0 +1,437 @@
+"""
+Modelo de costo (tiempo de pared y memoria) de una simulación.
+
+El costo de una corrida varía en órdenes de magnitud según dt, t_max, el
+integrador y el registro. ModeloCosto lo predice antes de correr a partir
+de:
+
+- pasos = t_max / dt (cota superior: la corrida puede terminar antes)
+- el costo por paso de cada integrador (medido) o, para los que no se
+  midieron, sus evaluaciones de la dinámica por paso
+- el plan de registro (muestras y bytes por muestra, ver presupuesto.py)
+
+con un modelo lineal de tiempo:
+
+    segundos = segundos_fijos + pasos·segundos_por_paso[metodo]
+
+(para un método sin calibrar, segundos_por_paso = evaluaciones por paso
+· segundos_por_evaluacion) y de memoria:
+
+    bytes_pico = bytes_fijos + bytes de los historiales
+
+Los coeficientes se calibran con corridas cortas de cada integrador
+(calibrar), y las mismas corridas forman el grupo "costos" de
+rendimiento.py, así que la línea base versionada calibra el modelo por
+defecto (modelo_por_defecto). barrido.ejecutar_barrido lo usa para
+ordenar los trabajos de mayor a menor y armar los lotes.
+
+Uso:
+    estimacion = cohete.estimar_costo()
+    estimacion.segundos, estimacion.bytes_pico
+    modelo = calibrar()                       # en esta máquina
+    modelo.guardar("costos.json")
+"""
+
+import os
+import time
+from typing import Dict, NamedTuple, Optional
+
+from historial import bytes_por_muestra
+from presupuesto import (
+    PlanRegistro, planificar_registro, resolver_presupuesto
+)
+
+
+# Evaluaciones de la dinámica por paso antes de calibrar
+EVALUACIONES_POR_PASO = {
+    "forward_euler": 1.0,
+    "backward_euler": 3.0,
+    "rk4": 4.0,
+    "adaptativo": 7.0,
+    "simplectico": 2.0,
+}
+
+# Evaluaciones por muestra de los métodos de solve_ivp (varía mucho con
+# el método y las tolerancias)
+EVALUACIONES_SCIPY = 10.0
+
+# Prefijo de los casos de calibración en las líneas base de rendimiento.py
+PREFIJO_CASOS = "costo "
+
+# Pasos de las corridas de calibración
+PASOS_CALIBRACION = 4000
+
+
+class EstimacionCosto(NamedTuple):
+    """
+    Costo previsto de una corrida.
+
+    Args:
+        metodo (str): Integrador
+        pasos (int): Pasos de integración (cota superior)
+        evaluaciones (float): Evaluaciones de la dinámica
+        segundos (float): Tiempo de pared (s)
+        bytes_pico (int): Memoria pico (bytes)
+        registro (PlanRegistro): Plan de registro supuesto
+    """
+    metodo: str
+    pasos: int
+    evaluaciones: float
+    segundos: float
+    bytes_pico: int
+    registro: PlanRegistro
+
+
+class ModeloCosto(NamedTuple):
+    """
+    Coeficientes del modelo de costo.
+
+    Args:
+        segundos_fijos (float): Costo por corrida (crear el cohete,
+            preparar el integrador)
+        segundos_por_paso (dict): Integrador -> costo medido de un paso
+            (dinámica, bucle, eventos y registro); None = ninguno
+        segundos_por_evaluacion (float): Costo de una evaluación de la
+            dinámica, para los integradores sin costo medido
+        evaluaciones_por_paso (dict): Integrador -> evaluaciones por paso
+            (None = EVALUACIONES_POR_PASO)
+        bytes_fijos (int): Memoria de una corrida sin historiales
+    """
+    segundos_fijos: float = 5e-5
+    segundos_por_paso: Optional[Dict[str, float]] = None
+    segundos_por_evaluacion: float = 8e-6
+    evaluaciones_por_paso: Optional[Dict[str, float]] = None
+    bytes_fijos: int = 16 * 1024
+
+    def evaluaciones(self, metodo):
+        """
+        Evaluaciones por paso de un integrador.
+
+        Args:
+            metodo (str): Integrador o "scipy:<método>"
+
+        Returns:
+            float: Evaluaciones por paso
+        """
+        tabla = (self.evaluaciones_por_paso
+                 if self.evaluaciones_por_paso is not None
+                 else EVALUACIONES_POR_PASO)
+        if metodo in tabla:
+            return tabla[metodo]
+        if metodo.startswith("scipy:"):
+            return EVALUACIONES_SCIPY
+        return max(tabla.values())
+
+    def costo_paso(self, metodo):
+        """
+        Tiempo de pared previsto de un paso.
+
+        Args:
+            metodo (str): Integrador o "scipy:<método>"
+
+        Returns:
+            float: Segundos por paso
+        """
+        if self.segundos_por_paso and metodo in self.segundos_por_paso:
+            return self.segundos_por_paso[metodo]
+        return self.evaluaciones(metodo) * self.segundos_por_evaluacion
+
+    def estimar(self, config, dt=None, t_max=None, metodo=None,
+                presupuesto_memoria=None, directorio_registro=None):
+        """
+        Costo previsto de simular una configuración.
+
+        Args:
+            config (ConfiguracionSimulacion): Configuración
+            dt (float): Paso (None = config.dt)
+            t_max (float): Tiempo máximo (None = config.t_max)
+            metodo (str): Integrador (None = config.metodo)
+            presupuesto_memoria (int | str): Presupuesto del registro
+                (ver Cohete.simular)
+            directorio_registro (str): Carpeta para volcar a disco
+
+        Returns:
+            EstimacionCosto: Tiempo, memoria y plan de registro
+        """
+        dt = config.dt if dt is None else dt
+        t_max = config.t_max if t_max is None else t_max
+        metodo = config.metodo if metodo is None else metodo
+        pasos = max(1, int(t_max / dt))
+        presupuesto = resolver_presupuesto(presupuesto_memoria)
+        if presupuesto is None:
+            costo = bytes_por_muestra(config.historial)
+            plan = PlanRegistro(
+                estrategia="completo", pasos=pasos, muestras=pasos + 2,
+                cada=1, bytes_por_muestra=costo,
+                bytes_memoria=(pasos + 2) * costo, bytes_disco=0,
+                presupuesto=0, esquema=config.historial,
+            )
+        else:
+            plan = planificar_registro(presupuesto, pasos, config.historial,
+                                       directorio_registro)
+        return EstimacionCosto(
+            metodo=metodo,
+            pasos=pasos,
+            evaluaciones=pasos * self.evaluaciones(metodo),
+            segundos=self.segundos_fijos + pasos * self.costo_paso(metodo),
+            bytes_pico=self.bytes_fijos + plan.bytes_memoria,
+            registro=plan,
+        )
+
+    def segundos(self, config):
+        """
+        Tiempo de pared previsto de una configuración (para ordenar).
+
+        Args:
+            config (ConfiguracionSimulacion): Configuración
+
+        Returns:
+            float: Segundos
+        """
+        pasos = max(1, int(config.t_max / config.dt))
+        return self.segundos_fijos + pasos * self.costo_paso(config.metodo)
+
+    def guardar(self, ruta):
+        """
+        Guarda el modelo en JSON.
+
+        Args:
+            ruta (str): Archivo de destino
+        """
+        import json  # diferido: solo hace falta para archivar el modelo
+
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump(self._asdict(), archivo, indent=2)
+            archivo.write("\n")
+
+    @classmethod
+    def cargar(cls, ruta):
+        """
+        Carga un modelo guardado con guardar().
+
+        Args:
+            ruta (str): Archivo JSON
+
+        Returns:
+            ModeloCosto: Modelo guardado
+        """
+        import json  # diferido: solo hace falta para archivar el modelo
+
+        with open(ruta, encoding="utf-8") as archivo:
+            return cls(**json.load(archivo))
+
+    @classmethod
+    def desde_mediciones(cls, mediciones, base=None):
+        """
+        Calibra el modelo con mediciones de corridas.
+
+        El costo fijo es el de las corridas de un paso; el costo por paso
+        y las evaluaciones por paso de cada integrador salen de sus
+        corridas largas, y el costo por evaluación es la mediana entre
+        integradores.
+
+        Args:
+            mediciones (sequence): dicts con metodo, pasos, evaluaciones,
+                tiempo_s y, opcionalmente, memoria_pico_kb y muestras
+            base (ModeloCosto): Valores para lo que las mediciones no
+                determinan (None = valores por defecto)
+
+        Returns:
+            ModeloCosto: Modelo calibrado
+        """
+        import statistics
+
+        base = base if base is not None else cls()
+        cortas = [m["tiempo_s"] for m in mediciones if m["pasos"] <= 1]
+        fijos = min(cortas) if cortas else base.segundos_fijos
+
+        segundos_por_paso = dict(base.segundos_por_paso or {})
+        evaluaciones_por_paso = dict(
+            base.evaluaciones_por_paso
+            if base.evaluaciones_por_paso is not None
+            else EVALUACIONES_POR_PASO
+        )
+        por_evaluacion = []
+        for m in mediciones:
+            if m["pasos"] <= 1:
+                continue
+            por_paso = max(0.0, m["tiempo_s"] - fijos) / m["pasos"]
+            evaluaciones = m["evaluaciones"] / m["pasos"]
+            segundos_por_paso[m["metodo"]] = por_paso
+            evaluaciones_por_paso[m["metodo"]] = evaluaciones
+            if evaluaciones > 0:
+                por_evaluacion.append(por_paso / evaluaciones)
+
+        bytes_fijos = base.bytes_fijos
+        con_memoria = [m for m in mediciones
+                       if m.get("memoria_pico_kb") is not None
+                       and m.get("muestras") is not None]
+        if con_memoria:
+            bytes_fijos = int(min(
+                max(0.0, m["memoria_pico_kb"] * 1024
+                    - m["muestras"] * bytes_por_muestra())
+                for m in con_memoria
+            ))
+        return cls(
+            segundos_fijos=fijos,
+            segundos_por_paso=segundos_por_paso,
+            segundos_por_evaluacion=(statistics.median(por_evaluacion)
+                                     if por_evaluacion
+                                     else base.segundos_por_evaluacion),
+            evaluaciones_por_paso=evaluaciones_por_paso,
+            bytes_fijos=bytes_fijos,
+        )
+
+    @classmethod
+    def desde_linea_base(cls, corrida):
+        """
+        Calibra el modelo con los casos "costo ..." de una línea base de
+        rendimiento.py.
+
+        Args:
+            corrida (dict): Línea base (rendimiento.cargar_linea_base)
+
+        Returns:
+            ModeloCosto: Modelo calibrado (el por defecto si la línea
+                base no tiene casos de costo)
+        """
+        mediciones = [
+            resultado for nombre, resultado in corrida["resultados"].items()
+            if nombre.startswith(PREFIJO_CASOS) and "evaluaciones" in resultado
+        ]
+        if not mediciones:
+            return cls()
+        return cls.desde_mediciones(mediciones)
+
+
+def configuraciones_calibracion(pasos=PASOS_CALIBRACION):
+    """
+    Corridas de calibración: el ascenso por defecto con cada integrador,
+    y una corrida de un paso para el costo fijo.
+
+    Args:
+        pasos (int): Pasos de cada corrida
+
+    Returns:
+        dict: Nombre del caso -> ConfiguracionSimulacion
+    """
+    from configuracion import ConfiguracionSimulacion
+
+    casos = {
+        f"{PREFIJO_CASOS}{metodo}": ConfiguracionSimulacion(
+            metodo=metodo, dt=0.1, t_max=0.1 * pasos
+        )
+        for metodo in EVALUACIONES_POR_PASO
+    }
+    casos[f"{PREFIJO_CASOS}fijo"] = ConfiguracionSimulacion(
+        metodo="forward_euler", dt=0.1, t_max=0.1
+    )
+    return casos
+
+
+def medir_corrida(config):
+    """
+    Simula una configuración y devuelve lo que usa la calibración.
+
+    Args:
+        config (ConfiguracionSimulacion): Configuración
+
+    Returns:
+        dict: metodo, pasos, evaluaciones, muestras y tiempo_s
+    """
+    from cohete import Cohete
+    from telemetria import Telemetria
+
+    inicio = time.perf_counter()
+    cohete = Cohete.desde_configuracion(config)
+    resumen = cohete.simular(telemetria=Telemetria.nula())
+    return {
+        "metodo": config.metodo,
+        "pasos": resumen["iter"],
+        "evaluaciones": resumen["evaluaciones"],
+        "muestras": len(cohete.r_hist),
+        "tiempo_s": time.perf_counter() - inicio,
+    }
+
+
+def calibrar(pasos=PASOS_CALIBRACION, repeticiones=3):
+    """
+    Calibra el modelo con corridas cortas en esta máquina.
+
+    Args:
+        pasos (int): Pasos de cada corrida
+        repeticiones (int): Repeticiones por caso (se toma el mínimo)
+
+    Returns:
+        ModeloCosto: Modelo calibrado
+    """
+    mediciones = []
+    for config in configuraciones_calibracion(pasos).values():
+        corridas = [medir_corrida(config) for _ in range(repeticiones)]
+        mediciones.append(min(corridas, key=lambda m: m["tiempo_s"]))
+    return ModeloCosto.desde_mediciones(mediciones)
+
+
+_MODELO_POR_DEFECTO = None
+
+
+def modelo_por_defecto():
+    """
+    Modelo calibrado con la línea base versionada de rendimiento.py.
+
+    Se carga una sola vez por proceso; si la línea base no existe o no
+    tiene casos de costo se usan los coeficientes por defecto.
+
+    Returns:
+        ModeloCosto: Modelo de costo
+    """
+    global _MODELO_POR_DEFECTO
+    if _MODELO_POR_DEFECTO is None:
+        import json  # diferido: solo hace falta para leer la línea base
+
+        ruta = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            "lineas_base", "referencia.json")
+        try:
+            with open(ruta, encoding="utf-8") as archivo:
+                _MODELO_POR_DEFECTO = ModeloCosto.desde_linea_base(
+                    json.load(archivo)
+                )
+        except (OSError, ValueError, KeyError):
+            _MODELO_POR_DEFECTO = ModeloCosto()
+    return _MODELO_POR_DEFECTO
+
+
+def repartir_en_lotes(costos, trabajadores, tandas_por_trabajador=4):
+    """
+    Agrupa trabajos en lotes de costo parecido, de mayor a menor.
+
+    Los trabajos se ordenan de mayor a menor costo (primero los más
+    largos, para que no queden núcleos ociosos esperando uno grande al
+    final) y se juntan en lotes de hasta costo_total / (tandas ·
+    trabajadores): un trabajo grande va solo y los chicos se agrupan
+    para amortizar el envío al proceso.
+
+    Args:
+        costos (sequence): Costo previsto de cada trabajo
+        trabajadores (int): Procesos del pool
+        tandas_por_trabajador (int): Lotes por trabajador aproximados
+
+    Returns:
+        list: Lotes (listas de índices en costos), del más costoso al
+            menos costoso
+    """
+    orden = sorted(range(len(costos)), key=lambda i: costos[i], reverse=True)
+    objetivo = sum(costos) / max(1, tandas_por_trabajador * trabajadores)
+    lotes = []
+    lote = []
+    acumulado = 0.0
+    for i in orden:
+        lote.append(i)
+        acumulado += costos[i]
+        if acumulado >= objetivo:
+            lotes.append(lote)
+            lote = []
+            acumulado = 0.0
+    if lote:
+        lotes.append(lote)
+    return lotes
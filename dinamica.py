@@ -0,0 +1,353 @@
+"""
+Ecuaciones de movimiento del cohete sobre un vector de estado empaquetado.
+
+Este módulo concentra toda la física del modelo (empuje, arrastre,
+gravedad y términos centrífugo/Coriolis) en funciones puras, sin efectos
+secundarios, que operan sobre el vector de estado:
+
+    y = (r, q, theta, gamma, masa)
+
+La función principal es derivada(t, y, params), que devuelve dy/dt.
+Los integradores de integradores.py la usan para avanzar el estado, de
+modo que se puede cambiar de método numérico sin tocar la física.
+
+El modelo de fuerzas está fusionado: las constantes del vehículo (área
+frontal, 0.5·cd·área, isp·g0) se calculan una sola vez al crear los
+parámetros, y empuje, arrastre y gravedad se evalúan juntos compartiendo
+la velocidad y la densidad. aceleraciones() es el camino rápido que usan
+los integradores; fuerzas() devuelve además cada componente para logging.
+
+Todas las constantes y perfiles llegan en params (ver
+configuracion.ConfiguracionSimulacion); este módulo no lee globales.
+
+El estado y los parámetros pueden ser números duales (duales.Dual) para
+derivar la simulación (ver jacobiano.py): las funciones de math lanzan
+TypeError con un Dual y se reemplazan por las de duales.py solo en ese
+caso, así que el camino con floats no cambia.
+"""
+
+import math
+from typing import NamedTuple, Tuple
+
+import duales
+from atmosfera import calcular_densidad_aire
+from utilidades import (
+    calcular_area_frontal_esfera, calcular_beta_altura,
+    calcular_beta_tiempo, calcular_mdot
+)
+
+
+# Índices de las componentes del vector de estado
+IDX_R = 0        # Posición radial (m)
+IDX_Q = 1        # Velocidad radial (m/s)
+IDX_THETA = 2    # Posición angular (rad)
+IDX_GAMMA = 3    # Velocidad angular (rad/s)
+IDX_MASA = 4     # Masa total (kg)
+N_ESTADO = 5
+
+
+class ParametrosDinamica(NamedTuple):
+    """
+    Parámetros del vehículo, constantes físicas y perfiles de control
+    que necesita la dinámica.
+
+    Es inmutable, así que puede compartirse entre integradores y pasos
+    sin riesgo de que la física modifique el estado del cohete.
+
+    Los últimos campos (area, k_arrastre, isp_g0) son constantes
+    derivadas de los anteriores: se construye con crear() y se modifica
+    con reemplazar(), que las recalculan.
+    """
+    masa_cohete: float
+    isp: float
+    diametro: float
+    h_0: float
+    h_1: float
+    h_2: float
+    mu: float
+    r_e: float
+    g0: float
+    cd: float
+    beta_altura: bool
+    tiempos_beta: Tuple[float, ...]
+    betas_tiempo: Tuple[float, ...]
+    fases_mdot: Tuple[Tuple[float, float], ...]
+    area: float          # Área frontal (m²)
+    k_arrastre: float    # 0.5·cd·área (m²)
+    isp_g0: float        # Velocidad de escape efectiva isp·g0 (m/s)
+
+    @classmethod
+    def crear(cls, **campos):
+        """
+        Construye los parámetros calculando las constantes derivadas.
+
+        Args:
+            **campos: Todos los campos salvo area, k_arrastre e isp_g0
+
+        Returns:
+            ParametrosDinamica: Parámetros completos
+        """
+        area = calcular_area_frontal_esfera(campos["diametro"] / 2)
+        return cls(
+            area=area,
+            k_arrastre=0.5 * campos["cd"] * area,
+            isp_g0=campos["isp"] * campos["g0"],
+            **campos
+        )
+
+    def reemplazar(self, **cambios):
+        """
+        Como _replace, pero recalcula las constantes derivadas.
+
+        Args:
+            **cambios: Campos a modificar
+
+        Returns:
+            ParametrosDinamica: Nuevos parámetros
+        """
+        campos = self._asdict()
+        for derivado in _CAMPOS_DERIVADOS:
+            del campos[derivado]
+        campos.update(cambios)
+        return ParametrosDinamica.crear(**campos)
+
+
+_CAMPOS_DERIVADOS = ("area", "k_arrastre", "isp_g0")
+
+
+class Fuerzas(NamedTuple):
+    """
+    Componentes de las fuerzas en un instante, para logging y análisis.
+
+    Las componentes radial (_r) y tangencial (_t) están en N; la
+    gravedad es la fuerza total hacia el centro de la Tierra.
+    """
+    empuje: float
+    empuje_r: float
+    empuje_t: float
+    arrastre: float
+    arrastre_r: float
+    arrastre_t: float
+    gravedad: float
+    densidad: float
+    velocidad: float
+    q_dot: float
+    gamma_dot: float
+
+
+def controles(t, y, params):
+    """
+    Evalúa los controles (tasa de consumo y ángulo de empuje).
+
+    Si no queda combustible, la tasa de consumo es nula.
+
+    Args:
+        t (float): Tiempo desde el despegue (s)
+        y (tuple): Vector de estado (r, q, theta, gamma, masa)
+        params (ParametrosDinamica): Parámetros del vehículo
+
+    Returns:
+        tuple: (m_dot, beta) - Tasa de consumo (kg/s) y ángulo (rad)
+    """
+    r = y[IDX_R]
+    if y[IDX_MASA] > params.masa_cohete:
+        m_dot = calcular_mdot(t, params.fases_mdot)
+    else:
+        m_dot = 0.0
+
+    if params.beta_altura:
+        beta = calcular_beta_altura(
+            r - params.r_e, params.h_0, params.h_1, params.h_2
+        )
+    else:
+        beta = calcular_beta_tiempo(
+            t, params.tiempos_beta, params.betas_tiempo
+        )
+    return m_dot, beta
+
+
+def arrastre(r, q, gamma, params):
+    """
+    Calcula el módulo de la fuerza de arrastre aerodinámico.
+
+    Args:
+        r (float): Posición radial (m)
+        q (float): Velocidad radial (m/s)
+        gamma (float): Velocidad angular (rad/s)
+        params (ParametrosDinamica): Parámetros del vehículo
+
+    Returns:
+        float: Fuerza de arrastre (N)
+    """
+    rho = max(0.0, calcular_densidad_aire(r - params.r_e))
+    v_t = r * gamma
+    return params.k_arrastre * rho * (q * q + v_t * v_t)
+
+
+def empuje(m_dot, beta, params):
+    """
+    Calcula las componentes radial y tangencial del empuje.
+
+    Args:
+        m_dot (float): Tasa de consumo de combustible (kg/s)
+        beta (float): Ángulo de empuje (rad)
+        params (ParametrosDinamica): Parámetros del vehículo
+
+    Returns:
+        tuple: (empuje_r, empuje_t) - Componentes del empuje (N)
+    """
+    T = params.isp_g0 * m_dot
+    try:
+        return T * math.cos(beta), T * math.sin(beta)
+    except TypeError:
+        # beta con derivadas (duales.Dual)
+        return T * duales.cos(beta), T * duales.sin(beta)
+
+
+def aceleraciones(r, q, gamma, masa, m_dot, beta, params):
+    """
+    Calcula las aceleraciones radial y angular para controles dados.
+
+    Ecuaciones en coordenadas polares:
+        q_dot = (T·cos(β) + D_r) / m - μ/r² + r·γ²
+        γ̇ = [(T·sin(β) + D_t) / m - 2·q·γ] / r
+
+    El arrastre se proyecta sobre los ejes radial y tangencial y
+    siempre se opone a la velocidad.
+
+    Args:
+        r (float): Posición radial (m)
+        q (float): Velocidad radial (m/s)
+        gamma (float): Velocidad angular (rad/s)
+        masa (float): Masa total (kg)
+        m_dot (float): Tasa de consumo de combustible (kg/s)
+        beta (float): Ángulo de empuje (rad)
+        params (ParametrosDinamica): Parámetros del vehículo
+
+    Returns:
+        tuple: (q_dot, gamma_dot) - Aceleración radial (m/s²) y
+            angular (rad/s²)
+    """
+    T = params.isp_g0 * m_dot
+    try:
+        empuje_r = T * math.cos(beta)
+        empuje_t = T * math.sin(beta)
+    except TypeError:
+        # beta con derivadas (duales.Dual)
+        empuje_r = T * duales.cos(beta)
+        empuje_t = T * duales.sin(beta)
+    return aceleraciones_con_empuje(
+        r, q, gamma, masa, empuje_r, empuje_t, params
+    )
+
+
+def aceleraciones_con_empuje(r, q, gamma, masa, empuje_r, empuje_t, params):
+    """
+    Aceleraciones con las componentes del empuje ya calculadas.
+
+    Los integradores que mantienen los controles fijos durante el paso
+    (Euler implícito) calculan el empuje una vez y reutilizan este
+    camino en cada iteración.
+
+    Args:
+        r (float): Posición radial (m)
+        q (float): Velocidad radial (m/s)
+        gamma (float): Velocidad angular (rad/s)
+        masa (float): Masa total (kg)
+        empuje_r (float): Componente radial del empuje (N)
+        empuje_t (float): Componente tangencial del empuje (N)
+        params (ParametrosDinamica): Parámetros del vehículo
+
+    Returns:
+        tuple: (q_dot, gamma_dot) - Aceleración radial (m/s²) y
+            angular (rad/s²)
+    """
+    v_t = r * gamma
+    try:
+        v = math.hypot(q, v_t)
+    except TypeError:
+        # Estado con derivadas (duales.Dual)
+        v = duales.hypot(q, v_t)
+    if v > 1e-9:
+        # D·(q, v_t)/v con D = k·ρ·v²: se simplifica una v
+        rho = calcular_densidad_aire(r - params.r_e)
+        f = params.k_arrastre * rho * v if rho > 0.0 else 0.0
+        fuerza_r = empuje_r - f * q
+        fuerza_t = empuje_t - f * v_t
+    else:
+        fuerza_r = empuje_r
+        fuerza_t = empuje_t
+
+    q_dot = fuerza_r / masa - params.mu / (r * r) + r * (gamma * gamma)
+    gamma_dot = (fuerza_t / masa - 2 * q * gamma) / r
+    return q_dot, gamma_dot
+
+
+def fuerzas(r, q, gamma, masa, m_dot, beta, params):
+    """
+    Evalúa todas las componentes de las fuerzas en un instante.
+
+    Usa las mismas cuentas que aceleraciones(), pero devuelve cada
+    componente por separado (para logging, gráficos o validación).
+
+    Args:
+        r (float): Posición radial (m)
+        q (float): Velocidad radial (m/s)
+        gamma (float): Velocidad angular (rad/s)
+        masa (float): Masa total (kg)
+        m_dot (float): Tasa de consumo de combustible (kg/s)
+        beta (float): Ángulo de empuje (rad)
+        params (ParametrosDinamica): Parámetros del vehículo
+
+    Returns:
+        Fuerzas: Componentes de empuje, arrastre y gravedad
+    """
+    T = params.isp_g0 * m_dot
+    empuje_r = T * math.cos(beta)
+    empuje_t = T * math.sin(beta)
+
+    v_t = r * gamma
+    v = math.hypot(q, v_t)
+    rho = max(0.0, calcular_densidad_aire(r - params.r_e))
+    # Mismas operaciones que aceleraciones_con_empuje, para que q_dot y
+    # gamma_dot coincidan bit a bit
+    f = params.k_arrastre * rho * v if v > 1e-9 and rho > 0.0 else 0.0
+    D = f * v
+    D_r = -f * q
+    D_t = -f * v_t
+
+    q_dot = (empuje_r + D_r) / masa - params.mu / (r * r) + r * (gamma * gamma)
+    gamma_dot = ((empuje_t + D_t) / masa - 2 * q * gamma) / r
+    return Fuerzas(
+        empuje=T,
+        empuje_r=empuje_r,
+        empuje_t=empuje_t,
+        arrastre=D,
+        arrastre_r=D_r,
+        arrastre_t=D_t,
+        gravedad=masa * params.mu / (r * r),
+        densidad=rho,
+        velocidad=v,
+        q_dot=q_dot,
+        gamma_dot=gamma_dot,
+    )
+
+
+def derivada(t, y, params):
+    """
+    Lado derecho de las ecuaciones de movimiento: dy/dt = f(t, y).
+
+    Función pura: no modifica y ni params.
+
+    Args:
+        t (float): Tiempo desde el despegue (s)
+        y (tuple): Vector de estado (r, q, theta, gamma, masa)
+        params (ParametrosDinamica): Parámetros del vehículo
+
+    Returns:
+        tuple: (dr, dq, dtheta, dgamma, dmasa)
+    """
+    r, q, _, gamma, masa = y
+    m_dot, beta = controles(t, y, params)
+    q_dot, gamma_dot = aceleraciones(r, q, gamma, masa, m_dot, beta, params)
+    return (q, q_dot, gamma, gamma_dot, -m_dot)
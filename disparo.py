@@ -0,0 +1,426 @@
+"""
+Método de disparo: ajustar el perfil para una órbita circular objetivo.
+
+Llegar a una órbita circular a ALTURA_LEO se hacía retocando a mano las
+tablas de guiado y de consumo. Este módulo elige unos pocos parámetros
+libres del perfil y resuelve por Newton-Broyden el sistema
+
+    F(x) = (r - R, q, r·γ - sqrt(μ/R)) = 0
+
+al apagar el motor, con R = r_e + altura: en el radio objetivo, sin
+velocidad radial y con la velocidad tangencial de la órbita circular.
+
+- Cada evaluación simula solo hasta el apagado (fin de la última fase
+  de consumo), no hasta t_max
+- El jacobiano se arma por diferencias finitas hacia adelante, con las
+  n + 1 corridas en paralelo (barrido.ejecutar_barrido); entre
+  recálculos se actualiza con Broyden, que cuesta una sola corrida
+- Los pasos se acotan a una fracción de cada parámetro y se acortan a
+  la mitad si no reducen el residuo; si aun así no lo reducen, se
+  recalcula el jacobiano
+- Los parámetros quedan dentro de su intervalo admisible (ver
+  limites_parametro). Si al terminar alguno está en el límite, la
+  órbita pedida probablemente no es alcanzable con ese perfil: con el
+  cohete nominal y guiado por tiempo, más arriba de ~190 km el consumo
+  llega al máximo que permite el combustible
+
+Los parámetros libres son los de montecarlo.py: campos numéricos de la
+configuración (h_0, h_1, h_2, ...) y elementos de los perfiles
+(fin_fase_<i>, mdot_fase_<i>, tiempo_guiado_<i>, angulo_guiado_<i>).
+
+Uso:
+    resultado = resolver_disparo(config, altura=185e3)
+    resultado.config        # configuración con el perfil ajustado
+    print(resultado.describir())
+"""
+
+import math
+from dataclasses import replace
+from typing import NamedTuple
+
+from constantes import ALTURA_LEO
+
+
+# Residuos tolerados: altura (m), velocidad radial y tangencial (m/s)
+TOLERANCIAS = (100.0, 1.0, 1.0)
+
+# Paso relativo de las diferencias finitas
+PASO_RELATIVO = 1e-5
+
+# Mayor cambio relativo de un parámetro en una iteración
+PASO_MAXIMO = 0.2
+
+# Veces que se acorta a la mitad un paso que no reduce el residuo
+REDUCCIONES = 4
+
+# Nombres de los residuos, en orden
+RESIDUOS = ("altura_m", "velocidad_radial_m_s", "exceso_tangencial_m_s")
+
+
+class ResultadoDisparo(NamedTuple):
+    """
+    Resultado de resolver_disparo.
+
+    Args:
+        config (ConfiguracionSimulacion): Configuración con los
+            parámetros libres ajustados (lista para simular)
+        valores (dict): Valor final de cada parámetro libre
+        residuos (dict): Residuos al apagar el motor (ver RESIDUOS)
+        convergio (bool): Si los residuos quedaron dentro de tolerancia
+        iteraciones (int): Iteraciones de Newton-Broyden
+        simulaciones (int): Simulaciones corridas en total
+        historial (list): Norma del residuo escalado tras cada iteración
+        en_limite (tuple): Parámetros que terminaron en un extremo de su
+            intervalo admisible
+    """
+    config: object
+    valores: dict
+    residuos: dict
+    convergio: bool
+    iteraciones: int
+    simulaciones: int
+    historial: list
+    en_limite: tuple = ()
+
+    def informe(self):
+        """
+        Resultado serializable a JSON (sin la configuración).
+
+        Returns:
+            dict: valores, residuos, convergio, iteraciones,
+                simulaciones, historial, en_limite y el perfil ajustado
+        """
+        return {
+            "valores": self.valores,
+            "residuos": self.residuos,
+            "convergio": self.convergio,
+            "iteraciones": self.iteraciones,
+            "simulaciones": self.simulaciones,
+            "historial": self.historial,
+            "en_limite": list(self.en_limite),
+            "perfil": {
+                "fases_mdot": self.config.fases_mdot,
+                "tiempos_beta": self.config.tiempos_beta,
+                "betas_tiempo": self.config.betas_tiempo,
+                "h_0": self.config.h_0,
+                "h_1": self.config.h_1,
+                "h_2": self.config.h_2,
+            },
+        }
+
+    def describir(self):
+        """
+        Resumen legible del ajuste.
+
+        Returns:
+            str: Texto con el estado, los valores y los residuos
+        """
+        estado = "convergió" if self.convergio else "NO convergió"
+        lineas = [f"{estado} en {self.iteraciones} iteraciones "
+                  f"({self.simulaciones} simulaciones)"]
+        for nombre, valor in self.valores.items():
+            limite = " (en el límite)" if nombre in self.en_limite else ""
+            lineas.append(f"  {nombre:>18s} = {valor:.6g}{limite}")
+        for nombre, valor in self.residuos.items():
+            lineas.append(f"  {nombre:>24s}: {valor:+.4g}")
+        return "\n".join(lineas)
+
+
+def parametros_libres_por_defecto(config):
+    """
+    Parámetros libres que controlan la inserción.
+
+    - Consumo de la última fase: la energía al apagar. Se usa el consumo
+      y no el fin de la fase porque con los esquemas de Euler, que
+      evalúan los controles al final del paso, el estado final cambia a
+      saltos de un paso de empuje con el fin de fase
+    - Guiado por tiempo: el último punto de control antes de que beta
+      llegue a su valor final (cuándo termina el giro) y el ángulo del
+      primer punto del giro, que fijan la altura y la velocidad radial
+    - Guiado por altura: h_1 y h_2
+
+    Args:
+        config (ConfiguracionSimulacion): Configuración nominal
+
+    Returns:
+        tuple: Nombres de los parámetros libres
+    """
+    consumo = f"mdot_fase_{len(config.fases_mdot) - 1}"
+    if config.beta_altura:
+        return (consumo, "h_1", "h_2")
+    betas = config.betas_tiempo
+    giro = next(i for i, beta in enumerate(betas) if beta != betas[0])
+    final = next(i for i, beta in enumerate(betas) if beta == betas[-1])
+    return (consumo, f"tiempo_guiado_{max(final - 1, 0)}",
+            f"angulo_guiado_{giro}")
+
+
+def limites_parametro(config, nombre):
+    """
+    Intervalo admisible de un parámetro libre.
+
+    Los puntos de control mantienen su orden respecto de los vecinos,
+    los ángulos quedan en [0, π/2] (calcular_beta_tiempo recorta fuera
+    de ese rango) y el consumo de una fase no puede agotar el
+    combustible antes de que termine, con las demás fases como están.
+
+    Args:
+        config (ConfiguracionSimulacion): Configuración actual
+        nombre (str): Parámetro (ver montecarlo.validar_parametro)
+
+    Returns:
+        tuple: (inferior, superior)
+    """
+    prefijo, _, indice = nombre.rpartition("_")
+    i = int(indice) if indice.isdigit() else None
+    if prefijo == "tiempo_guiado":
+        tiempos = config.tiempos_beta
+        return (tiempos[i - 1] if i > 0 else 0.0,
+                tiempos[i + 1] if i + 1 < len(tiempos) else math.inf)
+    if prefijo == "angulo_guiado":
+        return (0.0, math.pi / 2)
+    fases = config.fases_mdot
+    if prefijo in ("fin_fase", "mdot_fase"):
+        inicio = fases[i - 1][0] if i > 0 else 0.0
+        otras = sum((fin - (fases[k - 1][0] if k > 0 else 0.0)) * mdot
+                    for k, (fin, mdot) in enumerate(fases) if k != i)
+        disponible = config.masa_fuel - otras
+        if prefijo == "mdot_fase":
+            return (0.0, disponible / (fases[i][0] - inicio))
+        siguiente = fases[i + 1][0] if i + 1 < len(fases) else math.inf
+        return (inicio, min(siguiente, inicio + disponible / fases[i][1]))
+    if nombre == "h_1":
+        return (config.h_0, config.h_2)
+    if nombre == "h_2":
+        return (config.h_1, math.inf)
+    if nombre == "h_0":
+        return (0.0, config.h_1)
+    return (0.0, math.inf)
+
+
+def hasta_apagado(config):
+    """
+    Configuración que simula exactamente hasta el apagado del motor.
+
+    El apagado es el fin de la última fase de consumo. El paso se achica
+    lo justo para que entre un número entero de veces hasta él, así el
+    estado final varía en forma continua con los parámetros (terminar
+    en la grilla de dt sumaría un tramo balístico que salta con ellos).
+
+    Args:
+        config (ConfiguracionSimulacion): Configuración
+
+    Returns:
+        ConfiguracionSimulacion: La misma con dt y t_max ajustados
+    """
+    apagado = config.fases_mdot[-1][0]
+    pasos = max(1, math.ceil(apagado / config.dt - 1e-9))
+    dt = apagado / pasos
+    # Medio paso de margen: int(t_max/dt) da exactamente esos pasos
+    return replace(config, dt=dt, t_max=(pasos + 0.5) * dt)
+
+
+def residuos_insercion(estado, config, altura):
+    """
+    Residuos de la órbita circular objetivo.
+
+    Args:
+        estado (tuple): Estado (r, q, theta, gamma, masa)
+        config (ConfiguracionSimulacion): Configuración (mu y r_e)
+        altura (float): Altura de la órbita objetivo (m)
+
+    Returns:
+        tuple: (r - R, q, r·γ - sqrt(μ/R)) en m y m/s
+    """
+    r, q, _, gamma, _ = estado
+    radio = config.r_e + altura
+    return (r - radio, q, r * gamma - math.sqrt(config.mu / radio))
+
+
+def _resolver(matriz, vector):
+    """Solución de matriz·x = vector por eliminación con pivoteo parcial."""
+    n = len(vector)
+    a = [list(fila) + [v] for fila, v in zip(matriz, vector)]
+    for k in range(n):
+        pivote = max(range(k, n), key=lambda i: abs(a[i][k]))
+        if a[pivote][k] == 0.0:
+            raise ValueError("Jacobiano singular: los parámetros libres no "
+                             "controlan los residuos")
+        a[k], a[pivote] = a[pivote], a[k]
+        for i in range(k + 1, n):
+            factor = a[i][k] / a[k][k]
+            for j in range(k, n + 1):
+                a[i][j] -= factor * a[k][j]
+    x = [0.0] * n
+    for i in reversed(range(n)):
+        x[i] = (a[i][n] - sum(a[i][j] * x[j] for j in range(i + 1, n))) / a[i][i]
+    return x
+
+
+def resolver_disparo(config, altura=ALTURA_LEO, parametros=None,
+                     tolerancias=TOLERANCIAS, iteraciones_max=20,
+                     paso_relativo=PASO_RELATIVO, trabajadores=None):
+    """
+    Ajusta los parámetros libres para insertar en órbita circular.
+
+    Args:
+        config (ConfiguracionSimulacion): Configuración nominal (punto
+            de partida)
+        altura (float): Altura de la órbita objetivo (m)
+        parametros (sequence): Tres parámetros libres (None = ver
+            parametros_libres_por_defecto)
+        tolerancias (tuple): Residuos tolerados de altura (m) y de
+            velocidades radial y tangencial (m/s)
+        iteraciones_max (int): Máximo de iteraciones
+        paso_relativo (float): Paso relativo de las diferencias finitas
+        trabajadores (int): Procesos para el jacobiano (ver
+            barrido.ejecutar_barrido)
+
+    Returns:
+        ResultadoDisparo: Configuración ajustada y diagnóstico
+
+    Raises:
+        ValueError: Si no hay tres parámetros libres válidos
+    """
+    from barrido import ejecutar_barrido
+    from jacobiano import estado_final
+    from montecarlo import (
+        aplicar_perturbaciones, validar_parametro, valor_nominal
+    )
+
+    if parametros is None:
+        parametros = parametros_libres_por_defecto(config)
+    parametros = tuple(parametros)
+    if len(parametros) != len(RESIDUOS):
+        raise ValueError(f"Se necesitan {len(RESIDUOS)} parámetros libres, "
+                         f"uno por residuo ({len(parametros)} dados)")
+    for nombre in parametros:
+        validar_parametro(config, nombre)
+    n = len(parametros)
+    escalas = [max(abs(valor_nominal(config, nombre)), 1.0)
+               for nombre in parametros]
+    simulaciones = 0
+
+    def configuracion(x):
+        return aplicar_perturbaciones(config, {
+            nombre: valor * escala
+            for nombre, valor, escala in zip(parametros, x, escalas)
+        })
+
+    def evaluar(puntos):
+        """Residuos escalados de varios puntos, en paralelo."""
+        nonlocal simulaciones
+        configs = [configuracion(x) for x in puntos]
+        simulaciones += len(configs)
+        resultados = ejecutar_barrido(
+            [hasta_apagado(c) for c in configs],
+            trabajadores if len(configs) > 1 else 1,
+            funcion=estado_final,
+        )
+        return [[valor / tolerancia for valor, tolerancia in zip(
+                    residuos_insercion(estado, c, altura), tolerancias)]
+                for (estado, _, _), c in zip(resultados, configs)]
+
+    def norma(f):
+        return math.sqrt(sum(v * v for v in f))
+
+    def jacobiano_finito(x, f=None):
+        """
+        Residuos (si no se pasan) y jacobiano escalado por diferencias
+        hacia adelante, todo en una tanda.
+        """
+        puntos = [] if f is not None else [x]
+        for j in range(n):
+            punto = list(x)
+            punto[j] += paso_relativo
+            puntos.append(punto)
+        evaluados = evaluar(puntos)
+        if f is None:
+            f = evaluados.pop(0)
+        return f, [[(evaluados[j][i] - f[i]) / paso_relativo
+                    for j in range(n)] for i in range(n)]
+
+    def intervalo(x, i):
+        """Límites escalados del parámetro i, con un margen interior."""
+        inferior, superior = limites_parametro(configuracion(x), parametros[i])
+        margen = 1e-3 * (superior - inferior if superior < math.inf
+                         else abs(inferior))
+        return ((inferior + margen) / escalas[i],
+                (superior - margen) / escalas[i])
+
+    def proyectar(x, candidato):
+        # Uno a uno, con los límites de la configuración en que los ya
+        # proyectados tienen su valor nuevo y los demás el actual: así se
+        # mantiene el orden aunque dos vecinos sean libres
+        x = list(x)
+        for i in range(n):
+            inferior, superior = intervalo(x, i)
+            x[i] = min(max(candidato[i], inferior), superior)
+        return x
+
+    x = [valor_nominal(config, nombre) / escala
+         for nombre, escala in zip(parametros, escalas)]
+    f, jac = jacobiano_finito(x)
+    broyden = False
+    historial = [norma(f)]
+    iteraciones = 0
+
+    while max(abs(v) for v in f) > 1.0 and iteraciones < iteraciones_max:
+        iteraciones += 1
+        aceptado = False
+        try:
+            paso = _resolver(jac, [-v for v in f])
+        except ValueError:
+            reducciones = 0  # singular: se trata como un paso fallido
+        else:
+            reducciones = REDUCCIONES + 1
+            mayor = max(abs(p) for p in paso)
+            if mayor > PASO_MAXIMO:
+                paso = [p * PASO_MAXIMO / mayor for p in paso]
+
+        for _ in range(reducciones):
+            x_nuevo = proyectar(x, [v + p for v, p in zip(x, paso)])
+            f_nuevo = evaluar([x_nuevo])[0]
+            if norma(f_nuevo) < norma(f):
+                aceptado = True
+                break
+            paso = [p / 2 for p in paso]
+
+        if not aceptado:
+            if not broyden:
+                break  # ni el jacobiano recién calculado da un descenso
+            _, jac = jacobiano_finito(x, f)
+            broyden = False
+            historial.append(norma(f))
+            continue
+
+        # Actualización de Broyden: J += (Δf - J·s)·sᵀ / (s·s)
+        paso = [a - b for a, b in zip(x_nuevo, x)]
+        cuadrado = sum(p * p for p in paso)
+        diferencia = [f_nuevo[i] - f[i]
+                      - sum(jac[i][j] * paso[j] for j in range(n))
+                      for i in range(n)]
+        jac = [[jac[i][j] + diferencia[i] * paso[j] / cuadrado
+                for j in range(n)] for i in range(n)]
+        broyden = True
+        x, f = x_nuevo, f_nuevo
+        historial.append(norma(f))
+
+    valores = {nombre: v * escala
+               for nombre, v, escala in zip(parametros, x, escalas)}
+    en_limite = []
+    for i, nombre in enumerate(parametros):
+        inferior, superior = intervalo(x, i)
+        if not inferior < x[i] < superior:
+            en_limite.append(nombre)
+    return ResultadoDisparo(
+        config=configuracion(x),
+        valores=valores,
+        residuos={nombre: v * tolerancia for nombre, v, tolerancia
+                  in zip(RESIDUOS, f, tolerancias)},
+        convergio=max(abs(v) for v in f) <= 1.0,
+        iteraciones=iteraciones,
+        simulaciones=simulaciones,
+        historial=historial,
+        en_limite=tuple(en_limite),
+    )
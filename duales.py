@@ -0,0 +1,265 @@
+"""
+Números duales para derivar la simulación en modo directo.
+
+Un número dual lleva un valor y sus derivadas parciales respecto de un
+conjunto fijo de variables:
+
+    x = (valor, (∂x/∂p_1, ..., ∂x/∂p_n))
+
+Las operaciones aritméticas y las funciones de este módulo propagan las
+derivadas con la regla de la cadena, así que al evaluar la dinámica con
+duales se obtiene, además del resultado, su derivada exacta (salvo
+redondeo) respecto de parámetros y condiciones iniciales, sin
+diferencias finitas.
+
+La física (dinamica.py, atmosfera.py, utilidades.py) acepta duales sin
+cambios en su camino habitual: las funciones de math no aceptan un Dual
+y lanzan TypeError, que esos módulos atrapan para usar las versiones de
+este módulo. Con floats no hay costo adicional.
+
+Dual no define __float__ a propósito: convertir a float perdería las
+derivadas sin aviso. Las comparaciones usan solo el valor.
+
+Uso:
+    x = Dual.variable(2.0, 0, 2)      # derivada (1, 0)
+    y = Dual.variable(3.0, 1, 2)      # derivada (0, 1)
+    z = x * sin(y)
+    z.valor, z.derivadas              # (2·sin 3, (sin 3, 2·cos 3))
+"""
+
+import math
+from operator import add, neg, sub
+
+
+class Dual:
+    """
+    Valor con sus derivadas parciales.
+
+    Atributos:
+    - valor: Valor (float)
+    - derivadas: Tupla con la derivada respecto de cada variable
+    """
+
+    __slots__ = ("valor", "derivadas")
+
+    def __init__(self, valor, derivadas):
+        """
+        Args:
+            valor (float): Valor
+            derivadas (tuple): Derivadas parciales
+        """
+        self.valor = valor
+        self.derivadas = derivadas
+
+    @classmethod
+    def variable(cls, valor, indice, cantidad):
+        """
+        Variable independiente: derivada 1 respecto de sí misma.
+
+        Args:
+            valor (float): Valor de la variable
+            indice (int): Posición de la variable
+            cantidad (int): Cantidad total de variables
+
+        Returns:
+            Dual: La variable sembrada
+        """
+        derivadas = [0.0] * cantidad
+        derivadas[indice] = 1.0
+        return cls(float(valor), tuple(derivadas))
+
+    def __repr__(self):
+        return f"Dual({self.valor!r}, {self.derivadas!r})"
+
+    # Aritmética
+
+    def __add__(self, otro):
+        if isinstance(otro, Dual):
+            return Dual(self.valor + otro.valor,
+                        tuple(map(add, self.derivadas, otro.derivadas)))
+        return Dual(self.valor + otro, self.derivadas)
+
+    def __radd__(self, otro):
+        return Dual(otro + self.valor, self.derivadas)
+
+    def __sub__(self, otro):
+        if isinstance(otro, Dual):
+            return Dual(self.valor - otro.valor,
+                        tuple(map(sub, self.derivadas, otro.derivadas)))
+        return Dual(self.valor - otro, self.derivadas)
+
+    def __rsub__(self, otro):
+        return Dual(otro - self.valor, tuple(map(neg, self.derivadas)))
+
+    def __mul__(self, otro):
+        if isinstance(otro, Dual):
+            u = self.valor
+            v = otro.valor
+            return Dual(u * v,
+                        tuple([a * v + u * b for a, b in zip(self.derivadas,
+                                                              otro.derivadas)]))
+        return Dual(self.valor * otro, tuple([a * otro for a in self.derivadas]))
+
+    def __rmul__(self, otro):
+        return Dual(otro * self.valor, tuple([otro * a for a in self.derivadas]))
+
+    def __truediv__(self, otro):
+        if isinstance(otro, Dual):
+            v = otro.valor
+            cociente = self.valor / v
+            return Dual(cociente,
+                        tuple([(a - cociente * b) / v
+                               for a, b in zip(self.derivadas,
+                                               otro.derivadas)]))
+        return Dual(self.valor / otro, tuple([a / otro for a in self.derivadas]))
+
+    def __rtruediv__(self, otro):
+        cociente = otro / self.valor
+        factor = -cociente / self.valor
+        return Dual(cociente, tuple([factor * a for a in self.derivadas]))
+
+    def __pow__(self, exponente):
+        if isinstance(exponente, Dual):
+            return exp(exponente * log(self))
+        potencia = self.valor ** exponente
+        if exponente == 0:
+            return Dual(potencia, tuple([0.0] * len(self.derivadas)))
+        factor = exponente * self.valor ** (exponente - 1)
+        return Dual(potencia, tuple([factor * a for a in self.derivadas]))
+
+    def __rpow__(self, base):
+        potencia = base ** self.valor
+        factor = potencia * math.log(base) if base > 0 else 0.0
+        return Dual(potencia, tuple([factor * a for a in self.derivadas]))
+
+    def __neg__(self):
+        return Dual(-self.valor, tuple(map(neg, self.derivadas)))
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return -self if self.valor < 0 else self
+
+    # Comparaciones (solo el valor)
+
+    def __lt__(self, otro):
+        return self.valor < valor(otro)
+
+    def __le__(self, otro):
+        return self.valor <= valor(otro)
+
+    def __gt__(self, otro):
+        return self.valor > valor(otro)
+
+    def __ge__(self, otro):
+        return self.valor >= valor(otro)
+
+    def __eq__(self, otro):
+        return self.valor == valor(otro)
+
+    def __ne__(self, otro):
+        return self.valor != valor(otro)
+
+    __hash__ = None
+
+
+def valor(x):
+    """
+    Valor de un número, sea dual o no.
+
+    Args:
+        x (float | Dual): Número
+
+    Returns:
+        float: Valor sin derivadas
+    """
+    return x.valor if isinstance(x, Dual) else x
+
+
+def derivadas(x, cantidad):
+    """
+    Derivadas de un número; las de una constante son nulas.
+
+    Args:
+        x (float | Dual): Número
+        cantidad (int): Cantidad de variables
+
+    Returns:
+        tuple: Derivadas parciales
+    """
+    if isinstance(x, Dual):
+        return x.derivadas
+    return (0.0,) * cantidad
+
+
+# =========================
+# FUNCIONES ELEMENTALES
+# =========================
+
+def _aplicar(x, valor_x, derivada_x):
+    """Dual con valor f(x) y derivadas f'(x)·dx."""
+    return Dual(valor_x, tuple([derivada_x * a for a in x.derivadas]))
+
+
+def sin(x):
+    """Seno de un float o de un Dual."""
+    if isinstance(x, Dual):
+        return _aplicar(x, math.sin(x.valor), math.cos(x.valor))
+    return math.sin(x)
+
+
+def cos(x):
+    """Coseno de un float o de un Dual."""
+    if isinstance(x, Dual):
+        return _aplicar(x, math.cos(x.valor), -math.sin(x.valor))
+    return math.cos(x)
+
+
+def exp(x):
+    """Exponencial de un float o de un Dual."""
+    if isinstance(x, Dual):
+        e = math.exp(x.valor)
+        return _aplicar(x, e, e)
+    return math.exp(x)
+
+
+def log(x):
+    """Logaritmo natural de un float o de un Dual."""
+    if isinstance(x, Dual):
+        return _aplicar(x, math.log(x.valor), 1.0 / x.valor)
+    return math.log(x)
+
+
+def sqrt(x):
+    """
+    Raíz cuadrada de un float o de un Dual.
+
+    En 0 la derivada de un Dual se toma nula en lugar de infinita.
+    """
+    if isinstance(x, Dual):
+        raiz = math.sqrt(x.valor)
+        return _aplicar(x, raiz, 0.5 / raiz if raiz > 0.0 else 0.0)
+    return math.sqrt(x)
+
+
+def hypot(x, y):
+    """
+    sqrt(x² + y²) de floats o Duals.
+
+    En el origen la derivada de un Dual se toma nula (el arrastre, que
+    es el que la usa, se anula ahí).
+    """
+    if not isinstance(x, Dual) and not isinstance(y, Dual):
+        return math.hypot(x, y)
+    vx = valor(x)
+    vy = valor(y)
+    modulo = math.hypot(vx, vy)
+    cantidad = len((x if isinstance(x, Dual) else y).derivadas)
+    if modulo == 0.0:
+        return Dual(modulo, (0.0,) * cantidad)
+    cx = vx / modulo
+    cy = vy / modulo
+    return Dual(modulo, tuple([cx * a + cy * b for a, b in zip(
+        derivadas(x, cantidad), derivadas(y, cantidad)
+    )]))
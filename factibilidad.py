@@ -0,0 +1,251 @@
+"""
+Prefiltro analítico de factibilidad.
+
+Muchas configuraciones de un barrido (masas, isp, perfil de consumo) no
+pueden llegar a velocidad orbital de ninguna manera, y eso se ve sin
+integrar nada: con la ecuación de Tsiolkovsky y el perfil de consumo
+(el mismo que usa calcular_mdot) se obtienen, en microsegundos por punto:
+
+- El combustible que quema el perfil y el instante en que se agota
+  (si el perfil pide más del que hay)
+- El tiempo de quemado y el delta-v ideal isp·g0·ln(m0 / mf)
+- La relación empuje/peso al despegue, con la gravedad en r_0
+
+Una configuración se descarta si no despega (empuje/peso ≤ 1) o si su
+delta-v no alcanza el mínimo para llegar a la órbita: la transferencia
+impulsiva (Hohmann) desde r_0 hasta una órbita circular a la altura
+objetivo, descontando la velocidad inicial, más una tolerancia de
+pérdidas por gravedad y arrastre. La tolerancia es baja a propósito: el
+prefiltro solo descarta lo que seguro no llega, y la simulación completa
+decide el resto.
+
+Uso:
+    prefiltro = prefiltrar(configs)
+    factibles = [configs[i] for i in prefiltro.factibles]
+    print(prefiltro.evaluaciones[0].describir())
+"""
+
+import math
+from typing import NamedTuple
+
+from constantes import ALTURA_LEO
+
+
+# Tolerancia de pérdidas por gravedad y arrastre (m/s). Las corridas
+# nominales pierden del orden de 1.5 km/s; 500 m/s es una cota baja
+PERDIDAS = 500.0
+
+
+class Factibilidad(NamedTuple):
+    """
+    Estimación analítica de una configuración.
+
+    Args:
+        delta_v (float): Delta-v ideal del perfil de consumo (m/s)
+        delta_v_necesario (float): Delta-v mínimo para la órbita
+            objetivo, con la tolerancia de pérdidas (m/s)
+        empuje_peso (float): Relación empuje/peso al despegue
+        combustible_quemado (float): Combustible que consume el perfil (kg)
+        tiempo_quemado (float): Duración del vuelo propulsado (s)
+        tiempo_agotamiento (float): Instante en que se acaba el
+            combustible (s; inf si el perfil termina antes)
+        motivos (tuple): Por qué no es factible (vacío si lo es)
+    """
+    delta_v: float
+    delta_v_necesario: float
+    empuje_peso: float
+    combustible_quemado: float
+    tiempo_quemado: float
+    tiempo_agotamiento: float
+    motivos: tuple
+
+    @property
+    def factible(self):
+        """True si la configuración puede llegar a la órbita."""
+        return not self.motivos
+
+    @property
+    def margen(self):
+        """Delta-v sobrante respecto del necesario (m/s)."""
+        return self.delta_v - self.delta_v_necesario
+
+    def describir(self):
+        """
+        Resumen legible de la estimación.
+
+        Returns:
+            str: Delta-v, margen, empuje/peso y tiempos de quemado
+        """
+        agotamiento = ("el perfil termina antes"
+                       if math.isinf(self.tiempo_agotamiento)
+                       else f"{self.tiempo_agotamiento:.1f} s")
+        lineas = [
+            f"Delta-v ideal:      {self.delta_v:9.1f} m/s "
+            f"(necesario {self.delta_v_necesario:.1f}, "
+            f"margen {self.margen:+.1f})",
+            f"Empuje/peso:        {self.empuje_peso:9.3f}",
+            f"Tiempo de quemado:  {self.tiempo_quemado:9.1f} s "
+            f"({self.combustible_quemado:.0f} kg)",
+            f"Agotamiento:        {agotamiento}",
+        ]
+        lineas.append("Factible" if self.factible
+                      else "No factible: " + "; ".join(self.motivos))
+        return "\n".join(lineas)
+
+
+class Prefiltro(NamedTuple):
+    """
+    Resultado de prefiltrar.
+
+    Args:
+        evaluaciones (list): Factibilidad de cada configuración
+        factibles (tuple): Índices de las configuraciones que vale la
+            pena simular
+    """
+    evaluaciones: list
+    factibles: tuple
+
+    @property
+    def descartados(self):
+        """Índices de las configuraciones descartadas."""
+        conservados = set(self.factibles)
+        return tuple(i for i in range(len(self.evaluaciones))
+                     if i not in conservados)
+
+
+def quemado(fases, masa_fuel):
+    """
+    Combustible y tiempo de quemado de un perfil de consumo.
+
+    Recorre las fases como calcular_mdot y corta cuando se acaba el
+    combustible, como dinamica.controles.
+
+    Args:
+        fases (sequence): Pares (tiempo de fin de fase, mdot)
+        masa_fuel (float): Combustible disponible (kg)
+
+    Returns:
+        tuple: (combustible quemado (kg), tiempo de quemado (s), instante
+            de agotamiento (s; inf si el perfil termina antes))
+    """
+    quemado_total = 0.0
+    fin_quemado = 0.0
+    inicio = 0.0
+    for t_fin, mdot in fases:
+        duracion = max(0.0, t_fin - inicio)
+        inicio = max(inicio, t_fin)
+        if mdot <= 0 or duracion == 0:
+            continue
+        consumo = mdot * duracion
+        if quemado_total + consumo >= masa_fuel:
+            agotamiento = t_fin - duracion + (masa_fuel - quemado_total) / mdot
+            return masa_fuel, agotamiento, agotamiento
+        quemado_total += consumo
+        fin_quemado = t_fin
+    return quemado_total, fin_quemado, math.inf
+
+
+def delta_v_necesario(config, altura=ALTURA_LEO, perdidas=PERDIDAS):
+    """
+    Delta-v mínimo para llegar a una órbita circular.
+
+    Es la transferencia de Hohmann desde r_0 hasta r_e + altura, menos la
+    velocidad inicial del estado de config, más la tolerancia de pérdidas.
+
+    Args:
+        config (ConfiguracionSimulacion): Configuración
+        altura (float): Altura de la órbita objetivo (m)
+        perdidas (float): Tolerancia de pérdidas por gravedad y arrastre
+            (m/s)
+
+    Returns:
+        float: Delta-v necesario (m/s)
+    """
+    r_0 = config.r_0
+    r = config.r_e + altura
+    mu = config.mu
+    if r <= r_0:
+        return perdidas
+    periapsis = math.sqrt(2 * mu * r / (r_0 * (r_0 + r)))
+    apoapsis = math.sqrt(2 * mu * r_0 / (r * (r_0 + r)))
+    inicial = math.hypot(config.q_0, r_0 * config.gamma_0)
+    return (max(0.0, periapsis - inicial) + math.sqrt(mu / r) - apoapsis
+            + perdidas)
+
+
+def evaluar_factibilidad(config, altura=ALTURA_LEO, perdidas=PERDIDAS):
+    """
+    Estima sin integrar si una configuración puede llegar a la órbita.
+
+    Args:
+        config (ConfiguracionSimulacion): Configuración
+        altura (float): Altura de la órbita objetivo (m)
+        perdidas (float): Tolerancia de pérdidas por gravedad y arrastre
+            (m/s)
+
+    Returns:
+        Factibilidad: Delta-v, empuje/peso, tiempos y motivos de descarte
+
+    Raises:
+        ValueError: Si el combustible, el isp o las pérdidas no son
+            válidos
+    """
+    from utilidades import calcular_mdot
+
+    if config.masa_fuel < 0:
+        raise ValueError(f"La masa de combustible no puede ser negativa: "
+                         f"{config.masa_fuel}")
+    if config.isp <= 0:
+        raise ValueError(f"El isp debe ser positivo: {config.isp}")
+    if perdidas < 0:
+        raise ValueError(f"Las pérdidas no pueden ser negativas: {perdidas}")
+
+    masa_inicial = config.masa_cohete + config.masa_fuel
+    combustible, tiempo_quemado, agotamiento = quemado(config.fases_mdot,
+                                                       config.masa_fuel)
+    delta_v = config.isp * config.g0 * math.log(
+        masa_inicial / (masa_inicial - combustible)
+    )
+    necesario = delta_v_necesario(config, altura, perdidas)
+    mdot_inicial = calcular_mdot(0.0, config.fases_mdot) \
+        if config.masa_fuel > 0 else 0.0
+    peso = masa_inicial * config.mu / config.r_0 ** 2
+    empuje_peso = config.isp * config.g0 * mdot_inicial / peso
+
+    motivos = []
+    if empuje_peso <= 1:
+        motivos.append(f"empuje/peso {empuje_peso:.3f} ≤ 1 al despegue")
+    if delta_v < necesario:
+        motivos.append(f"delta-v {delta_v:.0f} m/s < {necesario:.0f} m/s "
+                       f"necesarios")
+    return Factibilidad(
+        delta_v=delta_v,
+        delta_v_necesario=necesario,
+        empuje_peso=empuje_peso,
+        combustible_quemado=combustible,
+        tiempo_quemado=tiempo_quemado,
+        tiempo_agotamiento=agotamiento,
+        motivos=tuple(motivos),
+    )
+
+
+def prefiltrar(configs, altura=ALTURA_LEO, perdidas=PERDIDAS):
+    """
+    Evalúa una grilla completa y separa lo que vale la pena simular.
+
+    Args:
+        configs (sequence): ConfiguracionSimulacion de cada punto
+        altura (float): Altura de la órbita objetivo (m)
+        perdidas (float): Tolerancia de pérdidas por gravedad y arrastre
+            (m/s)
+
+    Returns:
+        Prefiltro: Evaluación de cada punto e índices factibles
+    """
+    evaluaciones = [evaluar_factibilidad(config, altura, perdidas)
+                    for config in configs]
+    return Prefiltro(
+        evaluaciones=evaluaciones,
+        factibles=tuple(i for i, evaluacion in enumerate(evaluaciones)
+                        if evaluacion.factible),
+    )
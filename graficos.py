@@ -7,24 +7,36 @@ Este módulo contiene funciones para visualizar:
 - Dirección del empuje (beta)
 - Trayectoria en coordenadas polares
 
-Todos los gráficos se guardan en la carpeta 'graficos/'
+Todos los gráficos se guardan en la carpeta 'graficos/', que se crea
+al generar el primer gráfico (no al importar el módulo). matplotlib y
+numpy también se importan recién al graficar, así que
+imprimir_metricas_finales (que usa run.py simulate) no los necesita.
 """
 
 import math
 import os
-import numpy as np
-import matplotlib.pyplot as plt
 from constantes import R_E
 
 
-# Crear carpeta de gráficos si no existe
 CARPETA_GRAFICOS = os.path.join(
     os.path.dirname(os.path.abspath(__file__)), 
     'graficos'
 )
-if not os.path.exists(CARPETA_GRAFICOS):
-    os.makedirs(CARPETA_GRAFICOS)
-    print(f"Carpeta creada: {CARPETA_GRAFICOS}")
+
+
+def _preparar_graficos():
+    """
+    Importa matplotlib y crea la carpeta de gráficos si no existe.
+
+    Returns:
+        module: matplotlib.pyplot
+    """
+    import matplotlib.pyplot as plt
+
+    if not os.path.exists(CARPETA_GRAFICOS):
+        os.makedirs(CARPETA_GRAFICOS)
+        print(f"Carpeta creada: {CARPETA_GRAFICOS}")
+    return plt
 
 
 def graficar_evolucion_cohete(cohete, dt: float):
@@ -45,6 +57,10 @@ def graficar_evolucion_cohete(cohete, dt: float):
         cohete: Objeto Cohete con historiales de simulación
         dt (float): Paso de tiempo usado en la simulación (s)
     """
+    import numpy as np
+
+    plt = _preparar_graficos()
+
     # Crear eje de tiempo
     N = len(cohete.r_hist)
     tiempo = np.arange(N) * dt
@@ -371,6 +387,10 @@ def graficar_trayectoria_polar(cohete):
     Args:
         cohete: Objeto Cohete con historiales de simulación
     """
+    import numpy as np
+
+    plt = _preparar_graficos()
+
     plt.figure(figsize=(10, 10))
     ax = plt.subplot(111, projection='polar')
     
@@ -408,6 +428,10 @@ def graficar_metricas_adicionales(cohete, dt: float):
         cohete: Objeto Cohete con historiales de simulación
         dt (float): Paso de tiempo usado en la simulación (s)
     """
+    import numpy as np
+
+    plt = _preparar_graficos()
+
     N = len(cohete.r_hist)
     tiempo = np.arange(N) * dt
     
@@ -486,18 +510,15 @@ def imprimir_metricas_finales(cohete, dt: float):
     print("="*60)
     
     # Altura máxima
-    r = np.array(cohete.r_hist)
-    altura_max_m = max(r - R_E)
+    altura_max_m = max(cohete.r_hist) - R_E
     print(f"Altura máxima: {altura_max_m/1000:.3f} km ({altura_max_m:.0f} m)")
     
     # Velocidades máximas
-    q = np.array(cohete.q_hist)
-    gamma = np.array(cohete.gamma_hist)
-    v_rad_max = max(q)
-    v_tan = r * gamma
+    v_rad_max = max(cohete.q_hist)
+    v_tan = [r * gamma for r, gamma in zip(cohete.r_hist, cohete.gamma_hist)]
     v_tan_max = max(v_tan)
-    v_total = np.sqrt(q**2 + v_tan**2)
-    v_tot_max = max(v_total)
+    v_tot_max = max(math.hypot(q, v_t)
+                    for q, v_t in zip(cohete.q_hist, v_tan))
     
     print(f"Velocidad radial máxima: {v_rad_max:.3f} m/s")
     print(f"Velocidad tangencial máxima: {v_tan_max:.3f} m/s")
@@ -511,7 +532,7 @@ def imprimir_metricas_finales(cohete, dt: float):
     theta = cohete.theta_hist
     despl_angular_total = calcular_desplazamiento_angular_total(theta)
     print(f"Desplazamiento angular total: {despl_angular_total:.6f} rad")
-    print(f"  = {np.rad2deg(despl_angular_total):.3f} grados")
+    print(f"  = {math.degrees(despl_angular_total):.3f} grados")
     
     # Distancia sobre la superficie
     distancia_superficie_m = R_E * abs(despl_angular_total)
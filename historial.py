@@ -0,0 +1,708 @@
+"""
+Almacenamiento compacto de los historiales de la simulación.
+
+Por defecto Cohete guarda cada historial como una lista de floats de
+Python: 8 bytes del puntero más 24 del objeto float por muestra y por
+columna (unos 256 bytes por muestra). Para graficar y para la mayoría de
+los análisis alcanza con mucha menos precisión, así que un
+EsquemaHistorial permite guardar cada columna en un arreglo compacto
+(array.array) con su propio tipo y, opcionalmente, un desplazamiento y
+una escala:
+
+    valor_guardado = (valor - desplazamiento) / escala
+
+La integración sigue siendo en float64; solo se reduce lo que se
+registra. r se guarda como altura sobre R_E, de modo que float32 alcanza
+(~2 cm a 200 km); theta crece sin límite con las vueltas y se conserva
+en float64.
+
+Uso:
+    config = ConfiguracionSimulacion(historial=ESQUEMA_COMPACTO)
+    cohete = Cohete.desde_configuracion(config)
+    cohete.simular()
+    cohete.r_hist[-1]                       # float, ya decodificado
+    np.asarray(cohete.r_hist)               # float64
+    guardar_historiales("corrida.hist", cohete.historiales())
+
+Los historiales se pueden archivar en disco con guardar_historiales:
+una línea de encabezado JSON seguida de los bytes crudos de cada
+columna, sin depender de numpy.
+
+Para corridas que no entran en memoria, ColumnaEnDisco guarda en memoria
+solo un búfer de muestras y vuelca el resto a un archivo a medida que se
+llena (ver presupuesto.py), y ColumnaCompartida escribe sobre un búfer
+de capacidad fija ajeno (memoria compartida o un archivo mapeado, ver
+trayectorias.py).
+"""
+
+import json
+import os
+import shutil
+import sys
+from array import array
+from typing import NamedTuple
+
+from constantes import R_E
+
+
+# Columnas que registra Cohete en cada paso, en orden
+COLUMNAS = (
+    "r", "q", "q_dot", "theta", "gamma", "gamma_dot", "masa", "beta",
+)
+
+# Bytes por muestra de una columna guardada como lista de floats
+# (puntero de la lista más el objeto float)
+BYTES_FLOAT_PYTHON = 8 + sys.getsizeof(0.0)
+
+FORMATO_ARCHIVO = "historial-v1"
+
+
+class FormatoColumna(NamedTuple):
+    """
+    Cómo se guarda una columna del historial.
+
+    Args:
+        tipo (str): Código de tipo de array.array ("d" float64, "f"
+            float32, o un entero: "q", "l", "i", "h", "b")
+        desplazamiento (float): Valor que se resta antes de guardar
+        escala (float): Valor por el que se divide antes de guardar (la
+            resolución, en las columnas enteras)
+    """
+    tipo: str = "d"
+    desplazamiento: float = 0.0
+    escala: float = 1.0
+
+    @property
+    def bytes_por_muestra(self):
+        """int: Bytes que ocupa cada muestra."""
+        return array(self.tipo).itemsize
+
+    @property
+    def entero(self):
+        """bool: True si la columna se guarda como entero."""
+        return self.tipo not in ("d", "f")
+
+
+FLOAT64 = FormatoColumna("d")
+FLOAT32 = FormatoColumna("f")
+
+
+class EsquemaHistorial(NamedTuple):
+    """
+    Formato de cada columna del historial.
+
+    Es inmutable y hasheable, así que puede ser un campo de
+    ConfiguracionSimulacion y viajar a los procesos trabajadores.
+    """
+    r: FormatoColumna = FLOAT64
+    q: FormatoColumna = FLOAT64
+    q_dot: FormatoColumna = FLOAT64
+    theta: FormatoColumna = FLOAT64
+    gamma: FormatoColumna = FLOAT64
+    gamma_dot: FormatoColumna = FLOAT64
+    masa: FormatoColumna = FLOAT64
+    beta: FormatoColumna = FLOAT64
+
+    def bytes_por_muestra(self):
+        """
+        Bytes por muestra del historial completo.
+
+        Returns:
+            int: Suma de los bytes por muestra de las columnas
+        """
+        return sum(formato.bytes_por_muestra for formato in self)
+
+
+# Todas las columnas en float64 (sin pérdida respecto de las listas)
+ESQUEMA_FLOAT64 = EsquemaHistorial()
+
+# float32 en todo salvo theta; r como altura sobre R_E
+ESQUEMA_COMPACTO = EsquemaHistorial(
+    r=FormatoColumna("f", desplazamiento=R_E),
+    q=FLOAT32,
+    q_dot=FLOAT32,
+    theta=FLOAT64,
+    gamma=FLOAT32,
+    gamma_dot=FLOAT32,
+    masa=FLOAT32,
+    beta=FLOAT32,
+)
+
+# Esquemas que se pueden indicar por nombre (p. ej. --set historial=compacto)
+ESQUEMAS = {
+    "float64": ESQUEMA_FLOAT64,
+    "compacto": ESQUEMA_COMPACTO,
+}
+
+
+def esquema_por_nombre(esquema):
+    """
+    Devuelve el esquema indicado por nombre o el mismo esquema.
+
+    Args:
+        esquema (EsquemaHistorial | str | None): Esquema, nombre de
+            ESQUEMAS o None (listas de floats)
+
+    Returns:
+        EsquemaHistorial | None: Esquema resultante
+
+    Raises:
+        ValueError: Si el nombre no es uno de ESQUEMAS
+    """
+    if esquema is None or isinstance(esquema, EsquemaHistorial):
+        return esquema
+    if isinstance(esquema, str):
+        try:
+            return ESQUEMAS[esquema]
+        except KeyError:
+            raise ValueError(
+                f"Esquema de historial desconocido: {esquema!r} "
+                f"(disponibles: {', '.join(ESQUEMAS)})"
+            ) from None
+    return EsquemaHistorial(*(FormatoColumna(*formato) for formato in esquema))
+
+
+def bytes_por_muestra(esquema=None):
+    """
+    Bytes por muestra del historial con un esquema dado.
+
+    Args:
+        esquema (EsquemaHistorial): Esquema (None = listas de floats)
+
+    Returns:
+        int: Bytes por muestra de las 8 columnas
+    """
+    if esquema is None:
+        return BYTES_FLOAT_PYTHON * len(COLUMNAS)
+    return esquema.bytes_por_muestra()
+
+
+class ColumnaHistorial:
+    """
+    Columna del historial guardada en un array.array.
+
+    Se comporta como una secuencia de floats: append() codifica,
+    el índice y las rebanadas decodifican (las rebanadas devuelven
+    listas) y np.asarray() la convierte a float64 sin recorrerla en
+    Python.
+
+    Args:
+        formato (FormatoColumna): Tipo, desplazamiento y escala
+        valores (iterable): Valores iniciales (ya decodificados)
+    """
+
+    __slots__ = ("formato", "datos", "append")
+
+    def __init__(self, formato=FLOAT64, valores=()):
+        self.formato = FormatoColumna(*formato)
+        self.datos = array(self.formato.tipo)
+        _, desplazamiento, escala = self.formato
+        if self.formato.entero:
+            agregar = self.datos.append
+
+            def append(valor):
+                agregar(round((valor - desplazamiento) / escala))
+        elif desplazamiento == 0.0 and escala == 1.0:
+            # Sin transformación: append del arreglo, sin llamada extra
+            append = self.datos.append
+        else:
+            agregar = self.datos.append
+
+            def append(valor):
+                agregar((valor - desplazamiento) / escala)
+        self.append = append
+        for valor in valores:
+            append(valor)
+
+    @classmethod
+    def desde_bytes(cls, formato, datos):
+        """
+        Reconstruye una columna a partir de sus bytes crudos.
+
+        Args:
+            formato (FormatoColumna): Formato de la columna
+            datos (bytes): Bytes de los valores guardados
+
+        Returns:
+            ColumnaHistorial: Columna con esos datos
+        """
+        columna = cls(formato)
+        columna.datos.frombytes(datos)
+        return columna
+
+    def __len__(self):
+        return len(self.datos)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return self._decodificar(self.datos[indice])
+        _, desplazamiento, escala = self.formato
+        return float(self.datos[indice]) * escala + desplazamiento
+
+    def _decodificar(self, valores):
+        """Decodifica valores guardados a una lista de floats."""
+        _, desplazamiento, escala = self.formato
+        if desplazamiento == 0.0 and escala == 1.0:
+            return [float(v) for v in valores]
+        return [v * escala + desplazamiento for v in valores]
+
+    def __iter__(self):
+        _, desplazamiento, escala = self.formato
+        for valor in self.datos:
+            yield float(valor) * escala + desplazamiento
+
+    def __array__(self, dtype=None, copy=None):
+        import numpy as np
+
+        valores = np.frombuffer(self.datos, dtype=self.formato.tipo)
+        return self._escalar(valores.astype(np.float64), dtype)
+
+    def _escalar(self, valores, dtype):
+        """Decodifica en el lugar un arreglo float64 de valores guardados."""
+        _, desplazamiento, escala = self.formato
+        if escala != 1.0:
+            valores *= escala
+        if desplazamiento != 0.0:
+            valores += desplazamiento
+        return valores if dtype is None else valores.astype(dtype)
+
+    def __repr__(self):
+        return (f"ColumnaHistorial({self.formato.tipo!r}, "
+                f"{len(self)} muestras)")
+
+    @property
+    def nbytes(self):
+        """int: Bytes que ocupan los valores guardados."""
+        return len(self.datos) * self.datos.itemsize
+
+    def copiar_a(self, archivo):
+        """
+        Escribe los bytes crudos de todas las muestras en un archivo.
+
+        Args:
+            archivo: Archivo binario abierto para escribir
+        """
+        self.datos.tofile(archivo)
+
+
+class ColumnaEnDisco(ColumnaHistorial):
+    """
+    Columna del historial que vuelca sus muestras a un archivo.
+
+    En memoria queda solo un búfer de hasta `capacidad` muestras; al
+    llenarse se agrega al archivo (bytes crudos, como en
+    guardar_historiales) y se vacía. Se lee igual que una
+    ColumnaHistorial: índices, rebanadas, iteración y np.asarray
+    combinan el archivo con el búfer.
+
+    Args:
+        formato (FormatoColumna): Tipo, desplazamiento y escala
+        ruta (str): Archivo donde se vuelcan las muestras (se trunca)
+        capacidad (int): Muestras en memoria antes de volcar
+        valores (iterable): Valores iniciales (ya decodificados)
+    """
+
+    __slots__ = ("ruta", "capacidad", "volcadas")
+
+    def __init__(self, formato, ruta, capacidad, valores=()):
+        super().__init__(formato)
+        self.ruta = ruta
+        self.capacidad = max(1, int(capacidad))
+        self.volcadas = 0
+        open(ruta, "wb").close()
+
+        codificar = self.append
+        datos = self.datos
+        capacidad = self.capacidad
+        volcar = self.volcar
+
+        def append(valor):
+            codificar(valor)
+            if len(datos) >= capacidad:
+                volcar()
+        self.append = append
+        for valor in valores:
+            append(valor)
+
+    def volcar(self):
+        """Agrega el búfer al archivo y lo vacía."""
+        if self.datos:
+            with open(self.ruta, "ab") as archivo:
+                self.datos.tofile(archivo)
+            self.volcadas += len(self.datos)
+            del self.datos[:]
+
+    def _crudos(self, inicio, fin):
+        """Valores guardados en [inicio, fin), del archivo y del búfer."""
+        valores = array(self.formato.tipo)
+        if inicio < self.volcadas:
+            tamano = valores.itemsize
+            with open(self.ruta, "rb") as archivo:
+                archivo.seek(inicio * tamano)
+                valores.frombytes(archivo.read(
+                    (min(fin, self.volcadas) - inicio) * tamano
+                ))
+        if fin > self.volcadas:
+            valores.extend(self.datos[max(inicio, self.volcadas) - self.volcadas:
+                                      fin - self.volcadas])
+        return valores
+
+    def __len__(self):
+        return self.volcadas + len(self.datos)
+
+    def __getitem__(self, indice):
+        n = len(self)
+        if isinstance(indice, slice):
+            inicio, fin, paso = indice.indices(n)
+            if paso < 0:
+                return self._decodificar(self._crudos(0, n)[indice])
+            return self._decodificar(
+                self._crudos(inicio, max(inicio, fin))[::paso]
+            )
+        if indice < 0:
+            indice += n
+        if not 0 <= indice < n:
+            raise IndexError("índice fuera de rango")
+        _, desplazamiento, escala = self.formato
+        if indice >= self.volcadas:
+            valor = self.datos[indice - self.volcadas]
+        else:
+            valor = self._crudos(indice, indice + 1)[0]
+        return float(valor) * escala + desplazamiento
+
+    def __iter__(self):
+        n = len(self)
+        for inicio in range(0, n, self.capacidad):
+            yield from self._decodificar(
+                self._crudos(inicio, min(n, inicio + self.capacidad))
+            )
+
+    def __array__(self, dtype=None, copy=None):
+        import numpy as np
+
+        valores = np.concatenate((
+            np.fromfile(self.ruta, dtype=self.formato.tipo,
+                        count=self.volcadas),
+            np.frombuffer(self.datos, dtype=self.formato.tipo),
+        )).astype(np.float64)
+        return self._escalar(valores, dtype)
+
+    def __repr__(self):
+        return (f"ColumnaEnDisco({self.formato.tipo!r}, {len(self)} "
+                f"muestras, {len(self.datos)} en memoria, {self.ruta!r})")
+
+    def copiar_a(self, archivo):
+        """
+        Escribe los bytes crudos de todas las muestras en un archivo.
+
+        Args:
+            archivo: Archivo binario abierto para escribir
+        """
+        self.volcar()
+        with open(self.ruta, "rb") as origen:
+            shutil.copyfileobj(origen, archivo)
+
+    @property
+    def bytes_disco(self):
+        """int: Bytes volcados al archivo."""
+        return self.volcadas * self.datos.itemsize
+
+
+class ColumnaCompartida(ColumnaHistorial):
+    """
+    Columna del historial escrita sobre un búfer de capacidad fija.
+
+    El búfer no es de la columna (memoria compartida, un archivo mapeado,
+    ver trayectorias.py): append escribe la muestra siguiente en su
+    lugar, sin copias ni realocaciones, así que otro proceso que mapee el
+    mismo búfer la lee sin pickle. np.asarray devuelve una vista sin
+    copia si la columna es float64 sin transformación.
+
+    Args:
+        formato (FormatoColumna): Tipo, desplazamiento y escala
+        bufer: Objeto con protocolo de búfer de al menos capacidad ·
+            bytes por muestra (se usa desde el comienzo)
+        muestras (int): Muestras ya escritas en el búfer
+
+    Raises:
+        IndexError: Al agregar una muestra con el búfer lleno
+    """
+
+    __slots__ = ("muestras",)
+
+    def __init__(self, formato, bufer, muestras=0):
+        super().__init__(formato)
+        bytes_crudos = memoryview(bufer).cast("B")
+        tamano = self.formato.bytes_por_muestra
+        self.datos = bytes_crudos[:len(bytes_crudos) - len(bytes_crudos) % tamano
+                                  ].cast(self.formato.tipo)
+        bytes_crudos.release()
+        self.muestras = muestras
+        vista = self.datos
+        _, desplazamiento, escala = self.formato
+        if self.formato.entero:
+            def append(valor):
+                i = self.muestras
+                vista[i] = round((valor - desplazamiento) / escala)
+                self.muestras = i + 1
+        elif desplazamiento == 0.0 and escala == 1.0:
+            def append(valor):
+                i = self.muestras
+                vista[i] = valor
+                self.muestras = i + 1
+        else:
+            def append(valor):
+                i = self.muestras
+                vista[i] = (valor - desplazamiento) / escala
+                self.muestras = i + 1
+        self.append = append
+
+    @property
+    def capacidad(self):
+        """int: Muestras que entran en el búfer."""
+        return len(self.datos)
+
+    def __len__(self):
+        return self.muestras
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return self._decodificar(self.datos[:self.muestras][indice])
+        if indice < 0:
+            indice += self.muestras
+        if not 0 <= indice < self.muestras:
+            raise IndexError("índice fuera de rango")
+        _, desplazamiento, escala = self.formato
+        return float(self.datos[indice]) * escala + desplazamiento
+
+    def __iter__(self):
+        _, desplazamiento, escala = self.formato
+        for valor in self.datos[:self.muestras]:
+            yield float(valor) * escala + desplazamiento
+
+    def __array__(self, dtype=None, copy=None):
+        import numpy as np
+
+        valores = np.frombuffer(self.datos, dtype=self.formato.tipo,
+                                count=self.muestras)
+        if (self.formato == FLOAT64 and not copy
+                and dtype in (None, np.float64)):
+            return valores
+        return self._escalar(valores.astype(np.float64), dtype)
+
+    def __repr__(self):
+        return (f"ColumnaCompartida({self.formato.tipo!r}, {len(self)} "
+                f"de {self.capacidad} muestras)")
+
+    @property
+    def nbytes(self):
+        """int: Bytes que ocupan los valores guardados."""
+        return self.muestras * self.datos.itemsize
+
+    def copiar_a(self, archivo):
+        """
+        Escribe los bytes crudos de todas las muestras en un archivo.
+
+        Args:
+            archivo: Archivo binario abierto para escribir
+        """
+        archivo.write(self.datos[:self.muestras])
+
+    def liberar(self):
+        """
+        Suelta el búfer para que su dueño pueda cerrarlo.
+
+        Returns:
+            bool: False si quedan vistas exportadas (p. ej. arreglos de
+                numpy) y el búfer sigue en uso
+        """
+        try:
+            self.datos.release()
+        except BufferError:
+            return False
+        return True
+
+
+def crear_columnas(esquema, iniciales):
+    """
+    Crea las columnas del historial con sus valores iniciales.
+
+    Args:
+        esquema (EsquemaHistorial): Esquema (None = listas de floats)
+        iniciales (dict): Valor inicial de cada columna de COLUMNAS
+
+    Returns:
+        dict: Nombre de la columna -> lista o ColumnaHistorial
+    """
+    if esquema is None:
+        return {nombre: [iniciales[nombre]] for nombre in COLUMNAS}
+    return {
+        nombre: ColumnaHistorial(formato, (iniciales[nombre],))
+        for nombre, formato in zip(COLUMNAS, esquema)
+    }
+
+
+def crear_columnas_en_disco(esquema, iniciales, carpeta, capacidad):
+    """
+    Crea columnas que vuelcan sus muestras a archivos de una carpeta.
+
+    Cada columna se guarda en "<carpeta>/<nombre>.col".
+
+    Args:
+        esquema (EsquemaHistorial): Esquema (None = float64)
+        iniciales (dict): Valor inicial de cada columna de COLUMNAS
+        carpeta (str): Carpeta existente para los archivos
+        capacidad (int): Muestras en memoria por columna
+
+    Returns:
+        dict: Nombre de la columna -> ColumnaEnDisco
+    """
+    if esquema is None:
+        esquema = ESQUEMA_FLOAT64
+    return {
+        nombre: ColumnaEnDisco(formato, os.path.join(carpeta, f"{nombre}.col"),
+                               capacidad, (iniciales[nombre],))
+        for nombre, formato in zip(COLUMNAS, esquema)
+    }
+
+
+def bytes_por_muestra_columnas(columnas):
+    """
+    Bytes por muestra de un historial según el tipo de sus columnas.
+
+    Args:
+        columnas (dict): Nombre -> lista o ColumnaHistorial
+
+    Returns:
+        int: Suma de los bytes por muestra de las columnas
+    """
+    return sum(
+        columna.formato.bytes_por_muestra
+        if isinstance(columna, ColumnaHistorial) else BYTES_FLOAT_PYTHON
+        for columna in columnas.values()
+    )
+
+
+def bytes_disco_columnas(columnas):
+    """
+    Bytes que las columnas volcaron a disco.
+
+    Args:
+        columnas (dict): Nombre -> lista o ColumnaHistorial
+
+    Returns:
+        int: Bytes en los archivos de las ColumnaEnDisco
+    """
+    return sum(columna.bytes_disco for columna in columnas.values()
+               if isinstance(columna, ColumnaEnDisco))
+
+
+def memoria_columnas(columnas):
+    """
+    Bytes que ocupan las columnas de un historial.
+
+    Las listas se cuentan como punteros más objetos float (aunque
+    CPython reserve algo de espacio extra al crecer); de las
+    ColumnaEnDisco se cuenta solo el búfer en memoria.
+
+    Args:
+        columnas (dict): Nombre -> lista o ColumnaHistorial
+
+    Returns:
+        int: Bytes ocupados por los valores
+    """
+    total = 0
+    for columna in columnas.values():
+        if isinstance(columna, ColumnaHistorial):
+            total += columna.nbytes
+        else:
+            total += len(columna) * BYTES_FLOAT_PYTHON
+    return total
+
+
+def guardar_historiales(ruta, columnas, esquema=None, metadatos=None):
+    """
+    Archiva las columnas de un historial en disco.
+
+    El archivo tiene una línea de encabezado JSON (formato, cantidad de
+    muestras, formato de cada columna y metadatos) seguida de los bytes
+    de cada columna en el orden del encabezado.
+
+    Args:
+        ruta (str): Archivo de destino
+        columnas (dict): Nombre -> lista, ColumnaHistorial o
+            ColumnaEnDisco (p. ej. Cohete.historiales()); las columnas en
+            disco se copian sin cargarlas en memoria
+        esquema (EsquemaHistorial): Formato para las columnas que son
+            listas (None = el de cada columna compacta, o float64)
+        metadatos (dict): Datos adicionales serializables a JSON
+
+    Returns:
+        int: Bytes escritos
+    """
+    esquema = esquema_por_nombre(esquema)
+    formatos = {}
+    bloques = []
+    for nombre, columna in columnas.items():
+        if esquema is not None and nombre in COLUMNAS:
+            formato = esquema[COLUMNAS.index(nombre)]
+        elif isinstance(columna, ColumnaHistorial):
+            formato = columna.formato
+        else:
+            formato = FLOAT64
+        if not (isinstance(columna, ColumnaHistorial)
+                and columna.formato == formato):
+            columna = ColumnaHistorial(formato, columna)
+        formatos[nombre] = formato
+        bloques.append(columna)
+    muestras = {len(bloque) for bloque in bloques}
+    if len(muestras) > 1:
+        raise ValueError("Las columnas tienen distinta cantidad de muestras")
+
+    encabezado = {
+        "formato": FORMATO_ARCHIVO,
+        "orden_bytes": sys.byteorder,
+        "muestras": muestras.pop() if muestras else 0,
+        "columnas": [[nombre, *formato] for nombre, formato in formatos.items()],
+        "metadatos": metadatos or {},
+    }
+    linea = (json.dumps(encabezado, ensure_ascii=False) + "\n").encode("utf-8")
+    escritos = len(linea)
+    with open(ruta, "wb") as archivo:
+        archivo.write(linea)
+        for bloque in bloques:
+            bloque.copiar_a(archivo)
+            escritos += len(bloque) * bloque.formato.bytes_por_muestra
+    return escritos
+
+
+def cargar_historiales(ruta):
+    """
+    Carga un historial archivado con guardar_historiales().
+
+    Args:
+        ruta (str): Archivo a leer
+
+    Returns:
+        tuple: (columnas, metadatos), con columnas un dict
+            nombre -> ColumnaHistorial
+
+    Raises:
+        ValueError: Si el archivo no tiene el formato esperado
+    """
+    with open(ruta, "rb") as archivo:
+        encabezado = json.loads(archivo.readline().decode("utf-8"))
+        if encabezado.get("formato") != FORMATO_ARCHIVO:
+            raise ValueError(f"{ruta} no es un historial ({FORMATO_ARCHIVO})")
+        n = encabezado["muestras"]
+        columnas = {}
+        for nombre, *formato in encabezado["columnas"]:
+            formato = FormatoColumna(*formato)
+            datos = archivo.read(n * formato.bytes_por_muestra)
+            columna = ColumnaHistorial.desde_bytes(formato, datos)
+            if len(columna) != n:
+                raise ValueError(f"{ruta}: columna {nombre} incompleta")
+            if encabezado["orden_bytes"] != sys.byteorder:
+                columna.datos.byteswap()
+            columnas[nombre] = columna
+    return columnas, encabezado["metadatos"]
@@ -0,0 +1,223 @@
+"""
+Motor de integración opcional basado en scipy.integrate.solve_ivp.
+
+Permite resolver las ecuaciones de movimiento de dinamica.py con los
+integradores compilados de SciPy (RK45, DOP853, Radau, LSODA, BDF), con
+control de tolerancias. Sirve como referencia confiable para validar los
+métodos de paso fijo y para los casos rígidos (atmósfera densa, saltos
+de m_dot).
+
+Las discontinuidades del modelo se tratan explícitamente:
+- Cada quiebre de los perfiles de consumo y de guiado (ver
+  planificador.puntos_de_quiebre) inicia un segmento de integración, y
+  dentro de cada segmento los controles se evalúan del lado correcto
+  del salto
+- El agotamiento del combustible es un evento que reinicia el segmento
+- El impacto con la Tierra es un evento terminal
+
+La solución densa se muestrea en la grilla uniforme de dt, de modo que
+los historiales del Cohete quedan en el mismo formato que con los
+integradores de paso fijo.
+
+SciPy es una dependencia opcional: solo se importa al usar este motor.
+"""
+
+import math
+
+from dinamica import IDX_R, IDX_MASA, aceleraciones, controles, derivada
+from observadores import GestorObservadores
+from planificador import puntos_de_quiebre
+from telemetria import INFO, CambioFase, Evento, Resumen, Telemetria
+
+
+PREFIJO = "scipy:"
+METODOS_SCIPY = ("RK45", "DOP853", "Radau", "LSODA", "BDF")
+
+
+def es_metodo_scipy(metodo):
+    """
+    Indica si un nombre de método corresponde a este motor.
+
+    Args:
+        metodo (str): Nombre del método (por ejemplo "scipy:Radau")
+
+    Returns:
+        bool: True si el método se delega a solve_ivp
+    """
+    return metodo is not None and metodo.startswith(PREFIJO)
+
+
+def simular_scipy(cohete, dt, t_max, metodo="scipy:RK45", rtol=1e-8,
+                  atol=1e-9, log_cada=0, telemetria=None, registrar=None):
+    """
+    Simula el cohete con solve_ivp y registra los historiales.
+
+    Args:
+        cohete (Cohete): Cohete a simular (se actualiza en el lugar)
+        dt (float): Separación de las muestras registradas (s)
+        t_max (float): Tiempo máximo de simulación (s)
+        metodo (str): "scipy:" seguido de un método de solve_ivp
+        rtol (float): Tolerancia relativa
+        atol (float): Tolerancia absoluta
+        log_cada (int): Frecuencia de logging en muestras (0 para silenciar)
+        telemetria (Telemetria): Destino de los registros (None = texto
+            por stdout)
+        registrar (callable): Función que registra cada muestra (None =
+            cohete._registrar; ver Cohete._registrador)
+
+    Returns:
+        dict: Resumen con el mismo formato que Cohete.simular, más
+            "evaluaciones" (evaluaciones de la dinámica)
+
+    Raises:
+        ValueError: Si el método no es uno de METODOS_SCIPY
+        ImportError: Si SciPy no está instalado
+    """
+    nombre = metodo[len(PREFIJO):] if es_metodo_scipy(metodo) else metodo
+    if nombre not in METODOS_SCIPY:
+        raise ValueError(
+            f"Método de SciPy desconocido: {nombre!r} "
+            f"(disponibles: {', '.join(METODOS_SCIPY)})"
+        )
+    try:
+        from scipy.integrate import solve_ivp
+    except ImportError as exc:
+        raise ImportError(
+            "El motor 'scipy' requiere SciPy: pip install scipy"
+        ) from exc
+
+    params = cohete.parametros()
+    if telemetria is None:
+        telemetria = Telemetria()
+    if registrar is None:
+        registrar = cohete._registrar
+
+    # Grilla de registro: t_k = t_0 + k·dt, con k = 1..n_muestras
+    t_0 = dt * cohete.pasos
+    n_muestras = max(1, int(t_max / dt))
+    t_fin = t_0 + n_muestras * dt
+    cortes = [tc for tc in puntos_de_quiebre(t_0, t_fin, params)
+              if tc < t_fin]
+    limites = [tc for tc in cortes if tc > t_0] + [t_fin]
+
+    informar = log_cada != 0 and telemetria.acepta(INFO)
+    if informar:
+        telemetria.emitir(Evento(0.0, "inicio", {"dt": dt, "metodo": metodo}))
+        cohete._progreso(telemetria, 0, 0.0)
+
+    y = cohete.estado
+    t = t_0
+    k = 1
+    evaluaciones = 0
+    end_reason = "t_max"
+    flag_combustible_agotado = True
+    gestor = None
+    proximo = math.inf
+    if cohete.observadores:
+        gestor = GestorObservadores(cohete.observadores, dt,
+                                    len(cohete.r_hist) - 1,
+                                    cada=cohete.cada_registro)
+        proximo = gestor.proximo
+
+    while t < t_fin and end_reason == "t_max":
+        t_seg = next(tl for tl in limites if tl > t)
+        # Controles evaluados dentro de [t, t_seg): la etapa final del
+        # segmento usa el valor previo al salto
+        ventana = (t, math.nextafter(t_seg, -math.inf))
+        eventos = [_impacto]
+        if y[IDX_MASA] > params.masa_cohete:
+            eventos.append(_sin_combustible)
+
+        sol = solve_ivp(
+            _derivada_acotada, (t, t_seg), y, method=nombre,
+            args=(params, ventana),
+            rtol=rtol, atol=atol, events=eventos, dense_output=True
+        )
+        evaluaciones += sol.nfev
+        if sol.status == -1:
+            end_reason = "numerical_error"
+            break
+
+        # Muestrear la solución densa en los puntos de grilla alcanzados
+        t_alcanzado = float(sol.t[-1])
+        while k <= n_muestras and t_0 + k * dt <= t_alcanzado:
+            t_k = t_0 + k * dt
+            _registrar_muestra(registrar, t_k, sol.sol(t_k), params)
+            if informar and log_cada > 0 and k % log_cada == 0:
+                cohete._progreso(telemetria, k, t_k - t_0)
+            k += 1
+            if k - 1 >= proximo:
+                if gestor.notificar(cohete, k - 1, t_k - t_0):
+                    end_reason = "cancelled"
+                    t = t_k
+                    break
+                proximo = gestor.proximo
+        if end_reason == "cancelled":
+            break
+
+        y = tuple(float(v) for v in sol.y[:, -1])
+        t = t_alcanzado
+
+        if sol.status == 1:
+            if sol.t_events[0].size > 0:
+                # Impacto: la última muestra es el instante del evento
+                _registrar_muestra(registrar, t, y, params)
+                end_reason = "hit_ground"
+            else:
+                y = y[:IDX_MASA] + (params.masa_cohete,)
+                if flag_combustible_agotado:
+                    if telemetria.acepta(INFO):
+                        telemetria.emitir(CambioFase(
+                            t - t_0, "combustible_agotado",
+                            max(0.0, y[IDX_R] - params.r_e)
+                        ))
+                    flag_combustible_agotado = False
+
+    if not all(math.isfinite(v) for v in cohete.estado):
+        end_reason = "numerical_error"
+    if gestor is not None and end_reason != "cancelled":
+        gestor.finalizar(cohete, k - 1, t - t_0)
+
+    resumen = {
+        "end_reason": end_reason,
+        "iter": k - 1,
+        "t_final": t - t_0,
+        "h_final_m": max(0.0, cohete.r - params.r_e),
+        "theta_final": cohete.theta,
+        "evaluaciones": evaluaciones,
+    }
+    if informar:
+        telemetria.emitir(Resumen(**resumen))
+    return resumen
+
+
+def _derivada_acotada(t, y, params, ventana):
+    """derivada() con el tiempo de los controles acotado al segmento."""
+    return derivada(min(max(t, ventana[0]), ventana[1]), y, params)
+
+
+def _impacto(t, y, params, ventana):
+    """Evento terminal: el cohete alcanza la superficie (r = R_E)."""
+    return y[IDX_R] - params.r_e
+
+
+_impacto.terminal = True
+_impacto.direction = -1
+
+
+def _sin_combustible(t, y, params, ventana):
+    """Evento terminal: la masa llega a la masa estructural."""
+    return y[IDX_MASA] - params.masa_cohete
+
+
+_sin_combustible.terminal = True
+_sin_combustible.direction = -1
+
+
+def _registrar_muestra(registrar, t, y, params):
+    """Registra una muestra de la solución con sus aceleraciones."""
+    r, q, theta, gamma, masa = (float(v) for v in y)
+    masa = max(params.masa_cohete, masa)
+    m_dot, beta = controles(t, (r, q, theta, gamma, masa), params)
+    q_dot, gamma_dot = aceleraciones(r, q, gamma, masa, m_dot, beta, params)
+    registrar((r, q, theta, gamma, masa), q_dot, gamma_dot, beta, m_dot)
@@ -0,0 +1,395 @@
+"""
+Registro de integradores numéricos para las ecuaciones de movimiento.
+
+Cada integrador avanza el vector de estado y = (r, q, theta, gamma, masa)
+un paso de tiempo dt usando la física pura de dinamica.py. Están
+registrados por nombre, de modo que Cohete.simular puede elegir el método
+sin conocer su implementación:
+
+- forward_euler: Euler semi-implícito (esquema original del proyecto)
+- backward_euler: Euler implícito por iteración de punto fijo (original)
+- rk4: Runge-Kutta clásico de orden 4
+- adaptativo: Dormand-Prince 5(4) con control de error por subpasos
+- simplectico: Störmer-Verlet (kick-drift-kick) en variables (r, q, h)
+
+Para agregar un método nuevo basta con heredar de Integrador y decorar
+la clase con @registrar_integrador("nombre").
+"""
+
+import math
+
+from dinamica import (
+    IDX_Q, IDX_GAMMA, IDX_MASA, aceleraciones_con_empuje,
+    controles, derivada, empuje
+)
+
+
+INTEGRADORES = {}
+
+
+def registrar_integrador(nombre):
+    """
+    Decorador que registra una clase de integrador bajo un nombre.
+
+    Args:
+        nombre (str): Nombre con el que se selecciona el integrador
+
+    Returns:
+        callable: Decorador de clase
+    """
+    def decorador(cls):
+        cls.nombre = nombre
+        INTEGRADORES[nombre] = cls
+        return cls
+    return decorador
+
+
+def crear_integrador(nombre, **opciones):
+    """
+    Crea una instancia nueva del integrador registrado con ese nombre.
+
+    Args:
+        nombre (str): Nombre del integrador (ver INTEGRADORES)
+        **opciones: Argumentos para el constructor del integrador
+
+    Returns:
+        Integrador: Instancia lista para usar
+
+    Raises:
+        ValueError: Si no hay ningún integrador con ese nombre
+    """
+    try:
+        cls = INTEGRADORES[nombre]
+    except KeyError:
+        disponibles = ", ".join(sorted(INTEGRADORES))
+        raise ValueError(
+            f"Integrador desconocido: {nombre!r} (disponibles: {disponibles})"
+        ) from None
+    return cls(**opciones)
+
+
+class Integrador:
+    """
+    Clase base de los integradores.
+
+    Las subclases implementan paso(). Un integrador puede guardar estado
+    entre pasos (por ejemplo el último subpaso aceptado), por eso se
+    crea una instancia nueva para cada simulación.
+
+    Atributos:
+    - evaluaciones: Cantidad de evaluaciones de la dinámica realizadas
+    - ventana: Intervalo (t_min, t_max) al que se acota el tiempo con que
+      se evalúan los controles (ver planificador.paso_con_quiebres)
+    """
+
+    nombre = ""
+
+    def __init__(self):
+        self.evaluaciones = 0
+        self.ventana = (-math.inf, math.inf)
+
+    def _t(self, t):
+        """Acota un tiempo de evaluación a la ventana del subpaso."""
+        t_min, t_max = self.ventana
+        return min(max(t, t_min), t_max)
+
+    def paso(self, t, y, dt, params):
+        """
+        Avanza el estado desde t hasta t + dt.
+
+        Args:
+            t (float): Tiempo al inicio del paso (s)
+            y (tuple): Vector de estado (r, q, theta, gamma, masa)
+            dt (float): Paso de tiempo (s)
+            params (ParametrosDinamica): Parámetros del vehículo
+
+        Returns:
+            tuple: (y_nuevo, registro) donde registro es
+                (q_dot, gamma_dot, beta, m_dot) para los historiales
+        """
+        raise NotImplementedError
+
+    def _registro_efectivo(self, t, y, y_nuevo, dt, params):
+        """
+        Registro para métodos de varias etapas: aceleración media del paso
+        y controles evaluados en el estado final.
+        """
+        m_dot, beta = controles(self._t(t + dt), y_nuevo, params)
+        q_dot = (y_nuevo[IDX_Q] - y[IDX_Q]) / dt
+        gamma_dot = (y_nuevo[IDX_GAMMA] - y[IDX_GAMMA]) / dt
+        return (q_dot, gamma_dot, beta, m_dot)
+
+
+def controles_retenidos(t, y, dt, params):
+    """
+    Controles mantenidos constantes durante todo el paso.
+
+    Los esquemas de Euler originales evalúan m_dot y beta al final del
+    paso (t + dt) y limitan m_dot por el combustible disponible, para que
+    el paso nunca consuma más combustible del que queda. Los perfiles de
+    vuelo están ajustados a esta convención, por eso estos esquemas no
+    usan la ventana de controles del planificador.
+
+    Args:
+        t (float): Tiempo al inicio del paso (s)
+        y (tuple): Vector de estado (r, q, theta, gamma, masa)
+        dt (float): Paso de tiempo (s)
+        params (ParametrosDinamica): Parámetros del vehículo
+
+    Returns:
+        tuple: (m_dot, beta)
+    """
+    m_dot, beta = controles(t + dt, y, params)
+    fuel_restante = y[IDX_MASA] - params.masa_cohete
+    if fuel_restante > 0:
+        m_dot = min(m_dot, fuel_restante / dt)
+    else:
+        m_dot = 0.0
+    return m_dot, beta
+
+
+@registrar_integrador("forward_euler")
+class ForwardEuler(Integrador):
+    """
+    Euler semi-implícito: actualiza primero las velocidades y luego las
+    posiciones con las velocidades nuevas. La masa se descuenta antes de
+    evaluar las fuerzas.
+    """
+
+    def paso(self, t, y, dt, params):
+        r, q, theta, gamma, masa = y
+        m_dot, beta = controles_retenidos(t, y, dt, params)
+        masa = max(params.masa_cohete, masa - m_dot * dt)
+
+        empuje_r, empuje_t = empuje(m_dot, beta, params)
+        q_dot, gamma_dot = aceleraciones_con_empuje(
+            r, q, gamma, masa, empuje_r, empuje_t, params
+        )
+        self.evaluaciones += 1
+
+        gamma = gamma_dot * dt + gamma
+        q = q_dot * dt + q
+        theta = gamma * dt + theta
+        r = q * dt + r
+        return (r, q, theta, gamma, masa), (q_dot, gamma_dot, beta, m_dot)
+
+
+@registrar_integrador("backward_euler")
+class BackwardEuler(Integrador):
+    """
+    Euler implícito resuelto por iteración de punto fijo.
+
+    Más estable que Forward Euler para fuerzas grandes o cambios
+    rápidos. El empuje y beta se mantienen fijos durante el paso; el
+    arrastre, la gravedad y el término centrífugo se evalúan en el
+    estado predicho, y el de Coriolis con la velocidad radial ya
+    actualizada en la misma iteración (como el esquema original).
+
+    Atributos adicionales:
+    - iteraciones_implicitas: Iteraciones de punto fijo realizadas
+    """
+
+    def __init__(self, iteraciones=3):
+        super().__init__()
+        self.iteraciones = iteraciones
+        self.iteraciones_implicitas = 0
+
+    def paso(self, t, y, dt, params):
+        r, q, theta, gamma, masa = y
+        m_dot, beta = controles_retenidos(t, y, dt, params)
+        masa = max(params.masa_cohete, masa - m_dot * dt)
+        # El empuje es el mismo en todas las iteraciones
+        empuje_r, empuje_t = empuje(m_dot, beta, params)
+
+        # Estimación inicial: estado actual
+        q_new = q
+        gamma_new = gamma
+        r_new = r
+        q_dot_new = 0.0
+        gamma_dot_new = 0.0
+        for _ in range(self.iteraciones):
+            r_new = r + dt * q_new
+            q_predicha = q_new
+            q_dot_new, gamma_dot_new = aceleraciones_con_empuje(
+                r_new, q_predicha, gamma_new, masa, empuje_r, empuje_t, params
+            )
+            q_new = q + dt * q_dot_new
+            # Como en el esquema original, el arrastre usa la q predicha
+            # pero el término de Coriolis usa la q recién actualizada
+            gamma_dot_new -= 2 * (q_new - q_predicha) * gamma_new / r_new
+            gamma_new = gamma + dt * gamma_dot_new
+        self.evaluaciones += self.iteraciones
+        self.iteraciones_implicitas += self.iteraciones
+
+        theta_new = theta + dt * gamma_new
+        return (
+            (r_new, q_new, theta_new, gamma_new, masa),
+            (q_dot_new, gamma_dot_new, beta, m_dot),
+        )
+
+
+@registrar_integrador("rk4")
+class RK4(Integrador):
+    """Runge-Kutta clásico de orden 4 sobre derivada()."""
+
+    def paso(self, t, y, dt, params):
+        h2 = 0.5 * dt
+        t_med = self._t(t + h2)
+        k1 = derivada(self._t(t), y, params)
+        k2 = derivada(t_med, _combinar(y, h2, k1), params)
+        k3 = derivada(t_med, _combinar(y, h2, k2), params)
+        k4 = derivada(self._t(t + dt), _combinar(y, dt, k3), params)
+        self.evaluaciones += 4
+
+        h6 = dt / 6.0
+        y_nuevo = tuple(
+            y[i] + h6 * (k1[i] + 2.0 * k2[i] + 2.0 * k3[i] + k4[i])
+            for i in range(len(y))
+        )
+        y_nuevo = _limitar_masa(y_nuevo, params)
+        return y_nuevo, self._registro_efectivo(t, y, y_nuevo, dt, params)
+
+
+@registrar_integrador("adaptativo")
+class DormandPrince(Integrador):
+    """
+    Dormand-Prince 5(4) con control de paso.
+
+    Cada paso de registro dt se recorre con subpasos cuyo tamaño se ajusta
+    para mantener el error local estimado por debajo de la tolerancia.
+    Así los historiales conservan la grilla uniforme de dt.
+
+    Atributos:
+    - rechazos: Cantidad de subpasos rechazados por error
+    """
+
+    # Coeficientes del tablero de Butcher
+    _C = (0.0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1.0, 1.0)
+    _A = (
+        (),
+        (1 / 5,),
+        (3 / 40, 9 / 40),
+        (44 / 45, -56 / 15, 32 / 9),
+        (19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729),
+        (9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656),
+        (35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84),
+    )
+    # Diferencia entre las soluciones de orden 5 y 4
+    _E = (71 / 57600, 0.0, -71 / 16695, 71 / 1920, -17253 / 339200,
+          22 / 525, -1 / 40)
+
+    def __init__(self, rtol=1e-8, atol=1e-9, h_min=1e-6):
+        super().__init__()
+        self.rtol = rtol
+        self.atol = atol
+        self.h_min = h_min
+        self.rechazos = 0
+        self._h = None
+        self._fsal = None
+
+    def paso(self, t, y, dt, params):
+        t_fin = t + dt
+        h = dt if self._h is None else min(self._h, dt)
+
+        # First Same As Last: la última etapa del paso anterior es la
+        # derivada en el estado actual (si la ventana de controles no cambió)
+        if (self._fsal is not None and self._fsal[0] is y
+                and self._fsal[2] == self.ventana):
+            k1 = self._fsal[1]
+        else:
+            k1 = derivada(self._t(t), y, params)
+            self.evaluaciones += 1
+
+        y_ini = y
+        t_act = t
+        while t_fin - t_act > 1e-12 * max(1.0, abs(t_fin)):
+            h = min(h, t_fin - t_act)
+            k = [k1]
+            for s in range(1, 7):
+                y_s = y
+                for j, a in enumerate(self._A[s]):
+                    if a != 0.0:
+                        y_s = _combinar(y_s, h * a, k[j])
+                k.append(derivada(self._t(t_act + self._C[s] * h), y_s,
+                                  params))
+            self.evaluaciones += 6
+            y5 = y_s  # la etapa 7 se evalúa en la solución de orden 5
+
+            err = 0.0
+            for i in range(len(y)):
+                e = h * sum(self._E[s] * k[s][i] for s in range(7))
+                escala = self.atol + self.rtol * max(abs(y[i]), abs(y5[i]))
+                err += (e / escala) ** 2
+            err = math.sqrt(err / len(y))
+
+            if err <= 1.0 or h <= self.h_min:
+                t_act += h
+                y = y5
+                k1 = k[6]
+            else:
+                self.rechazos += 1
+
+            if err == 0.0:
+                factor = 5.0
+            else:
+                factor = min(5.0, max(0.2, 0.9 * err ** -0.2))
+            h = max(self.h_min, h * factor)
+
+        self._h = h
+        y_nuevo = _limitar_masa(y, params)
+        self._fsal = (y_nuevo, k1, self.ventana) if y_nuevo is y else None
+        return y_nuevo, self._registro_efectivo(t, y_ini, y_nuevo, dt, params)
+
+
+@registrar_integrador("simplectico")
+class StormerVerlet(Integrador):
+    """
+    Störmer-Verlet (kick-drift-kick) en las variables (r, q, h = r²·γ).
+
+    Para el problema de dos cuerpos sin empuje ni arrastre es un método
+    simplético: conserva exactamente el momento angular específico h y
+    la energía no deriva en órbitas largas. Las fuerzas no conservativas
+    se aplican en los dos medios impulsos.
+    """
+
+    def paso(self, t, y, dt, params):
+        r, q, theta, gamma, masa = y
+        h2 = 0.5 * dt
+
+        # Medio impulso con las fuerzas al inicio del paso
+        _, q_dot, _, gamma_dot, dm1 = derivada(self._t(t), y, params)
+        h = r * r * gamma
+        h_dot = r * r * gamma_dot + 2.0 * r * q * gamma
+        q_med = q + h2 * q_dot
+        h_med = h + h2 * h_dot
+
+        # Deriva de las posiciones
+        r_new = r + dt * q_med
+        theta_new = theta + h2 * (h_med / (r * r) + h_med / (r_new * r_new))
+        masa_pred = max(params.masa_cohete, masa + dt * dm1)
+
+        # Segundo medio impulso con las fuerzas en la posición nueva
+        gamma_med = h_med / (r_new * r_new)
+        _, q_dot, _, gamma_dot, dm2 = derivada(
+            self._t(t + dt), (r_new, q_med, theta_new, gamma_med, masa_pred), params
+        )
+        self.evaluaciones += 2
+        h_dot = r_new * r_new * gamma_dot + 2.0 * r_new * q_med * gamma_med
+        q_new = q_med + h2 * q_dot
+        h_new = h_med + h2 * h_dot
+
+        masa_new = max(params.masa_cohete, masa + h2 * (dm1 + dm2))
+        y_nuevo = (r_new, q_new, theta_new, h_new / (r_new * r_new), masa_new)
+        return y_nuevo, self._registro_efectivo(t, y, y_nuevo, dt, params)
+
+
+def _combinar(y, h, k):
+    """Devuelve y + h·k componente a componente."""
+    return tuple(y_i + h * k_i for y_i, k_i in zip(y, k))
+
+
+def _limitar_masa(y, params):
+    """Evita que la masa quede por debajo de la masa estructural."""
+    if y[IDX_MASA] >= params.masa_cohete:
+        return y
+    return y[:IDX_MASA] + (params.masa_cohete,) + y[IDX_MASA + 1:]
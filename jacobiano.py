@@ -0,0 +1,392 @@
+"""
+Estado final de una simulación junto con su jacobiano (modo directo).
+
+Para ajustar el guiado o el perfil de consumo con métodos de gradiente
+hace falta la derivada del estado final respecto de los parámetros. Con
+diferencias finitas centradas eso cuesta 2p + 1 simulaciones para p
+parámetros, y el resultado es ruidoso cerca de los saltos de
+calcular_mdot.
+
+Aquí se corre una sola simulación aumentada: los parámetros elegidos y
+las condiciones iniciales se siembran como números duales (ver
+duales.py) y la misma dinámica de dinamica.py propaga sus derivadas paso
+a paso. El resultado es la derivada exacta del integrador discreto, con
+el mismo estado final que Cohete.simular.
+
+La aritmética de los duales es Python puro: la corrida aumentada cuesta
+unas 9 corridas comunes más media corrida por variable, así que conviene
+desde unas 5 variables (con 20 cuesta la mitad que las diferencias
+centradas) y, con cualquier cantidad, no tiene el ruido del paso.
+
+Variables que se pueden derivar:
+- Parámetros del vehículo y constantes: isp, cd, diametro, masa_cohete,
+  h_0, h_1, h_2, mu, g0, r_e
+- Perfiles: mdot_fase_<i>, tiempo_guiado_<i>, angulo_guiado_<i>,
+  factor_mdot y desfase_guiado (como en montecarlo.py)
+- Condiciones iniciales: r_0, q_0, theta_0, gamma_0 y masa_fuel
+
+Los fines de fase (fin_fase_<i>) no: el consumo salta en ellos y su
+derivada no es la de la dinámica. Solo se admiten los integradores de
+paso fijo (ver METODOS).
+
+Uso:
+    resultado = simular_con_jacobiano(config, ("cd", "angulo_guiado_3"))
+    resultado.derivada("r", "cd")      # ∂r_final/∂cd (m)
+    referencia = jacobiano_por_diferencias(config, ("cd", "angulo_guiado_3"))
+"""
+
+import math
+from typing import NamedTuple
+
+from duales import Dual, derivadas, valor
+from dinamica import IDX_MASA, IDX_Q, IDX_R, IDX_GAMMA, IDX_THETA
+
+
+# Integradores que admiten números duales (los de paso fijo)
+METODOS = ("forward_euler", "backward_euler", "rk4", "simplectico")
+
+# Componentes del vector de estado, en orden
+COMPONENTES = ("r", "q", "theta", "gamma", "masa")
+
+# Condiciones iniciales derivables -> componente del estado
+INICIALES = {
+    "r_0": IDX_R,
+    "q_0": IDX_Q,
+    "theta_0": IDX_THETA,
+    "gamma_0": IDX_GAMMA,
+    "masa_fuel": IDX_MASA,
+}
+
+# Campos numéricos de ParametrosDinamica derivables
+PARAMETROS = ("isp", "cd", "diametro", "masa_cohete", "h_0", "h_1", "h_2",
+              "mu", "g0", "r_e")
+
+# Perfiles derivables elemento a elemento (ver montecarlo.py)
+PERFILES = ("mdot_fase", "tiempo_guiado", "angulo_guiado")
+
+# Paso relativo de las diferencias finitas de referencia
+PASO_RELATIVO = 1e-6
+
+
+class ResultadoJacobiano(NamedTuple):
+    """
+    Estado final de una corrida y sus derivadas.
+
+    Args:
+        variables (tuple): Variables respecto de las que se deriva
+        estado (tuple): Estado final (r, q, theta, gamma, masa)
+        jacobiano (tuple): Una fila por componente del estado, con la
+            derivada respecto de cada variable
+        end_reason (str): Razón de finalización
+        t_final (float): Tiempo final (s)
+        simulaciones (int): Simulaciones corridas para obtenerlo
+        final (tuple): Estado final como números duales, para derivar
+            otras salidas (None si salió de diferencias finitas)
+    """
+    variables: tuple
+    estado: tuple
+    jacobiano: tuple
+    end_reason: str
+    t_final: float
+    simulaciones: int
+    final: tuple = None
+
+    def derivada(self, componente, variable):
+        """
+        Derivada de una componente del estado final.
+
+        Args:
+            componente (str): Componente (ver COMPONENTES)
+            variable (str): Una de las variables
+
+        Returns:
+            float: ∂componente/∂variable
+        """
+        return self.jacobiano[COMPONENTES.index(componente)][
+            self.variables.index(variable)
+        ]
+
+    def informe(self):
+        """
+        Resultado serializable a JSON.
+
+        Returns:
+            dict: Estado final, jacobiano por componente y variable,
+                end_reason, t_final y simulaciones
+        """
+        return {
+            "estado": dict(zip(COMPONENTES, self.estado)),
+            "jacobiano": {
+                componente: dict(zip(self.variables, fila))
+                for componente, fila in zip(COMPONENTES, self.jacobiano)
+            },
+            "end_reason": self.end_reason,
+            "t_final": self.t_final,
+            "simulaciones": self.simulaciones,
+        }
+
+
+def variables_por_defecto(config):
+    """
+    Variables que se derivan si no se eligen otras.
+
+    isp y cd, más los parámetros del guiado que usa la configuración:
+    h_0, h_1 y h_2 con guiado por altura; con guiado por tiempo, el
+    tiempo y el ángulo de cada punto de control dentro del giro (los que
+    no tienen el beta inicial ni el final), porque con ese guiado las
+    derivadas respecto de h_* son cero.
+
+    Args:
+        config (ConfiguracionSimulacion): Configuración nominal
+
+    Returns:
+        tuple: Nombres de las variables
+    """
+    if config.beta_altura:
+        return ("isp", "cd", "h_0", "h_1", "h_2")
+    betas = config.betas_tiempo
+    giro = [i for i, beta in enumerate(betas)
+            if beta != betas[0] and beta != betas[-1]]
+    return (("isp", "cd")
+            + tuple(f"tiempo_guiado_{i}" for i in giro)
+            + tuple(f"angulo_guiado_{i}" for i in giro))
+
+
+def validar_variable(config, nombre):
+    """
+    Verifica que se pueda derivar respecto de una variable.
+
+    Args:
+        config (ConfiguracionSimulacion): Configuración nominal
+        nombre (str): Variable (ver el docstring del módulo)
+
+    Raises:
+        ValueError: Si la variable no es derivable
+    """
+    from montecarlo import PERTURBACIONES, validar_parametro
+
+    prefijo, _, indice = nombre.rpartition("_")
+    if prefijo in PERFILES and indice.isdigit():
+        validar_parametro(config, nombre)
+    elif (nombre not in PARAMETROS and nombre not in INICIALES
+          and nombre not in PERTURBACIONES):
+        raise ValueError(
+            f"No se puede derivar respecto de {nombre!r} (parámetros "
+            f"{', '.join(PARAMETROS)}; condiciones iniciales "
+            f"{', '.join(INICIALES)}; {', '.join(PERTURBACIONES)} o "
+            f"{'_<i>, '.join(PERFILES)}_<i>)"
+        )
+
+
+def sembrar(config, variables):
+    """
+    Parámetros y estado inicial con las variables como números duales.
+
+    Args:
+        config (ConfiguracionSimulacion): Configuración nominal
+        variables (sequence): Variables respecto de las que se deriva
+
+    Returns:
+        tuple: (params, y_0) - ParametrosDinamica y estado inicial, con
+            duales donde intervienen las variables
+
+    Raises:
+        ValueError: Si una variable no es derivable o está repetida
+    """
+    from montecarlo import valor_nominal
+
+    variables = tuple(variables)
+    if len(set(variables)) != len(variables):
+        raise ValueError(f"Variables repetidas: {variables}")
+    for nombre in variables:
+        validar_variable(config, nombre)
+    n = len(variables)
+    semillas = {nombre: Dual.variable(valor_nominal(config, nombre), i, n)
+                for i, nombre in enumerate(variables)}
+
+    cambios = {nombre: semilla for nombre, semilla in semillas.items()
+               if nombre in PARAMETROS}
+    fases = [list(fase) for fase in config.fases_mdot]
+    tiempos = list(config.tiempos_beta)
+    betas = list(config.betas_tiempo)
+    for nombre, semilla in semillas.items():
+        prefijo, _, indice = nombre.rpartition("_")
+        if prefijo == "mdot_fase":
+            fases[int(indice)][1] = semilla
+        elif prefijo == "tiempo_guiado":
+            tiempos[int(indice)] = semilla
+        elif prefijo == "angulo_guiado":
+            betas[int(indice)] = semilla
+    if "factor_mdot" in semillas:
+        fases = [[t_fin, mdot * semillas["factor_mdot"]]
+                 for t_fin, mdot in fases]
+    if "desfase_guiado" in semillas:
+        tiempos = [t + semillas["desfase_guiado"] for t in tiempos]
+    cambios["fases_mdot"] = tuple(tuple(fase) for fase in fases)
+    cambios["tiempos_beta"] = tuple(tiempos)
+    cambios["betas_tiempo"] = tuple(betas)
+    params = config.parametros_dinamica().reemplazar(**cambios)
+
+    y_0 = [config.r_0, config.q_0, config.theta_0, config.gamma_0,
+           config.masa_fuel]
+    for nombre, indice in INICIALES.items():
+        if nombre in semillas:
+            y_0[indice] = semillas[nombre]
+    y_0[IDX_MASA] = params.masa_cohete + y_0[IDX_MASA]
+    return params, tuple(y_0)
+
+
+def simular_con_jacobiano(config, variables, metodo=None, dt=None,
+                          t_max=None):
+    """
+    Simula una vez y devuelve el estado final con su jacobiano.
+
+    Recorre la misma grilla que Cohete.simular (con los pasos partidos
+    en los quiebres si config.respetar_quiebres) y con los mismos
+    criterios de parada, así que el estado final coincide con el suyo.
+
+    Args:
+        config (ConfiguracionSimulacion): Configuración nominal
+        variables (sequence): Variables respecto de las que se deriva
+        metodo (str): Integrador (None = config.metodo; ver METODOS)
+        dt (float): Paso de tiempo (s) (None = config.dt)
+        t_max (float): Tiempo máximo (s) (None = config.t_max)
+
+    Returns:
+        ResultadoJacobiano: Estado final y derivadas
+
+    Raises:
+        ValueError: Si el integrador no admite duales o una variable no
+            es derivable
+    """
+    from integradores import crear_integrador
+    from planificador import (
+        CalendarioQuiebres, paso_con_quiebres, puntos_de_quiebre
+    )
+
+    metodo = config.metodo if metodo is None else metodo
+    dt = config.dt if dt is None else dt
+    t_max = config.t_max if t_max is None else t_max
+    if metodo not in METODOS:
+        raise ValueError(f"El integrador {metodo!r} no admite números duales "
+                         f"(disponibles: {', '.join(METODOS)})")
+
+    variables = tuple(variables)
+    params, y = sembrar(config, variables)
+    integrador = crear_integrador(metodo)
+
+    # Los quiebres y los criterios de parada usan solo los valores
+    iter_max = max(1, int(t_max / dt))
+    nominales = config.parametros_dinamica()
+    if config.respetar_quiebres:
+        quiebres = puntos_de_quiebre(0.0, iter_max * dt, nominales)
+    else:
+        quiebres = ()
+    calendario = CalendarioQuiebres(quiebres, dt)
+
+    end_reason = "t_max"
+    t = 0.0
+    for i in range(1, iter_max + 1):
+        t_a = (i - 1) * dt
+        cercanos = calendario.cercanos(t_a, dt)
+        if cercanos:
+            y, _ = paso_con_quiebres(integrador, t_a, dt, y, params, cercanos)
+        else:
+            y, _ = integrador.paso(t_a, y, dt, params)
+        t = i * dt
+
+        valores = [valor(componente) for componente in y]
+        if valores[IDX_R] <= nominales.r_e:
+            end_reason = "hit_ground"
+            break
+        if not all(math.isfinite(v) for v in valores[:IDX_MASA]):
+            end_reason = "numerical_error"
+            break
+        if t >= t_max:
+            break
+
+    n = len(variables)
+    return ResultadoJacobiano(
+        variables=variables,
+        estado=tuple(valor(componente) for componente in y),
+        jacobiano=tuple(derivadas(componente, n) for componente in y),
+        end_reason=end_reason,
+        t_final=t,
+        simulaciones=1,
+        final=y,
+    )
+
+
+def estado_final(config):
+    """
+    Simula una configuración y devuelve su estado final.
+
+    Es una función de módulo para que los procesos trabajadores puedan
+    recibirla por pickle.
+
+    Args:
+        config (ConfiguracionSimulacion): Configuración
+
+    Returns:
+        tuple: (estado, end_reason, t_final)
+    """
+    from cohete import Cohete
+    from montecarlo import REGISTRO_MUESTRA
+    from telemetria import Telemetria
+
+    cohete = Cohete.desde_configuracion(config)
+    resumen = cohete.simular(telemetria=Telemetria.nula(),
+                             presupuesto_memoria=REGISTRO_MUESTRA)
+    return cohete.estado, resumen["end_reason"], resumen["t_final"]
+
+
+def jacobiano_por_diferencias(config, variables, paso_relativo=PASO_RELATIVO,
+                              trabajadores=None):
+    """
+    Jacobiano por diferencias finitas centradas, como referencia.
+
+    Cada variable x se mueve ±paso_relativo·max(|x|, 1); son 2p + 1
+    simulaciones, repartidas con barrido.ejecutar_barrido.
+
+    Args:
+        config (ConfiguracionSimulacion): Configuración nominal
+        variables (sequence): Variables (ver validar_variable; aquí
+            también se admite fin_fase_<i>)
+        paso_relativo (float): Paso relativo de las diferencias
+        trabajadores (int): Procesos (ver barrido.ejecutar_barrido)
+
+    Returns:
+        ResultadoJacobiano: Estado nominal y derivadas aproximadas
+    """
+    from barrido import ejecutar_barrido
+    from montecarlo import (
+        aplicar_perturbaciones, validar_parametro, valor_nominal
+    )
+
+    variables = tuple(variables)
+    configs = [config]
+    pasos = []
+    for nombre in variables:
+        validar_parametro(config, nombre)
+        x = valor_nominal(config, nombre)
+        h = paso_relativo * max(abs(x), 1.0)
+        pasos.append(h)
+        configs += [aplicar_perturbaciones(config, {nombre: x + h}),
+                    aplicar_perturbaciones(config, {nombre: x - h})]
+    resultados = ejecutar_barrido(configs, trabajadores, funcion=estado_final)
+
+    estado, end_reason, t_final = resultados[0]
+    columnas = []
+    for i, h in enumerate(pasos):
+        arriba = resultados[1 + 2 * i][0]
+        abajo = resultados[2 + 2 * i][0]
+        columnas.append([(a - b) / (2 * h) for a, b in zip(arriba, abajo)])
+    return ResultadoJacobiano(
+        variables=variables,
+        estado=tuple(estado),
+        jacobiano=tuple(tuple(columna[k] for columna in columnas)
+                        for k in range(len(COMPONENTES))),
+        end_reason=end_reason,
+        t_final=t_final,
+        simulaciones=len(configs),
+    )
@@ -0,0 +1,927 @@
+"""
+Análisis de dispersión Monte Carlo con agregación en línea.
+
+Una Dispersion declara qué parámetros de la configuración son inciertos
+y con qué distribución:
+
+- campos numéricos de ConfiguracionSimulacion (isp, cd, masa_fuel...)
+- factor_mdot: factor que multiplica el consumo de todas las fases
+- desfase_guiado: segundos que se suman a los tiempos del guiado por
+  tiempo (tiempos_beta)
+- un elemento de los perfiles, por su índice: mdot_fase_<i> y
+  fin_fase_<i> (consumo y tiempo de fin de la fase i de fases_mdot),
+  tiempo_guiado_<i> y angulo_guiado_<i> (punto i del guiado por tiempo,
+  en s y rad)
+
+Cada muestra usa su propio generador, sembrado con (semilla, índice):
+la muestra i es siempre la misma, sin importar cuántas se corran ni en
+qué proceso, y Dispersion.repetir(i) la vuelve a simular con su
+historial completo.
+
+Las corridas no guardan trayectorias: de cada una se extraen las
+métricas finales (metricas_finales) y se agregan en línea con memoria
+constante: media y varianza (Welford), mínimo y máximo con el índice de
+la muestra, un bosquejo de cuantiles (KLL) e histogramas. Las muestras
+se reparten en tramos fijos entre los procesos (ver barrido.py); cada
+trabajador devuelve solo el agregado de su tramo y los agregados se
+combinan en orden, así que el resultado no depende de la cantidad de
+trabajadores.
+
+Uso:
+    dispersion = Dispersion({"isp": Normal(300, 3),
+                             "factor_mdot": Normal(1, 0.01)}, semilla=7)
+    agregado = ejecutar_montecarlo(dispersion, 10_000)
+    agregado.informe()["altura_final_km"]["cuantiles"]
+    cohete = dispersion.repetir(agregado.estadisticas["excentricidad"]
+                                .indice_maximo)
+"""
+
+import math
+import random
+from collections import Counter
+from dataclasses import dataclass, fields, replace
+from functools import partial
+from typing import NamedTuple, Tuple
+
+from configuracion import ConfiguracionSimulacion
+from utilidades import calcular_elementos_orbitales
+
+
+# Perturbaciones que no son campos de ConfiguracionSimulacion
+PERTURBACIONES = ("factor_mdot", "desfase_guiado")
+
+# Perturbaciones de un elemento de los perfiles ("<prefijo>_<índice>"):
+# prefijo -> (campo de la configuración, posición dentro del elemento)
+PERTURBACIONES_INDEXADAS = {
+    "mdot_fase": ("fases_mdot", 1),
+    "fin_fase": ("fases_mdot", 0),
+    "tiempo_guiado": ("tiempos_beta", None),
+    "angulo_guiado": ("betas_tiempo", None),
+}
+
+# Métricas finales de cada muestra (ver metricas_finales)
+METRICAS = ("altura_final_km", "perigeo_km", "excentricidad",
+            "margen_combustible_kg")
+
+# Cuantiles del informe
+CUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+# Tramos en que se dividen las muestras (fijo: el resultado no depende
+# de la cantidad de trabajadores)
+TRAMOS = 256
+
+# Presupuesto del registro de cada muestra: solo importa el estado final
+REGISTRO_MUESTRA = 64 * 1024
+
+
+# =========================
+# DISTRIBUCIONES
+# =========================
+
+class Normal(NamedTuple):
+    """Distribución normal de media y desvío dados."""
+    media: float
+    desvio: float
+
+    def muestrear(self, rng):
+        """
+        Args:
+            rng (random.Random): Generador de la muestra
+
+        Returns:
+            float: Valor muestreado
+        """
+        return rng.gauss(self.media, self.desvio)
+
+    def cuantil(self, u):
+        """
+        Inversa de la función de distribución.
+
+        Args:
+            u (float): Probabilidad en (0, 1)
+
+        Returns:
+            float: Valor con esa probabilidad acumulada
+        """
+        from statistics import NormalDist
+
+        return NormalDist(self.media, self.desvio).inv_cdf(u)
+
+
+class Uniforme(NamedTuple):
+    """Distribución uniforme en [minimo, maximo]."""
+    minimo: float
+    maximo: float
+
+    def muestrear(self, rng):
+        """
+        Args:
+            rng (random.Random): Generador de la muestra
+
+        Returns:
+            float: Valor muestreado
+        """
+        return rng.uniform(self.minimo, self.maximo)
+
+    def cuantil(self, u):
+        """
+        Inversa de la función de distribución.
+
+        Args:
+            u (float): Probabilidad en [0, 1]
+
+        Returns:
+            float: Valor con esa probabilidad acumulada
+        """
+        return self.minimo + u * (self.maximo - self.minimo)
+
+
+class Triangular(NamedTuple):
+    """Distribución triangular en [minimo, maximo] con la moda dada."""
+    minimo: float
+    moda: float
+    maximo: float
+
+    def muestrear(self, rng):
+        """
+        Args:
+            rng (random.Random): Generador de la muestra
+
+        Returns:
+            float: Valor muestreado
+        """
+        return rng.triangular(self.minimo, self.maximo, self.moda)
+
+    def cuantil(self, u):
+        """
+        Inversa de la función de distribución.
+
+        Args:
+            u (float): Probabilidad en [0, 1]
+
+        Returns:
+            float: Valor con esa probabilidad acumulada
+        """
+        ancho = self.maximo - self.minimo
+        if ancho == 0:
+            return self.minimo
+        corte = (self.moda - self.minimo) / ancho
+        if u < corte:
+            return self.minimo + math.sqrt(u * ancho * (self.moda - self.minimo))
+        return self.maximo - math.sqrt((1 - u) * ancho
+                                       * (self.maximo - self.moda))
+
+
+# Distribuciones por nombre (ver distribucion_desde_texto)
+DISTRIBUCIONES = {
+    "normal": Normal,
+    "uniforme": Uniforme,
+    "triangular": Triangular,
+}
+
+
+def distribucion_desde_texto(texto):
+    """
+    Interpreta una distribución escrita como "tipo:parámetro:parámetro".
+
+    Args:
+        texto (str): Por ejemplo "normal:300:3", "uniforme:0.4:0.6" o
+            "triangular:-2:0:1"
+
+    Returns:
+        Normal | Uniforme | Triangular: Distribución
+
+    Raises:
+        ValueError: Si el tipo no existe o los parámetros no son números
+    """
+    tipo, *parametros = texto.split(":")
+    try:
+        clase = DISTRIBUCIONES[tipo.strip().lower()]
+    except KeyError:
+        raise ValueError(
+            f"Distribución desconocida: {tipo!r} "
+            f"(disponibles: {', '.join(DISTRIBUCIONES)})"
+        ) from None
+    if len(parametros) != len(clase._fields):
+        raise ValueError(f"{tipo} espera {len(clase._fields)} parámetros "
+                         f"({', '.join(clase._fields)}): {texto!r}")
+    return clase(*(float(p) for p in parametros))
+
+
+# =========================
+# DISPERSIÓN
+# =========================
+
+@dataclass(frozen=True)
+class Dispersion:
+    """
+    Parámetros inciertos de una configuración y sus distribuciones.
+
+    Es inmutable y se envía barata a los procesos trabajadores.
+
+    Args:
+        parametros (dict | tuple): Nombre -> distribución; el nombre es
+            un campo numérico de ConfiguracionSimulacion, uno de
+            PERTURBACIONES o un elemento de los perfiles (ver
+            PERTURBACIONES_INDEXADAS). Se muestrean en este orden.
+        base (ConfiguracionSimulacion): Configuración nominal
+        semilla (int): Semilla del estudio
+
+    Raises:
+        ValueError: Si un parámetro no es perturbable
+    """
+    parametros: Tuple[Tuple[str, object], ...]
+    base: ConfiguracionSimulacion = ConfiguracionSimulacion()
+    semilla: int = 0
+
+    def __post_init__(self):
+        parametros = self.parametros
+        if isinstance(parametros, dict):
+            parametros = parametros.items()
+        object.__setattr__(self, "parametros", tuple(
+            (nombre, distribucion) for nombre, distribucion in parametros
+        ))
+        for nombre, distribucion in self.parametros:
+            validar_parametro(self.base, nombre)
+            if not hasattr(distribucion, "muestrear"):
+                raise ValueError(f"{nombre}: {distribucion!r} no es una "
+                                 f"distribución")
+
+    def generador(self, indice):
+        """
+        Generador de números aleatorios de una muestra.
+
+        Se siembra con una cadena, que random.Random convierte con
+        SHA-512: es el mismo en todos los procesos y no depende de
+        PYTHONHASHSEED.
+
+        Args:
+            indice (int): Índice de la muestra
+
+        Returns:
+            random.Random: Generador propio de la muestra
+        """
+        return random.Random(f"montecarlo:{self.semilla}:{indice}")
+
+    def valores(self, indice):
+        """
+        Valores muestreados de los parámetros inciertos.
+
+        Args:
+            indice (int): Índice de la muestra
+
+        Returns:
+            dict: Nombre del parámetro -> valor
+        """
+        rng = self.generador(indice)
+        return {nombre: distribucion.muestrear(rng)
+                for nombre, distribucion in self.parametros}
+
+    def muestra(self, indice):
+        """
+        Configuración de una muestra.
+
+        Args:
+            indice (int): Índice de la muestra
+
+        Returns:
+            ConfiguracionSimulacion: Base con los valores de la muestra
+        """
+        return aplicar_perturbaciones(self.base, self.valores(indice))
+
+    def repetir(self, indice, **opciones):
+        """
+        Vuelve a simular una muestra con su historial completo.
+
+        Args:
+            indice (int): Índice de la muestra
+            **opciones: Argumentos de Cohete.simular (por defecto sin
+                telemetría)
+
+        Returns:
+            Cohete: Cohete simulado
+        """
+        from cohete import Cohete
+        from telemetria import Telemetria
+
+        opciones.setdefault("telemetria", Telemetria.nula())
+        cohete = Cohete.desde_configuracion(self.muestra(indice))
+        cohete.simular(**opciones)
+        return cohete
+
+
+def _indexada(nombre):
+    """(prefijo, índice) de una perturbación indexada, o None."""
+    prefijo, _, indice = nombre.rpartition("_")
+    if prefijo in PERTURBACIONES_INDEXADAS and indice.isdigit():
+        return prefijo, int(indice)
+    return None
+
+
+def validar_parametro(base, nombre):
+    """
+    Verifica que un parámetro se pueda perturbar.
+
+    Args:
+        base (ConfiguracionSimulacion): Configuración nominal
+        nombre (str): Campo de la configuración, perturbación de
+            PERTURBACIONES o elemento de los perfiles
+
+    Raises:
+        ValueError: Si no es un campo numérico ni una perturbación, o si
+            el índice no existe en el perfil
+    """
+    if nombre in PERTURBACIONES:
+        return
+    indexada = _indexada(nombre)
+    if indexada is not None:
+        prefijo, indice = indexada
+        campo = PERTURBACIONES_INDEXADAS[prefijo][0]
+        if indice >= len(getattr(base, campo)):
+            raise ValueError(f"{nombre}: {campo} tiene "
+                             f"{len(getattr(base, campo))} elementos")
+        return
+    numericos = {campo.name for campo in fields(ConfiguracionSimulacion)
+                 if type(getattr(base, campo.name)) in (int, float)}
+    if nombre not in numericos:
+        raise ValueError(
+            f"Parámetro no perturbable: {nombre!r} (campos numéricos de la "
+            f"configuración, {', '.join(PERTURBACIONES)} o "
+            f"{'_<i>, '.join(PERTURBACIONES_INDEXADAS)}_<i>)"
+        )
+
+
+def valor_nominal(base, nombre):
+    """
+    Valor de un parámetro perturbable en la configuración nominal.
+
+    Args:
+        base (ConfiguracionSimulacion): Configuración nominal
+        nombre (str): Campo de la configuración, perturbación de
+            PERTURBACIONES o elemento de los perfiles
+
+    Returns:
+        float: Valor del campo o del elemento, 1 para factor_mdot y 0
+            para desfase_guiado
+    """
+    if nombre == "factor_mdot":
+        return 1.0
+    if nombre == "desfase_guiado":
+        return 0.0
+    indexada = _indexada(nombre)
+    if indexada is not None:
+        prefijo, indice = indexada
+        campo, posicion = PERTURBACIONES_INDEXADAS[prefijo]
+        elemento = getattr(base, campo)[indice]
+        return float(elemento if posicion is None else elemento[posicion])
+    return float(getattr(base, nombre))
+
+
+def aplicar_perturbaciones(base, valores):
+    """
+    Configuración con los valores de una muestra.
+
+    Los elementos de los perfiles se fijan primero; factor_mdot y
+    desfase_guiado se aplican después sobre el perfil resultante.
+
+    Args:
+        base (ConfiguracionSimulacion): Configuración nominal
+        valores (dict): Parámetro (ver validar_parametro) -> valor
+
+    Returns:
+        ConfiguracionSimulacion: Configuración perturbada
+    """
+    perfiles = {}
+    cambios = {}
+    for nombre, valor in valores.items():
+        indexada = _indexada(nombre)
+        if indexada is not None:
+            prefijo, indice = indexada
+            campo, posicion = PERTURBACIONES_INDEXADAS[prefijo]
+            if campo not in perfiles:
+                perfiles[campo] = [list(e) if posicion is not None else e
+                                   for e in getattr(base, campo)]
+            if posicion is None:
+                perfiles[campo][indice] = valor
+            else:
+                perfiles[campo][indice][posicion] = valor
+        elif nombre not in PERTURBACIONES:
+            cambios[nombre] = valor
+    fases = perfiles.get("fases_mdot", base.fases_mdot)
+    tiempos = perfiles.get("tiempos_beta", base.tiempos_beta)
+    if "factor_mdot" in valores:
+        fases = [(t_fin, mdot * valores["factor_mdot"])
+                 for t_fin, mdot in fases]
+    if "desfase_guiado" in valores:
+        tiempos = [t + valores["desfase_guiado"] for t in tiempos]
+    if fases is not base.fases_mdot:
+        cambios["fases_mdot"] = fases
+    if tiempos is not base.tiempos_beta:
+        cambios["tiempos_beta"] = tiempos
+    if "betas_tiempo" in perfiles:
+        cambios["betas_tiempo"] = perfiles["betas_tiempo"]
+    return replace(base, **cambios)
+
+
+def dispersion_por_defecto(base=None, semilla=0):
+    """
+    Dispersión típica alrededor de una configuración nominal.
+
+    ISP ±1 %, CD ±10 %, masa de combustible ±0.5 %, consumo ±2 % y
+    guiado ±1 s (desvíos de distribuciones normales).
+
+    Args:
+        base (ConfiguracionSimulacion): Configuración nominal (None = la
+            por defecto)
+        semilla (int): Semilla del estudio
+
+    Returns:
+        Dispersion: Dispersión
+    """
+    if base is None:
+        base = ConfiguracionSimulacion()
+    return Dispersion({
+        "isp": Normal(base.isp, 0.01 * base.isp),
+        "cd": Normal(base.cd, 0.10 * base.cd),
+        "masa_fuel": Normal(base.masa_fuel, 0.005 * base.masa_fuel),
+        "factor_mdot": Normal(1.0, 0.02),
+        "desfase_guiado": Normal(0.0, 1.0),
+    }, base=base, semilla=semilla)
+
+
+# =========================
+# AGREGACIÓN EN LÍNEA
+# =========================
+
+class EstadisticaEnLinea:
+    """
+    Cantidad, media, varianza, mínimo y máximo de una serie en línea.
+
+    Usa el algoritmo de Welford, y el de Chan et al. para combinar dos
+    series (p. ej. de distintos trabajadores). Guarda el índice de la
+    muestra del mínimo y del máximo para poder repetirlas.
+    """
+
+    __slots__ = ("n", "media", "m2", "minimo", "maximo",
+                 "indice_minimo", "indice_maximo")
+
+    def __init__(self):
+        self.n = 0
+        self.media = 0.0
+        self.m2 = 0.0
+        self.minimo = math.inf
+        self.maximo = -math.inf
+        self.indice_minimo = None
+        self.indice_maximo = None
+
+    def agregar(self, valor, indice=None):
+        """
+        Agrega un valor.
+
+        Args:
+            valor (float): Valor
+            indice (int): Índice de la muestra
+        """
+        self.n += 1
+        delta = valor - self.media
+        self.media += delta / self.n
+        self.m2 += delta * (valor - self.media)
+        if valor < self.minimo:
+            self.minimo = valor
+            self.indice_minimo = indice
+        if valor > self.maximo:
+            self.maximo = valor
+            self.indice_maximo = indice
+
+    def combinar(self, otra):
+        """
+        Agrega los valores de otra estadística.
+
+        Args:
+            otra (EstadisticaEnLinea): Estadística a combinar
+        """
+        if otra.n == 0:
+            return
+        n = self.n + otra.n
+        delta = otra.media - self.media
+        self.media += delta * otra.n / n
+        self.m2 += otra.m2 + delta**2 * self.n * otra.n / n
+        self.n = n
+        if otra.minimo < self.minimo:
+            self.minimo = otra.minimo
+            self.indice_minimo = otra.indice_minimo
+        if otra.maximo > self.maximo:
+            self.maximo = otra.maximo
+            self.indice_maximo = otra.indice_maximo
+
+    @property
+    def varianza(self):
+        """float: Varianza muestral (NaN con menos de dos valores)."""
+        return self.m2 / (self.n - 1) if self.n > 1 else math.nan
+
+    @property
+    def desvio(self):
+        """float: Desvío estándar muestral."""
+        return math.sqrt(self.varianza)
+
+
+class BosquejoCuantiles:
+    """
+    Bosquejo de cuantiles KLL: cuantiles aproximados en memoria constante.
+
+    Los valores entran al nivel 0; cuando un nivel supera su capacidad
+    se ordena y pasa al nivel siguiente uno de cada dos valores, que
+    desde entonces representa el doble de muestras. Las capacidades
+    decrecen geométricamente hacia los niveles bajos, así que se guardan
+    unos 3k valores sin importar cuántos entren, con error de rango
+    O(1/k). Dos bosquejos se combinan juntando sus niveles.
+
+    Para que el resultado sea reproducible, el valor que sobrevive de
+    cada par alterna en lugar de elegirse al azar.
+
+    Args:
+        k (int): Capacidad del nivel más alto (precisión)
+    """
+
+    __slots__ = ("k", "niveles", "n", "compactaciones")
+
+    def __init__(self, k=200):
+        self.k = k
+        self.niveles = [[]]
+        self.n = 0
+        self.compactaciones = 0
+
+    def _capacidad(self, nivel):
+        """Capacidad de un nivel según la altura actual."""
+        profundidad = len(self.niveles) - 1 - nivel
+        return max(2, int(self.k * (2 / 3) ** profundidad))
+
+    def agregar(self, valor):
+        """
+        Agrega un valor.
+
+        Args:
+            valor (float): Valor
+        """
+        self.niveles[0].append(valor)
+        self.n += 1
+        if len(self.niveles[0]) >= self._capacidad(0):
+            self._compactar()
+
+    def _compactar(self):
+        """Compacta los niveles que superan su capacidad."""
+        nivel = 0
+        while nivel < len(self.niveles):
+            valores = self.niveles[nivel]
+            if len(valores) >= self._capacidad(nivel):
+                if nivel + 1 == len(self.niveles):
+                    self.niveles.append([])
+                valores.sort()
+                sobrante = [valores.pop()] if len(valores) % 2 else []
+                inicio = self.compactaciones % 2
+                self.compactaciones += 1
+                self.niveles[nivel + 1].extend(valores[inicio::2])
+                self.niveles[nivel] = sobrante
+            nivel += 1
+
+    def combinar(self, otro):
+        """
+        Agrega los valores de otro bosquejo.
+
+        Args:
+            otro (BosquejoCuantiles): Bosquejo a combinar
+        """
+        while len(self.niveles) < len(otro.niveles):
+            self.niveles.append([])
+        for nivel, valores in enumerate(otro.niveles):
+            self.niveles[nivel].extend(valores)
+        self.n += otro.n
+        self._compactar()
+
+    def cuantiles(self, probabilidades=CUANTILES):
+        """
+        Cuantiles aproximados.
+
+        Args:
+            probabilidades (sequence): Probabilidades en [0, 1]
+
+        Returns:
+            list: Cuantil de cada probabilidad (NaN si no hay valores)
+        """
+        pesados = sorted(
+            (valor, 2**nivel)
+            for nivel, valores in enumerate(self.niveles)
+            for valor in valores
+        )
+        if not pesados:
+            return [math.nan for _ in probabilidades]
+        total = sum(peso for _, peso in pesados)
+        resultado = []
+        for p in probabilidades:
+            objetivo = p * total
+            acumulado = 0
+            for valor, peso in pesados:
+                acumulado += peso
+                if acumulado >= objetivo:
+                    break
+            resultado.append(valor)
+        return resultado
+
+    def __len__(self):
+        return sum(len(valores) for valores in self.niveles)
+
+
+class Histograma:
+    """
+    Histograma de intervalos iguales con cuentas fuera de rango.
+
+    Args:
+        minimo (float): Borde inferior
+        maximo (float): Borde superior
+        intervalos (int): Cantidad de intervalos
+    """
+
+    __slots__ = ("minimo", "maximo", "conteos", "debajo", "encima")
+
+    def __init__(self, minimo, maximo, intervalos=50):
+        if not maximo > minimo or intervalos < 1:
+            raise ValueError(f"Histograma inválido: [{minimo}, {maximo}] "
+                             f"con {intervalos} intervalos")
+        self.minimo = minimo
+        self.maximo = maximo
+        self.conteos = [0] * intervalos
+        self.debajo = 0
+        self.encima = 0
+
+    def agregar(self, valor):
+        """
+        Cuenta un valor.
+
+        Args:
+            valor (float): Valor
+        """
+        if valor < self.minimo:
+            self.debajo += 1
+        elif valor >= self.maximo:
+            self.encima += 1
+        else:
+            ancho = (self.maximo - self.minimo) / len(self.conteos)
+            self.conteos[min(len(self.conteos) - 1,
+                             int((valor - self.minimo) / ancho))] += 1
+
+    def combinar(self, otro):
+        """
+        Suma las cuentas de otro histograma con los mismos bordes.
+
+        Args:
+            otro (Histograma): Histograma a combinar
+
+        Raises:
+            ValueError: Si los bordes no coinciden
+        """
+        if self.bordes != otro.bordes:
+            raise ValueError("Los histogramas tienen bordes distintos")
+        self.conteos = [a + b for a, b in zip(self.conteos, otro.conteos)]
+        self.debajo += otro.debajo
+        self.encima += otro.encima
+
+    @property
+    def bordes(self):
+        """list: Bordes de los intervalos (uno más que conteos)."""
+        ancho = (self.maximo - self.minimo) / len(self.conteos)
+        return [self.minimo + i * ancho for i in range(len(self.conteos) + 1)]
+
+
+def rangos_por_defecto(base):
+    """
+    Rangos de los histogramas de cada métrica.
+
+    Args:
+        base (ConfiguracionSimulacion): Configuración nominal
+
+    Returns:
+        dict: Métrica -> (mínimo, máximo, intervalos)
+    """
+    return {
+        "altura_final_km": (0.0, 1000.0, 50),
+        "perigeo_km": (-base.r_e / 1000, 1000.0, 50),
+        "excentricidad": (0.0, 1.0, 50),
+        "margen_combustible_kg": (0.0, max(1.0, base.masa_fuel), 50),
+    }
+
+
+class AgregadoMontecarlo:
+    """
+    Estadísticas de las métricas finales de un conjunto de muestras.
+
+    Ocupa memoria constante: por métrica una EstadisticaEnLinea, un
+    BosquejoCuantiles y un Histograma, y las cuentas de cada motivo de
+    fin. Los valores no finitos (corridas con error numérico) solo se
+    cuentan.
+
+    Args:
+        rangos (dict): Métrica -> (mínimo, máximo, intervalos) de su
+            histograma (ver rangos_por_defecto)
+        k (int): Precisión de los bosquejos de cuantiles
+    """
+
+    def __init__(self, rangos, k=200):
+        self.muestras = 0
+        self.motivos_fin = Counter()
+        self.no_finitos = Counter()
+        self.estadisticas = {nombre: EstadisticaEnLinea() for nombre in rangos}
+        self.bosquejos = {nombre: BosquejoCuantiles(k) for nombre in rangos}
+        self.histogramas = {nombre: Histograma(*rango)
+                            for nombre, rango in rangos.items()}
+
+    def agregar(self, indice, metricas, motivo_fin):
+        """
+        Agrega una muestra.
+
+        Args:
+            indice (int): Índice de la muestra
+            metricas (dict): Métrica -> valor (ver metricas_finales)
+            motivo_fin (str): end_reason de la corrida
+        """
+        self.muestras += 1
+        self.motivos_fin[motivo_fin] += 1
+        for nombre, estadistica in self.estadisticas.items():
+            valor = metricas[nombre]
+            if not math.isfinite(valor):
+                self.no_finitos[nombre] += 1
+                continue
+            estadistica.agregar(valor, indice)
+            self.bosquejos[nombre].agregar(valor)
+            self.histogramas[nombre].agregar(valor)
+
+    def combinar(self, otro):
+        """
+        Agrega las muestras de otro agregado (p. ej. de otro tramo).
+
+        Args:
+            otro (AgregadoMontecarlo): Agregado con las mismas métricas
+        """
+        self.muestras += otro.muestras
+        self.motivos_fin.update(otro.motivos_fin)
+        self.no_finitos.update(otro.no_finitos)
+        for nombre in self.estadisticas:
+            self.estadisticas[nombre].combinar(otro.estadisticas[nombre])
+            self.bosquejos[nombre].combinar(otro.bosquejos[nombre])
+            self.histogramas[nombre].combinar(otro.histogramas[nombre])
+
+    def informe(self, cuantiles=CUANTILES):
+        """
+        Resultados serializables a JSON.
+
+        Args:
+            cuantiles (sequence): Probabilidades de los cuantiles
+
+        Returns:
+            dict: muestras, motivos_fin y, por métrica, estadísticas,
+                cuantiles, índices de los extremos e histograma
+        """
+        datos = {
+            "muestras": self.muestras,
+            "motivos_fin": dict(self.motivos_fin),
+        }
+        for nombre, estadistica in self.estadisticas.items():
+            histograma = self.histogramas[nombre]
+            datos[nombre] = {
+                "n": estadistica.n,
+                "no_finitos": self.no_finitos[nombre],
+                "media": estadistica.media,
+                "desvio": estadistica.desvio,
+                "minimo": estadistica.minimo,
+                "maximo": estadistica.maximo,
+                "indice_minimo": estadistica.indice_minimo,
+                "indice_maximo": estadistica.indice_maximo,
+                "cuantiles": dict(zip(
+                    (f"p{100 * p:g}" for p in cuantiles),
+                    self.bosquejos[nombre].cuantiles(cuantiles),
+                )),
+                "histograma": {
+                    "bordes": histograma.bordes,
+                    "conteos": histograma.conteos,
+                    "debajo": histograma.debajo,
+                    "encima": histograma.encima,
+                },
+            }
+        return datos
+
+
+# =========================
+# EJECUCIÓN
+# =========================
+
+def metricas_finales(cohete):
+    """
+    Métricas de inserción del estado final de una corrida.
+
+    Args:
+        cohete (Cohete): Cohete ya simulado
+
+    Returns:
+        dict: altura_final_km, perigeo_km (altura del perigeo de la
+            órbita kepleriana por el estado final), excentricidad y
+            margen_combustible_kg
+    """
+    config = cohete.config
+    _, excentricidad, radio_perigeo, _ = calcular_elementos_orbitales(
+        cohete.r, cohete.q, cohete.gamma, config.mu
+    )
+    return {
+        "altura_final_km": (cohete.r - config.r_e) / 1000,
+        "perigeo_km": (radio_perigeo - config.r_e) / 1000,
+        "excentricidad": excentricidad,
+        "margen_combustible_kg": cohete.masa - config.masa_cohete,
+    }
+
+
+def simular_metricas(config):
+    """
+    Simula una configuración sin guardar la trayectoria.
+
+    Es una función de módulo para que los procesos trabajadores puedan
+    recibirla por pickle.
+
+    Args:
+        config (ConfiguracionSimulacion): Configuración
+
+    Returns:
+        dict: Métricas finales (ver metricas_finales) y end_reason
+    """
+    from cohete import Cohete
+    from telemetria import Telemetria
+
+    cohete = Cohete.desde_configuracion(config)
+    resumen = cohete.simular(telemetria=Telemetria.nula(),
+                             presupuesto_memoria=REGISTRO_MUESTRA)
+    return {**metricas_finales(cohete), "end_reason": resumen["end_reason"]}
+
+
+def correr_tramo(dispersion, tramo, rangos, k=200):
+    """
+    Simula un tramo de muestras y devuelve solo su agregado.
+
+    Es una función de módulo para que los procesos trabajadores puedan
+    recibirla por pickle.
+
+    Args:
+        dispersion (Dispersion): Dispersión
+        tramo (tuple): (primer índice, índice final excluido)
+        rangos (dict): Rangos de los histogramas
+        k (int): Precisión de los bosquejos
+
+    Returns:
+        AgregadoMontecarlo: Agregado del tramo
+    """
+    agregado = AgregadoMontecarlo(rangos, k)
+    for indice in range(*tramo):
+        metricas = simular_metricas(dispersion.muestra(indice))
+        agregado.agregar(indice, metricas, metricas["end_reason"])
+    return agregado
+
+
+def ejecutar_montecarlo(dispersion, muestras, trabajadores=None,
+                        tramos=TRAMOS, rangos=None, k=200, inicio=0):
+    """
+    Corre un estudio Monte Carlo en un pool de procesos.
+
+    Args:
+        dispersion (Dispersion): Parámetros inciertos
+        muestras (int): Cantidad de muestras
+        trabajadores (int): Procesos (ver barrido.ejecutar_barrido)
+        tramos (int): Tramos en que se dividen las muestras; con los
+            mismos tramos el resultado es idéntico para cualquier
+            cantidad de trabajadores
+        rangos (dict): Rangos de los histogramas (None =
+            rangos_por_defecto de la configuración nominal)
+        k (int): Precisión de los bosquejos de cuantiles
+        inicio (int): Índice de la primera muestra (para continuar un
+            estudio y combinar los agregados)
+
+    Returns:
+        AgregadoMontecarlo: Estadísticas de todas las muestras
+
+    Raises:
+        ValueError: Si muestras o tramos no son positivos
+    """
+    from barrido import ejecutar_barrido
+
+    if muestras < 1 or tramos < 1:
+        raise ValueError(f"muestras y tramos deben ser positivos "
+                         f"({muestras}, {tramos})")
+    if rangos is None:
+        rangos = rangos_por_defecto(dispersion.base)
+    tramos = min(tramos, muestras)
+    cortes = [inicio + muestras * i // tramos for i in range(tramos + 1)]
+    lista_tramos = list(zip(cortes[:-1], cortes[1:]))
+    parciales = ejecutar_barrido(
+        lista_tramos, trabajadores,
+        funcion=partial(correr_tramo, dispersion, rangos=rangos, k=k),
+        costos=[fin - primero for primero, fin in lista_tramos],
+    )
+    agregado = AgregadoMontecarlo(rangos, k)
+    for parcial in parciales:
+        agregado.combinar(parcial)
+    return agregado
@@ -0,0 +1,427 @@
+"""
+Evaluación multifidelidad de candidatos.
+
+Para ordenar candidatos (perfiles de guiado, grillas de parámetros) no
+hace falta simularlos todos con la fidelidad final: una corrida gruesa
+(dt de 1-2 s, sin historial, terminada por los eventos) ya separa los
+buenos de los malos. El recorrido es:
+
+1. Todos los candidatos se simulan con el primer nivel (el más barato)
+2. Se promueve la mejor fracción al nivel siguiente, con un dt más fino
+   o un integrador mejor, y así hasta el último nivel (por defecto la
+   configuración propia de cada candidato)
+3. El ranking final ordena por el nivel más alto alcanzado y, dentro de
+   él, por el objetivo
+
+Para validar la regla de promoción, una muestra de control (candidatos
+al azar, con semilla) se simula en todos los niveles: la correlación de
+rangos de Spearman entre cada nivel y el último, y qué parte de los
+mejores del último nivel habría promovido cada uno, dicen si el nivel
+grueso ordena bien. Por defecto la muestra es el 10% de los candidatos
+(al menos 8). Entre niveles consecutivos también se informa la
+correlación sobre los promovidos, que no cuesta corridas extra pero no
+valida la regla: los promovidos son solo la parte alta del ranking.
+
+El costo total queda dominado por los pocos candidatos que llegan arriba;
+el informe lo compara, con el modelo de costos.py, con simular a todos en
+el último nivel.
+
+Uso:
+    candidatos = candidatos_grilla(base, {"tiempo_guiado_4": [80, 90, 100],
+                                          "angulo_guiado_2": [0.3, 0.4]})
+    resultado = evaluar_multifidelidad(candidatos, objetivo="perigeo_km")
+    candidatos[resultado.mejor]
+    print(resultado.describir())
+"""
+
+import itertools
+import math
+import random
+import time
+from dataclasses import replace
+from typing import NamedTuple, Optional
+
+
+# Fracción de candidatos que pasa de un nivel al siguiente
+FRACCION_PROMOCION = 0.25
+
+# Muestra de control por defecto: esta fracción de los candidatos, con un
+# mínimo de CONTROL_MINIMO
+FRACCION_CONTROL = 0.1
+CONTROL_MINIMO = 8
+
+
+class Nivel(NamedTuple):
+    """
+    Fidelidad de una corrida.
+
+    Args:
+        metodo (str): Integrador (None = el del candidato)
+        dt (float): Paso (None = el del candidato)
+    """
+    metodo: Optional[str] = None
+    dt: Optional[float] = None
+
+    def aplicar(self, config):
+        """
+        Configuración del candidato con esta fidelidad.
+
+        Args:
+            config (ConfiguracionSimulacion): Candidato
+
+        Returns:
+            ConfiguracionSimulacion: El candidato con metodo y dt del nivel
+        """
+        cambios = {}
+        if self.metodo is not None:
+            cambios["metodo"] = self.metodo
+        if self.dt is not None:
+            cambios["dt"] = self.dt
+        return replace(config, **cambios) if cambios else config
+
+    def __str__(self):
+        if self.metodo is None and self.dt is None:
+            return "candidato"
+        return (f"{self.metodo or 'candidato'}, "
+                f"dt={'candidato' if self.dt is None else f'{self.dt:g}'}")
+
+
+# Niveles por defecto: simpléctico grueso, RK4 intermedio y la
+# configuración propia de cada candidato
+NIVELES = (Nivel("simplectico", 2.0), Nivel("rk4", 0.5), Nivel())
+
+
+def candidatos_grilla(base, valores):
+    """
+    Candidatos de una grilla (producto cartesiano de los valores).
+
+    Args:
+        base (ConfiguracionSimulacion): Configuración nominal
+        valores (dict): Parámetro (ver montecarlo.validar_parametro) ->
+            valores
+
+    Returns:
+        list: ConfiguracionSimulacion de cada punto, con el último
+            parámetro variando más rápido
+    """
+    from montecarlo import aplicar_perturbaciones, validar_parametro
+
+    for nombre in valores:
+        validar_parametro(base, nombre)
+    nombres = list(valores)
+    return [aplicar_perturbaciones(base, dict(zip(nombres, punto)))
+            for punto in itertools.product(*valores.values())]
+
+
+def rangos(valores):
+    """
+    Rangos (1 = menor) con el promedio para los empates.
+
+    Args:
+        valores (sequence): Números
+
+    Returns:
+        list: Rango de cada valor
+    """
+    orden = sorted(range(len(valores)), key=lambda i: valores[i])
+    resultado = [0.0] * len(valores)
+    i = 0
+    while i < len(orden):
+        j = i
+        while j + 1 < len(orden) and valores[orden[j + 1]] == valores[orden[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            resultado[orden[k]] = (i + j) / 2 + 1
+        i = j + 1
+    return resultado
+
+
+def correlacion_spearman(a, b):
+    """
+    Correlación de rangos de Spearman.
+
+    Args:
+        a (sequence): Valores
+        b (sequence): Valores pareados con a
+
+    Returns:
+        float: Correlación en [-1, 1] (nan con menos de 3 pares o si
+            alguno es constante)
+    """
+    if len(a) < 3:
+        return math.nan
+    ra = rangos(a)
+    rb = rangos(b)
+    media = (len(a) + 1) / 2
+    cov = sum((x - media) * (y - media) for x, y in zip(ra, rb))
+    var_a = sum((x - media) ** 2 for x in ra)
+    var_b = sum((y - media) ** 2 for y in rb)
+    if var_a == 0 or var_b == 0:
+        return math.nan
+    return cov / math.sqrt(var_a * var_b)
+
+
+class EtapaMultifidelidad(NamedTuple):
+    """
+    Un nivel del recorrido.
+
+    Args:
+        nivel (Nivel): Fidelidad
+        evaluados (dict): Índice del candidato -> objetivo (puntaje a
+            minimizar: el objetivo con signo cambiado si se maximiza)
+        promovidos (tuple): Índices que pasan al nivel siguiente
+        segundos (float): Tiempo de pared del nivel
+        costo_previsto (float): Segundos previstos por costos.py
+    """
+    nivel: Nivel
+    evaluados: dict
+    promovidos: tuple
+    segundos: float
+    costo_previsto: float
+
+
+class ResultadoMultifidelidad(NamedTuple):
+    """
+    Resultado de evaluar_multifidelidad.
+
+    Args:
+        objetivo (str): Descripción del objetivo
+        maximizar (bool): Si el objetivo se maximiza
+        etapas (list): EtapaMultifidelidad de cada nivel
+        ranking (list): Índices de los candidatos, del mejor al peor
+        control (tuple): Índices de la muestra de control
+        validacion (list): Por nivel (salvo el último): dict con
+            spearman_control, acierto_control y spearman_promovidos
+        costo_todos_ultimo (float): Segundos previstos de simular todos
+            los candidatos en el último nivel
+    """
+    objetivo: str
+    maximizar: bool
+    etapas: list
+    ranking: list
+    control: tuple
+    validacion: list
+    costo_todos_ultimo: float
+
+    @property
+    def mejor(self):
+        """Índice del mejor candidato."""
+        return self.ranking[0]
+
+    def valor(self, indice):
+        """
+        Objetivo de un candidato en el nivel más alto que alcanzó.
+
+        Args:
+            indice (int): Índice del candidato
+
+        Returns:
+            float: Objetivo (con su signo original)
+        """
+        for etapa in reversed(self.etapas):
+            if indice in etapa.evaluados:
+                puntaje = etapa.evaluados[indice]
+                return -puntaje if self.maximizar else puntaje
+        raise KeyError(indice)
+
+    def informe(self):
+        """
+        Resultado serializable a JSON.
+
+        Returns:
+            dict: objetivo, mejor, ranking (primeros 20 con su valor),
+                etapas, validación y costos
+        """
+        return {
+            "objetivo": self.objetivo,
+            "maximizar": self.maximizar,
+            "mejor": self.mejor,
+            "ranking": [{"indice": i, "valor": self.valor(i)}
+                        for i in self.ranking[:20]],
+            "etapas": [{
+                "nivel": str(etapa.nivel),
+                "evaluados": len(etapa.evaluados),
+                "promovidos": len(etapa.promovidos),
+                "segundos": etapa.segundos,
+                "costo_previsto_s": etapa.costo_previsto,
+            } for etapa in self.etapas],
+            "control": list(self.control),
+            "validacion": self.validacion,
+            "costo_previsto_s": sum(e.costo_previsto for e in self.etapas),
+            "costo_todos_ultimo_s": self.costo_todos_ultimo,
+        }
+
+    def describir(self):
+        """
+        Resumen legible del recorrido.
+
+        Returns:
+            str: Etapas, validación de la promoción y mejores candidatos
+        """
+        sentido = "máximo" if self.maximizar else "mínimo"
+        lineas = [f"Objetivo: {self.objetivo} ({sentido})", "",
+                  f"{'nivel':>24s} {'evaluados':>10s} {'promovidos':>11s} "
+                  f"{'tiempo (s)':>11s} {'previsto (s)':>13s}"]
+        for etapa in self.etapas:
+            lineas.append(f"{str(etapa.nivel):>24s} {len(etapa.evaluados):10d} "
+                          f"{len(etapa.promovidos):11d} {etapa.segundos:11.2f} "
+                          f"{etapa.costo_previsto:13.2f}")
+        previsto = sum(etapa.costo_previsto for etapa in self.etapas)
+        lineas.append(f"Costo previsto {previsto:.2f} s contra "
+                      f"{self.costo_todos_ultimo:.2f} s de simular todos en "
+                      f"el último nivel")
+        if self.validacion and not self.control:
+            lineas.append("")
+            lineas.append("Sin validación de la promoción: no hubo "
+                          "candidatos de control, y la correlación")
+            lineas.append("sobre los promovidos (la parte alta del "
+                          "ranking) no valida la regla:")
+            for etapa, datos in zip(self.etapas, self.validacion):
+                lineas.append(f"  {str(etapa.nivel):>24s}: con el siguiente "
+                              f"(promovidos) "
+                              f"{_correlacion(datos['spearman_promovidos'])}")
+        elif self.validacion:
+            lineas.append("")
+            lineas.append(f"Validación de la promoción ({len(self.control)} "
+                          f"candidatos de control):")
+            for etapa, datos in zip(self.etapas, self.validacion):
+                lineas.append(
+                    f"  {str(etapa.nivel):>24s}: Spearman con el último "
+                    f"{_correlacion(datos['spearman_control'])}, acierto "
+                    f"{datos['acierto_control']:.0%}; con el siguiente "
+                    f"(promovidos) "
+                    f"{_correlacion(datos['spearman_promovidos'])}"
+                )
+        lineas.append("")
+        lineas.append("Mejores candidatos:")
+        for indice in self.ranking[:5]:
+            lineas.append(f"  #{indice:<6d} {self.valor(indice):.6g}")
+        return "\n".join(lineas)
+
+
+def _correlacion(valor):
+    """Correlación con signo, o una raya si no está definida."""
+    return "—" if math.isnan(valor) else f"{valor:+.3f}"
+
+
+def _puntaje(metricas, objetivo, maximizar):
+    """Objetivo a minimizar de una corrida; lo no finito va al final."""
+    valor = objetivo(metricas) if callable(objetivo) else metricas[objetivo]
+    if not math.isfinite(valor):
+        return math.inf
+    return -valor if maximizar else valor
+
+
+def evaluar_multifidelidad(candidatos, objetivo="perigeo_km", maximizar=True,
+                           niveles=NIVELES, fraccion=FRACCION_PROMOCION,
+                           minimo=1, control=None, semilla=0,
+                           trabajadores=None):
+    """
+    Ordena candidatos simulándolos con fidelidad creciente.
+
+    Args:
+        candidatos (list): ConfiguracionSimulacion de cada candidato
+        objetivo (str | callable): Métrica de montecarlo.simular_metricas
+            o función de ese dict que devuelve un número
+        maximizar (bool): Si el objetivo se maximiza
+        niveles (sequence): Nivel de cada etapa, del más barato al final
+        fraccion (float): Fracción de los evaluados que se promueve
+        minimo (int): Mínimo de promovidos por nivel
+        control (int): Candidatos al azar que se simulan en todos los
+            niveles para validar la promoción (None = FRACCION_CONTROL
+            de los candidatos, al menos CONTROL_MINIMO; 0 = sin
+            validación)
+        semilla (int): Semilla de la muestra de control
+        trabajadores (int): Procesos (ver barrido.ejecutar_barrido)
+
+    Returns:
+        ResultadoMultifidelidad: Etapas, ranking y validación
+
+    Raises:
+        ValueError: Si no hay candidatos o niveles, o la fracción no
+            está en (0, 1]
+    """
+    from barrido import ejecutar_barrido
+    from costos import modelo_por_defecto
+    from montecarlo import REGISTRO_MUESTRA, simular_metricas
+
+    if not candidatos:
+        raise ValueError("No hay candidatos")
+    if not niveles:
+        raise ValueError("Se necesita al menos un nivel")
+    if not 0 < fraccion <= 1:
+        raise ValueError(f"La fracción de promoción debe estar en (0, 1]: "
+                         f"{fraccion}")
+    niveles = [Nivel(*nivel) for nivel in niveles]
+    modelo = modelo_por_defecto()
+
+    def costo(configs):
+        return sum(modelo.estimar(c, presupuesto_memoria=REGISTRO_MUESTRA)
+                   .segundos for c in configs)
+
+    if control is None:
+        control = max(CONTROL_MINIMO,
+                      math.ceil(FRACCION_CONTROL * len(candidatos)))
+    control = tuple(sorted(random.Random(f"multifidelidad:{semilla}").sample(
+        range(len(candidatos)), min(control, len(candidatos))
+    )))
+    etapas = []
+    activos = list(range(len(candidatos)))
+    for k, nivel in enumerate(niveles):
+        indices = sorted(set(activos) | set(control))
+        configs = [nivel.aplicar(candidatos[i]) for i in indices]
+        inicio = time.perf_counter()
+        resultados = ejecutar_barrido(configs, trabajadores,
+                                      funcion=simular_metricas)
+        segundos = time.perf_counter() - inicio
+        evaluados = {i: _puntaje(metricas, objetivo, maximizar)
+                     for i, metricas in zip(indices, resultados)}
+        ordenados = sorted(activos, key=lambda i: (evaluados[i], i))
+        if k + 1 < len(niveles):
+            cantidad = max(minimo, math.ceil(fraccion * len(ordenados)))
+            promovidos = tuple(ordenados[:cantidad])
+        else:
+            promovidos = ()
+        etapas.append(EtapaMultifidelidad(nivel, evaluados, promovidos,
+                                          segundos, costo(configs)))
+        activos = list(promovidos)
+
+    # Ranking: primero los que llegaron más alto
+    ranking = []
+    vistos = set()
+    for etapa in reversed(etapas):
+        for i in sorted(etapa.evaluados, key=lambda i: (etapa.evaluados[i], i)):
+            if i not in vistos:
+                vistos.add(i)
+                ranking.append(i)
+
+    validacion = []
+    final = etapas[-1].evaluados
+    for etapa, siguiente in zip(etapas, etapas[1:]):
+        datos = {"spearman_control": math.nan, "acierto_control": math.nan}
+        if control:
+            grueso = [etapa.evaluados[i] for i in control]
+            fino = [final[i] for i in control]
+            datos["spearman_control"] = correlacion_spearman(grueso, fino)
+            mejores = max(1, math.ceil(fraccion * len(control)))
+            por_fino = set(sorted(control, key=lambda i: (final[i], i))[:mejores])
+            por_grueso = set(sorted(control, key=lambda i: (
+                etapa.evaluados[i], i))[:mejores])
+            datos["acierto_control"] = len(por_fino & por_grueso) / mejores
+        comunes = etapa.promovidos
+        datos["spearman_promovidos"] = correlacion_spearman(
+            [etapa.evaluados[i] for i in comunes],
+            [siguiente.evaluados[i] for i in comunes],
+        )
+        validacion.append(datos)
+
+    return ResultadoMultifidelidad(
+        objetivo=objetivo if isinstance(objetivo, str)
+        else getattr(objetivo, "__name__", repr(objetivo)),
+        maximizar=maximizar,
+        etapas=etapas,
+        ranking=ranking,
+        control=control,
+        validacion=validacion,
+        costo_todos_ultimo=costo([niveles[-1].aplicar(c) for c in candidatos]),
+    )
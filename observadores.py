@@ -0,0 +1,283 @@
+"""
+Observadores para seguir una simulación mientras corre.
+
+Un observador es una función que Cohete.simular llama periódicamente:
+- cada N pasos (cada_pasos)
+- cada T segundos de tiempo simulado (cada_t)
+- cada T segundos de tiempo de pared (cada_segundos)
+
+Recibe una VistaEstado (tupla inmutable con el estado actual) y, si se
+pide, un Fragmento con las muestras nuevas desde la llamada anterior.
+Si la función devuelve True, la simulación se cancela (end_reason
+"cancelled").
+
+El costo está acotado de dos formas:
+- El bucle de simular solo compara el paso actual con el próximo paso
+  de consulta; las vistas y fragmentos se arman solo al notificar
+- Cada observador tiene una fracción máxima del tiempo de pared
+  (fraccion_max): si sus llamadas ya consumieron más que esa fracción
+  del tiempo transcurrido, se posterga hasta que vuelva a estar dentro
+  del presupuesto
+
+Uso (por ejemplo en satelite.ipynb):
+    def mostrar(vista):
+        print(f"t = {vista.t:.0f} s, h = {vista.altura_m / 1000:.1f} km")
+
+    cohete.observar(mostrar, cada_segundos=1.0)
+    cohete.simular()
+"""
+
+import math
+import time
+from typing import NamedTuple, Tuple
+
+
+# Pasos entre consultas del reloj de pared para observadores cada_segundos
+PASOS_SONDEO = 256
+
+
+class VistaEstado(NamedTuple):
+    """Estado de la simulación en el momento de la notificación."""
+    iteracion: int
+    t: float
+    r: float
+    q: float
+    theta: float
+    gamma: float
+    masa: float
+    beta: float
+    m_dot: float
+    altura_m: float
+    tiempo_pared_s: float
+    final: bool
+
+
+class Fragmento(NamedTuple):
+    """Muestras registradas desde la notificación anterior."""
+    inicio: int
+    dt: float
+    r: Tuple[float, ...]
+    q: Tuple[float, ...]
+    theta: Tuple[float, ...]
+    gamma: Tuple[float, ...]
+    masa: Tuple[float, ...]
+    beta: Tuple[float, ...]
+
+    def tiempos(self):
+        """
+        Tiempos de las muestras del fragmento.
+
+        Returns:
+            list: Tiempo de cada muestra (s)
+        """
+        return [(self.inicio + k) * self.dt for k in range(len(self.r))]
+
+
+class Observador:
+    """
+    Función observadora con su criterio de disparo y su presupuesto.
+
+    Args:
+        funcion (callable): funcion(vista) o funcion(vista, fragmento) si
+            fragmentos es True; si devuelve True se cancela la simulación
+        cada_pasos (int): Disparar cada N pasos
+        cada_t (float): Disparar cada T segundos de tiempo simulado
+        cada_segundos (float): Disparar cada T segundos de tiempo de pared
+        fragmentos (bool): Pasar también las muestras nuevas
+        fraccion_max (float): Fracción máxima del tiempo de pared que
+            pueden consumir las llamadas (None = sin límite)
+        al_final (bool): Notificar una última vez al terminar
+
+    Raises:
+        ValueError: Si no se indica ningún criterio de disparo
+    """
+
+    def __init__(self, funcion, cada_pasos=None, cada_t=None,
+                 cada_segundos=None, fragmentos=False, fraccion_max=0.05,
+                 al_final=True):
+        if cada_pasos is None and cada_t is None and cada_segundos is None:
+            raise ValueError(
+                "Indicar cada_pasos, cada_t o cada_segundos"
+            )
+        for nombre, valor in (("cada_pasos", cada_pasos), ("cada_t", cada_t),
+                              ("cada_segundos", cada_segundos)):
+            if valor is not None and valor <= 0:
+                raise ValueError(f"{nombre} debe ser positivo ({valor})")
+        self.funcion = funcion
+        self.cada_pasos = cada_pasos
+        self.cada_t = cada_t
+        self.cada_segundos = cada_segundos
+        self.fragmentos = fragmentos
+        self.fraccion_max = fraccion_max
+        self.al_final = al_final
+
+        # Estadísticas de la última simulación
+        self.llamadas = 0
+        self.postergadas = 0
+        self.costo_s = 0.0
+
+    def _intervalo_sondeo(self, dt):
+        """Pasos entre consultas de este observador."""
+        intervalos = []
+        if self.cada_pasos is not None:
+            intervalos.append(int(self.cada_pasos))
+        if self.cada_t is not None:
+            intervalos.append(max(1, math.ceil(self.cada_t / dt - 1e-9)))
+        if self.cada_segundos is not None:
+            intervalos.append(PASOS_SONDEO)
+        return max(1, min(intervalos))
+
+
+class GestorObservadores:
+    """
+    Decide cuándo notificar a los observadores durante una simulación.
+
+    simular consulta `proximo` (paso de la próxima consulta) en cada
+    paso y solo llama a notificar() cuando lo alcanza.
+
+    Args:
+        observadores (sequence): Observadores registrados
+        dt (float): Paso de tiempo (s)
+        i_0 (int): Índice de la última muestra registrada antes de simular
+        cada (int): Pasos por muestra de los historiales (los fragmentos
+            de un historial diezmado tienen muestras cada cada·dt)
+    """
+
+    def __init__(self, observadores, dt, i_0=0, cada=1):
+        self.observadores = tuple(observadores)
+        self.dt = dt
+        self.cada = cada
+        self.inicio = time.perf_counter()
+        self._estado = {}
+        for obs in self.observadores:
+            obs.llamadas = 0
+            obs.postergadas = 0
+            obs.costo_s = 0.0
+            self._estado[id(obs)] = {
+                "intervalo": obs._intervalo_sondeo(dt),
+                "proximo": obs._intervalo_sondeo(dt),
+                "ultimo_paso": 0,
+                "ultimo_t": 0.0,
+                "ultimo_reloj": self.inicio,
+                "ultimo_indice": i_0 + 1,
+            }
+        self.proximo = self._calcular_proximo()
+
+    def _calcular_proximo(self):
+        if not self._estado:
+            return math.inf
+        return min(e["proximo"] for e in self._estado.values())
+
+    def notificar(self, cohete, i, t):
+        """
+        Notifica a los observadores que corresponden al paso i.
+
+        Args:
+            cohete (Cohete): Cohete simulado
+            i (int): Paso actual (contado desde el inicio de simular)
+            t (float): Tiempo simulado (s)
+
+        Returns:
+            bool: True si algún observador pidió cancelar
+        """
+        ahora = time.perf_counter()
+        cancelar = False
+        vista = None
+        for obs in self.observadores:
+            estado = self._estado[id(obs)]
+            if i < estado["proximo"]:
+                continue
+            estado["proximo"] = i + estado["intervalo"]
+            if not self._corresponde(obs, estado, i, t, ahora):
+                continue
+            transcurrido = ahora - self.inicio
+            if (obs.fraccion_max is not None and
+                    obs.costo_s > obs.fraccion_max * transcurrido):
+                # Fuera de presupuesto: saltar los pasos que, al ritmo
+                # actual, faltan para volver a estar dentro de él
+                obs.postergadas += 1
+                faltante = obs.costo_s / obs.fraccion_max - transcurrido
+                pasos = math.ceil(faltante * i / transcurrido)
+                estado["proximo"] = i + max(estado["intervalo"], pasos)
+                continue
+            if vista is None:
+                vista = self._vista(cohete, i, t, ahora, final=False)
+            cancelar = self._llamar(obs, estado, cohete, vista, i, t) or cancelar
+            ahora = time.perf_counter()
+        self.proximo = self._calcular_proximo()
+        return cancelar
+
+    def finalizar(self, cohete, i, t):
+        """
+        Última notificación (sin límite de presupuesto) al terminar.
+
+        Se omite para los observadores ya notificados en el último paso.
+
+        Args:
+            cohete (Cohete): Cohete simulado
+            i (int): Último paso
+            t (float): Tiempo final (s)
+        """
+        ahora = time.perf_counter()
+        vista = self._vista(cohete, i, t, ahora, final=True)
+        for obs in self.observadores:
+            estado = self._estado[id(obs)]
+            # Si ya se lo notificó en este paso no hay nada nuevo
+            if obs.al_final and (estado["ultimo_paso"] != i or i == 0):
+                self._llamar(obs, estado, cohete, vista, i, t)
+
+    def _corresponde(self, obs, estado, i, t, ahora):
+        if (obs.cada_pasos is not None and
+                i - estado["ultimo_paso"] >= obs.cada_pasos):
+            return True
+        if (obs.cada_t is not None and
+                t - estado["ultimo_t"] >= obs.cada_t - 1e-9 * obs.cada_t):
+            return True
+        if (obs.cada_segundos is not None and
+                ahora - estado["ultimo_reloj"] >= obs.cada_segundos):
+            return True
+        return False
+
+    def _llamar(self, obs, estado, cohete, vista, i, t):
+        inicio = time.perf_counter()
+        if obs.fragmentos:
+            resultado = obs.funcion(vista, self._fragmento(cohete, estado))
+        else:
+            resultado = obs.funcion(vista)
+        fin = time.perf_counter()
+        obs.costo_s += fin - inicio
+        obs.llamadas += 1
+        estado["ultimo_paso"] = i
+        estado["ultimo_t"] = t
+        estado["ultimo_reloj"] = fin
+        return resultado is True
+
+    def _fragmento(self, cohete, estado):
+        desde = estado["ultimo_indice"]
+        estado["ultimo_indice"] = len(cohete.r_hist)
+        return Fragmento(
+            inicio=desde,
+            dt=self.dt * self.cada,
+            r=tuple(cohete.r_hist[desde:]),
+            q=tuple(cohete.q_hist[desde:]),
+            theta=tuple(cohete.theta_hist[desde:]),
+            gamma=tuple(cohete.gamma_hist[desde:]),
+            masa=tuple(cohete.masa_hist[desde:]),
+            beta=tuple(cohete.beta_hist[desde:]),
+        )
+
+    def _vista(self, cohete, i, t, ahora, final):
+        return VistaEstado(
+            iteracion=i,
+            t=t,
+            r=cohete.r,
+            q=cohete.q,
+            theta=cohete.theta,
+            gamma=cohete.gamma,
+            masa=cohete.masa,
+            beta=cohete.beta,
+            m_dot=cohete.m_dot,
+            altura_m=max(0.0, cohete.r - cohete.config.r_e),
+            tiempo_pared_s=ahora - self.inicio,
+            final=final,
+        )
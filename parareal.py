@@ -0,0 +1,414 @@
+"""
+Integración paralela en el tiempo (Parareal).
+
+Una trayectoria larga (vida orbital, propagaciones de varios días) no
+puede repartirse entre núcleos con ejecutar_barrido, porque cada paso
+depende del anterior. Parareal parte el intervalo en tramos y alterna:
+
+1. Un propagador grueso G (RK4 con pasos grandes) recorre los tramos en
+   serie y da un estado aproximado al inicio de cada uno
+2. El propagador fino F (el integrador y el dt de la configuración)
+   refina todos los tramos a la vez, cada uno en un proceso
+3. La corrección U[n+1] = F(U[n] viejo) + G(U[n] nuevo) - G(U[n] viejo)
+   se aplica en serie, con el grueso, y se repite hasta que los bordes
+   de los tramos dejan de moverse
+
+Tras k iteraciones los primeros k tramos son exactos, así que con tantas
+iteraciones como tramos se obtiene la corrida serie; la ganancia viene de
+converger en pocas. Los tramos finos recorren la misma grilla de ticks
+que Cohete.simular (con los quiebres y los mismos criterios de parada),
+por lo que un tramo exacto coincide bit a bit con la corrida serie.
+
+Si una corrida fina choca con la Tierra (o da valores inválidos), la
+trayectoria termina ahí en cuanto los tramos anteriores convergen.
+
+La aceleración que informa el resultado es una estimación: el tiempo
+serie se estima sumando el tiempo de CPU de los tramos finos de la
+primera iteración, que no crece si hay más procesos que núcleos. La
+aceleración medida contra una corrida serie real la da
+run.py parareal --verificar.
+
+Uso:
+    resultado = simular_parareal(replace(config, t_max=200_000), tramos=16)
+    print(resultado.describir())
+"""
+
+import math
+import time
+from typing import NamedTuple
+
+from dinamica import IDX_MASA, IDX_R, IDX_THETA
+
+
+# Integrador y paso del propagador grueso
+METODO_GRUESO = "rk4"
+DT_GRUESO = 10.0
+
+# Cambio máximo de posición en los bordes de los tramos entre dos
+# iteraciones para dar por convergida la corrida (m)
+TOLERANCIA = 0.01
+
+
+class Propagacion(NamedTuple):
+    """
+    Resultado de propagar un tramo.
+
+    Args:
+        estado (tuple): Estado al final del tramo (o donde paró)
+        end_reason (str): "t_max" si llegó al final del tramo,
+            "hit_ground" o "numerical_error"
+        t_final (float): Tiempo donde terminó (s)
+        segundos (float): Tiempo de CPU de la propagación (no crece si
+            el proceso comparte el núcleo con otros)
+    """
+    estado: tuple
+    end_reason: str
+    t_final: float
+    segundos: float
+
+
+class TramoFino(NamedTuple):
+    """
+    Trabajo enviado a un proceso: un tramo del propagador fino.
+
+    Args:
+        config (ConfiguracionSimulacion): Configuración (metodo y dt
+            definen el propagador fino)
+        estado (tuple): Estado al inicio del tramo
+        tick_inicio (int): Primer tick del tramo (t = tick·dt)
+        pasos (int): Pasos de la grilla fina del tramo
+    """
+    config: object
+    estado: tuple
+    tick_inicio: int
+    pasos: int
+
+
+def propagar(config, estado, tick_inicio, pasos, dt, metodo, origen=0.0):
+    """
+    Avanza un estado por una grilla uniforme, como Cohete.simular.
+
+    Los pasos van de origen + (tick_inicio + i - 1)·dt a
+    origen + (tick_inicio + i)·dt, partidos en los quiebres si
+    config.respetar_quiebres.
+
+    Args:
+        config (ConfiguracionSimulacion): Configuración
+        estado (tuple): Estado (r, q, theta, gamma, masa) al inicio
+        tick_inicio (int): Tick del inicio
+        pasos (int): Cantidad de pasos
+        dt (float): Paso (s)
+        metodo (str): Integrador (ver integradores.INTEGRADORES)
+        origen (float): Tiempo del tick 0 (s)
+
+    Returns:
+        Propagacion: Estado final, motivo de fin y tiempos
+    """
+    from integradores import crear_integrador
+    from planificador import (
+        CalendarioQuiebres, paso_con_quiebres, puntos_de_quiebre
+    )
+
+    inicio = time.process_time()
+    params = config.parametros_dinamica()
+    opciones = {}
+    if config.rtol is not None:
+        opciones["rtol"] = config.rtol
+    if config.atol is not None:
+        opciones["atol"] = config.atol
+    integrador = crear_integrador(metodo, **opciones)
+    if config.respetar_quiebres:
+        quiebres = puntos_de_quiebre(origen + tick_inicio * dt,
+                                     origen + (tick_inicio + pasos) * dt,
+                                     params)
+    else:
+        quiebres = ()
+    calendario = CalendarioQuiebres(quiebres, dt)
+
+    y = tuple(estado)
+    masa_cohete = params.masa_cohete
+    end_reason = "t_max"
+    t = origen + tick_inicio * dt
+    for i in range(1, pasos + 1):
+        if y[IDX_MASA] <= masa_cohete:
+            y = y[:IDX_MASA] + (masa_cohete,) + y[IDX_MASA + 1:]
+        t_a = origen + (tick_inicio + i - 1) * dt
+        cercanos = calendario.cercanos(t_a, dt)
+        if cercanos:
+            y, _ = paso_con_quiebres(integrador, t_a, dt, y, params, cercanos)
+        else:
+            y, _ = integrador.paso(t_a, y, dt, params)
+        t = origen + (tick_inicio + i) * dt
+        if y[IDX_R] <= params.r_e:
+            end_reason = "hit_ground"
+            break
+        if not all(math.isfinite(v) for v in y[:IDX_MASA]):
+            end_reason = "numerical_error"
+            break
+    return Propagacion(y, end_reason, t, time.process_time() - inicio)
+
+
+def propagar_fino(tramo):
+    """
+    Propaga un tramo con el integrador y el dt de su configuración.
+
+    Es una función de módulo para que los procesos trabajadores puedan
+    recibirla por pickle.
+
+    Args:
+        tramo (TramoFino): Tramo a propagar
+
+    Returns:
+        Propagacion: Resultado del tramo
+    """
+    config = tramo.config
+    return propagar(config, tramo.estado, tramo.tick_inicio, tramo.pasos,
+                    config.dt, config.metodo)
+
+
+def distancia(a, b):
+    """
+    Distancia entre las posiciones de dos estados.
+
+    Args:
+        a (tuple): Estado (r, q, theta, gamma, masa)
+        b (tuple): Estado
+
+    Returns:
+        float: Distancia aproximada (m): radial y a lo largo de la órbita
+    """
+    r = 0.5 * (a[IDX_R] + b[IDX_R])
+    return math.hypot(a[IDX_R] - b[IDX_R], r * (a[IDX_THETA] - b[IDX_THETA]))
+
+
+def estado_inicial(config):
+    """
+    Estado inicial de una configuración.
+
+    Args:
+        config (ConfiguracionSimulacion): Configuración
+
+    Returns:
+        tuple: (r, q, theta, gamma, masa) como en Cohete.desde_configuracion
+    """
+    return (config.r_0, config.q_0, config.theta_0, config.gamma_0,
+            config.masa_cohete + config.masa_fuel)
+
+
+class ResultadoParareal(NamedTuple):
+    """
+    Resultado de simular_parareal.
+
+    Args:
+        estado (tuple): Estado final
+        end_reason (str): Motivo de fin (como en Cohete.simular)
+        t_final (float): Tiempo final (s)
+        iteraciones (int): Iteraciones de Parareal
+        tramos (int): Cantidad de tramos
+        convergido (bool): Si los bordes convergieron a la tolerancia
+        cambios (tuple): Cambio máximo de los bordes en cada iteración (m)
+        corridas_finas (int): Tramos finos propagados en total
+        segundos (float): Tiempo de pared
+        segundos_serie (float): Estimación del tiempo de la corrida
+            serie: suma del tiempo de CPU de los tramos finos de la
+            primera iteración
+    """
+    estado: tuple
+    end_reason: str
+    t_final: float
+    iteraciones: int
+    tramos: int
+    convergido: bool
+    cambios: tuple
+    corridas_finas: int
+    segundos: float
+    segundos_serie: float
+
+    @property
+    def aceleracion_estimada(self):
+        """Tiempo serie estimado sobre tiempo de pared."""
+        return self.segundos_serie / self.segundos if self.segundos else math.nan
+
+    def informe(self):
+        """
+        Resultado serializable a JSON.
+
+        Returns:
+            dict: Estado, fin, iteraciones, cambios y tiempos
+        """
+        return {
+            "estado": list(self.estado),
+            "end_reason": self.end_reason,
+            "t_final": self.t_final,
+            "iteraciones": self.iteraciones,
+            "tramos": self.tramos,
+            "convergido": self.convergido,
+            "cambios_m": list(self.cambios),
+            "corridas_finas": self.corridas_finas,
+            "segundos": self.segundos,
+            "segundos_serie_estimado": self.segundos_serie,
+            "aceleracion_estimada": self.aceleracion_estimada,
+        }
+
+    def describir(self):
+        """
+        Resumen legible de la corrida.
+
+        Returns:
+            str: Convergencia, tiempos y estado final
+        """
+        estado = "convergió" if self.convergido else "no convergió"
+        lineas = [
+            f"Parareal: {self.tramos} tramos, {self.iteraciones} "
+            f"iteraciones ({estado}), {self.corridas_finas} tramos finos"
+        ]
+        if self.cambios:
+            lineas.append("Cambio máximo de los bordes por iteración: "
+                          + ", ".join(f"{cambio:.3g} m"
+                                      for cambio in self.cambios))
+        lineas += [
+            f"Tiempo {self.segundos:.2f} s, serie estimado "
+            f"{self.segundos_serie:.2f} s (aceleración estimada "
+            f"{self.aceleracion_estimada:.2f}x)",
+            f"Fin: {self.end_reason} en t = {self.t_final:.1f} s, "
+            f"r = {self.estado[IDX_R] / 1000:.3f} km",
+        ]
+        return "\n".join(lineas)
+
+
+def simular_parareal(config, tramos=None, metodo_grueso=METODO_GRUESO,
+                     dt_grueso=DT_GRUESO, tolerancia=TOLERANCIA,
+                     iteraciones=None, trabajadores=None):
+    """
+    Simula una configuración repartiendo el tiempo entre procesos.
+
+    Args:
+        config (ConfiguracionSimulacion): Configuración (metodo, dt y
+            t_max definen la corrida fina)
+        tramos (int): Cantidad de tramos (None = uno por trabajador)
+        metodo_grueso (str): Integrador del propagador grueso
+        dt_grueso (float): Paso del propagador grueso (s); se ajusta para
+            que cada tramo tenga un número entero de pasos
+        tolerancia (float): Cambio máximo de posición de los bordes para
+            dar la corrida por convergida (m)
+        iteraciones (int): Máximo de iteraciones (None = tramos, que da
+            la corrida serie exacta)
+        trabajadores (int): Procesos (ver barrido.ejecutar_barrido)
+
+    Returns:
+        ResultadoParareal: Estado final, iteraciones y tiempos
+
+    Raises:
+        ValueError: Si el integrador es de scipy o los argumentos no son
+            válidos
+    """
+    from barrido import ejecutar_barrido, trabajadores_disponibles
+    from integracion_scipy import es_metodo_scipy
+
+    if es_metodo_scipy(config.metodo) or es_metodo_scipy(metodo_grueso):
+        raise ValueError("Parareal necesita integradores propios, no de scipy")
+    if trabajadores is None:
+        trabajadores = trabajadores_disponibles()
+    if tramos is None:
+        tramos = trabajadores
+    if tramos < 1:
+        raise ValueError(f"Se necesita al menos un tramo: {tramos}")
+    if dt_grueso <= 0 or tolerancia <= 0:
+        raise ValueError(f"dt_grueso y tolerancia deben ser positivos "
+                         f"({dt_grueso}, {tolerancia})")
+    if iteraciones is None:
+        iteraciones = tramos
+
+    inicio = time.perf_counter()
+    dt = config.dt
+    pasos_totales = max(1, int(config.t_max / dt))
+    tramos = min(tramos, pasos_totales)
+    bordes = [pasos_totales * n // tramos for n in range(tramos + 1)]
+
+    def grueso(n, estado):
+        duracion = (bordes[n + 1] - bordes[n]) * dt
+        pasos = max(1, round(duracion / dt_grueso))
+        return propagar(config, estado, 0, pasos, duracion / pasos,
+                        metodo_grueso, origen=bordes[n] * dt)
+
+    def corregir(u, g_viejo, finos, desde):
+        """Barrido serie de la corrección; devuelve U y G nuevos."""
+        u_nuevo = list(u[:desde + 1])
+        g_nuevo = list(g_viejo[:desde])
+        for n in range(desde, tramos):
+            g = grueso(n, u_nuevo[n])
+            g_nuevo.append(g)
+            u_nuevo.append(tuple(
+                f + (a - b) for f, a, b in zip(finos[n].estado, g.estado,
+                                               g_viejo[n].estado)
+            ))
+        return u_nuevo, g_nuevo
+
+    # Barrido grueso inicial
+    u = [estado_inicial(config)]
+    g = []
+    for n in range(tramos):
+        g.append(grueso(n, u[n]))
+        u.append(g[-1].estado)
+
+    finos = [None] * tramos
+    cambios = []
+    corridas = 0
+    segundos_serie = 0.0
+    convergido = False
+    exactos = 0
+    k = 0
+    fin = None
+    while k < iteraciones:
+        k += 1
+        pendientes = list(range(exactos, tramos))
+        resultados = ejecutar_barrido(
+            [TramoFino(config, u[n], bordes[n], bordes[n + 1] - bordes[n])
+             for n in pendientes],
+            trabajadores, funcion=propagar_fino, tamano_lote=1,
+        )
+        corridas += len(pendientes)
+        for n, resultado in zip(pendientes, resultados):
+            finos[n] = resultado
+        if k == 1:
+            segundos_serie = sum(f.segundos for f in finos)
+
+        # El primer tramo pendiente partió de un estado exacto
+        primero = exactos
+        exactos += 1
+        fin = next((n for n in range(exactos)
+                    if finos[n].end_reason != "t_max"), None)
+        if fin is not None or exactos == tramos:
+            convergido = True
+            break
+
+        u_nuevo, g = corregir(u, g, finos, primero)
+        cambio = max(distancia(a, b) for a, b in zip(u_nuevo, u))
+        cambios.append(cambio)
+        u = u_nuevo
+        if cambio < tolerancia:
+            convergido = True
+            break
+
+    if fin is None:
+        fin = next((n for n in range(tramos)
+                    if finos[n].end_reason != "t_max"), None)
+    if fin is not None:
+        estado, end_reason, t_final = finos[fin][:3]
+    elif exactos == tramos:
+        estado, end_reason, t_final = finos[-1][:3]
+    else:
+        estado, end_reason, t_final = u[-1], "t_max", pasos_totales * dt
+    return ResultadoParareal(
+        estado=tuple(estado),
+        end_reason=end_reason,
+        t_final=t_final,
+        iteraciones=k,
+        tramos=tramos,
+        convergido=convergido,
+        cambios=tuple(cambios),
+        corridas_finas=corridas,
+        segundos=time.perf_counter() - inicio,
+        segundos_serie=segundos_serie,
+    )
+
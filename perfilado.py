@@ -0,0 +1,197 @@
+"""
+Perfilado por componente de una simulación.
+
+Perfilador acumula tiempos y contadores de los componentes del camino
+crítico de Cohete.simular:
+- atmosfera: calcular_densidad_aire
+- guiado: calcular_beta_tiempo / calcular_beta_altura
+- mdot: calcular_mdot
+- fuerzas: evaluación fusionada de empuje, arrastre y gravedad
+- integrador: cada paso del método de integración
+- quiebres: consulta del calendario de quiebres
+- registro: copia del estado a los historiales
+- eventos: criterios de parada
+
+Los tiempos son inclusivos por componente (integrador incluye fuerzas,
+que incluye atmosfera) y además se guardan por pila de llamadas con su
+tiempo propio, de modo que el volcado es compatible con flamegraph.pl y
+speedscope (formato "a;b;c <microsegundos>").
+
+El perfilado es opcional: sin Perfilador, simular no instrumenta nada.
+Mientras está activo, las funciones de dinamica.py e integradores.py se
+reemplazan por versiones cronometradas, así que no conviene perfilar
+varias simulaciones en hilos a la vez.
+"""
+
+import importlib
+import json
+import time
+from contextlib import contextmanager
+
+
+# (componente, módulo, función) que se cronometran reemplazando la
+# referencia global del módulo durante la simulación
+PUNTOS_INSTRUMENTADOS = (
+    ("atmosfera", "dinamica", "calcular_densidad_aire"),
+    ("guiado", "dinamica", "calcular_beta_tiempo"),
+    ("guiado", "dinamica", "calcular_beta_altura"),
+    ("mdot", "dinamica", "calcular_mdot"),
+    ("fuerzas", "dinamica", "aceleraciones_con_empuje"),
+    ("fuerzas", "integradores", "aceleraciones_con_empuje"),
+)
+
+
+class Perfilador:
+    """
+    Temporizadores acumulativos por componente y contadores.
+
+    Uso:
+        perfil = Perfilador()
+        cohete.simular(perfil=perfil)
+        perfil.informe()              # dict serializable a JSON
+        perfil.volcar_flamegraph("perfil.folded")
+    """
+
+    def __init__(self):
+        self.tiempos = {}      # componente -> tiempo inclusivo (s)
+        self.llamadas = {}     # componente -> cantidad de llamadas
+        self.contadores = {}   # nombre -> valor
+        self.pilas = {}        # "a;b;c" -> tiempo propio (s)
+        self._pila = []        # [nombre, inicio, tiempo de los hijos]
+
+    def entrar(self, componente):
+        """
+        Empieza a cronometrar un componente (anidado en el actual).
+
+        Args:
+            componente (str): Nombre del componente
+        """
+        self._pila.append([componente, time.perf_counter(), 0.0])
+
+    def salir(self):
+        """
+        Termina de cronometrar el componente más interno.
+        """
+        fin = time.perf_counter()
+        componente, inicio, hijos = self._pila.pop()
+        duracion = fin - inicio
+        self.tiempos[componente] = self.tiempos.get(componente, 0.0) + duracion
+        self.llamadas[componente] = self.llamadas.get(componente, 0) + 1
+
+        clave = ";".join([marco[0] for marco in self._pila] + [componente])
+        self.pilas[clave] = self.pilas.get(clave, 0.0) + duracion - hijos
+        if self._pila:
+            self._pila[-1][2] += duracion
+
+    def contar(self, contador, cantidad=1):
+        """
+        Suma a un contador.
+
+        Args:
+            contador (str): Nombre del contador
+            cantidad (int): Incremento
+        """
+        self.contadores[contador] = self.contadores.get(contador, 0) + cantidad
+
+    def envolver(self, componente, funcion):
+        """
+        Devuelve una versión cronometrada de una función.
+
+        Args:
+            componente (str): Componente al que se asigna su tiempo
+            funcion (callable): Función a envolver
+
+        Returns:
+            callable: Función con la misma firma
+        """
+        entrar = self.entrar
+        salir = self.salir
+
+        def cronometrada(*args, **kwargs):
+            entrar(componente)
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                salir()
+
+        cronometrada.__wrapped__ = funcion
+        return cronometrada
+
+    @contextmanager
+    def instrumentar(self):
+        """
+        Cronometra PUNTOS_INSTRUMENTADOS mientras dura el bloque.
+
+        Las referencias originales se restauran al salir, aunque haya
+        una excepción.
+        """
+        originales = []
+        try:
+            for componente, nombre_modulo, nombre in PUNTOS_INSTRUMENTADOS:
+                modulo = importlib.import_module(nombre_modulo)
+                funcion = getattr(modulo, nombre)
+                originales.append((modulo, nombre, funcion))
+                setattr(modulo, nombre, self.envolver(componente, funcion))
+            yield self
+        finally:
+            for modulo, nombre, funcion in reversed(originales):
+                setattr(modulo, nombre, funcion)
+
+    def informe(self):
+        """
+        Informe legible por máquina del perfilado.
+
+        Returns:
+            dict: total_s (tiempo del componente raíz), componentes
+                (tiempo_s inclusivo, tiempo_propio_s, llamadas y fraccion
+                del total por componente) y contadores
+        """
+        propios = {}
+        for clave, tiempo in self.pilas.items():
+            componente = clave.rsplit(";", 1)[-1]
+            propios[componente] = propios.get(componente, 0.0) + tiempo
+
+        raices = {clave for clave in self.pilas if ";" not in clave}
+        total = sum(self.tiempos[raiz] for raiz in raices)
+        componentes = {
+            nombre: {
+                "tiempo_s": tiempo,
+                "tiempo_propio_s": propios.get(nombre, 0.0),
+                "llamadas": self.llamadas[nombre],
+                "fraccion": tiempo / total if total > 0 else 0.0,
+            }
+            for nombre, tiempo in sorted(
+                self.tiempos.items(), key=lambda item: -item[1]
+            )
+        }
+        return {
+            "total_s": total,
+            "componentes": componentes,
+            "contadores": dict(self.contadores),
+        }
+
+    def guardar_informe(self, ruta):
+        """
+        Guarda informe() como JSON.
+
+        Args:
+            ruta (str): Archivo de destino
+        """
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump(self.informe(), archivo, indent=2, ensure_ascii=False)
+            archivo.write("\n")
+
+    def volcar_flamegraph(self, ruta):
+        """
+        Escribe las pilas en formato "collapsed" (flamegraph.pl, speedscope).
+
+        Cada línea es "raiz;hijo;nieto <tiempo propio en µs>".
+
+        Args:
+            ruta (str): Archivo de destino
+        """
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            for clave, tiempo in sorted(self.pilas.items()):
+                microsegundos = int(round(tiempo * 1e6))
+                if microsegundos > 0:
+                    archivo.write(f"{clave} {microsegundos}\n")
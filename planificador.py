@@ -0,0 +1,151 @@
+"""
+Planificación de pasos alrededor de las discontinuidades del modelo.
+
+calcular_mdot salta al cambiar de fase y calcular_beta_tiempo tiene
+quiebres de pendiente en sus puntos de control. Un paso que atraviesa uno
+de esos instantes integra una fuerza discontinua y pierde el orden del
+método, lo que obliga a usar dt pequeño en toda la simulación.
+
+Este módulo:
+- Reúne los puntos de quiebre de los perfiles de consumo y de guiado
+- Divide los pasos de la grilla para que los subpasos terminen
+  exactamente en los quiebres
+- Acota el tiempo de evaluación de los controles dentro de cada subpaso,
+  de modo que una etapa que cae justo sobre un salto use el valor del
+  lado correcto
+
+El tiempo de la grilla se calcula como tick·dt con ticks enteros, sin
+acumular t += dt, para que no se desvíe de los quiebres.
+"""
+
+import math
+
+from utilidades import discontinuidades_beta_tiempo, discontinuidades_mdot
+
+
+# Tolerancia relativa al paso para considerar que un quiebre coincide con
+# un extremo del paso
+TOLERANCIA_QUIEBRE = 1e-6
+
+VENTANA_LIBRE = (-math.inf, math.inf)
+
+
+def puntos_de_quiebre(t_inicio, t_fin, params):
+    """
+    Reúne los instantes de discontinuidad de los perfiles de control.
+
+    Si el guiado depende de la altura, sus quiebres no se conocen en el
+    tiempo y solo se usan los del perfil de consumo.
+
+    Args:
+        t_inicio (float): Inicio del intervalo (s)
+        t_fin (float): Fin del intervalo (s)
+        params (ParametrosDinamica): Parámetros con los perfiles
+
+    Returns:
+        tuple: Tiempos de quiebre en [t_inicio, t_fin], ordenados
+    """
+    tiempos = set(discontinuidades_mdot(params.fases_mdot))
+    if not params.beta_altura:
+        tiempos.update(discontinuidades_beta_tiempo(
+            params.tiempos_beta, params.betas_tiempo
+        ))
+    return tuple(sorted(t for t in tiempos if t_inicio <= t <= t_fin))
+
+
+def paso_con_quiebres(integrador, t_a, dt, y, params, quiebres):
+    """
+    Avanza de t_a a t_a + dt partiendo el paso en los quiebres interiores.
+
+    Cada subpaso se integra con una ventana de tiempo para los controles:
+    si empieza en un quiebre, los controles se evalúan desde el quiebre
+    en adelante; si termina en un quiebre, se evalúan justo antes de él.
+
+    Args:
+        integrador (Integrador): Integrador a usar
+        t_a (float): Inicio del paso (s)
+        dt (float): Paso de tiempo (s)
+        y (tuple): Vector de estado en t_a
+        params (ParametrosDinamica): Parámetros del vehículo
+        quiebres (sequence): Quiebres en [t_a - tol, t_b + tol], ordenados
+
+    Returns:
+        tuple: (y_nuevo, registro) del último subpaso
+    """
+    t_b = t_a + dt
+    tol = TOLERANCIA_QUIEBRE * dt
+
+    # Bordes de los subpasos y el quiebre (o None) que hay en cada uno
+    bordes = [t_a]
+    quiebre_en = [None]
+    for b in quiebres:
+        if abs(b - t_a) <= tol:
+            quiebre_en[0] = b
+        elif abs(b - t_b) <= tol:
+            continue
+        elif t_a < b < t_b:
+            bordes.append(b)
+            quiebre_en.append(b)
+    bordes.append(t_b)
+    quiebre_en.append(next(
+        (b for b in quiebres if abs(b - t_b) <= tol), None
+    ))
+
+    registro = None
+    try:
+        for j in range(len(bordes) - 1):
+            inicio = quiebre_en[j]
+            fin = quiebre_en[j + 1]
+            integrador.ventana = (
+                -math.inf if inicio is None else inicio,
+                math.inf if fin is None else math.nextafter(fin, -math.inf),
+            )
+            # Sin subdivisión se usa el dt original para no introducir
+            # errores de redondeo en la grilla
+            h = dt if len(bordes) == 2 else bordes[j + 1] - bordes[j]
+            y, registro = integrador.paso(bordes[j], y, h, params)
+    finally:
+        integrador.ventana = VENTANA_LIBRE
+    return y, registro
+
+
+class CalendarioQuiebres:
+    """
+    Recorre en orden los quiebres a medida que avanza la grilla.
+
+    Mantiene un índice al próximo quiebre, así que consultar en cada paso
+    cuesta unas pocas comparaciones.
+    """
+
+    __slots__ = ("quiebres", "tol", "_j")
+
+    def __init__(self, quiebres, dt):
+        """
+        Args:
+            quiebres (sequence): Tiempos de quiebre ordenados (s)
+            dt (float): Paso de la grilla (s)
+        """
+        self.quiebres = tuple(quiebres)
+        self.tol = TOLERANCIA_QUIEBRE * dt
+        self._j = 0
+
+    def cercanos(self, t_a, dt):
+        """
+        Quiebres que tocan el paso [t_a, t_a + dt] (incluidos extremos).
+
+        Args:
+            t_a (float): Inicio del paso (s)
+            dt (float): Paso de tiempo (s)
+
+        Returns:
+            tuple: Quiebres del paso (vacío en el caso habitual)
+        """
+        quiebres = self.quiebres
+        j = self._j
+        while j < len(quiebres) and quiebres[j] < t_a - self.tol:
+            j += 1
+        self._j = j
+        k = j
+        while k < len(quiebres) and quiebres[k] <= t_a + dt + self.tol:
+            k += 1
+        return quiebres[j:k]
@@ -0,0 +1,306 @@
+"""
+Presupuesto de memoria para el registro de los historiales.
+
+Una corrida registra una muestra por paso, así que su memoria crece con
+t_max/dt: a DT=0.1 y T_MAX grande las listas de floats pueden superar la
+memoria de la máquina. Dado un presupuesto en bytes, planificar_registro
+estima el costo por muestra según el registro configurado y elige la
+primera estrategia que entra:
+
+- completo: el registro configurado entra tal cual
+- arreglos: las listas de floats (~256 B/muestra) pasan a arreglos
+  float64 (64 B/muestra), sin pérdida
+- disco: si se indica una carpeta, se registran todas las muestras y en
+  memoria queda solo un búfer (ver historial.ColumnaEnDisco)
+- diezmado: se registra una muestra cada `cada` pasos
+
+La integración no cambia: el plan solo decide qué se guarda.
+
+Uso:
+    cohete.simular(presupuesto_memoria="512M")      # o bytes, o "auto"
+    cohete.plan_registro(2**30).describir()         # ver el plan antes
+    ejecutar_barrido(configs, presupuesto_memoria="auto")
+
+En un pool de procesos el presupuesto es de toda la máquina y se reparte
+entre los trabajadores (presupuesto_por_trabajador). "auto" usa una
+fracción de la memoria disponible (memoria_disponible).
+"""
+
+import math
+import os
+from typing import NamedTuple, Optional
+
+from historial import (
+    ESQUEMA_FLOAT64, ESQUEMAS, EsquemaHistorial, bytes_por_muestra
+)
+
+
+# Fracción de la memoria disponible que usa el presupuesto "auto"
+FRACCION_AUTOMATICA = 0.5
+
+# Sufijos aceptados por bytes_desde_texto
+_SUFIJOS = {"": 1, "K": 2**10, "M": 2**20, "G": 2**30, "T": 2**40}
+
+
+class PlanRegistro(NamedTuple):
+    """
+    Cómo se registran los historiales de una corrida.
+
+    Args:
+        estrategia (str): "completo", "arreglos", "disco" o "diezmado"
+        pasos (int): Pasos de integración previstos (cota superior)
+        muestras (int): Muestras que se registran, incluidas las previas
+        cada (int): Se registra una muestra cada `cada` pasos
+        bytes_por_muestra (int): Costo de cada muestra registrada
+        bytes_memoria (int): Memoria estimada de los historiales
+        bytes_disco (int): Bytes estimados en disco
+        presupuesto (int): Presupuesto de memoria (bytes)
+        esquema (EsquemaHistorial): Formato de las columnas (None =
+            listas de floats)
+        directorio (str): Carpeta para los archivos (estrategia disco)
+    """
+    estrategia: str
+    pasos: int
+    muestras: int
+    cada: int
+    bytes_por_muestra: int
+    bytes_memoria: int
+    bytes_disco: int
+    presupuesto: int
+    esquema: Optional[EsquemaHistorial] = None
+    directorio: Optional[str] = None
+
+    @property
+    def capacidad(self):
+        """int: Muestras por columna en memoria (búfer en modo disco)."""
+        return max(1, self.bytes_memoria // self.bytes_por_muestra)
+
+    def informe(self):
+        """
+        Plan serializable a JSON (el esquema, por nombre).
+
+        Returns:
+            dict: Campos del plan
+        """
+        datos = self._asdict()
+        datos["esquema"] = nombre_esquema(self.esquema)
+        return datos
+
+    def describir(self):
+        """
+        Descripción del plan en una línea.
+
+        Returns:
+            str: Texto legible
+        """
+        texto = (f"registro {self.estrategia}: {self.muestras} muestras "
+                 f"({nombre_esquema(self.esquema)}, "
+                 f"{self.bytes_por_muestra} B/muestra")
+        if self.cada > 1:
+            texto += f", 1 de cada {self.cada} pasos"
+        texto += (f"), {_legible(self.bytes_memoria)} en memoria de "
+                  f"{_legible(self.presupuesto)}")
+        if self.bytes_disco:
+            texto += f", {_legible(self.bytes_disco)} en {self.directorio}"
+        return texto
+
+
+def _legible(cantidad):
+    """Cantidad de bytes con la unidad binaria más adecuada."""
+    for unidad in ("B", "KiB", "MiB", "GiB"):
+        if cantidad < 1024 or unidad == "GiB":
+            break
+        cantidad /= 1024
+    if unidad == "B":
+        return f"{cantidad} B"
+    return f"{cantidad:.1f} {unidad}"
+
+
+def nombre_esquema(esquema):
+    """
+    Nombre de un esquema de historial para los informes.
+
+    Args:
+        esquema (EsquemaHistorial): Esquema (None = listas de floats)
+
+    Returns:
+        str: Nombre en historial.ESQUEMAS, "listas" o "personalizado"
+    """
+    if esquema is None:
+        return "listas"
+    for nombre, conocido in ESQUEMAS.items():
+        if conocido == esquema:
+            return nombre
+    return "personalizado"
+
+
+def bytes_desde_texto(texto):
+    """
+    Interpreta una cantidad de memoria.
+
+    Args:
+        texto (str | int): Bytes, o número con sufijo K, M, G o T
+            (potencias de 1024; se acepta "512M", "2GiB", "1.5G")
+
+    Returns:
+        int: Cantidad en bytes
+
+    Raises:
+        ValueError: Si el texto no es una cantidad válida
+    """
+    if isinstance(texto, int):
+        return texto
+    limpio = texto.strip().upper().removesuffix("IB").removesuffix("B")
+    sufijo = limpio[-1:] if limpio[-1:] in _SUFIJOS else ""
+    try:
+        valor = float(limpio[:len(limpio) - len(sufijo)])
+    except ValueError:
+        raise ValueError(f"Cantidad de memoria inválida: {texto!r}") from None
+    return int(valor * _SUFIJOS[sufijo])
+
+
+def memoria_disponible():
+    """
+    Memoria física disponible en la máquina.
+
+    Usa MemAvailable de /proc/meminfo (Linux) y, si no existe, las
+    páginas libres que informa sysconf.
+
+    Returns:
+        int | None: Bytes disponibles (None si no se pueden averiguar)
+    """
+    try:
+        with open("/proc/meminfo", encoding="ascii") as archivo:
+            for linea in archivo:
+                if linea.startswith("MemAvailable:"):
+                    return int(linea.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def resolver_presupuesto(presupuesto):
+    """
+    Convierte un presupuesto a bytes.
+
+    Args:
+        presupuesto (int | str | None): Bytes, texto con sufijo
+            (ver bytes_desde_texto), "auto" o None
+
+    Returns:
+        int | None: Bytes (None = sin presupuesto)
+
+    Raises:
+        ValueError: Si el presupuesto no es positivo
+    """
+    if presupuesto is None:
+        return None
+    if isinstance(presupuesto, str) and presupuesto.strip().lower() == "auto":
+        disponible = memoria_disponible()
+        if disponible is None:
+            return None
+        return int(disponible * FRACCION_AUTOMATICA)
+    cantidad = bytes_desde_texto(presupuesto)
+    if cantidad <= 0:
+        raise ValueError(f"El presupuesto debe ser positivo ({presupuesto})")
+    return cantidad
+
+
+def presupuesto_por_trabajador(presupuesto, trabajadores):
+    """
+    Reparte un presupuesto de toda la máquina entre procesos trabajadores.
+
+    Cada trabajador corre una simulación a la vez, así que recibe una
+    parte igual.
+
+    Args:
+        presupuesto (int | str | None): Presupuesto total (ver
+            resolver_presupuesto)
+        trabajadores (int): Procesos simultáneos
+
+    Returns:
+        int | None: Bytes por trabajador (None = sin presupuesto)
+    """
+    total = resolver_presupuesto(presupuesto)
+    if total is None:
+        return None
+    return max(1, total // max(1, trabajadores))
+
+
+def planificar_registro(presupuesto, pasos, esquema=None, directorio=None,
+                        muestras_previas=1):
+    """
+    Elige cómo registrar una corrida para que entre en el presupuesto.
+
+    Args:
+        presupuesto (int | str): Presupuesto de memoria de los
+            historiales (ver resolver_presupuesto)
+        pasos (int): Pasos de integración previstos
+        esquema (EsquemaHistorial): Registro configurado (None = listas)
+        directorio (str): Carpeta para volcar a disco (None = no usar
+            disco, diezmar si hace falta)
+        muestras_previas (int): Muestras ya registradas
+
+    Returns:
+        PlanRegistro: Plan elegido
+
+    Raises:
+        ValueError: Si el presupuesto no alcanza para el búfer (disco) o
+            para tres muestras (diezmado), o si habría que diezmar un
+            historial que ya tiene muestras
+    """
+    presupuesto = resolver_presupuesto(presupuesto)
+    if presupuesto is None:
+        raise ValueError("No se pudo determinar la memoria disponible")
+    # Una muestra más por si la corrida registra el instante del impacto
+    muestras = muestras_previas + pasos + 1
+
+    def plan(estrategia, esquema, cada=1, en_memoria=None):
+        costo = bytes_por_muestra(esquema)
+        registradas = muestras_previas + pasos // cada + 1
+        if en_memoria is None:
+            en_memoria = registradas
+        return PlanRegistro(
+            estrategia=estrategia,
+            pasos=pasos,
+            muestras=registradas,
+            cada=cada,
+            bytes_por_muestra=costo,
+            bytes_memoria=en_memoria * costo,
+            bytes_disco=(registradas - en_memoria) * costo,
+            presupuesto=presupuesto,
+            esquema=esquema,
+            directorio=directorio if estrategia == "disco" else None,
+        )
+
+    if muestras * bytes_por_muestra(esquema) <= presupuesto:
+        return plan("completo", esquema)
+    arreglos = esquema if esquema is not None else ESQUEMA_FLOAT64
+    costo = bytes_por_muestra(arreglos)
+    if esquema is None and muestras * costo <= presupuesto:
+        return plan("arreglos", arreglos)
+
+    capacidad = presupuesto // costo
+    if directorio is not None:
+        if capacidad < 1:
+            raise ValueError(
+                f"El presupuesto ({presupuesto} B) no alcanza para el búfer "
+                f"de una muestra de {costo} B"
+            )
+        return plan("disco", arreglos, en_memoria=capacidad)
+    if muestras_previas > 1:
+        raise ValueError(
+            "No se puede diezmar un historial que ya tiene muestras: "
+            "indicar un directorio para volcar a disco o un presupuesto mayor"
+        )
+    if capacidad < 3:
+        raise ValueError(
+            f"El presupuesto ({presupuesto} B) no alcanza para registrar "
+            f"tres muestras de {costo} B"
+        )
+    # Con `cada` pasos por muestra se registran pasos // cada + 2 muestras
+    cada = max(2, math.ceil(pasos / (capacidad - 2)))
+    return plan("diezmado", arreglos, cada=cada)
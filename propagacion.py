@@ -0,0 +1,412 @@
+"""
+Propagación de incertidumbre gaussiana con la transformada unscented.
+
+Para estimar la media y la covarianza del estado de inserción (altura,
+velocidad y ángulo de trayectoria al final de la corrida) cuando los
+parámetros tienen incertidumbre gaussiana, la transformada unscented
+simula 2n + 1 configuraciones ("puntos sigma") elegidas para tener la
+media y la covarianza de los n parámetros:
+
+    x_0 = μ,   x_±i = μ ± sqrt(n + λ)·L_i     (L·Lᵀ = Σ, λ = α²(n+κ) - n)
+
+y reconstruye la media y la covarianza de las salidas con los pesos
+
+    Wm_0 = λ/(n+λ),  Wc_0 = Wm_0 + 1 - α² + β,  W_i = 1/(2(n+λ))
+
+Con 6 a 10 parámetros son 13 a 21 simulaciones en lugar de miles;
+propagar_montecarlo estima lo mismo por muestreo para verificar
+(comparar).
+
+Los parámetros son los de montecarlo.py: campos numéricos de
+ConfiguracionSimulacion, factor_mdot y desfase_guiado.
+
+Uso:
+    incertidumbre = incertidumbre_por_defecto(config)
+    resultado = propagar_unscented(incertidumbre)
+    print(resultado.describir())
+    comparar(resultado, propagar_montecarlo(incertidumbre, 2000))
+"""
+
+import math
+import random
+from dataclasses import dataclass
+from typing import NamedTuple, Tuple
+
+from configuracion import ConfiguracionSimulacion
+from montecarlo import (
+    REGISTRO_MUESTRA, aplicar_perturbaciones, validar_parametro,
+    valor_nominal
+)
+from utilidades import calcular_velocidad, cholesky
+
+
+# Salidas de cada corrida (ver estado_insercion)
+SALIDAS = ("altura_km", "velocidad_m_s", "angulo_trayectoria_deg")
+
+
+@dataclass(frozen=True)
+class IncertidumbreGaussiana:
+    """
+    Incertidumbre gaussiana de parámetros de una configuración.
+
+    Args:
+        desvios (dict | tuple): Parámetro -> desvío estándar
+        base (ConfiguracionSimulacion): Configuración nominal (las medias
+            son sus valores, ver montecarlo.valor_nominal)
+        correlaciones (dict | tuple): (parámetro, parámetro) ->
+            coeficiente de correlación (por defecto independientes)
+
+    Raises:
+        ValueError: Si un parámetro no es perturbable, un desvío es
+            negativo o una correlación no está en [-1, 1]
+    """
+    desvios: Tuple[Tuple[str, float], ...]
+    base: ConfiguracionSimulacion = ConfiguracionSimulacion()
+    correlaciones: Tuple[Tuple[Tuple[str, str], float], ...] = ()
+
+    def __post_init__(self):
+        for campo in ("desvios", "correlaciones"):
+            valor = getattr(self, campo)
+            if isinstance(valor, dict):
+                valor = valor.items()
+            object.__setattr__(self, campo, tuple(
+                (clave, float(numero)) for clave, numero in valor
+            ))
+        nombres = self.nombres
+        for nombre, desvio in self.desvios:
+            validar_parametro(self.base, nombre)
+            if desvio < 0:
+                raise ValueError(f"Desvío negativo para {nombre}: {desvio}")
+        for (a, b), rho in self.correlaciones:
+            if a not in nombres or b not in nombres:
+                raise ValueError(f"Correlación entre parámetros sin desvío: "
+                                 f"{a}, {b}")
+            if not -1 <= rho <= 1:
+                raise ValueError(f"Correlación fuera de [-1, 1]: {a}, {b}")
+
+    @property
+    def nombres(self):
+        """tuple: Parámetros inciertos, en orden."""
+        return tuple(nombre for nombre, _ in self.desvios)
+
+    def medias(self):
+        """
+        Returns:
+            list: Valor nominal de cada parámetro
+        """
+        return [valor_nominal(self.base, nombre) for nombre in self.nombres]
+
+    def covarianza(self):
+        """
+        Returns:
+            list: Matriz de covarianza de los parámetros (lista de filas)
+        """
+        desvios = [desvio for _, desvio in self.desvios]
+        indice = {nombre: i for i, nombre in enumerate(self.nombres)}
+        matriz = [[0.0] * len(desvios) for _ in desvios]
+        for i, desvio in enumerate(desvios):
+            matriz[i][i] = desvio**2
+        for (a, b), rho in self.correlaciones:
+            i, j = indice[a], indice[b]
+            matriz[i][j] = matriz[j][i] = rho * desvios[i] * desvios[j]
+        return matriz
+
+    def configuracion(self, valores):
+        """
+        Configuración con los parámetros en los valores dados.
+
+        Args:
+            valores (sequence): Valor de cada parámetro, en el orden de
+                nombres
+
+        Returns:
+            ConfiguracionSimulacion: Configuración
+        """
+        return aplicar_perturbaciones(self.base,
+                                      dict(zip(self.nombres, valores)))
+
+
+def incertidumbre_por_defecto(base=None):
+    """
+    Incertidumbre típica de los parámetros del vehículo.
+
+    ISP 1 %, CD 10 %, masas de combustible 0.5 % y en seco 1 %, consumo
+    2 % y guiado 1 s; con guiado por altura, además H_0, H_1 y H_2 5 %.
+
+    Args:
+        base (ConfiguracionSimulacion): Configuración nominal (None = la
+            por defecto)
+
+    Returns:
+        IncertidumbreGaussiana: Incertidumbre
+    """
+    if base is None:
+        base = ConfiguracionSimulacion()
+    desvios = {
+        "isp": 0.01 * base.isp,
+        "cd": 0.10 * base.cd,
+        "masa_fuel": 0.005 * base.masa_fuel,
+        "masa_cohete": 0.01 * base.masa_cohete,
+        "factor_mdot": 0.02,
+    }
+    if base.beta_altura:
+        desvios.update(h_0=0.05 * base.h_0, h_1=0.05 * base.h_1,
+                       h_2=0.05 * base.h_2)
+    else:
+        desvios["desfase_guiado"] = 1.0
+    return IncertidumbreGaussiana(desvios, base)
+
+
+class PuntosSigma(NamedTuple):
+    """
+    Puntos sigma de la transformada unscented y sus pesos.
+
+    Args:
+        puntos (list): Valores de los parámetros de cada punto
+        pesos_media (list): Peso de cada punto para la media
+        pesos_covarianza (list): Peso de cada punto para la covarianza
+    """
+    puntos: list
+    pesos_media: list
+    pesos_covarianza: list
+
+
+def puntos_sigma(incertidumbre, alpha=1.0, beta=2.0, kappa=0.0):
+    """
+    Genera los 2n + 1 puntos sigma de la incertidumbre.
+
+    Args:
+        incertidumbre (IncertidumbreGaussiana): Parámetros inciertos
+        alpha (float): Dispersión de los puntos alrededor de la media
+        beta (float): Información previa de la distribución (2 es
+            óptimo para gaussianas)
+        kappa (float): Parámetro secundario de escala
+
+    Returns:
+        PuntosSigma: Puntos y pesos
+
+    Raises:
+        ValueError: Si n + λ no es positivo
+    """
+    medias = incertidumbre.medias()
+    n = len(medias)
+    lam = alpha**2 * (n + kappa) - n
+    if n + lam <= 0:
+        raise ValueError(f"n + λ debe ser positivo (n = {n}, λ = {lam})")
+    factor = cholesky(incertidumbre.covarianza(), semidefinida=True)
+    escala = math.sqrt(n + lam)
+    puntos = [list(medias)]
+    for signo in (1, -1):
+        for i in range(n):
+            puntos.append([media + signo * escala * factor[j][i]
+                           for j, media in enumerate(medias)])
+    peso = 1 / (2 * (n + lam))
+    pesos_media = [lam / (n + lam)] + [peso] * (2 * n)
+    pesos_covarianza = ([lam / (n + lam) + 1 - alpha**2 + beta]
+                        + [peso] * (2 * n))
+    return PuntosSigma(puntos, pesos_media, pesos_covarianza)
+
+
+def estado_insercion(cohete):
+    """
+    Estado de inserción al final de una corrida.
+
+    Args:
+        cohete (Cohete): Cohete ya simulado
+
+    Returns:
+        dict: altura_km, velocidad_m_s y angulo_trayectoria_deg (ángulo
+            de la velocidad sobre el horizonte local)
+    """
+    v_tangencial = cohete.gamma * cohete.r
+    return {
+        "altura_km": (cohete.r - cohete.config.r_e) / 1000,
+        "velocidad_m_s": calcular_velocidad(cohete.q, cohete.gamma, cohete.r),
+        "angulo_trayectoria_deg": math.degrees(
+            math.atan2(cohete.q, v_tangencial)
+        ),
+    }
+
+
+def correr_insercion(config):
+    """
+    Simula una configuración y devuelve su estado de inserción.
+
+    Es una función de módulo para que los procesos trabajadores puedan
+    recibirla por pickle.
+
+    Args:
+        config (ConfiguracionSimulacion): Configuración
+
+    Returns:
+        dict: Estado de inserción (ver estado_insercion) y end_reason
+    """
+    from cohete import Cohete
+    from telemetria import Telemetria
+
+    cohete = Cohete.desde_configuracion(config)
+    resumen = cohete.simular(telemetria=Telemetria.nula(),
+                             presupuesto_memoria=REGISTRO_MUESTRA)
+    return {**estado_insercion(cohete), "end_reason": resumen["end_reason"]}
+
+
+class ResultadoPropagacion(NamedTuple):
+    """
+    Media y covarianza estimadas del estado de inserción.
+
+    Args:
+        metodo (str): "unscented" o "montecarlo"
+        corridas (int): Simulaciones realizadas
+        media (list): Media de cada salida (SALIDAS)
+        covarianza (list): Covarianza de las salidas (lista de filas)
+        motivos_fin (dict): end_reason -> cantidad de corridas
+    """
+    metodo: str
+    corridas: int
+    media: list
+    covarianza: list
+    motivos_fin: dict
+
+    @property
+    def desvios(self):
+        """list: Desvío estándar de cada salida."""
+        return [math.sqrt(max(0.0, self.covarianza[i][i]))
+                for i in range(len(SALIDAS))]
+
+    def informe(self):
+        """
+        Resultado serializable a JSON.
+
+        Returns:
+            dict: Campos, desvíos y salidas por nombre
+        """
+        datos = self._asdict()
+        datos["salidas"] = list(SALIDAS)
+        datos["desvios"] = self.desvios
+        return datos
+
+    def describir(self):
+        """
+        Tabla de media ± desvío de cada salida.
+
+        Returns:
+            str: Texto legible
+        """
+        motivos = ", ".join(f"{motivo}: {cantidad}" for motivo, cantidad
+                            in self.motivos_fin.items())
+        lineas = [f"{self.metodo}: {self.corridas} corridas ({motivos})"]
+        for nombre, media, desvio in zip(SALIDAS, self.media, self.desvios):
+            lineas.append(f"  {nombre:>24s} {media:12.4f} ± {desvio:.4f}")
+        return "\n".join(lineas)
+
+
+def _estadisticas(salidas, pesos_media, pesos_covarianza):
+    """Media y covarianza ponderadas de los vectores de salida."""
+    media = [sum(w * y[k] for w, y in zip(pesos_media, salidas))
+             for k in range(len(SALIDAS))]
+    covarianza = [[
+        sum(w * (y[i] - media[i]) * (y[j] - media[j])
+            for w, y in zip(pesos_covarianza, salidas))
+        for j in range(len(SALIDAS))
+    ] for i in range(len(SALIDAS))]
+    return media, covarianza
+
+
+def _correr(configs, trabajadores):
+    """Simula las configuraciones y devuelve los vectores y los motivos."""
+    from collections import Counter
+    from barrido import ejecutar_barrido
+
+    resultados = ejecutar_barrido(configs, trabajadores,
+                                  funcion=correr_insercion)
+    salidas = [[resultado[nombre] for nombre in SALIDAS]
+               for resultado in resultados]
+    motivos = Counter(resultado["end_reason"] for resultado in resultados)
+    return salidas, dict(motivos)
+
+
+def propagar_unscented(incertidumbre, trabajadores=None, alpha=1.0,
+                       beta=2.0, kappa=0.0):
+    """
+    Media y covarianza del estado de inserción con 2n + 1 corridas.
+
+    Args:
+        incertidumbre (IncertidumbreGaussiana): Parámetros inciertos
+        trabajadores (int): Procesos (ver barrido.ejecutar_barrido)
+        alpha, beta, kappa (float): Parámetros de los puntos sigma (ver
+            puntos_sigma)
+
+    Returns:
+        ResultadoPropagacion: Estimación
+    """
+    sigma = puntos_sigma(incertidumbre, alpha, beta, kappa)
+    configs = [incertidumbre.configuracion(punto) for punto in sigma.puntos]
+    salidas, motivos = _correr(configs, trabajadores)
+    media, covarianza = _estadisticas(salidas, sigma.pesos_media,
+                                      sigma.pesos_covarianza)
+    return ResultadoPropagacion("unscented", len(configs), media,
+                                covarianza, motivos)
+
+
+def propagar_montecarlo(incertidumbre, muestras=2000, trabajadores=None,
+                        semilla=0):
+    """
+    Media y covarianza del estado de inserción por muestreo.
+
+    Cada muestra tiene su generador, sembrado con (semilla, índice),
+    como en montecarlo.py.
+
+    Args:
+        incertidumbre (IncertidumbreGaussiana): Parámetros inciertos
+        muestras (int): Cantidad de muestras (al menos 2)
+        trabajadores (int): Procesos (ver barrido.ejecutar_barrido)
+        semilla (int): Semilla
+
+    Returns:
+        ResultadoPropagacion: Estimación
+
+    Raises:
+        ValueError: Si hay menos de dos muestras
+    """
+    if muestras < 2:
+        raise ValueError(f"Se necesitan al menos dos muestras ({muestras})")
+    medias = incertidumbre.medias()
+    factor = cholesky(incertidumbre.covarianza(), semidefinida=True)
+    configs = []
+    for indice in range(muestras):
+        rng = random.Random(f"unscented:{semilla}:{indice}")
+        z = [rng.gauss(0.0, 1.0) for _ in medias]
+        configs.append(incertidumbre.configuracion([
+            media + sum(factor[i][j] * z[j] for j in range(i + 1))
+            for i, media in enumerate(medias)
+        ]))
+    salidas, motivos = _correr(configs, trabajadores)
+    media, covarianza = _estadisticas(
+        salidas, [1 / muestras] * muestras, [1 / (muestras - 1)] * muestras
+    )
+    return ResultadoPropagacion("montecarlo", muestras, media, covarianza,
+                                motivos)
+
+
+def comparar(estimado, referencia):
+    """
+    Compara una estimación con otra de referencia (p. ej. Monte Carlo).
+
+    Args:
+        estimado (ResultadoPropagacion): Estimación a verificar
+        referencia (ResultadoPropagacion): Estimación de referencia
+
+    Returns:
+        dict: Salida -> error de la media en desvíos de la referencia
+            (error_media_sigmas) y cociente de desvíos (razon_desvios)
+    """
+    comparacion = {}
+    for k, nombre in enumerate(SALIDAS):
+        desvio = referencia.desvios[k]
+        error = estimado.media[k] - referencia.media[k]
+        comparacion[nombre] = {
+            "error_media_sigmas": error / desvio if desvio > 0 else math.nan,
+            "razon_desvios": (estimado.desvios[k] / desvio if desvio > 0
+                              else math.nan),
+        }
+    return comparacion
@@ -0,0 +1,619 @@
+"""
+Benchmarks de los caminos críticos de la simulación.
+
+Mide el rendimiento en dos niveles:
+- Microbenchmarks: funciones que se llaman en cada paso
+  (calcular_densidad_aire, calcular_beta_tiempo, calcular_beta_altura,
+  calcular_mdot) y los pasos Cohete.forward_euler / backward_euler
+- Escenarios completos: el ascenso a LEO de simulacion.py, los casos de
+  los tests (mortero, velocidad de escape, órbitas LEO/GEO) y un barrido
+  de 1000 corridas cortas
+- Importación: tiempo de un `import cohete` (y de los demás módulos que
+  cargan los procesos trabajadores y la línea de comandos) en frío, en
+  un intérprete nuevo; el objetivo es OBJETIVO_IMPORTACION_S. También el
+  arranque completo de `run.py simulate`, que no debe cargar numpy,
+  scipy ni matplotlib
+- Costos: el ascenso con cada integrador y una corrida de un paso; la
+  línea base de este grupo calibra el modelo de costo de costos.py
+
+Para cada caso reporta tiempo de pared, pasos por segundo y memoria pico
+(tracemalloc, medida en una corrida aparte para no distorsionar los
+tiempos). Los resultados se guardan como línea base en JSON y se comparan
+contra otra línea base con un umbral de regresión.
+
+Uso:
+    python rendimiento.py                         # correr y mostrar
+    python rendimiento.py --guardar base.json     # guardar línea base
+    python rendimiento.py --comparar base.json    # detectar regresiones
+    python rendimiento.py --rapido --solo micro   # versión corta
+"""
+
+import argparse
+import ast
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import replace
+from datetime import datetime, timezone
+
+from atmosfera import calcular_densidad_aire
+from cohete import Cohete
+from configuracion import ConfiguracionSimulacion
+from costos import (
+    PASOS_CALIBRACION, ModeloCosto, configuraciones_calibracion, medir_corrida
+)
+from utilidades import calcular_beta_altura, calcular_beta_tiempo, calcular_mdot
+
+
+# Línea base por defecto (versionada junto al código)
+RUTA_LINEA_BASE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "lineas_base", "referencia.json"
+)
+
+# Aumento relativo del tiempo a partir del cual se reporta una regresión
+UMBRAL_REGRESION = 0.10
+
+# Cantidad de corridas del barrido
+N_BARRIDO = 1000
+
+# Tiempo máximo aceptable para importar el núcleo de la simulación en frío
+OBJETIVO_IMPORTACION_S = 0.100
+
+# Módulos cuya importación en frío se mide
+MODULOS_IMPORTACION = ("cohete", "barrido", "graficos", "run")
+
+# Comandos de run.py cuyo arranque en frío se mide (importar run y correr
+# main con esos argumentos, sin la salida)
+COMANDOS_IMPORTACION = {
+    "run.py simulate": ("simulate", "--metodo", "rk4", "--dt", "1",
+                        "--t-max", "300"),
+}
+
+# Dependencias pesadas que no deberían cargarse al importar esos módulos
+MODULOS_PESADOS = ("numpy", "scipy", "matplotlib")
+
+_CODIGO_IMPORTACION = (
+    "import contextlib, io, sys, time\n"
+    "inicio = time.perf_counter()\n"
+    "try:\n"
+    "    import {modulo}\n"
+    "    if {argumentos!r} is not None:\n"
+    "        with contextlib.redirect_stdout(io.StringIO()):\n"
+    "            {modulo}.main(list({argumentos!r}))\n"
+    "except ModuleNotFoundError as error:\n"
+    "    if error.name not in {pesados!r}:\n"
+    "        raise\n"
+    "    print(repr((None, [error.name])))\n"
+    "    sys.exit(0)\n"
+    "duracion = time.perf_counter() - inicio\n"
+    "pesados = [m for m in {pesados!r} if m in sys.modules]\n"
+    "print(repr((duracion, pesados)))\n"
+)
+
+
+# =========================
+# MEDICIÓN
+# =========================
+
+def medir(funcion, repeticiones=5, memoria=True, tiempo_minimo=0.2):
+    """
+    Mide el tiempo de pared y la memoria pico de una función.
+
+    La función se ejecuta al menos `repeticiones` veces (y más si en
+    total tardan menos de `tiempo_minimo`, para que los casos muy cortos
+    no queden dominados por el ruido) y se toma el mínimo, que es el
+    estimador menos sensible al ruido del sistema. La memoria pico se
+    mide en una ejecución adicional con tracemalloc activo.
+
+    Args:
+        funcion (callable): Función sin argumentos; devuelve la cantidad
+            de pasos (o llamadas) que realizó
+        repeticiones (int): Cantidad de ejecuciones cronometradas
+        memoria (bool): Si se mide la memoria pico
+        tiempo_minimo (float): Tiempo total mínimo de medición (s)
+
+    Returns:
+        dict: tiempo_s (mínimo), tiempo_mediana_s, pasos, pasos_por_s y
+            memoria_pico_kb (None si no se midió)
+    """
+    tiempos = []
+    pasos = 0
+    while len(tiempos) < repeticiones or sum(tiempos) < tiempo_minimo:
+        with contextlib.redirect_stdout(io.StringIO()):
+            inicio = time.perf_counter()
+            pasos = funcion()
+            tiempos.append(time.perf_counter() - inicio)
+
+    memoria_pico_kb = None
+    if memoria:
+        tracemalloc.start()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                funcion()
+            _, pico = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        memoria_pico_kb = pico / 1024
+
+    tiempo = min(tiempos)
+    return {
+        "tiempo_s": tiempo,
+        "tiempo_mediana_s": statistics.median(tiempos),
+        "pasos": pasos,
+        "pasos_por_s": pasos / tiempo if tiempo > 0 else math.inf,
+        "memoria_pico_kb": memoria_pico_kb,
+    }
+
+
+def medir_importacion(modulo, repeticiones=5, argumentos=None):
+    """
+    Mide el tiempo de importar un módulo en un intérprete nuevo.
+
+    Cada repetición lanza un proceso aparte, así que la importación es
+    siempre en frío (salvo el caché de bytecode y el del sistema de
+    archivos). El tiempo se cronometra dentro del proceso hijo y no
+    incluye el arranque del intérprete.
+
+    Args:
+        modulo (str): Nombre del módulo
+        repeticiones (int): Cantidad de procesos a lanzar
+        argumentos (tuple): Si no es None, después de importar se llama
+            a modulo.main(argumentos) (descartando lo que imprime) y se
+            mide el comando completo
+
+    Returns:
+        dict: Mismas claves que medir() (pasos = 1 importación) más
+            modulos_pesados (dependencias pesadas que quedaron cargadas),
+            o None si el módulo necesita una dependencia pesada que no
+            está instalada
+
+    Raises:
+        RuntimeError: Si la importación falla por otro motivo
+    """
+    codigo = _CODIGO_IMPORTACION.format(modulo=modulo, argumentos=argumentos,
+                                        pesados=MODULOS_PESADOS)
+    tiempos = []
+    pesados = []
+    for _ in range(repeticiones):
+        proceso = subprocess.run(
+            [sys.executable, "-c", codigo], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+        if proceso.returncode != 0:
+            raise RuntimeError(
+                f"No se pudo importar {modulo}:\n{proceso.stderr}"
+            )
+        duracion, pesados = ast.literal_eval(proceso.stdout.strip())
+        if duracion is None:
+            return None
+        tiempos.append(duracion)
+
+    tiempo = min(tiempos)
+    return {
+        "tiempo_s": tiempo,
+        "tiempo_mediana_s": statistics.median(tiempos),
+        "pasos": 1,
+        "pasos_por_s": 1 / tiempo if tiempo > 0 else math.inf,
+        "memoria_pico_kb": None,
+        "modulos_pesados": pesados,
+    }
+
+
+# =========================
+# MICROBENCHMARKS
+# =========================
+
+def _micro_densidad(n):
+    alturas = [i * 150_000.0 / n for i in range(n)]
+
+    def correr():
+        for h in alturas:
+            calcular_densidad_aire(h)
+        return n
+    return correr
+
+
+def _micro_beta_tiempo(n):
+    tiempos = [i * 500.0 / n for i in range(n)]
+
+    def correr():
+        for t in tiempos:
+            calcular_beta_tiempo(t)
+        return n
+    return correr
+
+
+def _micro_beta_altura(n):
+    config = ConfiguracionSimulacion()
+    alturas = [i * 250_000.0 / n for i in range(n)]
+
+    def correr():
+        for h in alturas:
+            calcular_beta_altura(h, config.h_0, config.h_1, config.h_2)
+        return n
+    return correr
+
+
+def _micro_mdot(n):
+    tiempos = [i * 400.0 / n for i in range(n)]
+
+    def correr():
+        for t in tiempos:
+            calcular_mdot(t)
+        return n
+    return correr
+
+
+def _micro_paso(nombre, n):
+    config = ConfiguracionSimulacion()
+
+    def correr():
+        cohete = Cohete.desde_configuracion(config)
+        paso = getattr(cohete, nombre)
+        for _ in range(n):
+            paso(config.dt)
+        return n
+    return correr
+
+
+def microbenchmarks(rapido=False):
+    """
+    Casos de microbenchmark.
+
+    Args:
+        rapido (bool): Usar menos llamadas por caso
+
+    Returns:
+        dict: Nombre del caso -> función a medir
+    """
+    n = 20_000 if rapido else 200_000
+    n_pasos = 2_000 if rapido else 20_000
+    return {
+        "calcular_densidad_aire": _micro_densidad(n),
+        "calcular_beta_tiempo": _micro_beta_tiempo(n),
+        "calcular_beta_altura": _micro_beta_altura(n),
+        "calcular_mdot": _micro_mdot(n),
+        "Cohete.forward_euler": _micro_paso("forward_euler", n_pasos),
+        "Cohete.backward_euler": _micro_paso("backward_euler", n_pasos),
+    }
+
+
+# =========================
+# ESCENARIOS COMPLETOS
+# =========================
+
+def _sin_combustible(**cambios):
+    """Configuración de un cuerpo sin combustible (casos de los tests)."""
+    return replace(
+        ConfiguracionSimulacion(),
+        masa_fuel=0.0, m_dot_0=0.0, q_dot_0=0.0, theta_0=0.0,
+        gamma_dot_0=0.0, beta_0=0.0, metodo="backward_euler",
+        **cambios
+    )
+
+
+def _orbita_circular(altura, diametro, dt, periodos):
+    base = ConfiguracionSimulacion()
+    r = base.r_e + altura
+    v = math.sqrt(base.mu / r)
+    periodo = 2 * math.pi * r / v
+    return _sin_combustible(
+        r_0=r, q_0=0.0, gamma_0=v / r, masa_cohete=1000.0,
+        diametro=diametro, dt=dt, t_max=periodo * periodos
+    )
+
+
+def configuraciones_escenarios(rapido=False):
+    """
+    Configuraciones de los escenarios completos.
+
+    Reproducen simulacion.py y los casos de tests/ (mortero, velocidad de
+    escape y órbitas LEO/GEO).
+
+    Args:
+        rapido (bool): Acortar el ascenso a LEO
+
+    Returns:
+        dict: Nombre del escenario -> tupla de ConfiguracionSimulacion
+    """
+    base = ConfiguracionSimulacion()
+    v_escape = math.sqrt(2 * base.mu / base.r_e)
+    escape = dict(
+        r_0=base.r_e + 100, gamma_0=0.0, masa_cohete=1000.0,
+        diametro=1.0, dt=1.0, t_max=3000.0
+    )
+    leo = base if not rapido else replace(base, t_max=2000.0)
+    geo = _orbita_circular(35786e3, 2.0, 10.0, 1.2)
+    return {
+        "leo_por_defecto": (leo,),
+        "mortero": (_sin_combustible(
+            r_0=base.r_e + 100, q_0=100.0, gamma_0=0.0, masa_cohete=100.0,
+            diametro=0.1, dt=0.1, t_max=30.0
+        ),),
+        "velocidad_escape": (
+            _sin_combustible(q_0=0.9 * v_escape, **escape),
+            _sin_combustible(q_0=v_escape, **escape),
+        ),
+        "orbitas_leo_geo": (
+            _orbita_circular(200e3, 2.0, 1.0, 1.5),
+            replace(geo, t_max=min(geo.t_max, 100000.0)),
+        ),
+    }
+
+
+def configuraciones_barrido(n=N_BARRIDO):
+    """
+    Configuraciones del barrido: ascensos cortos variando cd.
+
+    Args:
+        n (int): Cantidad de corridas
+
+    Returns:
+        tuple: Configuraciones del barrido
+    """
+    base = ConfiguracionSimulacion(metodo="forward_euler", dt=1.0, t_max=300.0)
+    return tuple(
+        replace(base, cd=0.3 + 0.4 * i / max(1, n - 1)) for i in range(n)
+    )
+
+
+def _correr_configuraciones(configs):
+    def correr():
+        pasos = 0
+        for config in configs:
+            cohete = Cohete.desde_configuracion(config)
+            cohete.simular()
+            pasos += len(cohete.r_hist) - 1
+        return pasos
+    return correr
+
+
+def escenarios(rapido=False):
+    """
+    Casos de escenarios completos, incluido el barrido.
+
+    Args:
+        rapido (bool): Versión corta (ascenso y barrido reducidos)
+
+    Returns:
+        dict: Nombre del escenario -> función a medir
+    """
+    casos = {
+        nombre: _correr_configuraciones(configs)
+        for nombre, configs in configuraciones_escenarios(rapido).items()
+    }
+    n = 100 if rapido else N_BARRIDO
+    casos[f"barrido_{n}"] = _correr_configuraciones(configuraciones_barrido(n))
+    return casos
+
+
+# =========================
+# EJECUCIÓN Y LÍNEAS BASE
+# =========================
+
+def ejecutar(solo=None, rapido=False, repeticiones=None):
+    """
+    Ejecuta la suite de benchmarks.
+
+    Args:
+        solo (str): "micro", "escenarios", "importacion", "costos" o
+            None para todos
+        rapido (bool): Versión corta de la suite
+        repeticiones (int): Repeticiones por caso (None = 5 para micro
+            e importación y 3 para escenarios)
+
+    Returns:
+        dict: Metadatos de la corrida y resultados por caso
+    """
+    grupos = []
+    if solo in (None, "micro"):
+        grupos.append(("micro", microbenchmarks(rapido), 5))
+    if solo in (None, "escenarios"):
+        grupos.append(("escenarios", escenarios(rapido), 3))
+
+    resultados = {}
+    for grupo, casos, rep_por_defecto in grupos:
+        for nombre, funcion in casos.items():
+            resultado = medir(funcion, repeticiones or rep_por_defecto)
+            resultado["grupo"] = grupo
+            resultados[nombre] = resultado
+            _imprimir_resultado(nombre, resultado)
+
+    if solo in (None, "importacion"):
+        casos = [(f"import {modulo}", modulo, None)
+                 for modulo in MODULOS_IMPORTACION]
+        casos += [(nombre, "run", argumentos)
+                  for nombre, argumentos in COMANDOS_IMPORTACION.items()]
+        for nombre, modulo, argumentos in casos:
+            resultado = medir_importacion(modulo, repeticiones or 5,
+                                          argumentos)
+            if resultado is None:
+                print(f"  {nombre:26s} sin medir (falta una dependencia "
+                      f"pesada)")
+                continue
+            resultado["grupo"] = "importacion"
+            resultados[nombre] = resultado
+            _imprimir_importacion(nombre, resultado)
+
+    if solo in (None, "costos"):
+        pasos = PASOS_CALIBRACION // 4 if rapido else PASOS_CALIBRACION
+        for nombre, config in configuraciones_calibracion(pasos).items():
+            resultado = medir(_correr_configuraciones((config,)),
+                              repeticiones or 5)
+            # Conteos de la corrida (deterministas) para la calibración
+            conteos = medir_corrida(config)
+            del conteos["tiempo_s"]
+            resultado.update(conteos)
+            resultado["grupo"] = "costos"
+            resultados[nombre] = resultado
+            _imprimir_resultado(nombre, resultado)
+        modelo = ModeloCosto.desde_linea_base({"resultados": resultados})
+        print(f"  Modelo de costo: {modelo.segundos_fijos * 1e3:.2f} ms "
+              f"fijos, {modelo.segundos_por_evaluacion * 1e6:.2f} µs por "
+              f"evaluación, {modelo.bytes_fijos / 1024:.0f} KB fijos")
+
+    return {"metadatos": _metadatos(rapido), "resultados": resultados}
+
+
+def guardar_linea_base(corrida, ruta):
+    """
+    Guarda una corrida como línea base en JSON.
+
+    Args:
+        corrida (dict): Resultado de ejecutar()
+        ruta (str): Archivo de destino
+    """
+    carpeta = os.path.dirname(ruta)
+    if carpeta:
+        os.makedirs(carpeta, exist_ok=True)
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(corrida, archivo, indent=2, ensure_ascii=False)
+        archivo.write("\n")
+
+
+def cargar_linea_base(ruta):
+    """
+    Carga una línea base guardada con guardar_linea_base().
+
+    Args:
+        ruta (str): Archivo JSON
+
+    Returns:
+        dict: Corrida guardada
+    """
+    with open(ruta, encoding="utf-8") as archivo:
+        return json.load(archivo)
+
+
+def comparar(corrida, base, umbral=UMBRAL_REGRESION):
+    """
+    Compara una corrida contra una línea base.
+
+    Se compara el tiempo por paso (tiempo_s / pasos), así que las líneas
+    base de la versión rápida y la completa son comparables entre sí.
+
+    Args:
+        corrida (dict): Resultado de ejecutar()
+        base (dict): Línea base
+        umbral (float): Aumento relativo tolerado (0.10 = 10 %)
+
+    Returns:
+        list: Tuplas (caso, tiempo por paso base, actual, cambio
+            relativo, es_regresion) de los casos presentes en ambas
+    """
+    comparacion = []
+    for nombre, actual in corrida["resultados"].items():
+        previo = base["resultados"].get(nombre)
+        if previo is None or not previo["pasos"] or not actual["pasos"]:
+            continue
+        t_base = previo["tiempo_s"] / previo["pasos"]
+        t_actual = actual["tiempo_s"] / actual["pasos"]
+        cambio = t_actual / t_base - 1.0
+        comparacion.append((nombre, t_base, t_actual, cambio, cambio > umbral))
+    return comparacion
+
+
+def _metadatos(rapido):
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, timeout=5,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "procesador": platform.machine(),
+        "rapido": rapido,
+    }
+
+
+def _imprimir_resultado(nombre, resultado):
+    memoria = resultado["memoria_pico_kb"]
+    texto_memoria = f"{memoria:10.1f} KB" if memoria is not None else ""
+    print(
+        f"  {nombre:26s} {resultado['tiempo_s']:9.4f} s "
+        f"{resultado['pasos_por_s']:14,.0f} pasos/s {texto_memoria}"
+    )
+
+
+def _imprimir_importacion(nombre, resultado):
+    marca = ""
+    if nombre == "import cohete":
+        marca = ("✓" if resultado["tiempo_s"] <= OBJETIVO_IMPORTACION_S
+                 else "✗") + f" objetivo {OBJETIVO_IMPORTACION_S * 1000:.0f} ms"
+    elif nombre in COMANDOS_IMPORTACION:
+        marca = "✗" if resultado["modulos_pesados"] else "✓"
+    pesados = ", ".join(resultado["modulos_pesados"]) or "ninguno"
+    print(
+        f"  {nombre:26s} {resultado['tiempo_s'] * 1000:9.1f} ms "
+        f"(pesados: {pesados}) {marca}".rstrip()
+    )
+
+
+def main(argv=None):
+    """
+    Punto de entrada de línea de comandos.
+
+    Returns:
+        int: 0 si no hay regresiones, 1 si las hay
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmarks de la simulación del cohete"
+    )
+    parser.add_argument("--solo", choices=("micro", "escenarios",
+                                           "importacion", "costos"),
+                        help="Correr solo un grupo de casos")
+    parser.add_argument("--rapido", action="store_true",
+                        help="Versión corta de la suite")
+    parser.add_argument("--repeticiones", type=int,
+                        help="Repeticiones por caso")
+    parser.add_argument("--guardar", metavar="RUTA",
+                        help="Guardar la corrida como línea base")
+    parser.add_argument("--comparar", metavar="RUTA", nargs="?",
+                        const=RUTA_LINEA_BASE,
+                        help="Comparar contra una línea base "
+                             "(por defecto lineas_base/referencia.json)")
+    parser.add_argument("--umbral", type=float, default=UMBRAL_REGRESION,
+                        help="Aumento relativo tolerado (por defecto 0.10)")
+    args = parser.parse_args(argv)
+
+    print("="*70)
+    print("BENCHMARKS")
+    print("="*70)
+    corrida = ejecutar(args.solo, args.rapido, args.repeticiones)
+
+    if args.guardar:
+        guardar_linea_base(corrida, args.guardar)
+        print(f"\nLínea base guardada en {args.guardar}")
+
+    hay_regresiones = False
+    if args.comparar:
+        base = cargar_linea_base(args.comparar)
+        print(f"\nComparación con {args.comparar} "
+              f"(commit {base['metadatos'].get('commit')}, "
+              f"umbral {args.umbral:.0%}):")
+        for nombre, t_base, t_actual, cambio, regresion in comparar(
+                corrida, base, args.umbral):
+            marca = "✗" if regresion else "✓"
+            print(f"  {marca} {nombre:26s} {t_base*1e6:10.3f} -> "
+                  f"{t_actual*1e6:10.3f} µs/paso ({cambio:+.1%})")
+            hay_regresiones = hay_regresiones or regresion
+
+    return 1 if hay_regresiones else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
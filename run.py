@@ -1,64 +1,1142 @@
 """
-Script de ayuda para ejecutar todas las funcionalidades del proyecto
+Línea de comandos del simulador (no interactiva).
+
+Subcomandos:
+    simulate  Simular una configuración y mostrar el resumen
+    sweep     Barrer un parámetro de la configuración en un pool de procesos
+    montecarlo  Dispersión Monte Carlo de las métricas de inserción
+    incertidumbre  Media y covarianza de la inserción (transformada unscented)
+    sensibilidad  Índices de Sobol de las métricas de inserción
+    jacobiano  Estado final y sus derivadas (números duales)
+    disparo   Ajustar el perfil para una órbita circular (Newton-Broyden)
+    sustituto  Consultas "¿y si...?" a un modelo sustituto de las métricas
+    multifidelidad  Ordenar candidatos con fidelidad creciente
+    factibilidad  Prefiltro analítico (delta-v, empuje/peso) de una grilla
+    parareal  Simular una trayectoria larga en paralelo en el tiempo
+    vida      Vida orbital desde la inserción (arrastre promediado)
+    plot      Simular y generar los gráficos de graficos.py
+    bench     Correr los benchmarks de rendimiento.py
+    test      Correr los tests de tests/ en paralelo
+
+Todo corre en este mismo proceso (o en un pool de procesos para sweep,
+montecarlo, incertidumbre, sensibilidad, disparo, sustituto,
+multifidelidad, parareal y test); matplotlib solo se importa en los comandos que grafican.
+
+Ejemplos:
+    python run.py simulate --metodo rk4 --dt 1 --t-max 600
+    python run.py simulate --set cd=0.5 --set beta_altura=True --json
+    python run.py sweep --param cd --valores 0.3:0.7:41 -j 8
+    python run.py sweep --param isp --valores 200:340:15 --prefiltro
+    python run.py montecarlo -n 10000 --dist cd=uniforme:0.4:0.55
+    python run.py montecarlo --repetir 137
+    python run.py incertidumbre --desvio cd=0.05 --verificar 2000
+    python run.py sensibilidad -n 256 --rango cd=uniforme:0.3:0.6 --sumar
+    python run.py jacobiano --var cd --var angulo_guiado_3 --verificar
+    python run.py disparo --altura 185 --libre mdot_fase_1 --libre h_1 --libre h_2
+    python run.py sustituto --rango cd=0.3:0.6 --rango masa_fuel=-2%:+2% \
+        --modelo sustituto.json --consulta cd=0.45,masa_fuel=-1%
+    python run.py multifidelidad --grilla tiempo_guiado_4=75:115:9 \
+        --grilla angulo_guiado_2=0.1:0.7:9 --control 12
+    python run.py factibilidad --grilla isp=200:340:8 \
+        --grilla masa_fuel=300000:600000:7
+    python run.py parareal --t-max 200000 --tramos 16 --verificar
+    python run.py vida --metodo rk4 --dt 1 --t-max 600
+    python run.py simulate --t-max 200000 --memoria 256M --disco /tmp/hist
+    python run.py simulate --metodo adaptativo --estimar
+    python run.py plot
+    python run.py bench --rapido --comparar
+    python run.py test
 """
+
+import argparse
+import ast
+import contextlib
+import glob
+import io
+import itertools
+import json
+import math
+import os
 import sys
-import subprocess
-
-def mostrar_menu():
-    print("="*70)
-    print("🚀 SIMULADOR DE COHETE A ÓRBITA LEO")
-    print("="*70)
-    print("\nOpciones:")
-    print("  1. Ejecutar simulación principal (simulacion.py)")
-    print("  2. Ejecutar test de mortero (tiro parabólico)")
-    print("  3. Ejecutar test de velocidad de escape")
-    print("  4. Ejecutar test de órbitas LEO/GEO")
-    print("  5. Ejecutar TODOS los tests")
-    print("  0. Salir")
-    print("="*70)
-
-def ejecutar_comando(cmd, descripcion):
-    print(f"\n▶ {descripcion}...")
-    print("-"*70)
-    result = subprocess.run(cmd, shell=True)
-    print("-"*70)
-    if result.returncode == 0:
-        print(f"✓ {descripcion} completado exitosamente\n")
+import time
+import traceback
+
+
+CARPETA_TESTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tests")
+
+
+# =========================
+# CONFIGURACIÓN DESDE ARGUMENTOS
+# =========================
+
+def _agregar_opciones_config(parser):
+    parser.add_argument("--metodo", help="Integrador (ver integradores.py) "
+                        "o scipy:<método>")
+    parser.add_argument("--dt", type=float, help="Paso de tiempo (s)")
+    parser.add_argument("--t-max", type=float, dest="t_max",
+                        help="Tiempo máximo (s)")
+    parser.add_argument("--set", action="append", default=[],
+                        metavar="CAMPO=VALOR", dest="cambios",
+                        help="Modificar un campo de ConfiguracionSimulacion "
+                             "(se puede repetir)")
+
+
+def _agregar_opciones_memoria(parser):
+    parser.add_argument("--memoria", default="auto",
+                        help="Presupuesto de memoria para los historiales "
+                             "(bytes, 512M, 2G o auto; en sweep es el total "
+                             "de la máquina). Por defecto: auto")
+    parser.add_argument("--disco", metavar="CARPETA",
+                        help="Volcar a esta carpeta los historiales que no "
+                             "entren en memoria (si no, se diezman)")
+
+
+def _agregar_opciones_prefiltro(parser):
+    parser.add_argument("--prefiltro", action="store_true",
+                        help="No simular las configuraciones que el "
+                             "prefiltro analítico descarta (factibilidad.py)")
+    parser.add_argument("--perdidas", type=float, default=500.0,
+                        help="Tolerancia de pérdidas del prefiltro en m/s "
+                             "(por defecto 500)")
+
+
+def _interpretar_valor(texto):
+    """Convierte un valor de la línea de comandos (número, tupla, bool...)."""
+    try:
+        return ast.literal_eval(texto)
+    except (ValueError, SyntaxError):
+        return texto
+
+
+def configuracion_desde_args(args):
+    """
+    Construye la configuración a partir de las opciones comunes.
+
+    Args:
+        args (argparse.Namespace): Argumentos con metodo, dt, t_max y
+            cambios ("campo=valor")
+
+    Returns:
+        ConfiguracionSimulacion: Configuración resultante
+
+    Raises:
+        ValueError: Si un cambio no tiene la forma campo=valor o el campo
+            no existe
+    """
+    from dataclasses import fields, replace
+    from configuracion import ConfiguracionSimulacion
+
+    campos = {campo.name for campo in fields(ConfiguracionSimulacion)}
+    cambios = {}
+    for nombre in ("metodo", "dt", "t_max"):
+        if getattr(args, nombre) is not None:
+            cambios[nombre] = getattr(args, nombre)
+    for cambio in args.cambios:
+        nombre, separador, valor = cambio.partition("=")
+        nombre = nombre.strip()
+        if not separador:
+            raise ValueError(f"Se esperaba CAMPO=VALOR: {cambio!r}")
+        if nombre not in campos:
+            raise ValueError(f"Campo desconocido: {nombre!r}")
+        cambios[nombre] = _interpretar_valor(valor.strip())
+    return replace(ConfiguracionSimulacion(), **cambios)
+
+
+def valores_barrido(texto):
+    """
+    Interpreta los valores de un barrido.
+
+    Args:
+        texto (str): "inicio:fin:cantidad" (equiespaciados, extremos
+            incluidos) o una lista separada por comas
+
+    Returns:
+        list: Valores del barrido
+    """
+    if ":" in texto:
+        inicio, fin, cantidad = texto.split(":")
+        inicio, fin, cantidad = float(inicio), float(fin), int(cantidad)
+        if cantidad == 1:
+            return [inicio]
+        paso = (fin - inicio) / (cantidad - 1)
+        return [inicio + k * paso for k in range(cantidad)]
+    return [_interpretar_valor(v.strip()) for v in texto.split(",")]
+
+
+# =========================
+# COMANDOS
+# =========================
+
+def comando_simulate(args):
+    from cohete import Cohete
+    from perfilado import Perfilador
+    from telemetria import Telemetria
+
+    config = configuracion_desde_args(args)
+    cohete = Cohete.desde_configuracion(config)
+    if args.estimar:
+        estimacion = cohete.estimar_costo(
+            presupuesto_memoria=args.memoria,
+            directorio_registro=args.disco,
+        )
+        if args.json:
+            datos = estimacion._asdict()
+            datos["registro"] = estimacion.registro.informe()
+            json.dump(datos, sys.stdout, indent=2, ensure_ascii=False)
+            print()
+        else:
+            print(f"{estimacion.metodo}: {estimacion.pasos} pasos como "
+                  f"máximo, ~{estimacion.segundos:.2f} s, "
+                  f"~{estimacion.bytes_pico / 2**20:.1f} MiB pico")
+            print(estimacion.registro.describir())
+        return 0
+    perfil = Perfilador() if args.perfil else None
+    telemetria = Telemetria.nula() if args.json else None
+
+    inicio = time.perf_counter()
+    resumen = cohete.simular(log_cada=args.log_cada, perfil=perfil,
+                             telemetria=telemetria,
+                             presupuesto_memoria=args.memoria,
+                             directorio_registro=args.disco)
+    resumen["tiempo_pared_s"] = time.perf_counter() - inicio
+    resumen["masa_final"] = cohete.masa
+    resumen["huella"] = config.huella()
+
+    if args.perfil:
+        perfil.guardar_informe(args.perfil)
+    if args.json:
+        json.dump(resumen, sys.stdout, indent=2, ensure_ascii=False)
+        print()
     else:
-        print(f"✗ Error al ejecutar {descripcion}\n")
-    return result.returncode
-
-def main():
-    while True:
-        mostrar_menu()
-        opcion = input("\nSelecciona una opción: ").strip()
-        
-        if opcion == "0":
-            print("\n¡Hasta luego! 🚀")
-            break
-        elif opcion == "1":
-            ejecutar_comando("python simulacion.py", "Simulación principal")
-        elif opcion == "2":
-            ejecutar_comando("python tests/test_mortero.py", "Test de mortero")
-        elif opcion == "3":
-            ejecutar_comando("python tests/test_velocidad_escape.py", "Test de velocidad de escape")
-        elif opcion == "4":
-            ejecutar_comando("python tests/test_orbitas.py", "Test de órbitas LEO/GEO")
-        elif opcion == "5":
-            print("\n" + "="*70)
-            print("EJECUTANDO TODOS LOS TESTS")
-            print("="*70)
-            ejecutar_comando("python tests/test_mortero.py", "Test 1/3: Mortero")
-            ejecutar_comando("python tests/test_velocidad_escape.py", "Test 2/3: Velocidad de escape")
-            ejecutar_comando("python tests/test_orbitas.py", "Test 3/3: Órbitas LEO/GEO")
-            print("\n" + "="*70)
-            print("✓ TODOS LOS TESTS COMPLETADOS")
-            print("="*70)
+        from graficos import imprimir_metricas_finales
+        imprimir_metricas_finales(cohete, config.dt * cohete.cada_registro)
+        registro = resumen.get("registro")
+        if registro is not None and registro["estrategia"] != "completo":
+            print(f"Registro {registro['estrategia']}: "
+                  f"{len(cohete.r_hist)} muestras, 1 de cada "
+                  f"{registro['cada']} pasos"
+                  + (f", en {registro['carpeta']}"
+                     if "carpeta" in registro else ""))
+        print(f"Fin: {resumen['end_reason']} en {resumen['iter']} pasos "
+              f"({resumen['tiempo_pared_s']:.2f} s de pared)")
+    return 0
+
+
+def comando_sweep(args):
+    from dataclasses import replace
+    from barrido import ejecutar_barrido
+
+    base = configuracion_desde_args(args)
+    valores = valores_barrido(args.valores)
+    configs = [replace(base, **{args.param: valor}) for valor in valores]
+    simular = range(len(configs))
+    if args.prefiltro:
+        from factibilidad import prefiltrar
+        prefiltro = prefiltrar(configs, perdidas=args.perdidas)
+        simular = prefiltro.factibles
+
+    inicio = time.perf_counter()
+    resultados = [None] * len(configs)
+    corridas = ejecutar_barrido([configs[i] for i in simular],
+                                trabajadores=args.trabajadores,
+                                presupuesto_memoria=args.memoria,
+                                directorio_registro=args.disco)
+    for i, resumen in zip(simular, corridas):
+        resultados[i] = resumen
+    duracion = time.perf_counter() - inicio
+
+    salida = open(args.salida, "w", encoding="utf-8") if args.salida else None
+    try:
+        print(f"{args.param:>14s} {'fin':>16s} {'h final (km)':>14s} "
+              f"{'masa final (kg)':>16s}")
+        for i, (valor, resumen) in enumerate(zip(valores, resultados)):
+            if resumen is None:
+                evaluacion = prefiltro.evaluaciones[i]
+                print(f"{valor!s:>14.14s} {'descartado':>16s}  "
+                      f"{'; '.join(evaluacion.motivos)}")
+                if salida is not None:
+                    salida.write(json.dumps({
+                        args.param: valor, "end_reason": "descartado",
+                        "motivos": list(evaluacion.motivos),
+                    }, ensure_ascii=False) + "\n")
+                continue
+            print(f"{valor!s:>14.14s} {resumen['end_reason']:>16s} "
+                  f"{resumen['h_final_m'] / 1000:14.3f} "
+                  f"{resumen['masa_final']:16.1f}")
+            if salida is not None:
+                salida.write(json.dumps({args.param: valor, **resumen},
+                                        ensure_ascii=False) + "\n")
+    finally:
+        if salida is not None:
+            salida.close()
+    descartados = len(configs) - len(simular)
+    print(f"\n{len(simular)} corridas en {duracion:.2f} s"
+          + (f" ({descartados} descartadas por el prefiltro)"
+             if descartados else ""))
+    return 0
+
+
+def comando_montecarlo(args):
+    import montecarlo
+
+    base = configuracion_desde_args(args)
+    dispersion = montecarlo.dispersion_por_defecto(base, args.semilla)
+    if args.dist:
+        parametros = dict(dispersion.parametros) if args.sumar else {}
+        for texto in args.dist:
+            nombre, separador, distribucion = texto.partition("=")
+            if not separador:
+                raise ValueError(f"Se esperaba PARAMETRO=DISTRIBUCION: "
+                                 f"{texto!r}")
+            parametros[nombre.strip()] = montecarlo.distribucion_desde_texto(
+                distribucion.strip()
+            )
+        dispersion = montecarlo.Dispersion(parametros, base, args.semilla)
+
+    if args.repetir is not None:
+        valores = dispersion.valores(args.repetir)
+        cohete = dispersion.repetir(args.repetir)
+        datos = {"muestra": args.repetir, "valores": valores,
+                 **montecarlo.metricas_finales(cohete)}
+        if args.json:
+            json.dump(datos, sys.stdout, indent=2, ensure_ascii=False)
+            print()
         else:
-            print("\n⚠ Opción inválida. Por favor selecciona 0-5.")
-        
-        if opcion != "0":
-            input("\nPresiona Enter para continuar...")
+            for nombre, valor in datos.items():
+                print(f"{nombre:>22s}: {valor}")
+        return 0
+
+    inicio = time.perf_counter()
+    agregado = montecarlo.ejecutar_montecarlo(
+        dispersion, args.muestras, trabajadores=args.trabajadores,
+        tramos=args.tramos,
+    )
+    duracion = time.perf_counter() - inicio
+    informe = agregado.informe()
+    if args.json:
+        json.dump(informe, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+        return 0
+    print(", ".join(f"{nombre} ~ {distribucion}"
+                    for nombre, distribucion in dispersion.parametros))
+    print(f"\n{'métrica':>22s} {'media':>11s} {'desvío':>10s} {'p5':>11s} "
+          f"{'p50':>11s} {'p95':>11s} {'i mín':>6s} {'i máx':>6s}")
+    for nombre in montecarlo.METRICAS:
+        datos = informe[nombre]
+        cuantiles = datos["cuantiles"]
+        print(f"{nombre:>22s} {datos['media']:11.4g} {datos['desvio']:10.3g} "
+              f"{cuantiles['p5']:11.4g} {cuantiles['p50']:11.4g} "
+              f"{cuantiles['p95']:11.4g} {datos['indice_minimo']!s:>6s} "
+              f"{datos['indice_maximo']!s:>6s}")
+    print(f"\nFin: {informe['motivos_fin']}")
+    print(f"{informe['muestras']} muestras en {duracion:.2f} s "
+          f"(--repetir N para simular una muestra)")
+    return 0
+
+
+def comando_incertidumbre(args):
+    import propagacion
+
+    base = configuracion_desde_args(args)
+    incertidumbre = propagacion.incertidumbre_por_defecto(base)
+    if args.desvio:
+        desvios = dict(incertidumbre.desvios)
+        for texto in args.desvio:
+            nombre, separador, desvio = texto.partition("=")
+            if not separador:
+                raise ValueError(f"Se esperaba PARAMETRO=DESVIO: {texto!r}")
+            desvios[nombre.strip()] = float(desvio)
+        incertidumbre = propagacion.IncertidumbreGaussiana(desvios, base)
+
+    resultados = [propagacion.propagar_unscented(
+        incertidumbre, trabajadores=args.trabajadores
+    )]
+    if args.verificar:
+        resultados.append(propagacion.propagar_montecarlo(
+            incertidumbre, args.verificar, trabajadores=args.trabajadores,
+            semilla=args.semilla,
+        ))
+    if args.json:
+        datos = {resultado.metodo: resultado.informe()
+                 for resultado in resultados}
+        if args.verificar:
+            datos["comparacion"] = propagacion.comparar(*resultados)
+        json.dump(datos, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+        return 0
+    print(", ".join(f"{nombre} σ={desvio:g}"
+                    for nombre, desvio in incertidumbre.desvios))
+    for resultado in resultados:
+        print(resultado.describir())
+    if args.verificar:
+        print("Unscented contra Monte Carlo:")
+        for nombre, datos in propagacion.comparar(*resultados).items():
+            print(f"  {nombre:>24s} media {datos['error_media_sigmas']:+.3f} σ,"
+                  f" desvío ×{datos['razon_desvios']:.3f}")
+    return 0
+
+
+def comando_sensibilidad(args):
+    import montecarlo
+    import sensibilidad
+
+    base = configuracion_desde_args(args)
+    parametros = dict(
+        sensibilidad.dispersion_sensibilidad_por_defecto(base).parametros
+    )
+    if args.rango and not args.sumar:
+        parametros = {}
+    for texto in args.rango:
+        nombre, separador, distribucion = texto.partition("=")
+        if not separador:
+            raise ValueError(f"Se esperaba PARAMETRO=DISTRIBUCION: {texto!r}")
+        parametros[nombre.strip()] = montecarlo.distribucion_desde_texto(
+            distribucion.strip()
+        )
+    dispersion = montecarlo.Dispersion(parametros, base, args.semilla)
+
+    inicio = time.perf_counter()
+    resultado = sensibilidad.analizar_sensibilidad(
+        dispersion, args.muestras, salidas=args.salida or sensibilidad.SALIDAS,
+        trabajadores=args.trabajadores, remuestreos=args.remuestreos,
+    )
+    duracion = time.perf_counter() - inicio
+    if args.json:
+        json.dump(resultado.informe(), sys.stdout, indent=2,
+                  ensure_ascii=False)
+        print()
+        return 0
+    print(", ".join(f"{nombre} ~ {distribucion}"
+                    for nombre, distribucion in dispersion.parametros))
+    print(resultado.describir())
+    print(f"\n{duracion:.2f} s")
+    return 0
+
+
+def comando_jacobiano(args):
+    import jacobiano
+
+    config = configuracion_desde_args(args)
+    variables = args.var or jacobiano.variables_por_defecto(config)
+    inicio = time.perf_counter()
+    resultado = jacobiano.simular_con_jacobiano(config, variables)
+    duracion = time.perf_counter() - inicio
+    resultados = [(f"duales ({duracion:.2f} s)", resultado)]
+    if args.verificar:
+        inicio = time.perf_counter()
+        referencia = jacobiano.jacobiano_por_diferencias(
+            config, variables, trabajadores=args.trabajadores
+        )
+        duracion = time.perf_counter() - inicio
+        resultados.append((f"diferencias finitas ({referencia.simulaciones} "
+                           f"corridas, {duracion:.2f} s)", referencia))
+    if args.json:
+        datos = resultado.informe()
+        if args.verificar:
+            datos["diferencias_finitas"] = referencia.informe()["jacobiano"]
+        json.dump(datos, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+        return 0
+    print(f"Estado final (t = {resultado.t_final:g} s, "
+          f"{resultado.end_reason}):")
+    for componente, valor in zip(jacobiano.COMPONENTES, resultado.estado):
+        print(f"  {componente:>6s} = {valor:.10g}")
+    for titulo, datos in resultados:
+        print(f"\nDerivadas por {titulo}:")
+        print(f"  {'variable':>18s}" + "".join(
+            f" {'∂' + componente:>12s}" for componente in jacobiano.COMPONENTES
+        ))
+        for j, variable in enumerate(variables):
+            print(f"  {variable:>18s}" + "".join(
+                f" {fila[j]:12.5g}" for fila in datos.jacobiano
+            ))
+    return 0
+
+
+def comando_parareal(args):
+    import parareal
+
+    config = configuracion_desde_args(args)
+    resultado = parareal.simular_parareal(
+        config, tramos=args.tramos, metodo_grueso=args.grueso,
+        dt_grueso=args.dt_grueso, tolerancia=args.tolerancia,
+        iteraciones=args.iteraciones, trabajadores=args.trabajadores,
+    )
+    datos = resultado.informe()
+    if args.verificar:
+        from cohete import Cohete
+        from telemetria import Telemetria
+
+        inicio = time.perf_counter()
+        cohete = Cohete.desde_configuracion(config)
+        resumen = cohete.simular(telemetria=Telemetria.nula())
+        duracion = time.perf_counter() - inicio
+        datos["serie"] = {
+            "estado": list(cohete.estado),
+            "end_reason": resumen["end_reason"],
+            "segundos": duracion,
+            "aceleracion": duracion / resultado.segundos,
+            "distancia_m": parareal.distancia(resultado.estado,
+                                              cohete.estado),
+        }
+    if args.json:
+        json.dump(datos, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+        return 0 if resultado.convergido else 1
+    print(resultado.describir())
+    if args.verificar:
+        serie = datos["serie"]
+        print(f"\nCorrida serie: {serie['end_reason']} en "
+              f"{serie['segundos']:.2f} s (aceleración medida "
+              f"{serie['aceleracion']:.2f}x), diferencia de posición "
+              f"{serie['distancia_m']:.3g} m")
+    return 0 if resultado.convergido else 1
+
+
+def comando_vida(args):
+    from cohete import Cohete
+    from telemetria import Telemetria
+    from vida_orbital import SEGUNDOS_DIA, predecir_vida
+
+    config = configuracion_desde_args(args)
+    inicio = time.perf_counter()
+    cohete = Cohete.desde_configuracion(config)
+    resumen = cohete.simular(telemetria=Telemetria.nula(),
+                             presupuesto_memoria="auto")
+    duracion = time.perf_counter() - inicio
+    vida = predecir_vida(config, cohete.estado,
+                         altura_reingreso=args.reingreso * 1000,
+                         fraccion=args.fraccion,
+                         vida_maxima=args.max_anios * 365.25 * SEGUNDOS_DIA)
+    if args.json:
+        json.dump({"insercion": {"end_reason": resumen["end_reason"],
+                                 "t_final": resumen["t_final"],
+                                 "estado": list(cohete.estado)},
+                   **vida.informe()},
+                  sys.stdout, indent=2, ensure_ascii=False)
+        print()
+        return 0
+    print(f"Inserción: {resumen['end_reason']} en t = "
+          f"{resumen['t_final']:g} s ({duracion:.2f} s de simulación)")
+    print(vida.describir())
+    return 0
+
+
+def comando_disparo(args):
+    import math
+    import disparo
+
+    config = configuracion_desde_args(args)
+    inicio = time.perf_counter()
+    resultado = disparo.resolver_disparo(
+        config, altura=args.altura * 1e3, parametros=args.libre or None,
+        iteraciones_max=args.iteraciones, trabajadores=args.trabajadores,
+    )
+    duracion = time.perf_counter() - inicio
+    if args.json:
+        json.dump(resultado.informe(), sys.stdout, indent=2,
+                  ensure_ascii=False)
+        print()
+        return 0 if resultado.convergio else 1
+    print(f"Órbita circular a {args.altura:g} km: {resultado.describir()}")
+    ajustada = resultado.config
+    print("\nPerfil ajustado:")
+    print("  fases_mdot = (" + ", ".join(
+        f"({t:.6g}, {mdot:.6g})" for t, mdot in ajustada.fases_mdot) + ")")
+    if ajustada.beta_altura:
+        print(f"  h_0, h_1, h_2 = {ajustada.h_0:.6g}, {ajustada.h_1:.6g}, "
+              f"{ajustada.h_2:.6g}")
+    else:
+        print("  tiempos_beta = (" + ", ".join(
+            f"{t:.6g}" for t in ajustada.tiempos_beta) + ")")
+        print("  betas (°)    = (" + ", ".join(
+            f"{math.degrees(b):.6g}" for b in ajustada.betas_tiempo) + ")")
+    print(f"\n{duracion:.2f} s")
+    return 0 if resultado.convergio else 1
+
+
+def _valor_relativo(base, nombre, texto):
+    """Valor de un parámetro; "N%" es relativo a su valor nominal."""
+    import montecarlo
+
+    texto = texto.strip()
+    if texto.endswith("%"):
+        return (montecarlo.valor_nominal(base, nombre)
+                * (1 + float(texto[:-1]) / 100))
+    return float(texto)
+
+
+def comando_sustituto(args):
+    import sustituto as modulo
+
+    base = configuracion_desde_args(args)
+    rangos = {}
+    for texto in args.rango:
+        nombre, separador, rango = texto.partition("=")
+        inferior, dos_puntos, superior = rango.rpartition(":")
+        if not separador or not dos_puntos:
+            raise ValueError(f"Se esperaba PARAMETRO=MIN:MAX: {texto!r}")
+        nombre = nombre.strip()
+        rangos[nombre] = (_valor_relativo(base, nombre, inferior),
+                          _valor_relativo(base, nombre, superior))
+    tolerancias = {}
+    for texto in args.tolerancia:
+        metrica, _, valor = texto.partition("=")
+        tolerancias[metrica.strip()] = float(valor)
+
+    inicio = time.perf_counter()
+    if args.modelo and os.path.exists(args.modelo):
+        modelo = modulo.Sustituto.cargar(args.modelo, base)
+        modelo.tolerancias.update(tolerancias)
+        if rangos:
+            modelo.ampliar(rangos, args.muestras, args.trabajadores)
+    elif rangos:
+        modelo = modulo.Sustituto.entrenar(
+            base, rangos, args.muestras,
+            metricas=args.metrica or modulo.METRICAS,
+            tolerancias=tolerancias, trabajadores=args.trabajadores,
+        )
+    else:
+        raise ValueError("Se necesita --rango para entrenar o un --modelo "
+                         "existente")
+
+    puntos = []
+    for texto in args.consulta:
+        punto = {}
+        for asignacion in texto.split(","):
+            nombre, separador, valor = asignacion.partition("=")
+            if not separador:
+                raise ValueError(f"Se esperaba PARAMETRO=VALOR: "
+                                 f"{asignacion!r}")
+            nombre = nombre.strip()
+            punto[nombre] = _valor_relativo(base, nombre, valor)
+        puntos.append(punto)
+    consultas = modelo.consultar_varios(puntos, args.trabajadores)
+    duracion = time.perf_counter() - inicio
+    if args.modelo:
+        modelo.guardar(args.modelo)
+
+    if args.json:
+        json.dump([consulta._asdict() for consulta in consultas], sys.stdout,
+                  indent=2, ensure_ascii=False)
+        print()
+        return 0
+    for consulta in consultas:
+        print(consulta.describir())
+    simuladas = sum(consulta.simulada for consulta in consultas)
+    print(f"\n{len(consultas)} consultas ({simuladas} simuladas); "
+          f"{len(modelo)} corridas en los datos, {modelo.simulaciones} "
+          f"nuevas; {duracion:.2f} s")
+    return 0
+
+
+def _grilla_desde_args(textos):
+    """Parámetro -> valores de las opciones --grilla PARAMETRO=VALORES."""
+    grilla = {}
+    for texto in textos:
+        nombre, separador, valores = texto.partition("=")
+        if not separador:
+            raise ValueError(f"Se esperaba PARAMETRO=VALORES: {texto!r}")
+        grilla[nombre.strip()] = valores_barrido(valores)
+    if not grilla:
+        raise ValueError("Se necesita al menos una --grilla")
+    return grilla
+
+
+def comando_multifidelidad(args):
+    import multifidelidad
+
+    base = configuracion_desde_args(args)
+    grilla = _grilla_desde_args(args.grilla)
+    niveles = multifidelidad.NIVELES
+    if args.nivel:
+        niveles = []
+        for texto in args.nivel:
+            if texto == "candidato":
+                niveles.append(multifidelidad.Nivel())
+                continue
+            metodo, _, dt = texto.partition(":")
+            niveles.append(multifidelidad.Nivel(metodo or None,
+                                                float(dt) if dt else None))
+    candidatos = multifidelidad.candidatos_grilla(base, grilla)
+    nombres = list(grilla)
+    combinaciones = list(itertools.product(*grilla.values()))
+    descartados = 0
+    if args.prefiltro:
+        from factibilidad import prefiltrar
+        factibles = prefiltrar(candidatos, perdidas=args.perdidas).factibles
+        if not factibles:
+            raise ValueError("El prefiltro descartó todos los candidatos")
+        descartados = len(candidatos) - len(factibles)
+        candidatos = [candidatos[i] for i in factibles]
+        combinaciones = [combinaciones[i] for i in factibles]
+
+    inicio = time.perf_counter()
+    resultado = multifidelidad.evaluar_multifidelidad(
+        candidatos, objetivo=args.objetivo, maximizar=not args.minimizar,
+        niveles=niveles, fraccion=args.fraccion, control=args.control,
+        semilla=args.semilla, trabajadores=args.trabajadores,
+    )
+    duracion = time.perf_counter() - inicio
+    if args.json:
+        informe = resultado.informe()
+        for fila in informe["ranking"]:
+            fila["parametros"] = dict(zip(nombres,
+                                          combinaciones[fila["indice"]]))
+        json.dump(informe, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+        return 0
+    print(resultado.describir())
+    print("\nMejor candidato: " + ", ".join(
+        f"{nombre} = {valor:g}" for nombre, valor
+        in zip(nombres, combinaciones[resultado.mejor])))
+    print(f"{len(candidatos)} candidatos en {duracion:.2f} s"
+          + (f" ({descartados} descartados por el prefiltro)"
+             if descartados else ""))
+    return 0
+
+
+def comando_factibilidad(args):
+    from factibilidad import prefiltrar
+    from multifidelidad import candidatos_grilla
+
+    base = configuracion_desde_args(args)
+    grilla = _grilla_desde_args(args.grilla)
+    configs = candidatos_grilla(base, grilla)
+    inicio = time.perf_counter()
+    prefiltro = prefiltrar(configs, altura=args.altura * 1000,
+                           perdidas=args.perdidas)
+    duracion = time.perf_counter() - inicio
+    nombres = list(grilla)
+    filas = [{
+        "parametros": dict(zip(nombres, punto)),
+        **evaluacion._asdict(),
+        "tiempo_agotamiento": (None if math.isinf(
+            evaluacion.tiempo_agotamiento) else evaluacion.tiempo_agotamiento),
+        "motivos": list(evaluacion.motivos),
+        "factible": evaluacion.factible,
+    } for punto, evaluacion in zip(itertools.product(*grilla.values()),
+                                   prefiltro.evaluaciones)]
+    if args.json:
+        json.dump(filas, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+        return 0
+    encabezado = " ".join(f"{nombre:>14.14s}" for nombre in nombres)
+    print(f"{encabezado} {'delta-v':>9s} {'margen':>8s} {'E/P':>6s} "
+          f"{'quemado (s)':>12s}")
+    for fila in filas:
+        if args.solo_factibles and not fila["factible"]:
+            continue
+        print(" ".join(f"{valor!s:>14.14s}"
+                       for valor in fila["parametros"].values())
+              + f" {fila['delta_v']:9.1f} "
+                f"{fila['delta_v'] - fila['delta_v_necesario']:+8.1f} "
+                f"{fila['empuje_peso']:6.2f} {fila['tiempo_quemado']:12.1f}"
+              + ("" if fila["factible"] else "  descartado"))
+    print(f"\n{len(prefiltro.factibles)} de {len(configs)} factibles "
+          f"({duracion * 1000:.1f} ms)")
+    return 0
+
+
+def comando_plot(args):
+    import matplotlib
+    matplotlib.use("Agg")
+    import simulacion
+
+    simulacion.main(configuracion_desde_args(args))
+    return 0
+
+
+def correr_test(ruta):
+    """
+    Ejecuta un script de tests/ y captura su salida.
+
+    Corre en el directorio del script y con el backend Agg de
+    matplotlib, así puede ejecutarse en un proceso trabajador.
+
+    Args:
+        ruta (str): Ruta del script
+
+    Returns:
+        dict: nombre, salida, error (traceback o None), segundos, ok
+            (cantidad de ✓) y fallas (cantidad de ✗)
+    """
+    import runpy
+
+    os.environ.setdefault("MPLBACKEND", "Agg")
+    directorio_previo = os.getcwd()
+    salida = io.StringIO()
+    error = None
+    inicio = time.perf_counter()
+    try:
+        os.chdir(os.path.dirname(os.path.abspath(ruta)))
+        with contextlib.redirect_stdout(salida):
+            runpy.run_path(ruta, run_name="__main__")
+    except Exception:
+        error = traceback.format_exc()
+    finally:
+        os.chdir(directorio_previo)
+        if "matplotlib.pyplot" in sys.modules:
+            sys.modules["matplotlib.pyplot"].close("all")
+    texto = salida.getvalue()
+    return {
+        "nombre": os.path.basename(ruta),
+        "salida": texto,
+        "error": error,
+        "segundos": time.perf_counter() - inicio,
+        "ok": texto.count("✓"),
+        "fallas": texto.count("✗"),
+    }
+
+
+def comando_test(args):
+    from barrido import ejecutar_barrido
+
+    if args.nombres:
+        rutas = [os.path.join(CARPETA_TESTS, nombre if nombre.endswith(".py")
+                              else f"{nombre}.py") for nombre in args.nombres]
+    else:
+        rutas = sorted(glob.glob(os.path.join(CARPETA_TESTS, "test_*.py")))
+
+    inicio = time.perf_counter()
+    resultados = ejecutar_barrido(rutas, trabajadores=args.trabajadores,
+                                  funcion=correr_test, tamano_lote=1)
+    duracion = time.perf_counter() - inicio
+
+    hay_fallas = False
+    for resultado in resultados:
+        fallo = resultado["error"] is not None or resultado["fallas"] > 0
+        hay_fallas = hay_fallas or fallo
+        marca = "✗" if fallo else "✓"
+        print(f"{marca} {resultado['nombre']:28s} {resultado['ok']:3d} ✓ "
+              f"{resultado['fallas']:3d} ✗  {resultado['segundos']:6.2f} s")
+        if args.verbose or fallo:
+            for linea in resultado["salida"].splitlines():
+                if args.verbose or "✗" in linea:
+                    print(f"    {linea}")
+        if resultado["error"]:
+            print("    " + resultado["error"].replace("\n", "\n    "))
+    print(f"\n{len(rutas)} scripts en {duracion:.2f} s")
+    return 1 if hay_fallas else 0
+
+
+# =========================
+# PUNTO DE ENTRADA
+# =========================
+
+def crear_parser():
+    """
+    Parser de la línea de comandos.
+
+    Returns:
+        argparse.ArgumentParser: Parser con los subcomandos
+    """
+    parser = argparse.ArgumentParser(
+        description="Simulador de cohete a órbita LEO",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="Ejemplos:" + __doc__.split("Ejemplos:", 1)[1],
+    )
+    subparsers = parser.add_subparsers(dest="comando", metavar="COMANDO")
+
+    p = subparsers.add_parser("simulate", help="Simular una configuración")
+    _agregar_opciones_config(p)
+    p.add_argument("--log-cada", type=int, default=0, dest="log_cada",
+                   help="Registrar el progreso cada N pasos")
+    p.add_argument("--json", action="store_true",
+                   help="Mostrar el resumen como JSON")
+    p.add_argument("--perfil", metavar="RUTA",
+                   help="Perfilar y guardar el informe JSON")
+    p.add_argument("--estimar", action="store_true",
+                   help="Mostrar el tiempo y la memoria previstos sin "
+                        "simular (ver costos.py)")
+    _agregar_opciones_memoria(p)
+    p.set_defaults(funcion=comando_simulate)
+
+    p = subparsers.add_parser("sweep", help="Barrer un parámetro")
+    _agregar_opciones_config(p)
+    p.add_argument("--param", required=True,
+                   help="Campo de ConfiguracionSimulacion a barrer")
+    p.add_argument("--valores", required=True,
+                   help="inicio:fin:cantidad o lista separada por comas")
+    p.add_argument("-j", "--trabajadores", type=int,
+                   help="Procesos (por defecto todos los núcleos)")
+    p.add_argument("--salida", metavar="RUTA",
+                   help="Guardar los resúmenes como JSON lines")
+    _agregar_opciones_memoria(p)
+    _agregar_opciones_prefiltro(p)
+    p.set_defaults(funcion=comando_sweep)
+
+    p = subparsers.add_parser("montecarlo",
+                              help="Dispersión Monte Carlo (montecarlo.py)")
+    _agregar_opciones_config(p)
+    p.add_argument("-n", "--muestras", type=int, default=1000,
+                   help="Cantidad de muestras (por defecto 1000)")
+    p.add_argument("--dist", action="append", default=[],
+                   metavar="PARAMETRO=TIPO:A:B",
+                   help="Distribución de un parámetro (normal:media:desvío, "
+                        "uniforme:min:max, triangular:min:moda:max); "
+                        "reemplaza la dispersión por defecto")
+    p.add_argument("--sumar", action="store_true",
+                   help="Agregar las --dist a la dispersión por defecto en "
+                        "lugar de reemplazarla")
+    p.add_argument("--semilla", type=int, default=0,
+                   help="Semilla del estudio")
+    p.add_argument("--tramos", type=int, default=256,
+                   help="Tramos en que se reparten las muestras")
+    p.add_argument("--repetir", type=int, metavar="INDICE",
+                   help="Simular solo esa muestra y mostrar sus valores")
+    p.add_argument("-j", "--trabajadores", type=int,
+                   help="Procesos (por defecto todos los núcleos)")
+    p.add_argument("--json", action="store_true",
+                   help="Mostrar el informe como JSON")
+    p.set_defaults(funcion=comando_montecarlo)
+
+    p = subparsers.add_parser("incertidumbre",
+                              help="Propagar incertidumbre (propagacion.py)")
+    _agregar_opciones_config(p)
+    p.add_argument("--desvio", action="append", default=[],
+                   metavar="PARAMETRO=DESVIO",
+                   help="Desvío de un parámetro (se agrega o reemplaza en la "
+                        "incertidumbre por defecto; 0 lo deja fijo)")
+    p.add_argument("--verificar", type=int, metavar="MUESTRAS",
+                   help="Comparar con un Monte Carlo de tantas muestras")
+    p.add_argument("--semilla", type=int, default=0,
+                   help="Semilla del Monte Carlo de verificación")
+    p.add_argument("-j", "--trabajadores", type=int,
+                   help="Procesos (por defecto todos los núcleos)")
+    p.add_argument("--json", action="store_true",
+                   help="Mostrar el informe como JSON")
+    p.set_defaults(funcion=comando_incertidumbre)
+
+    p = subparsers.add_parser("sensibilidad",
+                              help="Índices de Sobol (sensibilidad.py)")
+    _agregar_opciones_config(p)
+    p.add_argument("-n", "--muestras", type=int, default=256,
+                   help="Filas de las matrices de Saltelli, N (por defecto "
+                        "256; se corren N(d + 2) simulaciones)")
+    p.add_argument("--rango", action="append", default=[],
+                   metavar="PARAMETRO=TIPO:A:B",
+                   help="Distribución de un parámetro (como en montecarlo "
+                        "--dist); reemplaza los rangos por defecto")
+    p.add_argument("--sumar", action="store_true",
+                   help="Agregar los --rango a los rangos por defecto en "
+                        "lugar de reemplazarlos")
+    p.add_argument("--salida", action="append", default=[],
+                   help="Métrica a analizar (se puede repetir; por defecto "
+                        "altura final y margen de combustible)")
+    p.add_argument("--remuestreos", type=int, default=500,
+                   help="Remuestreos del bootstrap de los intervalos")
+    p.add_argument("--semilla", type=int, default=0,
+                   help="Semilla del bootstrap")
+    p.add_argument("-j", "--trabajadores", type=int,
+                   help="Procesos (por defecto todos los núcleos)")
+    p.add_argument("--json", action="store_true",
+                   help="Mostrar el informe como JSON")
+    p.set_defaults(funcion=comando_sensibilidad)
+
+    p = subparsers.add_parser("jacobiano",
+                              help="Derivadas del estado final (jacobiano.py)")
+    _agregar_opciones_config(p)
+    p.add_argument("--var", action="append", default=[],
+                   metavar="VARIABLE",
+                   help="Variable respecto de la que se deriva (se puede "
+                        "repetir; por defecto isp, cd y los parámetros "
+                        "del guiado: h_0, h_1 y h_2 o los puntos del giro)")
+    p.add_argument("--verificar", action="store_true",
+                   help="Comparar con diferencias finitas centradas")
+    p.add_argument("-j", "--trabajadores", type=int,
+                   help="Procesos para las diferencias finitas")
+    p.add_argument("--json", action="store_true",
+                   help="Mostrar el resultado como JSON")
+    p.set_defaults(funcion=comando_jacobiano)
+
+    p = subparsers.add_parser("parareal",
+                              help="Simular en paralelo en el tiempo "
+                                   "(parareal.py)")
+    _agregar_opciones_config(p)
+    p.add_argument("--tramos", type=int,
+                   help="Tramos en que se parte el tiempo (por defecto uno "
+                        "por trabajador)")
+    p.add_argument("--grueso", default="rk4",
+                   help="Integrador del propagador grueso (por defecto rk4)")
+    p.add_argument("--dt-grueso", type=float, default=10.0,
+                   help="Paso del propagador grueso en s (por defecto 10)")
+    p.add_argument("--tolerancia", type=float, default=0.01,
+                   help="Cambio máximo de los bordes para converger, en m "
+                        "(por defecto 0.01)")
+    p.add_argument("--iteraciones", type=int,
+                   help="Máximo de iteraciones (por defecto tantas como "
+                        "tramos)")
+    p.add_argument("--verificar", action="store_true",
+                   help="Correr también la simulación serie y comparar")
+    p.add_argument("-j", "--trabajadores", type=int,
+                   help="Procesos (por defecto todos los núcleos)")
+    p.add_argument("--json", action="store_true",
+                   help="Mostrar el resultado como JSON")
+    p.set_defaults(funcion=comando_parareal)
+
+    p = subparsers.add_parser("vida",
+                              help="Vida orbital desde la inserción "
+                                   "(vida_orbital.py)")
+    _agregar_opciones_config(p)
+    p.add_argument("--reingreso", type=float, default=120.0,
+                   help="Altura del perigeo en km donde se pasa por primera "
+                        "vez a la integración completa (por defecto 120)")
+    p.add_argument("--fraccion", type=float, default=0.1,
+                   help="Fracción de la altura de escala que puede bajar "
+                        "el perigeo en un paso (por defecto 0.1)")
+    p.add_argument("--max-anios", type=float, default=100.0,
+                   help="Corte de la predicción en años (por defecto 100)")
+    p.add_argument("--json", action="store_true",
+                   help="Mostrar el resultado como JSON")
+    p.set_defaults(funcion=comando_vida)
+
+    p = subparsers.add_parser("disparo",
+                              help="Ajustar el perfil para una órbita "
+                                   "circular (disparo.py)")
+    _agregar_opciones_config(p)
+    p.add_argument("--altura", type=float, default=200.0,
+                   help="Altura de la órbita objetivo en km (por defecto "
+                        "200, ALTURA_LEO)")
+    p.add_argument("--libre", action="append", default=[],
+                   metavar="PARAMETRO",
+                   help="Parámetro libre (repetir tres veces; por defecto "
+                        "consumo de la última fase y dos del guiado)")
+    p.add_argument("--iteraciones", type=int, default=20,
+                   help="Máximo de iteraciones de Newton-Broyden")
+    p.add_argument("-j", "--trabajadores", type=int,
+                   help="Procesos para el jacobiano (por defecto todos los "
+                        "núcleos)")
+    p.add_argument("--json", action="store_true",
+                   help="Mostrar el resultado como JSON")
+    p.set_defaults(funcion=comando_disparo)
+
+    p = subparsers.add_parser("sustituto",
+                              help="Consultas a un modelo sustituto "
+                                   "(sustituto.py)")
+    _agregar_opciones_config(p)
+    p.add_argument("--rango", action="append", default=[],
+                   metavar="PARAMETRO=MIN:MAX",
+                   help="Rango de entrenamiento de un parámetro (se puede "
+                        "repetir; MIN y MAX aceptan N%% relativo al nominal)")
+    p.add_argument("-n", "--muestras", type=int, default=32,
+                   help="Simulaciones de entrenamiento (diseño de Sobol)")
+    p.add_argument("--modelo", metavar="RUTA",
+                   help="Archivo JSON con los datos: se carga si existe y se "
+                        "guarda con las corridas nuevas")
+    p.add_argument("--consulta", action="append", default=[],
+                   metavar="PARAMETRO=VALOR,...",
+                   help="Punto a consultar (se puede repetir; los parámetros "
+                        "omitidos quedan en su valor nominal)")
+    p.add_argument("--metrica", action="append", default=[],
+                   help="Métrica a modelar (se puede repetir; por defecto "
+                        "todas)")
+    p.add_argument("--tolerancia", action="append", default=[],
+                   metavar="METRICA=DESVIO",
+                   help="Desvío admitido antes de simular (por defecto 2%% "
+                        "del rango de la métrica)")
+    p.add_argument("-j", "--trabajadores", type=int,
+                   help="Procesos (por defecto todos los núcleos)")
+    p.add_argument("--json", action="store_true",
+                   help="Mostrar las consultas como JSON")
+    p.set_defaults(funcion=comando_sustituto)
+
+    p = subparsers.add_parser("multifidelidad",
+                              help="Ordenar candidatos con fidelidad "
+                                   "creciente (multifidelidad.py)")
+    _agregar_opciones_config(p)
+    p.add_argument("--grilla", action="append", default=[],
+                   metavar="PARAMETRO=VALORES",
+                   help="Valores de un parámetro (como sweep --valores); "
+                        "los candidatos son el producto de las grillas")
+    p.add_argument("--objetivo", default="perigeo_km",
+                   help="Métrica a ordenar (por defecto perigeo_km)")
+    p.add_argument("--minimizar", action="store_true",
+                   help="Minimizar el objetivo en lugar de maximizarlo")
+    p.add_argument("--nivel", action="append", default=[],
+                   metavar="METODO:DT",
+                   help="Nivel de fidelidad, del más barato al final (se "
+                        "puede repetir; 'candidato' = la configuración "
+                        "propia; por defecto simplectico:2, rk4:0.5, "
+                        "candidato)")
+    p.add_argument("--fraccion", type=float, default=0.25,
+                   help="Fracción que se promueve en cada nivel")
+    p.add_argument("--control", type=int,
+                   help="Candidatos al azar simulados en todos los niveles "
+                        "para validar la promoción (por defecto el 10%%, "
+                        "al menos 8; 0 = sin validación)")
+    p.add_argument("--semilla", type=int, default=0,
+                   help="Semilla de la muestra de control")
+    p.add_argument("-j", "--trabajadores", type=int,
+                   help="Procesos (por defecto todos los núcleos)")
+    p.add_argument("--json", action="store_true",
+                   help="Mostrar el informe como JSON")
+    _agregar_opciones_prefiltro(p)
+    p.set_defaults(funcion=comando_multifidelidad)
+
+    p = subparsers.add_parser("factibilidad",
+                              help="Prefiltro analítico de una grilla "
+                                   "(factibilidad.py)")
+    _agregar_opciones_config(p)
+    p.add_argument("--grilla", action="append", default=[],
+                   metavar="PARAMETRO=VALORES",
+                   help="Valores de un parámetro (como sweep --valores); "
+                        "los puntos son el producto de las grillas")
+    p.add_argument("--altura", type=float, default=200.0,
+                   help="Altura de la órbita objetivo en km (por defecto "
+                        "200, ALTURA_LEO)")
+    p.add_argument("--perdidas", type=float, default=500.0,
+                   help="Tolerancia de pérdidas por gravedad y arrastre en "
+                        "m/s (por defecto 500)")
+    p.add_argument("--solo-factibles", action="store_true",
+                   help="Mostrar solo los puntos factibles")
+    p.add_argument("--json", action="store_true",
+                   help="Mostrar la evaluación como JSON")
+    p.set_defaults(funcion=comando_factibilidad)
+
+    p = subparsers.add_parser("plot", help="Simular y generar los gráficos")
+    _agregar_opciones_config(p)
+    p.set_defaults(funcion=comando_plot)
+
+    # Solo para la ayuda: main() pasa los argumentos directo a rendimiento.py
+    subparsers.add_parser("bench", help="Correr los benchmarks "
+                          "(opciones de rendimiento.py)", add_help=False)
+
+    p = subparsers.add_parser("test", help="Correr los tests en paralelo")
+    p.add_argument("nombres", nargs="*",
+                   help="Scripts de tests/ a correr (por defecto todos)")
+    p.add_argument("-j", "--trabajadores", type=int,
+                   help="Procesos (por defecto todos los núcleos)")
+    p.add_argument("-v", "--verbose", action="store_true",
+                   help="Mostrar la salida completa de cada test")
+    p.set_defaults(funcion=comando_test)
+    return parser
+
+
+def main(argv=None):
+    """
+    Punto de entrada de la línea de comandos.
+
+    Returns:
+        int: Código de salida
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] == "bench":
+        # Las opciones de bench son las de rendimiento.py: pasarlas tal cual
+        import rendimiento
+        return rendimiento.main(list(argv[1:]))
+
+    parser = crear_parser()
+    args = parser.parse_args(argv)
+    if args.comando is None:
+        parser.print_help()
+        return 0
+    try:
+        return args.funcion(args)
+    except ValueError as exc:
+        parser.error(str(exc))
+
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
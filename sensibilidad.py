@@ -0,0 +1,434 @@
+"""
+Análisis de sensibilidad global con índices de Sobol (esquema de Saltelli).
+
+Para saber qué parámetros determinan la altura de inserción y el margen
+de combustible, la varianza de cada salida se reparte entre los
+parámetros:
+
+- índice de primer orden S_i: fracción de la varianza que explica el
+  parámetro i solo
+- índice total ST_i: fracción en la que interviene el parámetro i,
+  incluidas sus interacciones con los demás
+
+Se estiman con el esquema de Saltelli: dos matrices A y B de N filas
+tomadas de una secuencia cuasi aleatoria de Sobol de dimensión 2d, y
+las d matrices A_B^i (A con la columna i de B). Las mismas N(d + 2)
+corridas dan los dos índices de todos los parámetros y de todas las
+salidas:
+
+    V     = Var([f(A), f(B)])
+    S_i   = mean(f(B)·(f(A_B^i) - f(A))) / V          (Saltelli 2010)
+    ST_i  = mean((f(A) - f(A_B^i))²) / (2V)           (Jansen)
+
+Los intervalos de confianza salen de remuestrear (bootstrap) las filas
+sin volver a simular.
+
+Los parámetros y sus rangos se declaran con una montecarlo.Dispersion
+(cada distribución se usa por su inversa, cuantil); su semilla es la
+del bootstrap.
+
+Uso:
+    dispersion = dispersion_sensibilidad_por_defecto(config)
+    resultado = analizar_sensibilidad(dispersion, muestras_base=256)
+    print(resultado.describir())
+"""
+
+import math
+import random
+from typing import NamedTuple
+
+from montecarlo import (
+    METRICAS, Dispersion, Uniforme, aplicar_perturbaciones, simular_metricas
+)
+
+
+# Salidas analizadas por defecto (de montecarlo.METRICAS)
+SALIDAS = ("altura_final_km", "margen_combustible_kg")
+
+# Bits de la secuencia de Sobol (hasta 2**BITS_SOBOL puntos)
+BITS_SOBOL = 32
+
+# Polinomios primitivos y números de dirección iniciales de Joe y Kuo
+# (new-joe-kuo-6.21201) para las dimensiones 2 en adelante: (grado s,
+# coeficientes a, m_1..m_s). La dimensión 1 es la de van der Corput.
+DIRECCIONES_JOE_KUO = (
+    (1, 0, (1,)),
+    (2, 1, (1, 3)),
+    (3, 1, (1, 3, 1)),
+    (3, 2, (1, 1, 1)),
+    (4, 1, (1, 1, 3, 3)),
+    (4, 4, (1, 3, 5, 13)),
+    (5, 2, (1, 1, 5, 5, 17)),
+    (5, 4, (1, 1, 5, 5, 5)),
+    (5, 7, (1, 1, 7, 11, 19)),
+    (5, 11, (1, 1, 5, 1, 1)),
+    (5, 13, (1, 1, 1, 3, 11)),
+    (5, 14, (1, 3, 5, 5, 31)),
+    (6, 1, (1, 3, 3, 9, 7, 49)),
+    (6, 13, (1, 1, 1, 15, 21, 21)),
+    (6, 16, (1, 3, 1, 13, 27, 49)),
+    (6, 19, (1, 1, 1, 15, 7, 5)),
+    (6, 22, (1, 3, 1, 15, 13, 25)),
+    (6, 25, (1, 1, 5, 5, 19, 61)),
+    (7, 1, (1, 3, 7, 11, 23, 15, 103)),
+    (7, 4, (1, 3, 7, 13, 13, 15, 69)),
+    (7, 7, (1, 1, 3, 13, 7, 35, 63)),
+    (7, 8, (1, 3, 5, 9, 1, 25, 53)),
+    (7, 14, (1, 3, 1, 13, 9, 35, 107)),
+    (7, 19, (1, 3, 1, 5, 27, 61, 31)),
+    (7, 21, (1, 1, 5, 11, 19, 41, 61)),
+    (7, 28, (1, 3, 5, 3, 3, 13, 69)),
+    (7, 31, (1, 1, 7, 13, 1, 19, 1)),
+    (7, 32, (1, 3, 7, 5, 13, 19, 59)),
+    (7, 37, (1, 1, 3, 9, 25, 29, 41)),
+    (7, 41, (1, 3, 5, 13, 23, 1, 55)),
+    (7, 42, (1, 3, 7, 3, 13, 59, 17)),
+    (7, 50, (1, 3, 1, 3, 5, 53, 69)),
+    (7, 55, (1, 1, 5, 5, 23, 33, 13)),
+    (7, 56, (1, 1, 7, 7, 1, 61, 123)),
+    (7, 59, (1, 1, 7, 9, 13, 61, 49)),
+    (7, 62, (1, 3, 3, 5, 3, 55, 33)),
+)
+
+# Dimensión máxima de la secuencia (2d: hasta 18 parámetros)
+DIMENSION_MAXIMA = len(DIRECCIONES_JOE_KUO) + 1
+
+
+# =========================
+# SECUENCIA DE SOBOL
+# =========================
+
+def _direcciones(dimension):
+    """Números de dirección V_1..V_BITS (enteros) de una dimensión."""
+    if dimension == 0:
+        return [1 << (BITS_SOBOL - 1 - k) for k in range(BITS_SOBOL)]
+    grado, coeficientes, iniciales = DIRECCIONES_JOE_KUO[dimension - 1]
+    v = [m << (BITS_SOBOL - 1 - k) for k, m in enumerate(iniciales)]
+    for k in range(grado, BITS_SOBOL):
+        nuevo = v[k - grado] ^ (v[k - grado] >> grado)
+        for j in range(1, grado):
+            if (coeficientes >> (grado - 1 - j)) & 1:
+                nuevo ^= v[k - j]
+        v.append(nuevo)
+    return v
+
+
+def puntos_sobol(cantidad, dimension, saltar=1):
+    """
+    Puntos de la secuencia de Sobol en [0, 1)^dimension.
+
+    Se generan en el orden del código de Gray (Antonov-Saleev): cada
+    punto sale del anterior con un XOR por dimensión.
+
+    Args:
+        cantidad (int): Puntos a generar
+        dimension (int): Dimensión (hasta DIMENSION_MAXIMA)
+        saltar (int): Puntos iniciales que se descartan (el primero es
+            el origen)
+
+    Returns:
+        list: Puntos (listas de floats)
+
+    Raises:
+        ValueError: Si la dimensión no está soportada
+    """
+    if not 1 <= dimension <= DIMENSION_MAXIMA:
+        raise ValueError(f"La secuencia de Sobol admite hasta "
+                         f"{DIMENSION_MAXIMA} dimensiones ({dimension})")
+    direcciones = [_direcciones(d) for d in range(dimension)]
+    escala = 1.0 / (1 << BITS_SOBOL)
+    x = [0] * dimension
+    puntos = []
+    for n in range(saltar + cantidad):
+        if n >= saltar:
+            puntos.append([valor * escala for valor in x])
+        # Bit menos significativo en cero de n
+        c = (~n & (n + 1)).bit_length() - 1
+        for d in range(dimension):
+            x[d] ^= direcciones[d][c]
+    return puntos
+
+
+# =========================
+# ÍNDICES DE SOBOL
+# =========================
+
+class IndicesSobol(NamedTuple):
+    """
+    Índices de Sobol de una salida.
+
+    Args:
+        salida (str): Métrica analizada
+        parametros (tuple): Parámetros, en orden
+        primer_orden (list): S_i de cada parámetro
+        total (list): ST_i de cada parámetro
+        intervalos_primer_orden (list): (inferior, superior) de S_i
+        intervalos_total (list): (inferior, superior) de ST_i
+        varianza (float): Varianza de la salida
+        filas (int): Filas usadas (las de salidas finitas)
+    """
+    salida: str
+    parametros: tuple
+    primer_orden: list
+    total: list
+    intervalos_primer_orden: list
+    intervalos_total: list
+    varianza: float
+    filas: int
+
+    def describir(self):
+        """
+        Tabla de índices, de mayor a menor índice total.
+
+        Returns:
+            str: Texto legible
+        """
+        if not self.filas:
+            return (f"{self.salida}: sin índices (ninguna fila con salidas "
+                    f"finitas)")
+        lineas = [f"{self.salida} (varianza {self.varianza:.4g}, "
+                  f"{self.filas} filas)",
+                  f"  {'parámetro':>18s} {'S_i':>20s} {'ST_i':>20s}"]
+        orden = sorted(range(len(self.parametros)),
+                       key=lambda i: self.total[i], reverse=True)
+        for i in orden:
+            s_inf, s_sup = self.intervalos_primer_orden[i]
+            t_inf, t_sup = self.intervalos_total[i]
+            lineas.append(
+                f"  {self.parametros[i]:>18s} "
+                f"{self.primer_orden[i]:6.3f} [{s_inf:5.2f},{s_sup:5.2f}] "
+                f"{self.total[i]:6.3f} [{t_inf:5.2f},{t_sup:5.2f}]"
+            )
+        return "\n".join(lineas)
+
+
+class ResultadoSensibilidad(NamedTuple):
+    """
+    Resultado de analizar_sensibilidad.
+
+    Args:
+        corridas (int): Simulaciones realizadas, N(d + 2)
+        muestras_base (int): N
+        indices (dict): Salida -> IndicesSobol
+    """
+    corridas: int
+    muestras_base: int
+    indices: dict
+
+    def informe(self):
+        """
+        Resultado serializable a JSON.
+
+        Returns:
+            dict: corridas, muestras_base e índices por salida
+        """
+        return {
+            "corridas": self.corridas,
+            "muestras_base": self.muestras_base,
+            "indices": {salida: indices._asdict()
+                        for salida, indices in self.indices.items()},
+        }
+
+    def describir(self):
+        """
+        Tablas de índices de todas las salidas.
+
+        Returns:
+            str: Texto legible
+        """
+        return "\n\n".join(
+            [f"{self.corridas} corridas (N = {self.muestras_base})"]
+            + [indices.describir() for indices in self.indices.values()]
+        )
+
+
+def matrices_saltelli(dispersion, muestras_base):
+    """
+    Valores de los parámetros de las matrices A, B y A_B^i.
+
+    Args:
+        dispersion (Dispersion): Parámetros y distribuciones
+        muestras_base (int): Filas N de cada matriz (mejor potencia de 2)
+
+    Returns:
+        tuple: (A, B, [A_B^1, ..., A_B^d]), listas de filas
+    """
+    d = len(dispersion.parametros)
+    distribuciones = [distribucion for _, distribucion in dispersion.parametros]
+    puntos = puntos_sobol(muestras_base, 2 * d)
+    a = [[dist.cuantil(u) for dist, u in zip(distribuciones, punto[:d])]
+         for punto in puntos]
+    b = [[dist.cuantil(u) for dist, u in zip(distribuciones, punto[d:])]
+         for punto in puntos]
+    ab = [[fila_a[:i] + [fila_b[i]] + fila_a[i + 1:]
+           for fila_a, fila_b in zip(a, b)] for i in range(d)]
+    return a, b, ab
+
+
+def _varianza(valores):
+    """Varianza poblacional."""
+    media = sum(valores) / len(valores)
+    return sum((v - media)**2 for v in valores) / len(valores)
+
+
+def _indices(f_a, f_b, f_ab, filas):
+    """S_i, ST_i y V con las filas indicadas (con repetición)."""
+    if not filas:
+        # Ninguna fila con salidas finitas: los índices no están definidos
+        return [math.nan] * len(f_ab), [math.nan] * len(f_ab), math.nan
+    varianza = _varianza([f_a[j] for j in filas] + [f_b[j] for j in filas])
+    n = len(filas)
+    primer_orden = []
+    total = []
+    for f_i in f_ab:
+        if varianza > 0:
+            primer_orden.append(
+                sum(f_b[j] * (f_i[j] - f_a[j]) for j in filas) / n / varianza
+            )
+            total.append(
+                sum((f_a[j] - f_i[j])**2 for j in filas) / (2 * n) / varianza
+            )
+        else:
+            primer_orden.append(0.0)
+            total.append(0.0)
+    return primer_orden, total, varianza
+
+
+def _percentiles(valores, nivel):
+    """Intervalo de percentiles con la confianza indicada."""
+    ordenados = sorted(valores)
+    cola = (1 - nivel) / 2
+    inferior = ordenados[int(cola * (len(ordenados) - 1))]
+    superior = ordenados[int(math.ceil((1 - cola) * (len(ordenados) - 1)))]
+    return inferior, superior
+
+
+def indices_sobol(salida, parametros, f_a, f_b, f_ab, remuestreos=500,
+                  nivel=0.95, semilla=0):
+    """
+    Índices de Sobol de una salida a partir de las evaluaciones.
+
+    Args:
+        salida (str): Nombre de la salida
+        parametros (tuple): Nombres de los parámetros
+        f_a, f_b (list): Salida en las filas de A y de B
+        f_ab (list): Salida en las filas de cada A_B^i
+        remuestreos (int): Remuestreos del bootstrap (0 = sin intervalos)
+        nivel (float): Confianza de los intervalos
+        semilla (int): Semilla del bootstrap
+
+    Returns:
+        IndicesSobol: Índices e intervalos (NaN, con filas = 0, si
+            ninguna fila tiene todas sus salidas finitas)
+    """
+    filas = [j for j in range(len(f_a))
+             if math.isfinite(f_a[j]) and math.isfinite(f_b[j])
+             and all(math.isfinite(f_i[j]) for f_i in f_ab)]
+    primer_orden, total, varianza = _indices(f_a, f_b, f_ab, filas)
+    d = len(parametros)
+    intervalos_primer_orden = [(s, s) for s in primer_orden]
+    intervalos_total = [(t, t) for t in total]
+    if remuestreos > 0 and filas:
+        rng = random.Random(f"sobol:{semilla}:{salida}")
+        muestras_s = [[] for _ in range(d)]
+        muestras_t = [[] for _ in range(d)]
+        for _ in range(remuestreos):
+            elegidas = rng.choices(filas, k=len(filas))
+            s, t, _ = _indices(f_a, f_b, f_ab, elegidas)
+            for i in range(d):
+                muestras_s[i].append(s[i])
+                muestras_t[i].append(t[i])
+        intervalos_primer_orden = [_percentiles(m, nivel) for m in muestras_s]
+        intervalos_total = [_percentiles(m, nivel) for m in muestras_t]
+    return IndicesSobol(salida, tuple(parametros), primer_orden, total,
+                        intervalos_primer_orden, intervalos_total, varianza,
+                        len(filas))
+
+
+def analizar_sensibilidad(dispersion, muestras_base=256, salidas=SALIDAS,
+                          trabajadores=None, remuestreos=500, nivel=0.95):
+    """
+    Índices de Sobol de primer orden y totales de las salidas.
+
+    Args:
+        dispersion (Dispersion): Parámetros y sus distribuciones
+        muestras_base (int): Filas N de las matrices (mejor potencia de
+            2); se corren N(d + 2) simulaciones
+        salidas (sequence): Métricas de montecarlo.METRICAS a analizar
+        trabajadores (int): Procesos (ver barrido.ejecutar_barrido)
+        remuestreos (int): Remuestreos del bootstrap
+        nivel (float): Confianza de los intervalos
+
+    Returns:
+        ResultadoSensibilidad: Índices de cada salida
+
+    Raises:
+        ValueError: Si una salida no es una métrica conocida o faltan
+            parámetros o muestras
+    """
+    from barrido import ejecutar_barrido
+
+    for salida in salidas:
+        if salida not in METRICAS:
+            raise ValueError(f"Salida desconocida: {salida!r} "
+                             f"(disponibles: {', '.join(METRICAS)})")
+    if not dispersion.parametros or muestras_base < 2:
+        raise ValueError("Se necesitan parámetros y al menos dos muestras")
+    nombres = [nombre for nombre, _ in dispersion.parametros]
+    a, b, ab = matrices_saltelli(dispersion, muestras_base)
+    filas = a + b + [fila for matriz in ab for fila in matriz]
+    configs = [aplicar_perturbaciones(dispersion.base, dict(zip(nombres, fila)))
+               for fila in filas]
+    resultados = ejecutar_barrido(configs, trabajadores,
+                                  funcion=simular_metricas)
+
+    n = muestras_base
+    indices = {}
+    for salida in salidas:
+        valores = [resultado[salida] for resultado in resultados]
+        f_ab = [valores[(2 + i) * n:(3 + i) * n] for i in range(len(nombres))]
+        indices[salida] = indices_sobol(
+            salida, nombres, valores[:n], valores[n:2 * n], f_ab,
+            remuestreos, nivel, dispersion.semilla,
+        )
+    return ResultadoSensibilidad(len(configs), n, indices)
+
+
+def dispersion_sensibilidad_por_defecto(base=None):
+    """
+    Rangos uniformes de los parámetros que más se ajustan.
+
+    ISP ±2 %, CD ±20 %, diámetro ±5 %, masa de combustible ±1 %, consumo
+    de cada fase ±3 % y ±5° en los puntos del guiado por tiempo que no
+    están en 0° ni en 90°.
+
+    Args:
+        base (ConfiguracionSimulacion): Configuración nominal (None = la
+            por defecto)
+
+    Returns:
+        Dispersion: Parámetros con distribuciones uniformes
+    """
+    from configuracion import ConfiguracionSimulacion
+
+    if base is None:
+        base = ConfiguracionSimulacion()
+
+    def alrededor(valor, fraccion):
+        return Uniforme(valor * (1 - fraccion), valor * (1 + fraccion))
+
+    parametros = {
+        "isp": alrededor(base.isp, 0.02),
+        "cd": alrededor(base.cd, 0.20),
+        "diametro": alrededor(base.diametro, 0.05),
+        "masa_fuel": alrededor(base.masa_fuel, 0.01),
+    }
+    for i, (_, mdot) in enumerate(base.fases_mdot):
+        parametros[f"mdot_fase_{i}"] = alrededor(mdot, 0.03)
+    margen = math.radians(5)
+    for i, beta in enumerate(base.betas_tiempo):
+        if 0 < beta < math.pi / 2:
+            parametros[f"angulo_guiado_{i}"] = Uniforme(
+                max(0.0, beta - margen), min(math.pi / 2, beta + margen)
+            )
+    return Dispersion(parametros, base)
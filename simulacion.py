@@ -9,50 +9,37 @@ Este script:
 """
 
 from cohete import Cohete
-from constantes import (
-    R_E, DT, T_MAX, USAR_BACKWARD, LOG_CADA,
-    MASA_COHETE, MASA_FUEL, DIAMETRO_COHETE, ISP, M_DOT_0,
-    R_0, Q_0, Q_DOT_0, THETA_0, GAMMA_0, GAMMA_DOT_0, BETA_0,
-    H_0, H_1, H_2
-)
+from configuracion import ConfiguracionSimulacion
+from constantes import LOG_CADA
 from graficos import (
     graficar_evolucion_cohete, graficar_trayectoria_polar,
     graficar_metricas_adicionales, imprimir_metricas_finales
 )
 
 
-def main():
+def main(config=None):
     """
     Función principal que ejecuta la simulación completa.
+    
+    Args:
+        config (ConfiguracionSimulacion): Configuración de la simulación
+            (None para los valores de constantes.py)
     """
+    if config is None:
+        config = ConfiguracionSimulacion()
+
     print("="*60)
     print("SIMULACIÓN DE COHETE - PUESTA EN ÓRBITA")
     print("="*60)
-    print(f"Método de integración: {'Backward Euler' if USAR_BACKWARD else 'Forward Euler'}")
-    print(f"Paso de tiempo: {DT} s")
-    print(f"Tiempo máximo: {T_MAX} s ({T_MAX/60:.1f} min)")
+    print(f"Método de integración: {config.metodo}")
+    print(f"Paso de tiempo: {config.dt} s")
+    print(f"Tiempo máximo: {config.t_max} s ({config.t_max/60:.1f} min)")
     print("="*60 + "\n")
     
     # =========================
     # CREAR INSTANCIA DEL COHETE
     # =========================
-    cohete1 = Cohete(
-        r_0=R_0,
-        q_0=Q_0,
-        q_dot_0=Q_DOT_0,
-        theta_0=THETA_0,
-        gamma_0=GAMMA_0,
-        gamma_dot_0=GAMMA_DOT_0,
-        masa_cohete=MASA_COHETE,
-        masa_fuel=MASA_FUEL,
-        beta=BETA_0,
-        diametro=DIAMETRO_COHETE,
-        m_dot=M_DOT_0,
-        isp=ISP,
-        h_0=H_0,
-        h_1=H_1,
-        h_2=H_2
-    )
+    cohete1 = Cohete.desde_configuracion(config)
     
     # Asegurar que los historiales estén inicializados
     # (ya deberían estarlo en __init__, pero por seguridad)
@@ -70,29 +57,24 @@ def main():
     # =========================
     # EJECUTAR SIMULACIÓN
     # =========================
-    resultado = cohete1.simular(
-        dt=DT,
-        t_max=T_MAX,
-        usar_backward=USAR_BACKWARD,
-        log_cada=LOG_CADA
-    )
+    resultado = cohete1.simular(log_cada=LOG_CADA)
     
     # =========================
     # MOSTRAR MÉTRICAS FINALES
     # =========================
-    imprimir_metricas_finales(cohete1, DT)
+    imprimir_metricas_finales(cohete1, config.dt)
     
     # =========================
     # GENERAR GRÁFICOS
     # =========================
     print("Generando gráficos de evolución temporal...")
-    graficar_evolucion_cohete(cohete1, DT)
+    graficar_evolucion_cohete(cohete1, config.dt)
     
     print("Generando gráfico de trayectoria polar...")
     graficar_trayectoria_polar(cohete1)
     
     print("Generando gráficos de métricas adicionales...")
-    graficar_metricas_adicionales(cohete1, DT)
+    graficar_metricas_adicionales(cohete1, config.dt)
     
     print("\n" + "="*60)
     print("SIMULACIÓN COMPLETADA")
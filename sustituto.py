@@ -0,0 +1,652 @@
+"""
+Modelos sustitutos de las métricas de inserción.
+
+Un Sustituto aprende, de simulaciones ya corridas, cómo dependen las
+métricas finales (montecarlo.METRICAS) de unos pocos parámetros de la
+configuración (los de montecarlo.py: campos numéricos, factor_mdot,
+mdot_fase_<i>, tiempo_guiado_<i>...) y responde consultas "¿y si...?"
+sin simular:
+
+- Modelo: un proceso gaussiano por métrica (kriging ordinario) con
+  núcleo exponencial cuadrático sobre los parámetros normalizados, con
+  una escala de longitud por parámetro. Escalas y ruido (nugget) se
+  eligen por máxima verosimilitud en una grilla: primero una escala
+  común, después cada parámetro por separado
+- Error: cada predicción trae su desvío estándar, que crece lejos de
+  los datos
+- Región de confianza: dentro de la caja de los datos (o de los rangos
+  de entrenamiento, si es mayor) y con desvío
+  menor que la tolerancia de cada métrica. Fuera de ella la consulta se
+  simula de verdad (montecarlo.simular_metricas) y la corrida se agrega
+  a los datos, así que explorar una zona cuesta cada vez menos
+  simulaciones
+- Persistencia: guardar/cargar en JSON, con la huella de la
+  configuración base para no mezclar datos de otra
+
+Uso:
+    sustituto = Sustituto.entrenar(base, {"h_1": (20e3, 40e3),
+                                          "masa_fuel": (520e3, 548e3)})
+    consulta = sustituto.consultar({"h_1": 30e3, "masa_fuel": 520.6e3})
+    consulta.valores["altura_final_km"], consulta.errores["altura_final_km"]
+    sustituto.guardar("sustituto.json")
+"""
+
+import json
+import math
+from typing import NamedTuple
+
+from montecarlo import METRICAS
+from utilidades import cholesky
+
+
+# Escalas de longitud del núcleo (parámetros normalizados a [0, 1]); las
+# mayores corresponden a parámetros que casi no influyen
+ESCALAS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.5, 5.0, 10.0)
+
+# Pasadas por los parámetros al ajustar la escala de cada uno
+PASADAS_ESCALAS = 2
+
+# Ruido relativo a la varianza del proceso: casi nulo (la simulación es
+# determinista) o algo mayor para los saltos de los esquemas de paso fijo
+NUGGETS = (1e-8, 1e-5, 1e-3)
+
+# Desvío admitido de una predicción, relativo al rango de la métrica en
+# los datos. El perigeo y la excentricidad tienen un quiebre donde la
+# órbita pasa por circular (se invierten los ápsides) y cerca de él el
+# modelo pide simular
+TOLERANCIA_RELATIVA = 0.02
+
+# Los hiperparámetros se vuelven a elegir cuando los datos crecen en
+# este factor; entre tanto solo se refactoriza con los anteriores
+CRECIMIENTO_REAJUSTE = 1.5
+
+
+# =========================
+# PROCESO GAUSSIANO
+# =========================
+
+def _sustituir(factor, vector):
+    """Solución de L·x = vector (L triangular inferior)."""
+    x = []
+    for i, fila in enumerate(factor):
+        x.append((vector[i] - sum(fila[k] * x[k] for k in range(i))) / fila[i])
+    return x
+
+
+def _sustituir_traspuesta(factor, vector):
+    """Solución de Lᵀ·x = vector (L triangular inferior)."""
+    n = len(vector)
+    x = [0.0] * n
+    for i in reversed(range(n)):
+        x[i] = (vector[i] - sum(factor[k][i] * x[k]
+                                for k in range(i + 1, n))) / factor[i][i]
+    return x
+
+
+def _correlacion(a, b, escalas):
+    """Núcleo exponencial cuadrático entre dos puntos normalizados."""
+    distancia = sum(((u - v) / escala) ** 2
+                    for u, v, escala in zip(a, b, escalas))
+    return math.exp(-0.5 * distancia)
+
+
+def _factorizar(entradas, escalas, nugget):
+    """Cholesky de la matriz de correlación de los datos."""
+    n = len(entradas)
+    matriz = [[0.0] * n for _ in range(n)]
+    for i in range(n):
+        matriz[i][i] = 1.0 + nugget
+        for j in range(i):
+            matriz[i][j] = matriz[j][i] = _correlacion(entradas[i],
+                                                       entradas[j], escalas)
+    return cholesky(matriz)
+
+
+class ModeloKriging(NamedTuple):
+    """
+    Proceso gaussiano ajustado a una métrica.
+
+    Args:
+        entradas (list): Puntos normalizados de los datos
+        media (float): Media constante del proceso
+        varianza (float): Varianza del proceso (máxima verosimilitud)
+        escalas (tuple): Escala de longitud de cada parámetro
+        nugget (float): Ruido relativo a la varianza
+        factor (list): Cholesky de la matriz de correlación
+        pesos (list): R⁻¹·(y - media)
+        verosimilitud (float): Log-verosimilitud concentrada
+    """
+    entradas: list
+    media: float
+    varianza: float
+    escalas: tuple
+    nugget: float
+    factor: list
+    pesos: list
+    verosimilitud: float
+
+    def predecir(self, x):
+        """
+        Predicción en un punto normalizado.
+
+        Args:
+            x (sequence): Punto normalizado
+
+        Returns:
+            tuple: (valor, desvío estándar)
+        """
+        k = [_correlacion(x, entrada, self.escalas)
+             for entrada in self.entradas]
+        valor = self.media + sum(a * b for a, b in zip(k, self.pesos))
+        v = _sustituir(self.factor, k)
+        restante = 1.0 + self.nugget - sum(a * a for a in v)
+        return valor, math.sqrt(self.varianza * max(restante, 0.0))
+
+
+def _modelo(entradas, salidas, escalas, nugget, factor):
+    """Kriging ordinario con una factorización ya hecha."""
+    n = len(salidas)
+    # Media por mínimos cuadrados generalizados: 1ᵀR⁻¹y / 1ᵀR⁻¹1
+    unos = _sustituir_traspuesta(factor, _sustituir(factor, [1.0] * n))
+    media = sum(a * b for a, b in zip(unos, salidas)) / sum(unos)
+    centradas = [y - media for y in salidas]
+    pesos = _sustituir_traspuesta(factor, _sustituir(factor, centradas))
+    varianza = sum(a * b for a, b in zip(centradas, pesos)) / n
+    log_det = 2.0 * sum(math.log(factor[i][i]) for i in range(n))
+    verosimilitud = (-0.5 * n * math.log(max(varianza, 1e-300))
+                     - 0.5 * log_det)
+    return ModeloKriging(entradas, media, varianza, escalas, nugget, factor,
+                         pesos, verosimilitud)
+
+
+def ajustar_kriging(entradas, columnas, escalas=ESCALAS, nuggets=NUGGETS,
+                    pasadas=PASADAS_ESCALAS):
+    """
+    Ajusta un proceso gaussiano por columna de salidas.
+
+    Primero se prueba una escala común a todos los parámetros con cada
+    nugget; cada factorización se comparte entre las columnas. Después,
+    para cada columna, se recorre la grilla de escalas de un parámetro
+    por vez (con las demás fijas) y se conserva lo que mejore la
+    verosimilitud.
+
+    Args:
+        entradas (list): Puntos normalizados
+        columnas (list): Salidas, una lista por columna
+        escalas (sequence): Escalas de longitud a probar
+        nuggets (sequence): Nuggets a probar
+        pasadas (int): Pasadas por los parámetros (0 = escala común)
+
+    Returns:
+        list: ModeloKriging de cada columna
+
+    Raises:
+        ValueError: Si ninguna combinación da una matriz definida positiva
+    """
+    dimension = len(entradas[0])
+    mejores = [None] * len(columnas)
+    for escala in escalas:
+        for nugget in nuggets:
+            comunes = (escala,) * dimension
+            try:
+                factor = _factorizar(entradas, comunes, nugget)
+            except ValueError:
+                continue
+            for c, salidas in enumerate(columnas):
+                modelo = _modelo(entradas, salidas, comunes, nugget, factor)
+                if (mejores[c] is None
+                        or modelo.verosimilitud > mejores[c].verosimilitud):
+                    mejores[c] = modelo
+    if any(modelo is None for modelo in mejores):
+        raise ValueError("No se pudo ajustar el proceso gaussiano (puntos "
+                         "repetidos o demasiado cercanos)")
+
+    if dimension > 1:
+        for c, salidas in enumerate(columnas):
+            for _ in range(pasadas):
+                for d in range(dimension):
+                    for escala in escalas:
+                        actual = mejores[c]
+                        if escala == actual.escalas[d]:
+                            continue
+                        prueba = (actual.escalas[:d] + (escala,)
+                                  + actual.escalas[d + 1:])
+                        try:
+                            factor = _factorizar(entradas, prueba,
+                                                 actual.nugget)
+                        except ValueError:
+                            continue
+                        modelo = _modelo(entradas, salidas, prueba,
+                                         actual.nugget, factor)
+                        if modelo.verosimilitud > actual.verosimilitud:
+                            mejores[c] = modelo
+    return mejores
+
+
+# =========================
+# SUSTITUTO
+# =========================
+
+class Consulta(NamedTuple):
+    """
+    Respuesta de Sustituto.consultar.
+
+    Args:
+        punto (dict): Parámetros consultados (los omitidos, nominales)
+        valores (dict): Métrica -> valor predicho o simulado
+        errores (dict): Métrica -> desvío estándar de la predicción (0
+            si se simuló)
+        simulada (bool): Si la consulta cayó fuera de la región de
+            confianza y se simuló
+    """
+    punto: dict
+    valores: dict
+    errores: dict
+    simulada: bool
+
+    def describir(self):
+        """
+        Resumen legible de la consulta.
+
+        Returns:
+            str: Punto y valor ± desvío de cada métrica
+        """
+        origen = "simulada" if self.simulada else "sustituto"
+        lineas = [", ".join(f"{nombre} = {valor:g}"
+                            for nombre, valor in self.punto.items())
+                  + f" ({origen})"]
+        for metrica, valor in self.valores.items():
+            lineas.append(f"  {metrica:>22s} = {valor:12.6g} "
+                          f"± {self.errores[metrica]:.3g}")
+        return "\n".join(lineas)
+
+
+class Sustituto:
+    """
+    Modelo sustituto de las métricas de inserción, con respaldo en la
+    simulación.
+
+    Atributos:
+    - base: Configuración nominal (los parámetros no consultados quedan
+      en su valor)
+    - parametros: Nombres de los parámetros de entrada
+    - metricas: Métricas modeladas
+    - tolerancias: Métrica -> desvío admitido (las que falten usan
+      TOLERANCIA_RELATIVA del rango de la métrica en los datos)
+    - entradas: Puntos de los datos (tuplas en el orden de parametros)
+    - salidas: Métrica -> valores en los datos
+    - region: Parámetro -> (mínimo, máximo) de la región de confianza:
+      la caja de los datos y de los rangos de entrenamiento
+    - simulaciones: Simulaciones corridas por este sustituto
+    """
+
+    def __init__(self, base, parametros, metricas=METRICAS, tolerancias=None):
+        """
+        Args:
+            base (ConfiguracionSimulacion): Configuración nominal
+            parametros (sequence): Parámetros de entrada (ver
+                montecarlo.validar_parametro)
+            metricas (sequence): Métricas a modelar (de METRICAS)
+            tolerancias (dict): Desvío admitido por métrica
+
+        Raises:
+            ValueError: Si un parámetro no se puede perturbar o una
+                métrica no existe
+        """
+        from montecarlo import validar_parametro
+
+        self.base = base
+        self.parametros = tuple(parametros)
+        if not self.parametros:
+            raise ValueError("El sustituto necesita al menos un parámetro")
+        for nombre in self.parametros:
+            validar_parametro(base, nombre)
+        self.metricas = tuple(metricas)
+        desconocidas = set(self.metricas) - set(METRICAS)
+        if desconocidas:
+            raise ValueError(f"Métricas desconocidas: {sorted(desconocidas)} "
+                             f"(disponibles: {', '.join(METRICAS)})")
+        self.tolerancias = dict(tolerancias or {})
+        self.entradas = []
+        self.salidas = {metrica: [] for metrica in self.metricas}
+        self.region = {}
+        self.simulaciones = 0
+        self._modelos = None
+        self._normalizacion = None
+        self._hiperparametros = None
+        self._datos_ajuste = 0
+
+    @classmethod
+    def entrenar(cls, base, rangos, muestras=32, metricas=METRICAS,
+                 tolerancias=None, trabajadores=None):
+        """
+        Sustituto entrenado con un diseño de Sobol sobre los rangos.
+
+        Args:
+            base (ConfiguracionSimulacion): Configuración nominal
+            rangos (dict): Parámetro -> (mínimo, máximo)
+            muestras (int): Simulaciones de entrenamiento
+            metricas (sequence): Métricas a modelar
+            tolerancias (dict): Desvío admitido por métrica
+            trabajadores (int): Procesos (ver barrido.ejecutar_barrido)
+
+        Returns:
+            Sustituto: Sustituto con los datos del diseño
+        """
+        sustituto = cls(base, tuple(rangos), metricas, tolerancias)
+        sustituto.ampliar(rangos, muestras, trabajadores)
+        return sustituto
+
+    def ampliar(self, rangos, muestras, trabajadores=None):
+        """
+        Simula un diseño de Sobol sobre los rangos y lo agrega a los datos.
+
+        Args:
+            rangos (dict): Parámetro de entrada -> (mínimo, máximo); los
+                que falten quedan en su valor nominal
+            muestras (int): Simulaciones
+            trabajadores (int): Procesos (ver barrido.ejecutar_barrido)
+        """
+        from sensibilidad import puntos_sobol
+
+        for nombre, limites in rangos.items():
+            self._extender(nombre, *limites)
+        limites = list(rangos.values())
+        self.simular([
+            {nombre: inferior + u * (superior - inferior)
+             for nombre, u, (inferior, superior) in zip(rangos, punto, limites)}
+            for punto in puntos_sobol(muestras, len(rangos))
+        ], trabajadores)
+
+    # Datos
+
+    def completar(self, punto):
+        """
+        Punto con todos los parámetros de entrada.
+
+        Args:
+            punto (dict): Parámetro -> valor (los omitidos, nominales)
+
+        Returns:
+            dict: Parámetro -> valor, en el orden de parametros
+
+        Raises:
+            ValueError: Si el punto trae un parámetro que no es de entrada
+        """
+        from montecarlo import valor_nominal
+
+        ajenos = set(punto) - set(self.parametros)
+        if ajenos:
+            raise ValueError(f"Parámetros fuera del sustituto: "
+                             f"{sorted(ajenos)} (entradas: "
+                             f"{', '.join(self.parametros)})")
+        return {nombre: float(punto[nombre]) if nombre in punto
+                else valor_nominal(self.base, nombre)
+                for nombre in self.parametros}
+
+    def agregar(self, punto, metricas):
+        """
+        Agrega un resultado a los datos.
+
+        Args:
+            punto (dict): Parámetro -> valor (los omitidos, nominales)
+            metricas (dict): Métricas de la corrida (ver
+                montecarlo.metricas_finales)
+        """
+        punto = self.completar(punto)
+        for nombre, valor in punto.items():
+            self._extender(nombre, valor, valor)
+        self.entradas.append(tuple(punto.values()))
+        for metrica in self.metricas:
+            self.salidas[metrica].append(float(metricas[metrica]))
+        self._modelos = None
+
+    def _extender(self, nombre, inferior, superior):
+        """Agranda la región de confianza para cubrir un intervalo."""
+        actual = self.region.get(nombre, (inferior, superior))
+        self.region[nombre] = (min(actual[0], inferior),
+                               max(actual[1], superior))
+
+    def simular(self, puntos, trabajadores=None):
+        """
+        Simula puntos y los agrega a los datos.
+
+        Args:
+            puntos (list): Puntos (dict parámetro -> valor)
+            trabajadores (int): Procesos (ver barrido.ejecutar_barrido)
+
+        Returns:
+            list: Métricas de cada corrida
+        """
+        from barrido import ejecutar_barrido
+        from montecarlo import aplicar_perturbaciones, simular_metricas
+
+        puntos = [self.completar(punto) for punto in puntos]
+        resultados = ejecutar_barrido(
+            [aplicar_perturbaciones(self.base, punto) for punto in puntos],
+            trabajadores, funcion=simular_metricas,
+        )
+        for punto, metricas in zip(puntos, resultados):
+            self.agregar(punto, metricas)
+        self.simulaciones += len(puntos)
+        return resultados
+
+    # Modelo
+
+    def _ajustar(self):
+        """Ajusta (o refactoriza) los modelos de todas las métricas."""
+        if not self.entradas:
+            raise ValueError("El sustituto no tiene datos")
+        n = len(self.entradas)
+        if (self._hiperparametros is None
+                or n >= CRECIMIENTO_REAJUSTE * self._datos_ajuste):
+            # Normalización a la caja de los datos actuales
+            columnas = list(zip(*self.entradas))
+            self._normalizacion = [
+                (min(c), (max(c) - min(c)) or 1.0) for c in columnas
+            ]
+            self._hiperparametros = None
+        entradas = [self._normalizar(x) for x in self.entradas]
+        columnas = []
+        for metrica in self.metricas:
+            finitas = [i for i, y in enumerate(self.salidas[metrica])
+                       if math.isfinite(y)]
+            columnas.append((finitas, [self.salidas[metrica][i]
+                                       for i in finitas]))
+
+        if self._hiperparametros is not None:
+            try:
+                self._modelos = self._refactorizar(entradas, columnas)
+                return
+            except ValueError:
+                pass  # un punto casi repetido: se vuelve a elegir todo
+        # Grilla completa, agrupando las métricas con las mismas filas
+        modelos = {}
+        grupos = {}
+        for metrica, (finitas, salidas) in zip(self.metricas, columnas):
+            grupos.setdefault(tuple(finitas), []).append((metrica, salidas))
+        for finitas, miembros in grupos.items():
+            ajustados = ajustar_kriging([entradas[i] for i in finitas],
+                                        [s for _, s in miembros])
+            for (metrica, _), modelo in zip(miembros, ajustados):
+                modelos[metrica] = modelo
+        self._hiperparametros = {
+            metrica: (modelo.escalas, modelo.nugget)
+            for metrica, modelo in modelos.items()
+        }
+        self._datos_ajuste = n
+        self._modelos = modelos
+
+    def _refactorizar(self, entradas, columnas):
+        """Modelos con los hiperparámetros ya elegidos."""
+        modelos = {}
+        factores = {}
+        for metrica, (finitas, salidas) in zip(self.metricas, columnas):
+            escalas, nugget = self._hiperparametros[metrica]
+            clave = (tuple(finitas), escalas, nugget)
+            puntos = [entradas[i] for i in finitas]
+            if clave not in factores:
+                factores[clave] = _factorizar(puntos, escalas, nugget)
+            modelos[metrica] = _modelo(puntos, salidas, escalas, nugget,
+                                       factores[clave])
+        return modelos
+
+    def _normalizar(self, x):
+        return tuple((v - minimo) / ancho
+                     for v, (minimo, ancho) in zip(x, self._normalizacion))
+
+    def tolerancia(self, metrica):
+        """
+        Desvío admitido de una métrica.
+
+        Args:
+            metrica (str): Métrica
+
+        Returns:
+            float: El de tolerancias o TOLERANCIA_RELATIVA del rango de
+                la métrica en los datos
+        """
+        if metrica in self.tolerancias:
+            return self.tolerancias[metrica]
+        finitas = [y for y in self.salidas[metrica] if math.isfinite(y)]
+        rango = max(finitas) - min(finitas) if finitas else 0.0
+        return TOLERANCIA_RELATIVA * rango
+
+    def predecir(self, punto):
+        """
+        Predicción del sustituto, sin respaldo.
+
+        Args:
+            punto (dict): Parámetro -> valor (los omitidos, nominales)
+
+        Returns:
+            tuple: (valores, errores, confiable): dicts métrica -> valor
+                y métrica -> desvío, y si el punto está en la región de
+                confianza
+        """
+        if self._modelos is None:
+            self._ajustar()
+        punto = self.completar(punto)
+        x = tuple(punto.values())
+        dentro = all(self.region[nombre][0] <= valor <= self.region[nombre][1]
+                     for nombre, valor in punto.items())
+        normalizado = self._normalizar(x)
+        valores = {}
+        errores = {}
+        for metrica in self.metricas:
+            valores[metrica], errores[metrica] = \
+                self._modelos[metrica].predecir(normalizado)
+        confiable = dentro and all(errores[metrica] <= self.tolerancia(metrica)
+                                   for metrica in self.metricas)
+        return valores, errores, confiable
+
+    def consultar_varios(self, puntos, trabajadores=None):
+        """
+        Responde varias consultas; las que caen fuera de la región de
+        confianza se simulan juntas (en paralelo) y se agregan a los
+        datos.
+
+        Args:
+            puntos (list): Puntos (dict parámetro -> valor)
+            trabajadores (int): Procesos para las simulaciones de respaldo
+
+        Returns:
+            list: Consulta de cada punto
+        """
+        puntos = [self.completar(punto) for punto in puntos]
+        respuestas = [None] * len(puntos)
+        pendientes = []
+        for i, punto in enumerate(puntos):
+            valores, errores, confiable = self.predecir(punto)
+            if confiable:
+                respuestas[i] = Consulta(punto, valores, errores, False)
+            else:
+                pendientes.append(i)
+        if pendientes:
+            simuladas = self.simular([puntos[i] for i in pendientes],
+                                     trabajadores)
+            for i, metricas in zip(pendientes, simuladas):
+                respuestas[i] = Consulta(
+                    puntos[i],
+                    {metrica: metricas[metrica] for metrica in self.metricas},
+                    {metrica: 0.0 for metrica in self.metricas},
+                    True,
+                )
+        return respuestas
+
+    def consultar(self, punto):
+        """
+        Responde una consulta (ver consultar_varios).
+
+        Args:
+            punto (dict): Parámetro -> valor (los omitidos, nominales)
+
+        Returns:
+            Consulta: Valores, errores y si se simuló
+        """
+        return self.consultar_varios([punto], trabajadores=1)[0]
+
+    # Persistencia
+
+    def guardar(self, ruta):
+        """
+        Guarda los datos y los hiperparámetros elegidos en JSON.
+
+        Args:
+            ruta (str): Archivo de destino
+        """
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump({
+                "huella": self.base.huella(),
+                "parametros": self.parametros,
+                "metricas": self.metricas,
+                "tolerancias": self.tolerancias,
+                "entradas": self.entradas,
+                "salidas": self.salidas,
+                "region": self.region,
+                "normalizacion": self._normalizacion,
+                "hiperparametros": self._hiperparametros,
+                "datos_ajuste": self._datos_ajuste,
+            }, archivo, ensure_ascii=False)
+
+    @classmethod
+    def cargar(cls, ruta, base):
+        """
+        Sustituto con los datos guardados por guardar.
+
+        Args:
+            ruta (str): Archivo
+            base (ConfiguracionSimulacion): Configuración nominal; debe
+                ser la misma con que se generaron los datos
+
+        Returns:
+            Sustituto: Sustituto con los datos
+
+        Raises:
+            ValueError: Si los datos son de otra configuración base
+        """
+        with open(ruta, encoding="utf-8") as archivo:
+            datos = json.load(archivo)
+        if datos["huella"] != base.huella():
+            raise ValueError(f"{ruta}: los datos son de otra configuración "
+                             f"base")
+        sustituto = cls(base, datos["parametros"], datos["metricas"],
+                        datos["tolerancias"])
+        sustituto.entradas = [tuple(x) for x in datos["entradas"]]
+        sustituto.salidas = {metrica: list(valores)
+                             for metrica, valores in datos["salidas"].items()}
+        sustituto.region = {nombre: tuple(limites)
+                            for nombre, limites in datos["region"].items()}
+        if datos.get("hiperparametros"):
+            sustituto._normalizacion = [tuple(par) for par
+                                        in datos["normalizacion"]]
+            sustituto._hiperparametros = {
+                metrica: (tuple(escalas), nugget)
+                for metrica, (escalas, nugget)
+                in datos["hiperparametros"].items()
+            }
+            sustituto._datos_ajuste = datos["datos_ajuste"]
+        return sustituto
+
+    def __len__(self):
+        return len(self.entradas)
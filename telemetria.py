@@ -0,0 +1,362 @@
+"""
+Telemetría estructurada de las simulaciones.
+
+Reemplaza los print() de Cohete.simular por registros tipados que se
+envían a un sumidero intercambiable:
+
+Registros:
+- Progreso: estado del cohete cada log_cada pasos
+- CambioFase: cambio de fase del vuelo (por ejemplo combustible agotado)
+- Evento: hechos puntuales (inicio de la simulación, empuje periódico)
+- Resumen: resultado final de la corrida
+
+Sumideros:
+- SumideroNulo: descarta todo
+- SumideroTexto: líneas de texto legibles (stdout por defecto, o stderr)
+- SumideroJSONL: una línea JSON por registro, fácil de procesar
+- SumideroMemoria: búfer circular con los últimos N registros
+
+Telemetria filtra por nivel y limita los registros de progreso por
+muestreo (1 de cada N) y por tasa (máximo por segundo). Los registros se
+construyen solo si pasan el filtro de nivel y el texto o JSON solo lo
+arma el sumidero, así que con la telemetría desactivada no se formatea
+nada. Cada sumidero escribe cada registro con una única escritura
+protegida por un lock, de modo que las líneas de corridas concurrentes no
+se entremezclan.
+"""
+
+import math
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+
+
+# Niveles (mismos valores que el módulo logging)
+DEPURACION = 10
+INFO = 20
+AVISO = 30
+SILENCIO = math.inf
+
+NOMBRES_NIVEL = {DEPURACION: "depuracion", INFO: "info", AVISO: "aviso"}
+
+
+# =========================
+# REGISTROS
+# =========================
+
+@dataclass(frozen=True)
+class Progreso:
+    """Estado del cohete en un paso de la simulación."""
+    iteracion: int
+    t: float
+    altura_m: float
+    q: float
+    gamma: float
+    masa: float
+    beta: float
+
+    tipo = "progreso"
+    nivel = INFO
+
+    def texto(self):
+        return (
+            f"Iter {self.iteracion}: altura = {self.altura_m / 1000:.3f} km, "
+            f"v_r = {self.q:.3f} m/s, omega = {self.gamma:.3e} rad/s, "
+            f"masa = {self.masa:.0f} kg, beta = {self.beta:.3f} rad, "
+            f"t = {self.t:.1f} s"
+        )
+
+
+@dataclass(frozen=True)
+class CambioFase:
+    """Cambio de fase del vuelo."""
+    t: float
+    fase: str
+    altura_m: float
+
+    tipo = "fase"
+    nivel = INFO
+
+    def texto(self):
+        if self.fase == "combustible_agotado":
+            return (f"*** COMBUSTIBLE AGOTADO en t={self.t:.1f}s, "
+                    f"altura={self.altura_m / 1000:.1f}km ***")
+        return (f"*** FASE {self.fase} en t={self.t:.1f}s, "
+                f"altura={self.altura_m / 1000:.1f}km ***")
+
+
+@dataclass(frozen=True)
+class Evento:
+    """Hecho puntual con datos asociados."""
+    t: float
+    nombre: str
+    datos: dict = field(default_factory=dict)
+    nivel: int = INFO
+
+    tipo = "evento"
+
+    def texto(self):
+        formato = _FORMATOS_EVENTO.get(self.nombre)
+        if formato is not None:
+            return formato.format(**self.datos)
+        detalle = ", ".join(f"{k} = {v}" for k, v in self.datos.items())
+        return f"{self.nombre} en t={self.t:.1f}s: {detalle}"
+
+
+_FORMATOS_EVENTO = {
+    "inicio": "Simulando con dt = {dt} s usando {metodo}",
+    "empuje": "Empuje: {empuje:.2f} N",
+    "plan_registro": ("Registro {estrategia}: {muestras} muestras, 1 de "
+                      "cada {cada} pasos, {bytes_memoria} B en memoria"),
+}
+
+
+@dataclass(frozen=True)
+class Resumen:
+    """Resultado final de una corrida."""
+    end_reason: str
+    iter: int
+    t_final: float
+    h_final_m: float
+    theta_final: float
+    evaluaciones: int
+
+    tipo = "resumen"
+    nivel = INFO
+
+    def texto(self):
+        return (
+            f"FIN: {self.end_reason} | iter: {self.iter} | "
+            f"t: {self.t_final:.1f} s | h: {self.h_final_m / 1000:.2f} km | "
+            f"theta: {self.theta_final:.4f} rad"
+        )
+
+
+# =========================
+# SUMIDEROS
+# =========================
+
+class SumideroNulo:
+    """Descarta todos los registros."""
+
+    def emitir(self, registro, corrida=None):
+        pass
+
+    def cerrar(self):
+        pass
+
+
+class SumideroTexto:
+    """
+    Escribe cada registro como una línea de texto.
+
+    Args:
+        flujo (file): Destino (None = sys.stdout al momento de escribir,
+            así respeta contextlib.redirect_stdout)
+    """
+
+    def __init__(self, flujo=None):
+        self.flujo = flujo
+        self._lock = threading.Lock()
+
+    def emitir(self, registro, corrida=None):
+        linea = registro.texto()
+        if corrida is not None:
+            linea = f"[{corrida}] {linea}"
+        flujo = self.flujo if self.flujo is not None else sys.stdout
+        with self._lock:
+            flujo.write(linea + "\n")
+
+    def cerrar(self):
+        flujo = self.flujo if self.flujo is not None else sys.stdout
+        flujo.flush()
+
+
+def sumidero_stderr():
+    """
+    Sumidero de texto sobre stderr (no se mezcla con la salida normal).
+
+    Returns:
+        SumideroTexto: Sumidero que escribe en sys.stderr
+    """
+    return SumideroTexto(sys.stderr)
+
+
+class SumideroJSONL:
+    """
+    Escribe cada registro como una línea JSON.
+
+    Cada línea tiene "tipo", "nivel", "corrida" (si se indicó) y los
+    campos del registro.
+
+    Args:
+        destino (str o file): Ruta del archivo (se abre en modo append) o
+            un archivo ya abierto
+    """
+
+    def __init__(self, destino):
+        if isinstance(destino, str):
+            self._archivo = open(destino, "a", encoding="utf-8")
+            self._propio = True
+        else:
+            self._archivo = destino
+            self._propio = False
+        self._lock = threading.Lock()
+
+    def emitir(self, registro, corrida=None):
+        import json  # diferido: el resto de la telemetría no lo necesita
+
+        datos = {"tipo": registro.tipo,
+                 "nivel": NOMBRES_NIVEL.get(registro.nivel, registro.nivel)}
+        if corrida is not None:
+            datos["corrida"] = corrida
+        campos = asdict(registro)
+        campos.pop("nivel", None)
+        datos.update(campos)
+        linea = json.dumps(datos, ensure_ascii=False)
+        with self._lock:
+            self._archivo.write(linea + "\n")
+
+    def cerrar(self):
+        if self._propio:
+            self._archivo.close()
+        else:
+            self._archivo.flush()
+
+
+class SumideroMemoria:
+    """
+    Guarda los últimos registros en un búfer circular.
+
+    Args:
+        capacidad (int): Cantidad máxima de registros (los más viejos se
+            descartan)
+    """
+
+    def __init__(self, capacidad=1000):
+        self.registros = deque(maxlen=capacidad)
+
+    def emitir(self, registro, corrida=None):
+        self.registros.append((corrida, registro))
+
+    def cerrar(self):
+        pass
+
+    def de_tipo(self, tipo):
+        """
+        Registros guardados de un tipo dado.
+
+        Args:
+            tipo (str): "progreso", "fase", "evento" o "resumen"
+
+        Returns:
+            list: Registros en orden de llegada
+        """
+        return [r for _, r in self.registros if r.tipo == tipo]
+
+
+# =========================
+# TELEMETRÍA
+# =========================
+
+class Telemetria:
+    """
+    Filtra y envía registros a un sumidero.
+
+    Args:
+        sumidero: Objeto con emitir(registro, corrida) y cerrar()
+            (None = SumideroTexto sobre stdout)
+        nivel (int): Nivel mínimo de los registros que se emiten
+        muestreo (int): Emitir 1 de cada `muestreo` registros de progreso
+        max_por_segundo (float): Tasa máxima de registros de progreso
+            (None = sin límite)
+        corrida (str): Identificador que se agrega a cada registro (útil
+            al compartir un sumidero entre corridas concurrentes)
+    """
+
+    def __init__(self, sumidero=None, nivel=INFO, muestreo=1,
+                 max_por_segundo=None, corrida=None):
+        if muestreo < 1:
+            raise ValueError(f"muestreo debe ser >= 1 (muestreo = {muestreo})")
+        self.sumidero = sumidero if sumidero is not None else SumideroTexto()
+        self.nivel = nivel
+        self.muestreo = muestreo
+        self.max_por_segundo = max_por_segundo
+        self.corrida = corrida
+        self.descartados = 0
+        self._progresos = 0
+        self._fichas = 1.0
+        self._ultimo = time.monotonic()
+
+    @classmethod
+    def nula(cls):
+        """
+        Telemetría desactivada: no construye ni formatea registros.
+
+        Returns:
+            Telemetria: Telemetría con nivel SILENCIO y SumideroNulo
+        """
+        return cls(SumideroNulo(), nivel=SILENCIO)
+
+    def acepta(self, nivel):
+        """
+        Indica si se emitirían registros de un nivel.
+
+        Se consulta antes de construir un registro para no hacer trabajo
+        cuando la telemetría está desactivada.
+
+        Args:
+            nivel (int): Nivel del registro
+
+        Returns:
+            bool: True si el nivel pasa el filtro
+        """
+        return nivel >= self.nivel
+
+    def emitir(self, registro):
+        """
+        Envía un registro al sumidero si pasa los filtros.
+
+        Los registros de progreso pasan además por el muestreo y el
+        límite de tasa; el resto (fases, eventos, resumen) solo se
+        filtra por nivel.
+
+        Args:
+            registro: Progreso, CambioFase, Evento o Resumen
+
+        Returns:
+            bool: True si se emitió
+        """
+        if registro.nivel < self.nivel:
+            return False
+        if registro.tipo == "progreso" and not self._admitir_progreso():
+            self.descartados += 1
+            return False
+        self.sumidero.emitir(registro, self.corrida)
+        return True
+
+    def _admitir_progreso(self):
+        self._progresos += 1
+        if (self._progresos - 1) % self.muestreo != 0:
+            return False
+        if self.max_por_segundo is None:
+            return True
+        # Cubeta de fichas: se recargan max_por_segundo fichas por segundo.
+        # Cabe al menos una ficha, para que las tasas menores que 1/s
+        # lleguen a emitir
+        ahora = time.monotonic()
+        self._fichas = min(
+            max(1.0, self.max_por_segundo),
+            self._fichas + (ahora - self._ultimo) * self.max_por_segundo
+        )
+        self._ultimo = ahora
+        if self._fichas >= 1.0:
+            self._fichas -= 1.0
+            return True
+        return False
+
+    def cerrar(self):
+        """Cierra el sumidero."""
+        self.sumidero.cerrar()
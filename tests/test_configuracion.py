@@ -0,0 +1,91 @@
+"""
+Test: Configuración inmutable de la simulación
+
+Verifica que ConfiguracionSimulacion permita correr configuraciones
+distintas en un mismo proceso:
+- Es inmutable, hasheable y su huella es estable
+- Dos cohetes con distinto cd o distinto guiado corriendo en hilos a la
+  vez dan lo mismo que corriendo por separado
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import dataclasses
+import pickle
+import threading
+
+from cohete import Cohete
+from configuracion import ConfiguracionSimulacion
+
+print("="*70)
+print("TEST: CONFIGURACIÓN INMUTABLE")
+print("="*70)
+
+base = ConfiguracionSimulacion(metodo="rk4", dt=1.0, t_max=300.0)
+variantes = {
+    "base": base,
+    "cd = 0.9": dataclasses.replace(base, cd=0.9),
+    "beta por altura": dataclasses.replace(base, beta_altura=True),
+}
+
+
+def altura_final(config):
+    cohete = Cohete.desde_configuracion(config)
+    cohete.simular()
+    return cohete.r - config.r_e
+
+
+# Corridas secuenciales
+secuencial = {nombre: altura_final(cfg) for nombre, cfg in variantes.items()}
+
+# Corridas simultáneas en hilos
+concurrente = {}
+
+
+def correr(nombre, cfg):
+    concurrente[nombre] = altura_final(cfg)
+
+
+hilos = [threading.Thread(target=correr, args=item) for item in variantes.items()]
+for hilo in hilos:
+    hilo.start()
+for hilo in hilos:
+    hilo.join()
+
+print(f"\n{'Variante':20s} {'Secuencial (m)':>16s} {'Hilos (m)':>16s}")
+for nombre in variantes:
+    print(f"{nombre:20s} {secuencial[nombre]:16.2f} {concurrente[nombre]:16.2f}")
+
+# Verificaciones
+print(f"\n{'='*70}")
+print("VERIFICACIONES:")
+
+try:
+    base.cd = 1.0
+    print("  ✗ ERROR: la configuración se pudo modificar")
+except dataclasses.FrozenInstanceError:
+    print("  ✓ La configuración es inmutable")
+
+copia = pickle.loads(pickle.dumps(base))
+if copia == base and hash(copia) == hash(base) and copia.huella() == base.huella():
+    print(f"  ✓ Hash y huella estables tras pickle ({base.huella()[:12]}...)")
+else:
+    print("  ✗ ERROR: la copia no coincide con el original")
+
+if len(set(cfg.huella() for cfg in variantes.values())) == len(variantes):
+    print("  ✓ Configuraciones distintas tienen huellas distintas")
+else:
+    print("  ✗ ERROR: huellas repetidas entre configuraciones distintas")
+
+if secuencial == concurrente:
+    print("  ✓ Las corridas en hilos coinciden con las secuenciales")
+else:
+    print("  ✗ ERROR: las corridas en hilos difieren de las secuenciales")
+
+if len(set(round(h, 3) for h in secuencial.values())) == len(variantes):
+    print("  ✓ Cada configuración produce su propia trayectoria")
+else:
+    print("  ✗ ERROR: configuraciones distintas dan la misma trayectoria")
+
+print("="*70)
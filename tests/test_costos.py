@@ -0,0 +1,130 @@
+"""
+Test: Modelo de costo de las simulaciones
+
+Verifica costos.py, Cohete.estimar_costo y el reparto de un barrido:
+- La calibración da costos por paso positivos para cada integrador
+- El modelo ordena las configuraciones como sus tiempos medidos
+- La memoria prevista sigue el plan de registro del presupuesto
+- repartir_en_lotes pone primero lo más costoso y cubre cada trabajo una
+  sola vez
+- Un barrido con costos mezclados devuelve los resultados en orden
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import tempfile
+
+from barrido import correr_configuracion, ejecutar_barrido
+from cohete import Cohete
+from configuracion import ConfiguracionSimulacion
+from costos import (
+    EVALUACIONES_POR_PASO, ModeloCosto, calibrar, medir_corrida,
+    modelo_por_defecto, repartir_en_lotes
+)
+
+print("="*70)
+print("TEST: MODELO DE COSTO")
+print("="*70)
+
+modelo = calibrar(pasos=1500, repeticiones=2)
+print("\nCosto por paso calibrado:")
+for metodo, costo in sorted(modelo.segundos_por_paso.items()):
+    print(f"  {metodo:15s} {costo * 1e6:8.2f} µs "
+          f"({modelo.evaluaciones(metodo):.1f} evaluaciones)")
+
+# Predicción contra medición con integradores y duraciones distintas
+configs = [
+    ConfiguracionSimulacion(metodo="forward_euler", dt=0.1, t_max=100.0),
+    ConfiguracionSimulacion(metodo="rk4", dt=0.1, t_max=100.0),
+    ConfiguracionSimulacion(metodo="backward_euler", dt=0.1, t_max=300.0),
+]
+previstos = [modelo.segundos(c) for c in configs]
+medidos = [min(medir_corrida(c)["tiempo_s"] for _ in range(3))
+           for c in configs]
+print("\nPrevisto vs medido:")
+for config, previsto, medido in zip(configs, previstos, medidos):
+    print(f"  {config.metodo:15s} t_max={config.t_max:5.0f}  "
+          f"{previsto * 1e3:7.1f} ms vs {medido * 1e3:7.1f} ms")
+
+# Memoria según el plan de registro
+cohete = Cohete.desde_configuracion(configs[0])
+sin_presupuesto = cohete.estimar_costo(t_max=2000.0)
+con_presupuesto = cohete.estimar_costo(t_max=2000.0,
+                                       presupuesto_memoria=64 * 1024)
+
+# Modelo guardado y recargado
+ruta = os.path.join(tempfile.mkdtemp(), "costos.json")
+modelo.guardar(ruta)
+recargado = ModeloCosto.cargar(ruta)
+vacio = ModeloCosto()
+ruta_vacio = os.path.join(tempfile.mkdtemp(), "vacio.json")
+vacio.guardar(ruta_vacio)
+
+# Lotes de mayor a menor
+costos = [1.0, 50.0, 2.0, 3.0, 40.0, 0.5, 0.5, 1.0]
+lotes = repartir_en_lotes(costos, trabajadores=2, tandas_por_trabajador=2)
+print(f"\nLotes: {lotes}")
+
+# Barrido con configuraciones de costo muy distinto
+mezcla = [
+    ConfiguracionSimulacion(metodo=m, dt=0.5, t_max=t)
+    for m, t in (("forward_euler", 20.0), ("rk4", 200.0),
+                 ("backward_euler", 5.0), ("rk4", 60.0))
+]
+resultados = ejecutar_barrido(mezcla, trabajadores=2, modelo_costo=modelo)
+esperados = [correr_configuracion(c) for c in mezcla]
+
+# Verificaciones
+print(f"\n{'='*70}")
+print("VERIFICACIONES:")
+
+if (set(EVALUACIONES_POR_PASO) <= set(modelo.segundos_por_paso)
+        and all(c > 0 for c in modelo.segundos_por_paso.values())
+        and modelo.segundos_fijos > 0):
+    print("  ✓ Costo fijo y por paso positivos para cada integrador")
+else:
+    print("  ✗ ERROR: calibración incompleta")
+
+if (modelo.costo_paso("rk4") > modelo.costo_paso("forward_euler")
+        and modelo.evaluaciones("rk4") == 4
+        and modelo.costo_paso("scipy:RK45") > 0):
+    print("  ✓ rk4 cuesta más por paso que forward_euler")
+else:
+    print("  ✗ ERROR: costos por paso fuera de orden")
+
+orden_previsto = sorted(range(len(configs)), key=lambda i: previstos[i])
+orden_medido = sorted(range(len(configs)), key=lambda i: medidos[i])
+if orden_previsto == orden_medido:
+    print("  ✓ El modelo ordena las corridas como su tiempo medido")
+else:
+    print(f"  ✗ ERROR: orden previsto {orden_previsto}, medido {orden_medido}")
+
+if (sin_presupuesto.registro.estrategia == "completo"
+        and con_presupuesto.registro.estrategia != "completo"
+        and con_presupuesto.bytes_pico < sin_presupuesto.bytes_pico
+        and sin_presupuesto.segundos == con_presupuesto.segundos):
+    print("  ✓ La memoria prevista sigue el plan de registro")
+else:
+    print("  ✗ ERROR: memoria prevista incorrecta")
+
+if (recargado == modelo and modelo_por_defecto().segundos_por_paso
+        and ModeloCosto.cargar(ruta_vacio) == vacio
+        and vacio.costo_paso("rk4") == 4 * vacio.segundos_por_evaluacion
+        and ModeloCosto().segundos_por_paso is None):
+    print("  ✓ El modelo se guarda, se recarga y hay uno por defecto")
+else:
+    print("  ✗ ERROR: modelo guardado o por defecto")
+
+indices = sorted(i for lote in lotes for i in lote)
+if lotes[0] == [1] and indices == list(range(len(costos))):
+    print("  ✓ Lotes de mayor a menor, cada trabajo una sola vez")
+else:
+    print(f"  ✗ ERROR: lotes {lotes}")
+
+if resultados == esperados:
+    print("  ✓ El barrido con lotes por costo devuelve los resultados en orden")
+else:
+    print("  ✗ ERROR: resultados del barrido fuera de orden")
+
+print("="*70)
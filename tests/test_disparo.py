@@ -0,0 +1,88 @@
+"""
+Test: Método de disparo (órbita circular objetivo)
+
+Verifica disparo.py:
+- Con guiado por tiempo y por altura converge a la órbita circular en
+  pocas simulaciones
+- La configuración devuelta, simulada de nuevo, da los mismos residuos
+- Cada evaluación termina en el apagado del motor
+- Una órbita inalcanzable no converge y marca el parámetro en el límite
+- Una cantidad de parámetros libres distinta de tres se rechaza
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from configuracion import ConfiguracionSimulacion
+from disparo import (
+    TOLERANCIAS, hasta_apagado, resolver_disparo, residuos_insercion
+)
+from jacobiano import estado_final
+
+print("="*70)
+print("TEST: MÉTODO DE DISPARO")
+print("="*70)
+
+ALTURA = 185e3
+
+resultados = {}
+for nombre, config in (
+        ("tiempo", ConfiguracionSimulacion(metodo="rk4", dt=0.5)),
+        ("altura", ConfiguracionSimulacion(metodo="rk4", dt=0.5,
+                                           beta_altura=True))):
+    resultados[nombre] = resolver_disparo(config, altura=ALTURA,
+                                          trabajadores=2)
+    print(f"\nGuiado por {nombre}: {resultados[nombre].describir()}")
+
+# Simular de nuevo la configuración devuelta
+ajustada = hasta_apagado(resultados["tiempo"].config)
+estado, end_reason, t_final = estado_final(ajustada)
+residuos = residuos_insercion(estado, ajustada, ALTURA)
+
+inalcanzable = resolver_disparo(ConfiguracionSimulacion(metodo="rk4", dt=0.5),
+                                altura=250e3, trabajadores=2)
+print(f"\n250 km: {inalcanzable.describir()}")
+
+# Verificaciones
+print(f"\n{'='*70}")
+print("VERIFICACIONES:")
+
+if all(r.convergio and r.simulaciones <= 20 for r in resultados.values()):
+    print("  ✓ Converge con guiado por tiempo y por altura en "
+          + " y ".join(f"{r.simulaciones}" for r in resultados.values())
+          + " simulaciones")
+else:
+    print("  ✗ ERROR: el disparo no convergió en pocas simulaciones")
+
+if (all(abs(a - b) < 1e-6 * t for a, b, t in zip(
+        residuos, resultados["tiempo"].residuos.values(), TOLERANCIAS))
+        and all(abs(r) <= t for r, t in zip(residuos, TOLERANCIAS))):
+    print("  ✓ La configuración ajustada reproduce la órbita al simularla")
+else:
+    print(f"  ✗ ERROR: residuos al simular de nuevo {residuos}")
+
+apagado = ajustada.fases_mdot[-1][0]
+if end_reason == "t_max" and abs(t_final - apagado) < 1e-6:
+    print(f"  ✓ Las evaluaciones terminan en el apagado (t = {apagado:g} s)")
+else:
+    print(f"  ✗ ERROR: la evaluación terminó en t = {t_final} "
+          f"({end_reason})")
+
+if not inalcanzable.convergio and inalcanzable.en_limite:
+    print(f"  ✓ Una órbita inalcanzable no converge "
+          f"({', '.join(inalcanzable.en_limite)} en el límite)")
+else:
+    print("  ✗ ERROR: se informó convergencia a una órbita inalcanzable")
+
+rechazos = 0
+for parametros in (("mdot_fase_1", "h_1"), ("mdot_fase_1", "h_1", "metodo")):
+    try:
+        resolver_disparo(ConfiguracionSimulacion(), parametros=parametros)
+    except ValueError:
+        rechazos += 1
+if rechazos == 2:
+    print("  ✓ Se rechazan cantidades o nombres de parámetros inválidos")
+else:
+    print("  ✗ ERROR: se aceptaron parámetros libres inválidos")
+
+print("="*70)
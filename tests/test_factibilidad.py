@@ -0,0 +1,98 @@
+"""
+Test: Prefiltro analítico de factibilidad
+
+Verifica factibilidad.py:
+- El delta-v, el empuje/peso y el quemado nominales coinciden con las
+  cuentas a mano
+- El agotamiento de combustible corta el perfil de consumo
+- Nada de lo que se descarta llega a la órbita en la simulación completa
+- Se detecta el empuje insuficiente y se rechazan entradas inválidas
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import math
+from dataclasses import replace
+
+from configuracion import ConfiguracionSimulacion
+from factibilidad import evaluar_factibilidad, prefiltrar
+from montecarlo import simular_metricas
+
+print("="*70)
+print("TEST: PREFILTRO DE FACTIBILIDAD")
+print("="*70)
+
+base = ConfiguracionSimulacion(metodo="rk4", dt=1.0, t_max=600.0)
+nominal = evaluar_factibilidad(base)
+print(f"\n{nominal.describir()}")
+
+quemado = 4492.0 * 69 + 1118.0 * 211
+masa_inicial = base.masa_cohete + base.masa_fuel
+delta_v = base.isp * base.g0 * math.log(masa_inicial / (masa_inicial - quemado))
+empuje_peso = (base.isp * base.g0 * 4492.0
+               / (masa_inicial * base.mu / base.r_0 ** 2))
+
+corto = evaluar_factibilidad(replace(base, masa_fuel=450_000))
+agotamiento = 69 + (450_000 - 4492.0 * 69) / 1118.0
+
+# Grilla: lo descartado no debe llegar a la órbita
+configs = [replace(base, isp=isp, masa_fuel=masa)
+           for isp in (200.0, 250.0, 300.0, 330.0)
+           for masa in (300_000, 548_000)]
+prefiltro = prefiltrar(configs)
+perigeos = [simular_metricas(config)["perigeo_km"] for config in configs]
+print(f"\n{'isp':>6s} {'fuel (kg)':>10s} {'margen (m/s)':>13s} "
+      f"{'perigeo (km)':>13s}")
+for config, evaluacion, perigeo in zip(configs, prefiltro.evaluaciones,
+                                       perigeos):
+    print(f"{config.isp:6.0f} {config.masa_fuel:10.0f} "
+          f"{evaluacion.margen:13.1f} {perigeo:13.1f}"
+          f"{'' if evaluacion.factible else '  descartado'}")
+
+# Verificaciones
+print(f"\n{'='*70}")
+print("VERIFICACIONES:")
+
+if (nominal.factible and abs(nominal.delta_v - delta_v) < 1e-9
+        and abs(nominal.empuje_peso - empuje_peso) < 1e-12
+        and nominal.tiempo_quemado == 280.0
+        and math.isinf(nominal.tiempo_agotamiento)):
+    print(f"  ✓ Nominal factible: delta-v {nominal.delta_v:.1f} m/s, "
+          f"empuje/peso {nominal.empuje_peso:.3f}")
+else:
+    print(f"  ✗ ERROR: estimación nominal {nominal}")
+
+if (abs(corto.tiempo_agotamiento - agotamiento) < 1e-9
+        and corto.tiempo_quemado == corto.tiempo_agotamiento
+        and corto.combustible_quemado == 450_000):
+    print(f"  ✓ El combustible se agota a los {agotamiento:.2f} s")
+else:
+    print(f"  ✗ ERROR: agotamiento {corto.tiempo_agotamiento} != "
+          f"{agotamiento}")
+
+descartados = prefiltro.descartados
+if (descartados and 5 in prefiltro.factibles
+        and all(perigeos[i] < 0 for i in descartados)):
+    print(f"  ✓ {len(descartados)} de {len(configs)} descartados, ninguno "
+          f"llega a la órbita al simularlo")
+else:
+    print(f"  ✗ ERROR: descartados {descartados}, perigeos {perigeos}")
+
+debil = evaluar_factibilidad(replace(base, fases_mdot=((69.0, 1800.0),
+                                                       (280.0, 1118.0))))
+rechazos = 0
+for config, perdidas in ((replace(base, masa_fuel=-1), 500.0),
+                         (replace(base, isp=-1), 500.0),
+                         (base, -1.0)):
+    try:
+        evaluar_factibilidad(config, perdidas=perdidas)
+    except ValueError:
+        rechazos += 1
+if (not debil.factible and "empuje/peso" in debil.motivos[0]
+        and rechazos == 3):
+    print("  ✓ Se detecta empuje/peso < 1 y se rechazan entradas inválidas")
+else:
+    print(f"  ✗ ERROR: motivos {debil.motivos}, rechazos {rechazos}")
+
+print("="*70)
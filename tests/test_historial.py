@@ -0,0 +1,124 @@
+"""
+Test: Historiales compactos
+
+Verifica el almacenamiento de historial.py:
+- Con el esquema compacto la trayectoria integrada es idéntica (solo
+  cambia lo que se registra) y el error de cada columna es pequeño
+- Los bytes por muestra bajan a una fracción de los de las listas
+- np.asarray, índices y rebanadas devuelven los valores decodificados
+- Un historial archivado en disco se recupera igual
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import dataclasses
+import tempfile
+
+import numpy as np
+
+from cohete import Cohete
+from configuracion import ConfiguracionSimulacion
+from historial import (
+    COLUMNAS, ESQUEMA_COMPACTO, ColumnaHistorial, FormatoColumna,
+    cargar_historiales, guardar_historiales
+)
+from telemetria import Telemetria
+
+print("="*70)
+print("TEST: HISTORIALES COMPACTOS")
+print("="*70)
+
+base = ConfiguracionSimulacion(metodo="rk4", dt=0.5, t_max=2000.0)
+compacta = dataclasses.replace(base, historial="compacto")
+
+cohete_listas = Cohete.desde_configuracion(base)
+resumen_listas = cohete_listas.simular(telemetria=Telemetria.nula())
+cohete_compacto = Cohete.desde_configuracion(compacta)
+resumen_compacto = cohete_compacto.simular(telemetria=Telemetria.nula())
+
+memoria_listas = cohete_listas.memoria_historial()
+memoria_compacta = cohete_compacto.memoria_historial()
+print(f"\nBytes por muestra: listas {memoria_listas['bytes_por_muestra']}, "
+      f"compacto {memoria_compacta['bytes_por_muestra']}")
+print(f"Memoria ({memoria_listas['muestras']} muestras): "
+      f"{memoria_listas['bytes'] / 1024:.0f} KB -> "
+      f"{memoria_compacta['bytes'] / 1024:.0f} KB")
+
+# Error relativo máximo de cada columna respecto de las listas
+errores = {}
+for nombre, columna in cohete_compacto.historiales().items():
+    exacta = np.asarray(getattr(cohete_listas, f"{nombre}_hist"))
+    escala = max(np.max(np.abs(exacta)), 1e-30)
+    errores[nombre] = float(np.max(np.abs(np.asarray(columna) - exacta)) / escala)
+    print(f"  {nombre:10s} error relativo máx. {errores[nombre]:.1e}")
+
+# Altura: error absoluto gracias al desplazamiento R_E
+error_r_m = max(abs(a - b) for a, b in
+                zip(cohete_compacto.r_hist, cohete_listas.r_hist))
+print(f"Error máximo en r: {error_r_m * 100:.2f} cm")
+
+# Columna entera con escala (resolución de 1 mm)
+milimetros = ColumnaHistorial(FormatoColumna("i", desplazamiento=1000.0,
+                                             escala=0.001),
+                              (1000.0, 1000.002, 1234.5678))
+
+# Archivo en disco
+with tempfile.TemporaryDirectory() as carpeta:
+    ruta = os.path.join(carpeta, "corrida.hist")
+    escritos = guardar_historiales(ruta, cohete_compacto.historiales(),
+                                   metadatos={"huella": compacta.huella()})
+    recuperadas, metadatos = cargar_historiales(ruta)
+    ruta_listas = os.path.join(carpeta, "listas.hist")
+    guardar_historiales(ruta_listas, cohete_listas.historiales(),
+                        esquema=ESQUEMA_COMPACTO)
+    desde_listas, _ = cargar_historiales(ruta_listas)
+print(f"Archivo: {escritos / 1024:.0f} KB")
+
+# Verificaciones
+print(f"\n{'='*70}")
+print("VERIFICACIONES:")
+
+if (resumen_listas == resumen_compacto
+        and cohete_listas.estado == cohete_compacto.estado):
+    print("  ✓ La integración no cambia con el historial compacto")
+else:
+    print("  ✗ ERROR: el historial compacto cambió la trayectoria")
+
+if max(errores.values()) < 1e-6 and error_r_m < 0.05:
+    print(f"  ✓ Error de registro acotado (máx. {max(errores.values()):.1e}, "
+          f"r {error_r_m * 100:.2f} cm)")
+else:
+    print(f"  ✗ ERROR: error de registro grande ({errores})")
+
+fraccion = memoria_compacta["bytes"] / memoria_listas["bytes"]
+if (memoria_compacta["bytes_por_muestra"] == 36
+        and fraccion < 0.2):
+    print(f"  ✓ El historial compacto ocupa {fraccion:.0%} de las listas")
+else:
+    print(f"  ✗ ERROR: el historial compacto ocupa {fraccion:.0%}")
+
+columna_r = cohete_compacto.r_hist
+if (isinstance(columna_r[-1], float)
+        and columna_r[-3:] == list(np.asarray(columna_r)[-3:])
+        and len(columna_r) == len(cohete_listas.r_hist)):
+    print("  ✓ Índices, rebanadas y np.asarray decodifican igual")
+else:
+    print("  ✗ ERROR: acceso inconsistente a la columna compacta")
+
+if (list(milimetros.datos) == [0, 2, 234568]
+        and abs(milimetros[2] - 1234.568) < 1e-9):
+    print("  ✓ Columna entera con desplazamiento y escala")
+else:
+    print(f"  ✗ ERROR: columna entera {list(milimetros.datos)}")
+
+columnas_compactas = cohete_compacto.historiales()
+if (all(recuperadas[n].datos == columnas_compactas[n].datos
+        and desde_listas[n].datos == columnas_compactas[n].datos
+        for n in COLUMNAS)
+        and metadatos["huella"] == compacta.huella()):
+    print("  ✓ El archivo en disco se recupera igual")
+else:
+    print("  ✗ ERROR: el archivo en disco no coincide")
+
+print("="*70)
@@ -0,0 +1,251 @@
+"""
+Test: Integradores registrados
+
+Verifica que todos los integradores del registro funcionen sobre la
+misma física (dinamica.derivada) y que sean consistentes entre sí:
+- Un satélite en órbita circular LEO mantiene su altura
+- La derivada es pura (no modifica el estado de entrada)
+- El modelo de fuerzas fusionado coincide con las fórmulas de
+  utilidades.py (gravedad, velocidad, área frontal)
+- La interpolación de los perfiles de guiado coincide con np.interp y
+  el núcleo se importa sin numpy
+- Los métodos de mayor orden coinciden con Euler a dt pequeño
+- Respetando los quiebres de los perfiles, RK4 con dt grande coincide
+  con RK4 a dt pequeño y consume exactamente el combustible del perfil
+- El motor scipy:DOP853 (si SciPy está instalado) coincide con el
+  integrador adaptativo usando muchas menos evaluaciones
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from cohete import Cohete
+from constantes import *
+from dinamica import aceleraciones, derivada
+from atmosfera import calcular_densidad_aire
+from utilidades import (
+    BETAS_BETA, TIEMPOS_BETA, calcular_area_frontal_esfera,
+    calcular_gravedad, calcular_velocidad, interpolar_lineal
+)
+from integradores import INTEGRADORES
+import subprocess
+import numpy as np
+
+print("="*70)
+print("TEST: INTEGRADORES REGISTRADOS")
+print("="*70)
+print(f"\nIntegradores disponibles: {', '.join(sorted(INTEGRADORES))}")
+
+# Satélite en LEO sin combustible (igual que test_orbitas.py)
+h_leo = 200  # km
+r_leo = R_E + h_leo * 1000
+v_leo = np.sqrt(MU / r_leo)
+T_leo = 2 * np.pi * r_leo / v_leo
+
+
+def crear_satelite():
+    return Cohete(
+        r_0=r_leo, q_0=0.0, q_dot_0=0.0, theta_0=0.0,
+        gamma_0=v_leo / r_leo, gamma_dot_0=0.0,
+        masa_cohete=1000.0, masa_fuel=0.0, beta=0.0, diametro=2.0,
+        m_dot=0.0, isp=ISP, h_0=H_0, h_1=H_1, h_2=H_2
+    )
+
+
+print(f"\n{'='*70}")
+print("ÓRBITA LEO (1 período, dt = 1 s)")
+print("="*70)
+variaciones = {}
+for nombre in sorted(INTEGRADORES):
+    satelite = crear_satelite()
+    satelite.simular(dt=1.0, t_max=T_leo, metodo=nombre, log_cada=0)
+    alturas = [(r - R_E) / 1000 for r in satelite.r_hist]
+    variaciones[nombre] = max(alturas) - min(alturas)
+    print(f"  {nombre:15s} variación de altura: {variaciones[nombre]:.4f} km")
+
+# Derivada pura
+print(f"\n{'='*70}")
+print("DERIVADA PURA")
+print("="*70)
+satelite = crear_satelite()
+params = satelite.parametros()
+y = satelite.estado
+dy_1 = derivada(0.0, y, params)
+dy_2 = derivada(0.0, y, params)
+print(f"  dy = {tuple(round(float(v), 6) for v in dy_1)}")
+
+# Modelo de fuerzas fusionado frente a las fórmulas por separado
+print(f"\n{'='*70}")
+print("FUERZAS FUSIONADAS")
+print("="*70)
+cohete = Cohete(
+    r_0=R_E + 30000.0, q_0=800.0, q_dot_0=0.0, theta_0=0.0,
+    gamma_0=2e-4, gamma_dot_0=0.0,
+    masa_cohete=MASA_COHETE, masa_fuel=MASA_FUEL, beta=0.6,
+    diametro=DIAMETRO_COHETE, m_dot=1118.0, isp=ISP,
+    h_0=H_0, h_1=H_1, h_2=H_2
+)
+f = cohete.fuerzas()
+v = calcular_velocidad(cohete.q, cohete.gamma, cohete.r)
+D = (0.5 * CD * calcular_densidad_aire(cohete.r - R_E) * v**2
+     * calcular_area_frontal_esfera(DIAMETRO_COHETE / 2))
+T = ISP * cohete.m_dot * G0
+q_dot_ref = ((T * np.cos(cohete.beta) - D * cohete.q / v) / cohete.masa
+             - calcular_gravedad(cohete.r) + cohete.r * cohete.gamma**2)
+acel = aceleraciones(cohete.r, cohete.q, cohete.gamma, cohete.masa,
+                     cohete.m_dot, cohete.beta, cohete.parametros())
+errores_fuerzas = {
+    "empuje": abs(f.empuje - T) / T,
+    "arrastre": abs(f.arrastre - D) / D,
+    "gravedad": abs(f.gravedad / cohete.masa - calcular_gravedad(cohete.r))
+    / calcular_gravedad(cohete.r),
+    "q_dot": abs(f.q_dot - q_dot_ref) / abs(q_dot_ref),
+}
+print(f"  empuje = {f.empuje:.1f} N, arrastre = {f.arrastre:.1f} N, "
+      f"gravedad = {f.gravedad:.1f} N")
+
+# Interpolación sin numpy y núcleo importable sin numpy
+puntos = np.linspace(-50.0, 450.0, 5001).tolist() + list(TIEMPOS_BETA)
+interpolacion_igual = all(
+    interpolar_lineal(t, TIEMPOS_BETA, BETAS_BETA)
+    == float(np.interp(t, TIEMPOS_BETA, BETAS_BETA))
+    for t in puntos
+)
+importacion = subprocess.run(
+    [sys.executable, "-c",
+     "import sys, cohete; print('numpy' in sys.modules)"],
+    capture_output=True, text=True,
+    cwd=os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."),
+)
+numpy_al_importar = importacion.stdout.strip()
+
+# Ascenso corto con cada método a dt pequeño
+print(f"\n{'='*70}")
+print("ASCENSO (60 s, dt = 0.01 s)")
+print("="*70)
+alturas_ascenso = {}
+for nombre in ("forward_euler", "backward_euler", "rk4"):
+    cohete = Cohete(
+        r_0=R_0, q_0=Q_0, q_dot_0=Q_DOT_0, theta_0=THETA_0,
+        gamma_0=GAMMA_0, gamma_dot_0=GAMMA_DOT_0,
+        masa_cohete=MASA_COHETE, masa_fuel=MASA_FUEL, beta=BETA_0,
+        diametro=DIAMETRO_COHETE, m_dot=M_DOT_0, isp=ISP,
+        h_0=H_0, h_1=H_1, h_2=H_2
+    )
+    cohete.simular(dt=0.01, t_max=60.0, metodo=nombre, log_cada=0)
+    alturas_ascenso[nombre] = cohete.r - R_E
+    print(f"  {nombre:15s} altura a 60 s: {alturas_ascenso[nombre]:.2f} m")
+
+# Pasos grandes con quiebres de consumo y guiado
+print(f"\n{'='*70}")
+print("QUIEBRES DE LOS PERFILES (RK4, ascenso de 300 s)")
+print("="*70)
+masa_perfil = MASA_COHETE + MASA_FUEL - 4492.0 * 69.0 - 1118.0 * (280.0 - 69.0)
+resultados_quiebres = {}
+for dt_q, respetar in ((0.1, True), (2.0, True), (2.0, False)):
+    cohete = Cohete(
+        r_0=R_0, q_0=Q_0, q_dot_0=Q_DOT_0, theta_0=THETA_0,
+        gamma_0=GAMMA_0, gamma_dot_0=GAMMA_DOT_0,
+        masa_cohete=MASA_COHETE, masa_fuel=MASA_FUEL, beta=BETA_0,
+        diametro=DIAMETRO_COHETE, m_dot=M_DOT_0, isp=ISP,
+        h_0=H_0, h_1=H_1, h_2=H_2
+    )
+    resumen = cohete.simular(dt=dt_q, t_max=300.0, metodo="rk4",
+                             respetar_quiebres=respetar)
+    resultados_quiebres[(dt_q, respetar)] = (cohete.r - R_E, cohete.masa,
+                                             resumen["t_final"])
+    print(f"  dt = {dt_q:3.1f} s, quiebres = {str(respetar):5s} -> "
+          f"altura: {cohete.r - R_E:.2f} m, masa: {cohete.masa:.2f} kg")
+
+# Referencia con SciPy (motor opcional)
+print(f"\n{'='*70}")
+print("REFERENCIA SCIPY (ascenso de 300 s)")
+print("="*70)
+try:
+    import scipy  # noqa: F401
+    hay_scipy = True
+except ImportError:
+    hay_scipy = False
+    print("  SciPy no está instalado, se omite la comparación")
+
+resultados_ref = {}
+if hay_scipy:
+    for nombre in ("adaptativo", "scipy:DOP853"):
+        cohete = Cohete(
+            r_0=R_0, q_0=Q_0, q_dot_0=Q_DOT_0, theta_0=THETA_0,
+            gamma_0=GAMMA_0, gamma_dot_0=GAMMA_DOT_0,
+            masa_cohete=MASA_COHETE, masa_fuel=MASA_FUEL, beta=BETA_0,
+            diametro=DIAMETRO_COHETE, m_dot=M_DOT_0, isp=ISP,
+            h_0=H_0, h_1=H_1, h_2=H_2
+        )
+        resumen = cohete.simular(dt=1.0, t_max=300.0, metodo=nombre)
+        resultados_ref[nombre] = (cohete.r - R_E, resumen["evaluaciones"])
+        print(f"  {nombre:15s} altura: {cohete.r - R_E:.2f} m, "
+              f"evaluaciones: {resumen['evaluaciones']}")
+
+# Verificaciones
+print(f"\n{'='*70}")
+print("VERIFICACIONES:")
+
+for nombre, variacion in variaciones.items():
+    if variacion < 0.05 * h_leo:
+        print(f"  ✓ {nombre}: órbita estable ({variacion:.4f} km)")
+    else:
+        print(f"  ✗ {nombre}: órbita inestable ({variacion:.4f} km)")
+
+if dy_1 == dy_2 and y == satelite.estado:
+    print("  ✓ derivada() no modifica el estado")
+else:
+    print("  ✗ ERROR: derivada() tiene efectos secundarios")
+
+for nombre, error in errores_fuerzas.items():
+    if error < 1e-12:
+        print(f"  ✓ fuerzas(): {nombre} coincide con utilidades ({error:.1e})")
+    else:
+        print(f"  ✗ fuerzas(): {nombre} difiere de utilidades ({error:.1e})")
+if (f.q_dot, f.gamma_dot) == acel:
+    print("  ✓ fuerzas() y aceleraciones() dan el mismo resultado")
+else:
+    print("  ✗ ERROR: fuerzas() y aceleraciones() difieren")
+if interpolacion_igual:
+    print("  ✓ interpolar_lineal coincide con np.interp")
+else:
+    print("  ✗ ERROR: interpolar_lineal difiere de np.interp")
+if numpy_al_importar == "False":
+    print("  ✓ import cohete no carga numpy")
+else:
+    print(f"  ✗ ERROR: import cohete carga numpy ({numpy_al_importar or importacion.stderr})")
+
+referencia = alturas_ascenso["rk4"]
+for nombre, altura in alturas_ascenso.items():
+    error_rel = abs(altura - referencia) / referencia
+    if error_rel < 1e-3:
+        print(f"  ✓ {nombre}: coincide con RK4 (error relativo {error_rel:.2e})")
+    else:
+        print(f"  ✗ {nombre}: difiere de RK4 (error relativo {error_rel:.2e})")
+
+h_fino, _, t_final = resultados_quiebres[(0.1, True)]
+h_grueso, masa_grueso, _ = resultados_quiebres[(2.0, True)]
+h_sin, _, _ = resultados_quiebres[(2.0, False)]
+if abs(h_grueso - h_fino) < 1.0 and abs(h_sin - h_fino) > abs(h_grueso - h_fino):
+    print(f"  ✓ RK4 dt=2 s con quiebres coincide con dt=0.1 s ({abs(h_grueso - h_fino):.3f} m)")
+else:
+    print(f"  ✗ RK4 dt=2 s con quiebres difiere de dt=0.1 s ({abs(h_grueso - h_fino):.3f} m)")
+if abs(masa_grueso - masa_perfil) < 1e-6:
+    print(f"  ✓ Consumo exacto del perfil de mdot ({masa_grueso:.2f} kg)")
+else:
+    print(f"  ✗ Consumo distinto al perfil ({masa_grueso:.2f} vs {masa_perfil:.2f} kg)")
+if t_final == 300.0:
+    print("  ✓ Tiempo final sin error acumulado")
+else:
+    print(f"  ✗ Tiempo final con error acumulado ({t_final!r})")
+
+if resultados_ref:
+    h_adapt, _ = resultados_ref["adaptativo"]
+    h_scipy, _ = resultados_ref["scipy:DOP853"]
+    if abs(h_adapt - h_scipy) < 10.0:
+        print(f"  ✓ scipy:DOP853 coincide con adaptativo ({abs(h_adapt - h_scipy):.3f} m)")
+    else:
+        print(f"  ✗ scipy:DOP853 difiere de adaptativo ({abs(h_adapt - h_scipy):.3f} m)")
+
+print("="*70)
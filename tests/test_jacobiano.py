@@ -0,0 +1,125 @@
+"""
+Test: Jacobiano con números duales
+
+Verifica duales.py y jacobiano.py:
+- Las derivadas de los duales coinciden con las analíticas
+- La corrida aumentada llega exactamente al mismo estado final que
+  Cohete.simular, con cada integrador de paso fijo
+- El jacobiano coincide con diferencias finitas centradas para
+  parámetros, perfiles y condiciones iniciales
+- Las variables por defecto siguen el modo de guiado y ninguna tiene
+  derivadas nulas
+- Las variables e integradores no soportados se rechazan
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import math
+
+from cohete import Cohete
+from configuracion import ConfiguracionSimulacion
+from duales import Dual, exp, hypot, sin
+from jacobiano import (
+    COMPONENTES, METODOS, jacobiano_por_diferencias, simular_con_jacobiano,
+    variables_por_defecto
+)
+from telemetria import Telemetria
+
+print("="*70)
+print("TEST: JACOBIANO CON NÚMEROS DUALES")
+print("="*70)
+
+# f(x, y) = x·sin(y) / (1 + x²) + exp(y)·hypot(x, y) + x^y
+x = Dual.variable(1.3, 0, 2)
+y = Dual.variable(0.7, 1, 2)
+f = x * sin(y) / (1 + x**2) + exp(y) * hypot(x, y) + x**y
+h = math.hypot(1.3, 0.7)
+analiticas = (
+    math.sin(0.7) * (1 - 1.3**2) / (1 + 1.3**2)**2
+    + math.exp(0.7) * 1.3 / h + 0.7 * 1.3**(0.7 - 1),
+    1.3 * math.cos(0.7) / (1 + 1.3**2)
+    + math.exp(0.7) * (h + 0.7 / h) + 1.3**0.7 * math.log(1.3),
+)
+print(f"\nf = {f.valor:.6f}, ∇f = {f.derivadas}")
+
+# Estado final igual al de Cohete.simular
+iguales = {}
+for metodo in METODOS:
+    config = ConfiguracionSimulacion(metodo=metodo, dt=0.5, t_max=200.0)
+    cohete = Cohete.desde_configuracion(config)
+    cohete.simular(telemetria=Telemetria.nula())
+    resultado = simular_con_jacobiano(config, ("cd", "masa_fuel"))
+    iguales[metodo] = resultado.estado == cohete.estado
+
+# Jacobiano contra diferencias finitas
+config = ConfiguracionSimulacion(metodo="rk4", dt=0.5, t_max=400.0)
+variables = ("isp", "cd", "angulo_guiado_3", "tiempo_guiado_3",
+             "mdot_fase_1", "gamma_0", "masa_fuel", "factor_mdot")
+duales = simular_con_jacobiano(config, variables)
+finitas = jacobiano_por_diferencias(config, variables, trabajadores=1)
+errores = {}
+for j, variable in enumerate(variables):
+    escala = [max(abs(fila[j]) for fila in finitas.jacobiano[:4]), 1e-300]
+    errores[variable] = max(
+        abs(duales.jacobiano[k][j] - finitas.jacobiano[k][j])
+        / max(abs(finitas.jacobiano[k][j]), 1e-6 * max(escala))
+        for k in range(len(COMPONENTES))
+    )
+    print(f"  {variable:>16s} ∂r = {duales.derivada('r', variable):12.5g} "
+          f"(diferencias {finitas.derivada('r', variable):12.5g}), "
+          f"error relativo {errores[variable]:.1e}")
+
+# Variables por defecto según el guiado
+por_defecto = variables_por_defecto(config)
+nulas = [variable for j, variable in enumerate(por_defecto)
+         if all(fila[j] == 0 for fila
+                in simular_con_jacobiano(config, por_defecto).jacobiano)]
+por_altura = variables_por_defecto(
+    ConfiguracionSimulacion(beta_altura=True))
+print(f"\nPor defecto: {', '.join(por_defecto)}")
+
+# Verificaciones
+print(f"\n{'='*70}")
+print("VERIFICACIONES:")
+
+if all(abs(a - b) < 1e-12 * max(1, abs(b))
+       for a, b in zip(f.derivadas, analiticas)):
+    print("  ✓ Las derivadas de los duales son las analíticas")
+else:
+    print(f"  ✗ ERROR: derivadas {f.derivadas} != {analiticas}")
+
+if all(iguales.values()):
+    print(f"  ✓ El estado final es idéntico al de Cohete.simular "
+          f"({', '.join(METODOS)})")
+else:
+    print(f"  ✗ ERROR: estados distintos {iguales}")
+
+if max(errores.values()) < 1e-3 and duales.simulaciones == 1:
+    print(f"  ✓ Una corrida da el jacobiano de {len(variables)} variables "
+          f"(diferencias: {finitas.simulaciones} corridas)")
+else:
+    print(f"  ✗ ERROR: jacobiano distinto de las diferencias: {errores}")
+
+if (not nulas and "h_1" not in por_defecto
+        and por_altura == ("isp", "cd", "h_0", "h_1", "h_2")):
+    print(f"  ✓ Las variables por defecto siguen el guiado "
+          f"({len(por_defecto)} con guiado por tiempo, ninguna nula)")
+else:
+    print(f"  ✗ ERROR: variables nulas {nulas} o por altura {por_altura}")
+
+rechazos = 0
+for variables_malas, metodo in ((("fin_fase_0",), "rk4"),
+                                (("metodo",), "rk4"),
+                                (("cd",), "adaptativo")):
+    try:
+        simular_con_jacobiano(config, variables_malas, metodo=metodo)
+    except ValueError:
+        rechazos += 1
+if rechazos == 3:
+    print("  ✓ Se rechazan fines de fase, campos no numéricos e "
+          "integradores adaptativos")
+else:
+    print("  ✗ ERROR: se aceptó una variable o integrador no soportado")
+
+print("="*70)
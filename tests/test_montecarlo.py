@@ -0,0 +1,141 @@
+"""
+Test: Dispersión Monte Carlo
+
+Verifica montecarlo.py:
+- Cada muestra tiene su propio generador: se repite exactamente y no
+  depende de cuántas muestras se corran
+- Las estadísticas en línea coinciden con las calculadas con todos los
+  valores, también al combinar agregados parciales
+- El bosquejo de cuantiles aproxima los cuantiles exactos en memoria
+  acotada
+- El estudio da el mismo resultado con 1 y 2 trabajadores, y la muestra
+  extrema se reproduce con Dispersion.repetir
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+import statistics
+
+from configuracion import ConfiguracionSimulacion
+from montecarlo import (
+    METRICAS, BosquejoCuantiles, Dispersion, EstadisticaEnLinea, Histograma,
+    Uniforme, dispersion_por_defecto, ejecutar_montecarlo, metricas_finales
+)
+
+print("="*70)
+print("TEST: DISPERSIÓN MONTE CARLO")
+print("="*70)
+
+base = ConfiguracionSimulacion(metodo="rk4", dt=0.5, t_max=400.0)
+dispersion = dispersion_por_defecto(base, semilla=11)
+
+# Muestras reproducibles
+primera = dispersion.valores(5)
+otra = Dispersion(dict(dispersion.parametros), base, semilla=11).valores(5)
+distinta = dispersion.valores(6)
+config = dispersion.muestra(5)
+print(f"\nMuestra 5: {primera}")
+
+# Estadísticas en línea contra las exactas
+rng = random.Random(1)
+valores = [rng.lognormvariate(0, 1) for _ in range(20_000)]
+completa = EstadisticaEnLinea()
+partes = [EstadisticaEnLinea() for _ in range(3)]
+bosquejo = BosquejoCuantiles(k=200)
+bosquejos = [BosquejoCuantiles(k=200) for _ in range(3)]
+histograma = Histograma(0.0, 10.0, 20)
+for i, valor in enumerate(valores):
+    completa.agregar(valor, i)
+    partes[i % 3].agregar(valor, i)
+    bosquejo.agregar(valor)
+    bosquejos[i % 3].agregar(valor)
+    histograma.agregar(valor)
+combinada = EstadisticaEnLinea()
+combinado = BosquejoCuantiles(k=200)
+for parte, parcial in zip(partes, bosquejos):
+    combinada.combinar(parte)
+    combinado.combinar(parcial)
+
+ordenados = sorted(valores)
+probabilidades = (0.05, 0.5, 0.95)
+exactos = [ordenados[int(p * len(ordenados))] for p in probabilidades]
+
+
+def error_rango(aproximados):
+    """Mayor error de rango (fracción de las muestras) de los cuantiles."""
+    return max(abs(sum(v < a for v in valores) / len(valores) - p)
+               for a, p in zip(aproximados, probabilidades))
+
+
+errores = (error_rango(bosquejo.cuantiles(probabilidades)),
+           error_rango(combinado.cuantiles(probabilidades)))
+print(f"Cuantiles exactos {[f'{v:.3f}' for v in exactos]}, bosquejo "
+      f"{[f'{v:.3f}' for v in bosquejo.cuantiles(probabilidades)]} "
+      f"({len(bosquejo)} valores guardados de {bosquejo.n})")
+
+# Estudio completo con 1 y 2 trabajadores
+agregado = ejecutar_montecarlo(dispersion, 24, trabajadores=1, tramos=6)
+paralelo = ejecutar_montecarlo(dispersion, 24, trabajadores=2, tramos=6)
+informe = agregado.informe()
+peor = informe["excentricidad"]["indice_maximo"]
+repetida = metricas_finales(dispersion.repetir(peor))
+print(f"Excentricidad: media {informe['excentricidad']['media']:.3f}, "
+      f"máxima {informe['excentricidad']['maximo']:.3f} (muestra {peor})")
+
+# Verificaciones
+print(f"\n{'='*70}")
+print("VERIFICACIONES:")
+
+if (primera == otra and primera != distinta
+        and config.isp == primera["isp"]
+        and config.fases_mdot[0][1] == base.fases_mdot[0][1]
+        * primera["factor_mdot"]
+        and config.tiempos_beta[1] == base.tiempos_beta[1]
+        + primera["desfase_guiado"]):
+    print("  ✓ Cada muestra tiene valores propios y reproducibles")
+else:
+    print("  ✗ ERROR: muestras no reproducibles")
+
+try:
+    Dispersion({"metodo": Uniforme(0, 1)})
+    print("  ✗ ERROR: se aceptó un parámetro no numérico")
+except ValueError:
+    print("  ✓ Solo se perturban parámetros numéricos")
+
+exactas = (statistics.fmean(valores), statistics.stdev(valores))
+if all(abs(e.media - exactas[0]) < 1e-9 and abs(e.desvio - exactas[1]) < 1e-9
+       and e.maximo == max(valores)
+       and e.indice_maximo == valores.index(max(valores))
+       for e in (completa, combinada)):
+    print("  ✓ Media, desvío y extremos en línea y combinados son exactos")
+else:
+    print("  ✗ ERROR: estadísticas en línea")
+
+if max(errores) < 0.02 and len(bosquejo) < 1000:
+    print(f"  ✓ Cuantiles con error de rango {max(errores):.4f} "
+          f"en memoria acotada")
+else:
+    print(f"  ✗ ERROR: cuantiles con error {errores}")
+
+if (sum(histograma.conteos) + histograma.debajo + histograma.encima
+        == len(valores) and histograma.encima
+        == sum(v >= 10.0 for v in valores)):
+    print("  ✓ El histograma cuenta todos los valores")
+else:
+    print("  ✗ ERROR: conteos del histograma")
+
+if (paralelo.informe() == informe and informe["muestras"] == 24
+        and all(informe[m]["n"] + informe[m]["no_finitos"] == 24
+                for m in METRICAS)):
+    print("  ✓ El resultado no depende de la cantidad de trabajadores")
+else:
+    print("  ✗ ERROR: resultados distintos según los trabajadores")
+
+if repetida["excentricidad"] == informe["excentricidad"]["maximo"]:
+    print("  ✓ La muestra extrema se reproduce exactamente")
+else:
+    print("  ✗ ERROR: la muestra repetida no coincide")
+
+print("="*70)
@@ -0,0 +1,99 @@
+"""
+Test: Evaluación multifidelidad
+
+Verifica multifidelidad.py:
+- La correlación de Spearman da ±1 para órdenes iguales u opuestos y
+  promedia los empates
+- Sobre una grilla de guiado, el recorrido encuentra el mismo mejor
+  candidato que simular todos en el último nivel, con menos corridas
+- Por defecto hay candidatos de control, que se simulan en todos los
+  niveles y la validación los usa; sin control, el resumen avisa que
+  no hubo validación
+- Los argumentos inválidos se rechazan
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import math
+
+from barrido import ejecutar_barrido
+from configuracion import ConfiguracionSimulacion
+from montecarlo import simular_metricas
+from multifidelidad import (
+    NIVELES, candidatos_grilla, correlacion_spearman, evaluar_multifidelidad,
+    rangos
+)
+
+print("="*70)
+print("TEST: EVALUACIÓN MULTIFIDELIDAD")
+print("="*70)
+
+base = ConfiguracionSimulacion(t_max=600.0)
+candidatos = candidatos_grilla(base, {
+    "tiempo_guiado_4": [75.0, 85.0, 95.0, 105.0, 115.0],
+    "angulo_guiado_2": [0.1, 0.25, 0.4, 0.55, 0.7],
+})
+resultado = evaluar_multifidelidad(candidatos, control=0, trabajadores=2)
+print(resultado.describir())
+
+# Referencia: todos en el último nivel
+perigeos = [m["perigeo_km"] for m in ejecutar_barrido(
+    [NIVELES[-1].aplicar(c) for c in candidatos], 2,
+    funcion=simular_metricas)]
+mejor = max(range(len(candidatos)), key=lambda i: perigeos[i])
+
+controlado = evaluar_multifidelidad(candidatos, trabajadores=2)
+
+# Verificaciones
+print(f"\n{'='*70}")
+print("VERIFICACIONES:")
+
+if (correlacion_spearman([1, 2, 3, 4], [10, 20, 30, 45]) == 1.0
+        and correlacion_spearman([1, 2, 3, 4], [4, 3, 2, 1]) == -1.0
+        and rangos([3.0, 1.0, 3.0, 2.0]) == [3.5, 1.0, 3.5, 2.0]
+        and math.isnan(correlacion_spearman([1, 2], [2, 1]))):
+    print("  ✓ Spearman da ±1 en órdenes iguales u opuestos y promedia "
+          "empates")
+else:
+    print("  ✗ ERROR: correlación de rangos")
+
+corridas = sum(len(etapa.evaluados) for etapa in resultado.etapas)
+if (resultado.mejor == mejor
+        and abs(resultado.valor(mejor) - perigeos[mejor]) < 1e-9
+        and [len(e.evaluados) for e in resultado.etapas] == [25, 7, 2]
+        and sum(e.costo_previsto for e in resultado.etapas)
+        < resultado.costo_todos_ultimo):
+    print(f"  ✓ Mismo mejor candidato (#{mejor}, perigeo "
+          f"{perigeos[mejor]:.1f} km) con {corridas} corridas escalonadas")
+else:
+    print(f"  ✗ ERROR: mejor #{resultado.mejor}, referencia #{mejor}")
+
+if (len(controlado.control) == 8
+        and all(set(controlado.control) <= set(etapa.evaluados)
+                for etapa in controlado.etapas)
+        and all(-1 <= datos["spearman_control"] <= 1
+                and 0 <= datos["acierto_control"] <= 1
+                for datos in controlado.validacion)
+        and "Sin validación" in resultado.describir()
+        and "Sin validación" not in controlado.describir()):
+    print("  ✓ Por defecto hay 8 candidatos de control, simulados en todos "
+          "los niveles (Spearman " + ", ".join(f"{d['spearman_control']:+.2f}"
+                                   for d in controlado.validacion) + ")")
+else:
+    print("  ✗ ERROR: validación con candidatos de control")
+
+rechazos = 0
+for argumentos in ({"candidatos": []},
+                   {"candidatos": candidatos, "fraccion": 0.0},
+                   {"candidatos": candidatos, "niveles": ()}):
+    try:
+        evaluar_multifidelidad(**argumentos)
+    except ValueError:
+        rechazos += 1
+if rechazos == 3:
+    print("  ✓ Se rechazan listas vacías y fracciones inválidas")
+else:
+    print("  ✗ ERROR: se aceptaron argumentos inválidos")
+
+print("="*70)
@@ -0,0 +1,84 @@
+"""
+Test: Observadores durante la simulación
+
+Verifica la API Cohete.observar():
+- Disparo cada N pasos y cada T segundos de tiempo simulado
+- Los fragmentos cubren todas las muestras sin repetir ninguna
+- Un observador puede cancelar la simulación
+- Un observador lento queda acotado a su fracción del tiempo de pared
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import time
+
+from cohete import Cohete
+from configuracion import ConfiguracionSimulacion
+from telemetria import Telemetria
+
+print("="*70)
+print("TEST: OBSERVADORES")
+print("="*70)
+
+config = ConfiguracionSimulacion(metodo="backward_euler", dt=0.1, t_max=400.0)
+
+# Disparo por pasos y por tiempo simulado, con fragmentos
+cohete = Cohete.desde_configuracion(config)
+tiempos_t = []
+fragmentos = []
+cohete.observar(lambda vista: tiempos_t.append(vista.t), cada_t=50.0)
+cohete.observar(lambda vista, frag: fragmentos.append(frag),
+                cada_pasos=250, fragmentos=True)
+cohete.simular(telemetria=Telemetria.nula())
+muestras = [r for frag in fragmentos for r in frag.r]
+print(f"\nNotificaciones cada 50 s: {[round(t) for t in tiempos_t]}")
+print(f"Fragmentos: {len(fragmentos)}, muestras: {len(muestras)}")
+
+# Cancelación
+cohete_cancelado = Cohete.desde_configuracion(config)
+cohete_cancelado.observar(lambda vista: vista.altura_m > 100e3, cada_pasos=10)
+resumen_cancelado = cohete_cancelado.simular(telemetria=Telemetria.nula())
+print(f"Cancelado: {resumen_cancelado['end_reason']} en "
+      f"t = {resumen_cancelado['t_final']:.1f} s, "
+      f"h = {resumen_cancelado['h_final_m'] / 1000:.1f} km")
+
+# Observador lento con presupuesto del 5 %
+cohete_lento = Cohete.desde_configuracion(
+    ConfiguracionSimulacion(dt=0.1, t_max=2000.0)
+)
+lento = cohete_lento.observar(lambda vista: time.sleep(0.002), cada_pasos=1,
+                              fraccion_max=0.05, al_final=False)
+inicio = time.perf_counter()
+cohete_lento.simular(telemetria=Telemetria.nula())
+total = time.perf_counter() - inicio
+fraccion = lento.costo_s / total
+print(f"Observador lento: {lento.llamadas} llamadas, {lento.postergadas} "
+      f"postergaciones, {fraccion:.1%} del tiempo")
+
+# Verificaciones
+print(f"\n{'='*70}")
+print("VERIFICACIONES:")
+
+if [round(t) for t in tiempos_t] == list(range(50, 401, 50)):
+    print("  ✓ Disparo cada 50 s de tiempo simulado")
+else:
+    print(f"  ✗ ERROR: disparos en {tiempos_t}")
+
+if muestras == cohete.r_hist[1:]:
+    print("  ✓ Los fragmentos cubren todas las muestras sin repetir")
+else:
+    print("  ✗ ERROR: los fragmentos no coinciden con el historial")
+
+if (resumen_cancelado["end_reason"] == "cancelled"
+        and 100e3 < resumen_cancelado["h_final_m"] < 110e3):
+    print("  ✓ El observador cancela la simulación")
+else:
+    print(f"  ✗ ERROR: no se canceló ({resumen_cancelado['end_reason']})")
+
+if fraccion < 0.10 and lento.postergadas > 0:
+    print(f"  ✓ Observador lento acotado a su presupuesto ({fraccion:.1%})")
+else:
+    print(f"  ✗ ERROR: el observador lento usó {fraccion:.1%} del tiempo")
+
+print("="*70)
@@ -0,0 +1,91 @@
+"""
+Test: Integración Parareal
+
+Verifica parareal.py:
+- Converge en menos iteraciones que tramos y llega al estado de la
+  corrida serie
+- Sin tolerancia efectiva reproduce Cohete.simular bit a bit
+- Un choque con la Tierra termina la trayectoria en el mismo instante
+- Se rechazan integradores de scipy y cantidades de tramos inválidas
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from cohete import Cohete
+from configuracion import ConfiguracionSimulacion
+from parareal import distancia, simular_parareal
+from telemetria import Telemetria
+
+print("="*70)
+print("TEST: INTEGRACIÓN PARAREAL")
+print("="*70)
+
+
+def serie(config):
+    cohete = Cohete.desde_configuracion(config)
+    resumen = cohete.simular(telemetria=Telemetria.nula())
+    return cohete.estado, resumen
+
+
+# Trayectoria larga: ascenso y más de una órbita
+largo = ConfiguracionSimulacion(metodo="rk4", dt=1.0, t_max=8000.0)
+estado_largo, _ = serie(largo)
+resultado = simular_parareal(largo, tramos=8, trabajadores=1)
+error = distancia(resultado.estado, estado_largo)
+print(f"\n{resultado.describir()}")
+print(f"Diferencia con la corrida serie: {error:.3g} m")
+
+# Sin tolerancia efectiva: corrida serie exacta
+exacto = ConfiguracionSimulacion(dt=0.5, t_max=2000.0)
+estado_exacto, _ = serie(exacto)
+completo = simular_parareal(exacto, tramos=4, tolerancia=1e-300,
+                            trabajadores=1)
+
+# Choque
+choque = ConfiguracionSimulacion(metodo="rk4", dt=1.0, t_max=3000.0,
+                                 isp=250.0)
+estado_choque, resumen_choque = serie(choque)
+caida = simular_parareal(choque, tramos=4, trabajadores=1)
+
+# Verificaciones
+print(f"\n{'='*70}")
+print("VERIFICACIONES:")
+
+if (resultado.convergido and resultado.iteraciones < resultado.tramos
+        and error < 0.01):
+    print(f"  ✓ Converge en {resultado.iteraciones} iteraciones con "
+          f"{resultado.tramos} tramos, a {error:.1e} m de la corrida serie")
+else:
+    print(f"  ✗ ERROR: {resultado.iteraciones} iteraciones, error {error} m")
+
+if completo.convergido and completo.estado == estado_exacto:
+    print("  ✓ Sin tolerancia efectiva es idéntica a "
+          "Cohete.simular")
+else:
+    print(f"  ✗ ERROR: estado {completo.estado} != {estado_exacto}")
+
+if (caida.end_reason == resumen_choque["end_reason"] == "hit_ground"
+        and caida.t_final == resumen_choque["t_final"]
+        and caida.estado == estado_choque):
+    print(f"  ✓ El choque termina la trayectoria en t = {caida.t_final:g} s")
+else:
+    print(f"  ✗ ERROR: fin {caida.end_reason} en {caida.t_final} "
+          f"(serie {resumen_choque['end_reason']} en "
+          f"{resumen_choque['t_final']})")
+
+rechazos = 0
+for config, tramos in (
+        (ConfiguracionSimulacion(metodo="scipy:RK45", t_max=100.0), 2),
+        (largo, 0)):
+    try:
+        simular_parareal(config, tramos=tramos, trabajadores=1)
+    except ValueError:
+        rechazos += 1
+if rechazos == 2:
+    print("  ✓ Se rechazan integradores de scipy y tramos inválidos")
+else:
+    print("  ✗ ERROR: se aceptó un integrador o una cantidad de tramos "
+          "inválida")
+
+print("="*70)
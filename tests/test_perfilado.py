@@ -0,0 +1,90 @@
+"""
+Test: Perfilado por componente de simular()
+
+Verifica que el perfilado opcional:
+- No cambia el resultado de la simulación
+- Cuenta pasos, evaluaciones e iteraciones implícitas
+- Reparte el tiempo total entre las pilas del volcado flamegraph
+- Restaura las funciones instrumentadas al terminar
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import tempfile
+
+import dinamica
+import integradores
+from cohete import Cohete
+from configuracion import ConfiguracionSimulacion
+from perfilado import Perfilador
+
+print("="*70)
+print("TEST: PERFILADO DE SIMULAR")
+print("="*70)
+
+config = ConfiguracionSimulacion(metodo="backward_euler", t_max=300.0)
+originales = (dinamica.calcular_densidad_aire,
+              integradores.aceleraciones_con_empuje)
+
+sin_perfil = Cohete.desde_configuracion(config)
+sin_perfil.simular()
+
+perfil = Perfilador()
+con_perfil = Cohete.desde_configuracion(config)
+resumen = con_perfil.simular(perfil=perfil)
+informe = resumen["perfil"]
+
+print(f"\nTiempo total: {informe['total_s']*1000:.1f} ms")
+print(f"{'Componente':12s} {'Inclusivo (ms)':>15s} {'Propio (ms)':>12s} {'Llamadas':>10s}")
+for nombre, datos in informe["componentes"].items():
+    print(f"{nombre:12s} {datos['tiempo_s']*1000:15.2f} "
+          f"{datos['tiempo_propio_s']*1000:12.2f} {datos['llamadas']:10d}")
+print(f"Contadores: {informe['contadores']}")
+
+with tempfile.TemporaryDirectory() as carpeta:
+    ruta = os.path.join(carpeta, "perfil.folded")
+    perfil.volcar_flamegraph(ruta)
+    with open(ruta, encoding="utf-8") as archivo:
+        lineas = archivo.read().splitlines()
+total_volcado = sum(int(linea.rsplit(" ", 1)[1]) for linea in lineas) / 1e6
+
+# Verificaciones
+print(f"\n{'='*70}")
+print("VERIFICACIONES:")
+
+if con_perfil.estado == sin_perfil.estado:
+    print("  ✓ El perfilado no cambia el resultado")
+else:
+    print("  ✗ ERROR: el perfilado cambia el resultado")
+
+contadores = informe["contadores"]
+pasos = resumen["iter"]
+if (contadores["pasos"] == pasos
+        and contadores["iteraciones_implicitas"] == 3 * pasos
+        and contadores["evaluaciones"] == resumen["evaluaciones"]):
+    print(f"  ✓ Contadores consistentes ({pasos} pasos, "
+          f"{contadores['iteraciones_implicitas']} iteraciones implícitas)")
+else:
+    print(f"  ✗ ERROR: contadores inconsistentes ({contadores})")
+
+esperados = {"simular", "integrador", "fuerzas", "atmosfera", "guiado",
+             "mdot", "registro", "eventos", "quiebres"}
+faltantes = esperados - set(informe["componentes"])
+if not faltantes:
+    print("  ✓ Todos los componentes tienen tiempo asignado")
+else:
+    print(f"  ✗ ERROR: componentes sin tiempo: {sorted(faltantes)}")
+
+if abs(total_volcado - informe["total_s"]) < 0.01 * informe["total_s"] + 1e-4:
+    print(f"  ✓ El volcado flamegraph suma el tiempo total ({len(lineas)} pilas)")
+else:
+    print(f"  ✗ ERROR: el volcado suma {total_volcado:.4f} s de "
+          f"{informe['total_s']:.4f} s")
+
+if (dinamica.calcular_densidad_aire, integradores.aceleraciones_con_empuje) == originales:
+    print("  ✓ Funciones instrumentadas restauradas")
+else:
+    print("  ✗ ERROR: quedaron funciones instrumentadas")
+
+print("="*70)
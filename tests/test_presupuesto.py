@@ -0,0 +1,124 @@
+"""
+Test: Presupuesto de memoria del registro
+
+Verifica presupuesto.py y Cohete.simular(presupuesto_memoria=...):
+- Con presupuesto holgado el registro y el resumen no cambian
+- Cada estrategia (arreglos, diezmado, disco) respeta el presupuesto y
+  la integración es idéntica a la corrida sin presupuesto
+- Las muestras diezmadas y las volcadas a disco coinciden con las de la
+  corrida completa
+- Un barrido reparte el presupuesto de la máquina entre los trabajadores
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import shutil
+import tempfile
+
+from barrido import ejecutar_barrido
+from cohete import Cohete
+from configuracion import ConfiguracionSimulacion
+from historial import cargar_historiales, guardar_historiales
+from presupuesto import bytes_desde_texto, presupuesto_por_trabajador
+from telemetria import Telemetria
+
+print("="*70)
+print("TEST: PRESUPUESTO DE MEMORIA")
+print("="*70)
+
+config = ConfiguracionSimulacion(metodo="rk4", dt=1.0, t_max=600.0)
+nula = Telemetria.nula()
+
+completo = Cohete.desde_configuracion(config)
+resumen_completo = completo.simular(telemetria=nula)
+memoria_completa = completo.memoria_historial()["bytes"]
+print(f"\nSin presupuesto: {len(completo.r_hist)} muestras, "
+      f"{memoria_completa / 1024:.0f} KB")
+
+corridas = {}
+carpeta = tempfile.mkdtemp()
+casos = (
+    ("holgado", "1G", None),
+    ("arreglos", 50 * 1024, None),
+    ("diezmado", 8 * 1024, None),
+    ("disco", 4 * 1024, carpeta),
+)
+for nombre, presupuesto, directorio in casos:
+    cohete = Cohete.desde_configuracion(config)
+    plan = cohete.plan_registro(presupuesto, directorio=directorio)
+    resumen = cohete.simular(telemetria=nula, presupuesto_memoria=presupuesto,
+                             directorio_registro=directorio)
+    corridas[nombre] = (cohete, resumen, plan)
+    print(f"  {nombre:9s} {plan.describir()}")
+
+# Archivo del historial volcado a disco, sin cargarlo en memoria
+cohete_disco = corridas["disco"][0]
+ruta = os.path.join(carpeta, "corrida.hist")
+guardar_historiales(ruta, cohete_disco.historiales())
+recuperadas, _ = cargar_historiales(ruta)
+
+# Barrido con presupuesto de toda la máquina
+resultados = ejecutar_barrido([config] * 4, trabajadores=2,
+                              presupuesto_memoria=16 * 1024)
+presupuestos = {r["registro"]["presupuesto"] for r in resultados}
+print(f"\nBarrido: presupuesto por trabajador {presupuestos}")
+
+# Verificaciones
+print(f"\n{'='*70}")
+print("VERIFICACIONES:")
+
+if (bytes_desde_texto("512M") == 512 * 2**20
+        and bytes_desde_texto("1.5GiB") == 3 * 2**29
+        and presupuesto_por_trabajador("8G", 4) == 2 * 2**30):
+    print("  ✓ Presupuestos con sufijo y reparto entre trabajadores")
+else:
+    print("  ✗ ERROR: interpretación del presupuesto")
+
+estrategias = {n: corridas[n][2].estrategia for n in corridas}
+if estrategias == {n: n if n != "holgado" else "completo" for n in corridas}:
+    print("  ✓ Se elige la primera estrategia que entra")
+else:
+    print(f"  ✗ ERROR: estrategias {estrategias}")
+
+if all(cohete.estado == completo.estado
+       and resumen["iter"] == resumen_completo["iter"]
+       for cohete, resumen, _ in corridas.values()):
+    print("  ✓ El plan de registro no cambia la integración")
+else:
+    print("  ✗ ERROR: la trayectoria cambió con el presupuesto")
+
+presupuestos_ok = all(
+    cohete.memoria_historial()["bytes"] <= plan.presupuesto
+    and cohete.memoria_historial()["bytes"] <= plan.bytes_memoria
+    for cohete, _, plan in corridas.values()
+)
+if presupuestos_ok:
+    print("  ✓ La memoria de los historiales respeta el presupuesto")
+else:
+    print("  ✗ ERROR: memoria fuera del presupuesto")
+
+cohete_diezmado = corridas["diezmado"][0]
+cada = cohete_diezmado.cada_registro
+if (cada > 1 and list(cohete_diezmado.r_hist) == completo.r_hist[::cada]
+        and list(cohete_diezmado.beta_hist) == completo.beta_hist[::cada]):
+    print(f"  ✓ El diezmado registra 1 de cada {cada} pasos exactos")
+else:
+    print("  ✗ ERROR: muestras diezmadas incorrectas")
+
+if (list(cohete_disco.r_hist) == completo.r_hist
+        and cohete_disco.q_hist[100:110] == completo.q_hist[100:110]
+        and cohete_disco.masa_hist[-1] == completo.masa_hist[-1]
+        and cohete_disco.memoria_historial()["bytes_disco"] > 0
+        and list(recuperadas["theta"]) == completo.theta_hist):
+    print("  ✓ El historial en disco se lee y se archiva completo")
+else:
+    print("  ✗ ERROR: el historial en disco no coincide")
+
+if presupuestos == {8 * 1024}:
+    print("  ✓ El barrido reparte el presupuesto entre los trabajadores")
+else:
+    print(f"  ✗ ERROR: presupuestos del barrido {presupuestos}")
+
+shutil.rmtree(carpeta)
+print("="*70)
@@ -0,0 +1,112 @@
+"""
+Test: Propagación de incertidumbre (transformada unscented)
+
+Verifica propagacion.py:
+- Los 2n + 1 puntos sigma reproducen la media y la covarianza de los
+  parámetros, también con correlaciones
+- En una salida lineal la transformada es exacta
+- La media y el desvío del estado de inserción coinciden con los de un
+  Monte Carlo con muchas más corridas
+- Una correlación imposible se rechaza
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from configuracion import ConfiguracionSimulacion
+from propagacion import (
+    SALIDAS, IncertidumbreGaussiana, _estadisticas, comparar,
+    incertidumbre_por_defecto, propagar_montecarlo, propagar_unscented,
+    puntos_sigma
+)
+
+print("="*70)
+print("TEST: PROPAGACIÓN UNSCENTED")
+print("="*70)
+
+base = ConfiguracionSimulacion(metodo="rk4", dt=0.5, t_max=400.0)
+correlada = IncertidumbreGaussiana(
+    {"isp": 3.0, "cd": 0.05, "factor_mdot": 0.02}, base,
+    correlaciones={("isp", "factor_mdot"): -0.6},
+)
+sigma = puntos_sigma(correlada)
+n = len(correlada.nombres)
+medias = correlada.medias()
+covarianza = correlada.covarianza()
+
+# Media y covarianza de los propios puntos sigma (salida = identidad)
+media_puntos = [sum(w * p[i] for w, p in zip(sigma.pesos_media, sigma.puntos))
+                for i in range(n)]
+cov_puntos = [[sum(w * (p[i] - media_puntos[i]) * (p[j] - media_puntos[j])
+                   for w, p in zip(sigma.pesos_covarianza, sigma.puntos))
+               for j in range(n)] for i in range(n)]
+
+# Salida lineal de los parámetros: la transformada es exacta
+coeficientes = [(2.0, 0.0, 1.0), (0.0, -3.0, 0.5), (1.0, 1.0, 1.0)]
+salidas_lineales = [[sum(c * x for c, x in zip(fila, punto))
+                     for fila in coeficientes] for punto in sigma.puntos]
+media_lineal, cov_lineal = _estadisticas(salidas_lineales, sigma.pesos_media,
+                                         sigma.pesos_covarianza)
+media_exacta = [sum(c * m for c, m in zip(fila, medias))
+                for fila in coeficientes]
+cov_exacta = [[sum(a[i] * covarianza[i][j] * b[j]
+                   for i in range(n) for j in range(n))
+               for b in coeficientes] for a in coeficientes]
+
+# Simulación: unscented contra Monte Carlo
+incertidumbre = incertidumbre_por_defecto(base)
+unscented = propagar_unscented(incertidumbre, trabajadores=1)
+montecarlo = propagar_montecarlo(incertidumbre, 200, trabajadores=2)
+comparacion = comparar(unscented, montecarlo)
+print()
+print(unscented.describir())
+print(montecarlo.describir())
+
+
+def cerca(a, b, tolerancia=1e-9):
+    """Compara números o listas anidadas con tolerancia relativa."""
+    if isinstance(a, list):
+        return all(cerca(x, y, tolerancia) for x, y in zip(a, b))
+    return abs(a - b) <= tolerancia * max(1.0, abs(b))
+
+
+# Verificaciones
+print(f"\n{'='*70}")
+print("VERIFICACIONES:")
+
+if (len(sigma.puntos) == 2 * n + 1 and cerca(media_puntos, medias)
+        and cerca(cov_puntos, covarianza)):
+    print(f"  ✓ {2 * n + 1} puntos sigma con la media y covarianza pedidas")
+else:
+    print("  ✗ ERROR: momentos de los puntos sigma")
+
+if cerca(media_lineal, media_exacta) and cerca(cov_lineal, cov_exacta):
+    print("  ✓ Exacta para salidas lineales")
+else:
+    print("  ✗ ERROR: transformada de una salida lineal")
+
+if (unscented.corridas == 2 * len(incertidumbre.nombres) + 1
+        and all(abs(c["error_media_sigmas"]) < 0.3
+                and 0.8 < c["razon_desvios"] < 1.25
+                for c in comparacion.values())):
+    print(f"  ✓ {unscented.corridas} corridas estiman media y desvío como "
+          f"{montecarlo.corridas} de Monte Carlo")
+else:
+    print(f"  ✗ ERROR: comparación con Monte Carlo {comparacion}")
+
+if len(unscented.media) == len(SALIDAS) and unscented.desvios[0] > 0:
+    print("  ✓ Estado de inserción con altura, velocidad y ángulo")
+else:
+    print("  ✗ ERROR: salidas de la propagación")
+
+try:
+    puntos_sigma(IncertidumbreGaussiana(
+        {"isp": 1.0, "cd": 1.0, "factor_mdot": 1.0}, base,
+        correlaciones={("isp", "cd"): 0.9, ("cd", "factor_mdot"): 0.9,
+                       ("isp", "factor_mdot"): -0.9},
+    ))
+    print("  ✗ ERROR: se aceptó una covarianza imposible")
+except ValueError:
+    print("  ✓ Se rechazan correlaciones incompatibles")
+
+print("="*70)
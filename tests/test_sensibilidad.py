@@ -0,0 +1,125 @@
+"""
+Test: Sensibilidad global (índices de Sobol)
+
+Verifica sensibilidad.py:
+- La secuencia de Sobol estratifica cada dimensión: 2^k puntos caen uno
+  en cada intervalo de ancho 2^-k
+- Los índices de la función de Ishigami coinciden con los analíticos y
+  los intervalos del bootstrap los contienen
+- Sobre la simulación, N(d + 2) corridas dan los índices de todas las
+  salidas, y los parámetros que no afectan una salida tienen índice nulo
+- Una salida sin ninguna fila finita da índices NaN con 0 filas
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import math
+
+from configuracion import ConfiguracionSimulacion
+from montecarlo import Dispersion, Uniforme
+from sensibilidad import (
+    DIMENSION_MAXIMA, analizar_sensibilidad, dispersion_sensibilidad_por_defecto,
+    indices_sobol, puntos_sobol
+)
+
+print("="*70)
+print("TEST: SENSIBILIDAD GLOBAL (ÍNDICES DE SOBOL)")
+print("="*70)
+
+# Estratificación en cada dimensión
+puntos = puntos_sobol(64, DIMENSION_MAXIMA, saltar=0)
+estratificada = all(
+    sorted(int(punto[d] * 64) for punto in puntos) == list(range(64))
+    for d in range(DIMENSION_MAXIMA)
+)
+
+
+# Ishigami: S = (0.314, 0.442, 0), ST = (0.558, 0.442, 0.244)
+def ishigami(u):
+    x = [math.pi * (2 * v - 1) for v in u]
+    return (math.sin(x[0]) + 7 * math.sin(x[1])**2
+            + 0.1 * x[2]**4 * math.sin(x[0]))
+
+
+n = 2048
+puntos = puntos_sobol(n, 6)
+a = [punto[:3] for punto in puntos]
+b = [punto[3:] for punto in puntos]
+f_ab = [[ishigami(fa[:i] + [fb[i]] + fa[i + 1:]) for fa, fb in zip(a, b)]
+        for i in range(3)]
+ishi = indices_sobol("y", ("x1", "x2", "x3"), [ishigami(f) for f in a],
+                     [ishigami(f) for f in b], f_ab, remuestreos=200)
+analiticos = ((0.3139, 0.4424, 0.0), (0.5576, 0.4424, 0.2437))
+print(f"\n{ishi.describir()}")
+
+# Salida sin filas finitas
+sin_filas = indices_sobol("y", ("x1", "x2", "x3"), [math.nan] * n,
+                          [math.nan] * n, f_ab, remuestreos=200)
+
+# Simulación: 3 parámetros, N = 8
+base = ConfiguracionSimulacion(metodo="rk4", dt=0.5, t_max=300.0)
+completa = dispersion_sensibilidad_por_defecto(base)
+dispersion = Dispersion({"cd": Uniforme(0.3, 0.6),
+                         "masa_fuel": Uniforme(base.masa_fuel * 0.99,
+                                               base.masa_fuel * 1.01),
+                         "mdot_fase_0": Uniforme(4400, 4600)}, base)
+resultado = analizar_sensibilidad(dispersion, muestras_base=8,
+                                  trabajadores=2, remuestreos=50)
+print(f"\n{resultado.describir()}")
+
+# Verificaciones
+print(f"\n{'='*70}")
+print("VERIFICACIONES:")
+
+if estratificada:
+    print(f"  ✓ La secuencia de Sobol estratifica las {DIMENSION_MAXIMA} "
+          f"dimensiones")
+else:
+    print("  ✗ ERROR: la secuencia de Sobol no estratifica")
+
+errores = [abs(estimado - analitico)
+           for estimados, analiticos_i in zip((ishi.primer_orden, ishi.total),
+                                              analiticos)
+           for estimado, analitico in zip(estimados, analiticos_i)]
+if max(errores) < 0.03:
+    print(f"  ✓ Índices de Ishigami con error {max(errores):.4f}")
+else:
+    print(f"  ✗ ERROR: índices de Ishigami con error {max(errores):.4f}")
+
+contenidos = all(
+    inferior <= analitico <= superior
+    for intervalos, analiticos_i in zip((ishi.intervalos_primer_orden,
+                                         ishi.intervalos_total), analiticos)
+    for (inferior, superior), analitico in zip(intervalos, analiticos_i)
+)
+if contenidos:
+    print("  ✓ Los intervalos del bootstrap contienen los valores analíticos")
+else:
+    print("  ✗ ERROR: intervalos del bootstrap")
+
+margen = resultado.indices["margen_combustible_kg"]
+if (resultado.corridas == 8 * (3 + 2)
+        and set(resultado.indices) == {"altura_final_km",
+                                       "margen_combustible_kg"}
+        and all(indices.filas == 8 for indices in resultado.indices.values())
+        and margen.total[0] == 0.0 and margen.total[2] > 0.1):
+    print("  ✓ N(d + 2) corridas dan los índices de todas las salidas")
+else:
+    print("  ✗ ERROR: índices de la simulación")
+
+if (sin_filas.filas == 0 and math.isnan(sin_filas.varianza)
+        and all(math.isnan(v) for v in sin_filas.primer_orden
+                + sin_filas.total)
+        and "sin índices" in sin_filas.describir()):
+    print("  ✓ Sin filas finitas los índices son NaN con 0 filas")
+else:
+    print(f"  ✗ ERROR: salida sin filas finitas {sin_filas}")
+
+if {"isp", "cd", "mdot_fase_1", "angulo_guiado_3"} <= {
+        nombre for nombre, _ in completa.parametros}:
+    print("  ✓ Los rangos por defecto cubren propulsión, arrastre y guiado")
+else:
+    print("  ✗ ERROR: rangos por defecto")
+
+print("="*70)
@@ -0,0 +1,106 @@
+"""
+Test: Modelo sustituto de las métricas
+
+Verifica sustituto.py:
+- Las predicciones dentro de los datos caen a pocos desvíos estimados
+  de la simulación, y las confiables no simulan
+- Una consulta fuera de la región de confianza se simula, se agrega a
+  los datos y la siguiente igual la responde el modelo
+- Las consultas fuera de la región se simulan juntas
+- guardar/cargar conserva las predicciones y rechaza datos de otra base
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+import tempfile
+from dataclasses import replace
+
+from configuracion import ConfiguracionSimulacion
+from montecarlo import aplicar_perturbaciones, simular_metricas
+from sustituto import Sustituto
+
+print("="*70)
+print("TEST: MODELO SUSTITUTO")
+print("="*70)
+
+base = ConfiguracionSimulacion(metodo="rk4", dt=0.5, t_max=300.0)
+metricas = ("altura_final_km", "excentricidad")
+rangos = {"cd": (0.3, 0.6), "isp": (base.isp, base.isp * 1.03)}
+sustituto = Sustituto.entrenar(base, rangos, 24, metricas=metricas,
+                               trabajadores=2)
+
+# Predicciones contra simulaciones en puntos interiores
+generador = random.Random(3)
+desvios = []
+confiables = 0
+for _ in range(6):
+    punto = {nombre: generador.uniform(*rango)
+             for nombre, rango in rangos.items()}
+    valores, errores, confiable = sustituto.predecir(punto)
+    reales = simular_metricas(aplicar_perturbaciones(base, punto))
+    confiables += confiable
+    desvios.extend(abs(reales[m] - valores[m]) / max(errores[m], 1e-12)
+                   for m in metricas)
+    print(f"  cd = {punto['cd']:.3f}, isp = {punto['isp']:.1f}: "
+          + ", ".join(f"{m} {valores[m]:.5g} ± {errores[m]:.2g} "
+                      f"(real {reales[m]:.5g})" for m in metricas))
+antes = sustituto.simulaciones
+interior = sustituto.consultar({"cd": 0.45, "isp": base.isp * 1.015})
+
+# Fuera de la región: se simula y se aprende
+afuera = {"cd": 0.9}
+primera = sustituto.consultar(afuera)
+segunda = sustituto.consultar(afuera)
+nuevas = sustituto.simulaciones - antes
+print(f"\n{primera.describir()}\n{segunda.describir()}")
+
+lote = sustituto.consultar_varios([{"cd": 1.0}, {"cd": 1.1},
+                                   {"cd": 0.45, "isp": base.isp * 1.015}],
+                                  trabajadores=2)
+
+# Persistencia
+with tempfile.TemporaryDirectory() as carpeta:
+    ruta = os.path.join(carpeta, "sustituto.json")
+    sustituto.guardar(ruta)
+    cargado = Sustituto.cargar(ruta, base)
+    try:
+        Sustituto.cargar(ruta, replace(base, cd=0.3))
+        rechazo = False
+    except ValueError:
+        rechazo = True
+
+# Verificaciones
+print(f"\n{'='*70}")
+print("VERIFICACIONES:")
+
+if max(desvios) < 4.0 and confiables >= 4:
+    print(f"  ✓ Errores a menos de {max(desvios):.1f} desvíos estimados "
+          f"({confiables}/6 predicciones confiables)")
+else:
+    print(f"  ✗ ERROR: desvíos {max(desvios):.1f}, confiables {confiables}")
+
+if (not interior.simulada and nuevas == 1
+        and primera.simulada and not segunda.simulada
+        and all(abs(segunda.valores[m] - primera.valores[m])
+                <= sustituto.tolerancia(m) for m in metricas)):
+    print("  ✓ Fuera de la región se simula una vez y después responde el "
+          "modelo")
+else:
+    print("  ✗ ERROR: respaldo en la simulación")
+
+if ([c.simulada for c in lote] == [True, True, False]
+        and len(sustituto) == 24 + 3):
+    print("  ✓ Las consultas fuera de la región se simulan en un lote")
+else:
+    print(f"  ✗ ERROR: lote {[c.simulada for c in lote]}, "
+          f"{len(sustituto)} corridas")
+
+if (sustituto.predecir({"cd": 0.5}) == cargado.predecir({"cd": 0.5})
+        and rechazo):
+    print("  ✓ guardar/cargar conserva las predicciones y verifica la base")
+else:
+    print("  ✗ ERROR: persistencia")
+
+print("="*70)
@@ -0,0 +1,166 @@
+"""
+Test: Telemetría estructurada
+
+Verifica los registros y sumideros de telemetria.py:
+- La salida por defecto conserva el formato de texto de siempre
+- El sumidero JSONL produce líneas JSON válidas con el tipo de registro
+- El muestreo y el filtro de nivel descartan registros de progreso
+- El límite de tasa emite también con menos de un registro por segundo
+- Varias corridas en hilos comparten un sumidero sin entremezclar líneas
+- Con Telemetria.nula() no se construye ningún registro
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import contextlib
+import io
+import json
+import threading
+import types
+
+import cohete as modulo_cohete
+import telemetria as tel
+from cohete import Cohete
+from configuracion import ConfiguracionSimulacion
+from telemetria import (
+    AVISO, Progreso, SumideroJSONL, SumideroMemoria, SumideroTexto,
+    Telemetria
+)
+
+print("="*70)
+print("TEST: TELEMETRÍA ESTRUCTURADA")
+print("="*70)
+
+config = ConfiguracionSimulacion(metodo="rk4", dt=1.0, t_max=300.0)
+
+
+def correr(telemetria=None, log_cada=100):
+    cohete = Cohete.desde_configuracion(config)
+    return cohete.simular(log_cada=log_cada, telemetria=telemetria)
+
+
+# Salida de texto por defecto
+salida = io.StringIO()
+with contextlib.redirect_stdout(salida):
+    correr()
+lineas_texto = salida.getvalue().splitlines()
+print("\nSalida por defecto:")
+for linea in lineas_texto:
+    print(f"  {linea}")
+
+# JSON lines
+buffer_json = io.StringIO()
+correr(Telemetria(SumideroJSONL(buffer_json), corrida="json"))
+registros_json = [json.loads(linea) for linea in buffer_json.getvalue().splitlines()]
+tipos_json = [r["tipo"] for r in registros_json]
+print(f"\nTipos JSONL: {tipos_json}")
+
+# Muestreo y nivel
+memoria = SumideroMemoria(capacidad=1000)
+correr(Telemetria(memoria, muestreo=10), log_cada=1)
+progresos_muestreados = len(memoria.de_tipo("progreso"))
+memoria_aviso = SumideroMemoria()
+correr(Telemetria(memoria_aviso, nivel=AVISO), log_cada=1)
+print(f"Progresos con muestreo 1/10 (301 posibles): {progresos_muestreados}")
+
+# Límite de tasa con un reloj simulado: 100 progresos por segundo
+# durante 10 s
+def progresos_con_tasa(max_por_segundo):
+    reloj = [0.0]
+    tiempo_original = tel.time
+    tel.time = types.SimpleNamespace(monotonic=lambda: reloj[0])
+    try:
+        memoria_tasa = SumideroMemoria(capacidad=2000)
+        telemetria = Telemetria(memoria_tasa, max_por_segundo=max_por_segundo)
+        for i in range(1001):
+            reloj[0] = i / 100
+            telemetria.emitir(Progreso(i, reloj[0], 0.0, 0.0, 0.0, 0.0, 0.0))
+    finally:
+        tel.time = tiempo_original
+    return len(memoria_tasa.de_tipo("progreso"))
+
+
+progresos_tasa = {tasa: progresos_con_tasa(tasa) for tasa in (0.5, 2.0)}
+print(f"Progresos en 10 s con límite de tasa: {progresos_tasa}")
+
+# Corridas concurrentes sobre un mismo sumidero de texto
+compartido = io.StringIO()
+sumidero = SumideroTexto(compartido)
+hilos = [
+    threading.Thread(target=correr, args=(Telemetria(sumidero, corrida=f"c{k}"), 1))
+    for k in range(4)
+]
+for hilo in hilos:
+    hilo.start()
+for hilo in hilos:
+    hilo.join()
+lineas_compartidas = compartido.getvalue().splitlines()
+
+# Telemetría nula: contar registros construidos
+construidos = []
+Progreso_original = tel.Progreso
+
+
+class ProgresoContado(Progreso_original):
+    def __init__(self, *args, **kwargs):
+        construidos.append(1)
+        super().__init__(*args, **kwargs)
+
+
+modulo_cohete.Progreso = ProgresoContado
+try:
+    correr(Telemetria.nula(), log_cada=1)
+    construidos_nula = len(construidos)
+    correr(Telemetria(SumideroMemoria()), log_cada=1)
+    construidos_activa = len(construidos) - construidos_nula
+finally:
+    modulo_cohete.Progreso = Progreso_original
+
+# Verificaciones
+print(f"\n{'='*70}")
+print("VERIFICACIONES:")
+
+if (lineas_texto[0].startswith("Simulando con dt = 1.0 s usando rk4")
+        and lineas_texto[1].startswith("Iter 0: altura = ")
+        and lineas_texto[-1].startswith("FIN: t_max | iter: 300")):
+    print("  ✓ La salida de texto conserva el formato")
+else:
+    print("  ✗ ERROR: cambió el formato de la salida de texto")
+
+if (tipos_json[0] == "evento" and tipos_json[-1] == "resumen"
+        and all(r["corrida"] == "json" for r in registros_json)):
+    print(f"  ✓ JSONL válido ({len(registros_json)} registros)")
+else:
+    print("  ✗ ERROR: registros JSONL inesperados")
+
+if progresos_muestreados == 31:
+    print("  ✓ El muestreo emite 1 de cada 10 registros de progreso")
+else:
+    print(f"  ✗ ERROR: el muestreo emitió {progresos_muestreados} registros")
+
+if progresos_tasa == {0.5: 6, 2.0: 21}:
+    print("  ✓ El límite de tasa emite a 0.5/s y a 2/s")
+else:
+    print(f"  ✗ ERROR: progresos con límite de tasa {progresos_tasa}")
+
+if len(memoria_aviso.registros) == 0:
+    print("  ✓ El filtro de nivel descarta los registros INFO")
+else:
+    print(f"  ✗ ERROR: pasaron {len(memoria_aviso.registros)} registros")
+
+enteras = all(
+    linea.startswith("[c") and ("Iter" in linea or "FIN" in linea or "Simulando" in linea)
+    for linea in lineas_compartidas
+)
+if enteras and len(lineas_compartidas) == 4 * 303:
+    print(f"  ✓ Corridas concurrentes sin líneas entremezcladas ({len(lineas_compartidas)} líneas)")
+else:
+    print(f"  ✗ ERROR: salida concurrente inválida ({len(lineas_compartidas)} líneas)")
+
+if construidos_nula == 0 and construidos_activa > 0:
+    print("  ✓ Con telemetría nula no se construyen registros")
+else:
+    print(f"  ✗ ERROR: la telemetría nula construyó {construidos_nula} registros")
+
+print("="*70)
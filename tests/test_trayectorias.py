@@ -0,0 +1,111 @@
+"""
+Test: Trayectorias en memoria compartida
+
+Verifica trayectorias.py y historial.ColumnaCompartida:
+- Las trayectorias recolectadas (en el proceso y con un pool) coinciden
+  con las de simular cada configuración por separado
+- Entre procesos solo viajan la configuración, la ubicación y el
+  resumen: su tamaño no depende de la cantidad de muestras
+- El bloque puede ser un archivo mapeado y se elimina al cerrar
+- Las columnas compartidas se archivan con guardar_historiales
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pickle
+import shutil
+import tempfile
+
+from cohete import Cohete
+from configuracion import ConfiguracionSimulacion
+from historial import cargar_historiales, guardar_historiales
+from telemetria import Telemetria
+from trayectorias import recolectar_trayectorias, ubicar_trayectorias
+
+print("="*70)
+print("TEST: TRAYECTORIAS EN MEMORIA COMPARTIDA")
+print("="*70)
+
+configs = [
+    ConfiguracionSimulacion(metodo="rk4", dt=0.5, t_max=300.0),
+    ConfiguracionSimulacion(metodo="forward_euler", dt=0.5, t_max=100.0),
+    ConfiguracionSimulacion(metodo="rk4", dt=0.5, t_max=1500.0),
+    ConfiguracionSimulacion(metodo="rk4", dt=0.5, t_max=300.0,
+                            historial="compacto"),
+]
+referencias = []
+for config in configs:
+    cohete = Cohete.desde_configuracion(config)
+    cohete.simular(telemetria=Telemetria.nula())
+    referencias.append(cohete.historiales())
+
+
+def coinciden(trayectorias):
+    """True si cada trayectoria tiene las muestras de su referencia."""
+    return all(
+        list(trayectoria.columnas[nombre]) == list(referencia[nombre])
+        for trayectoria, referencia in zip(trayectorias, referencias)
+        for nombre in referencia
+    )
+
+
+carpeta = tempfile.mkdtemp()
+resultados = {}
+for nombre, trabajadores, directorio in (("proceso", 1, None),
+                                         ("pool", 2, None),
+                                         ("archivo", 2, carpeta)):
+    with recolectar_trayectorias(configs, trabajadores=trabajadores,
+                                 directorio=directorio) as trayectorias:
+        ok = coinciden(trayectorias)
+        muestras = [len(t.columnas["r"]) for t in trayectorias]
+        bloque = trayectorias.bloque.nombre
+        print(f"  {nombre:8s} {muestras} muestras, "
+              f"{trayectorias.nbytes / 1024:.0f} KB en el bloque")
+        if nombre == "archivo":
+            existia = os.path.exists(bloque)
+            ruta = os.path.join(carpeta, "corrida.hist")
+            guardar_historiales(ruta, trayectorias[2].columnas)
+            archivadas, _ = cargar_historiales(ruta)
+            os.remove(ruta)
+    resultados[nombre] = (ok, bloque)
+
+# Lo que viaja a los trabajadores y de vuelta
+ubicaciones, _ = ubicar_trayectorias(configs)
+ida = [len(pickle.dumps((c, u))) for c, u in zip(configs, ubicaciones)]
+with recolectar_trayectorias(configs, trabajadores=1) as trayectorias:
+    vuelta = [len(pickle.dumps(t.resumen)) for t in trayectorias]
+print(f"\nBytes por trabajo: ida {ida}, vuelta {vuelta}")
+
+# Verificaciones
+print(f"\n{'='*70}")
+print("VERIFICACIONES:")
+
+if resultados["proceso"][0] and resultados["pool"][0]:
+    print("  ✓ Las trayectorias coinciden con las corridas individuales")
+else:
+    print("  ✗ ERROR: trayectorias distintas de las de referencia")
+
+if max(ida + vuelta) < 2048 and max(vuelta) - min(vuelta) < 64:
+    print("  ✓ Entre procesos no viajan las muestras")
+else:
+    print(f"  ✗ ERROR: mensajes de {max(ida + vuelta)} bytes")
+
+if resultados["archivo"][0] and existia and not os.listdir(carpeta):
+    print("  ✓ El bloque en archivo mapeado funciona y se borra al cerrar")
+else:
+    print("  ✗ ERROR: bloque en archivo mapeado")
+
+en_shm = os.path.join("/dev/shm", resultados["pool"][1].lstrip("/"))
+if not os.path.isdir("/dev/shm") or not os.path.exists(en_shm):
+    print("  ✓ La memoria compartida se libera al cerrar")
+else:
+    print("  ✗ ERROR: la memoria compartida sigue existiendo")
+
+if list(archivadas["theta"]) == list(referencias[2]["theta"]):
+    print("  ✓ Las columnas compartidas se archivan sin cambios")
+else:
+    print("  ✗ ERROR: archivo del historial compartido")
+
+shutil.rmtree(carpeta)
+print("="*70)
@@ -0,0 +1,167 @@
+"""
+Test: Vida orbital con arrastre promediado
+
+Verifica atmosfera.calcular_densidad_exponencial y vida_orbital.py:
+- El modelo exponencial da las densidades de la tabla en las bases de
+  las capas y decrece con la altura
+- En órbita circular, el promedio da la fórmula de King-Hele
+  da/dt = -2k·ρ·sqrt(μa) y de/dt = 0
+- La caída de a en una órbita excéntrica coincide con integrar la
+  órbita paso a paso
+- La vida crece con la altura, converge al achicar los pasos y se
+  calcula en menos de un segundo
+- Una órbita muy excéntrica (perigeo 125 km, apogeo 5000 km) que no
+  choca en la primera ventana vuelve al promedio y llega al suelo
+- Las órbitas abiertas no decaen y se rechazan argumentos inválidos
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import math
+
+from atmosfera import CAPAS_EXPONENCIALES, calcular_densidad_exponencial
+from configuracion import ConfiguracionSimulacion
+from utilidades import calcular_elementos_orbitales
+from vida_orbital import predecir_vida, tasas_promedio
+
+print("="*70)
+print("TEST: VIDA ORBITAL")
+print("="*70)
+
+config = ConfiguracionSimulacion()
+mu, r_e = config.mu, config.r_e
+masa = 1000.0
+k = config.parametros_dinamica().k_arrastre / masa
+
+
+def circular(altura):
+    r = r_e + altura
+    return (r, 0.0, 0.0, math.sqrt(mu / r) / r, masa)
+
+
+# Densidad
+alturas = [i * 5_000.0 for i in range(201)]
+densidades = [calcular_densidad_exponencial(h) for h in alturas]
+en_bases = all(calcular_densidad_exponencial(base) == densidad
+               for base, densidad, _ in CAPAS_EXPONENCIALES)
+decrece = all(a > b for a, b in zip(densidades, densidades[1:]))
+
+# King-Hele en órbita circular
+a_circular = r_e + 300_000.0
+da, de = tasas_promedio(a_circular, 0.0, k, mu, r_e)
+king_hele = -2 * k * calcular_densidad_exponencial(300_000.0) * math.sqrt(
+    mu * a_circular)
+print(f"\nCircular a 300 km: da/dt = {da:.6e} m/s "
+      f"(King-Hele {king_hele:.6e}), de/dt = {de:.1e}")
+
+# Una órbita excéntrica paso a paso (RK4, dt = 0.5 s) desde el perigeo
+r_p = r_e + 200_000.0
+e_0 = 0.02
+a_0 = r_p / (1 - e_0)
+periodo = 2 * math.pi * math.sqrt(a_0 ** 3 / mu)
+
+
+def derivada(y):
+    r, q, _, gamma = y
+    v_t = r * gamma
+    f = k * calcular_densidad_exponencial(r - r_e) * math.hypot(q, v_t)
+    return (q, -f * q - mu / r ** 2 + r * gamma ** 2, gamma,
+            (-f * v_t - 2 * q * gamma) / r)
+
+
+y = (r_p, 0.0, 0.0, math.sqrt(mu * a_0 * (1 - e_0 ** 2)) / r_p ** 2)
+pasos = round(periodo / 0.5)
+h = periodo / pasos
+for _ in range(pasos):
+    k1 = derivada(y)
+    k2 = derivada(tuple(a + h / 2 * b for a, b in zip(y, k1)))
+    k3 = derivada(tuple(a + h / 2 * b for a, b in zip(y, k2)))
+    k4 = derivada(tuple(a + h * b for a, b in zip(y, k3)))
+    y = tuple(a + h / 6 * (b + 2 * c + 2 * d + e)
+              for a, b, c, d, e in zip(y, k1, k2, k3, k4))
+a_1 = calcular_elementos_orbitales(y[0], y[1], y[3], mu)[0]
+caida_directa = a_1 - a_0
+caida_promedio = tasas_promedio(a_0, e_0, k, mu, r_e)[0] * periodo
+print(f"Caída de a en una órbita (e = {e_0}): {caida_directa:.2f} m paso a "
+      f"paso, {caida_promedio:.2f} m promediada")
+
+# Vidas
+vidas = {altura: predecir_vida(config, circular(altura * 1000.0))
+         for altura in (250, 300, 400)}
+for altura, vida in vidas.items():
+    print(f"  {altura} km: {vida.dias:9.2f} días, {vida.pasos_promediados} "
+          f"pasos promediados, {vida.pasos_integrados} integrados, "
+          f"{vida.segundos:.3f} s")
+fina = predecir_vida(config, circular(400_000.0), fraccion=0.025)
+perigeo = r_e + 125_000.0
+apogeo = r_e + 5_000_000.0
+v_perigeo = math.sqrt(2 * mu * apogeo / (perigeo * (perigeo + apogeo)))
+excentrica = predecir_vida(
+    config, (perigeo, 0.0, 0.0, v_perigeo / perigeo, 20_000.0)
+)
+print(f"  125 x 5000 km, 20 t: {excentrica.dias:.2f} días "
+      f"({excentrica.end_reason}), {excentrica.pasos_integrados} pasos "
+      f"integrados, {excentrica.segundos:.3f} s")
+diferencia = abs(fina.vida - vidas[400].vida) / fina.vida
+print(f"  400 km con pasos 4 veces menores: {fina.dias:.2f} días "
+      f"({diferencia:.2%})")
+
+# Verificaciones
+print(f"\n{'='*70}")
+print("VERIFICACIONES:")
+
+if en_bases and decrece:
+    print(f"  ✓ Densidad exponencial: tabla en las bases y decreciente hasta "
+          f"{alturas[-1] / 1000:g} km")
+else:
+    print(f"  ✗ ERROR: bases {en_bases}, decreciente {decrece}")
+
+if abs(da - king_hele) < 1e-9 * abs(king_hele) and abs(de) < 1e-20:
+    print("  ✓ En órbita circular el promedio es la fórmula de King-Hele")
+else:
+    print(f"  ✗ ERROR: da/dt {da} != {king_hele} o de/dt {de} != 0")
+
+if abs(caida_promedio - caida_directa) < 0.02 * abs(caida_directa):
+    print(f"  ✓ La caída promediada coincide con la integración paso a paso "
+          f"({abs(caida_promedio / caida_directa - 1):.2%})")
+else:
+    print(f"  ✗ ERROR: caída {caida_promedio} != {caida_directa}")
+
+if (vidas[250].vida < vidas[300].vida < vidas[400].vida
+        and all(v.end_reason == "hit_ground" for v in vidas.values())
+        and diferencia < 0.01
+        and max(v.segundos for v in vidas.values()) < 1.0):
+    print(f"  ✓ La vida crece con la altura ({vidas[400].dias:.0f} días a "
+          f"400 km), converge y se calcula en menos de 1 s")
+else:
+    print("  ✗ ERROR: vidas no monótonas, sin converger o lentas")
+
+if (excentrica.end_reason == "hit_ground"
+        and excentrica.tiempo_promediado > 0
+        and excentrica.vida > excentrica.tiempo_promediado
+        and excentrica.segundos < 1.0):
+    print("  ✓ La órbita excéntrica vuelve al promedio tras la ventana y "
+          "llega al suelo en menos de 1 s")
+else:
+    print(f"  ✗ ERROR: órbita excéntrica {excentrica.end_reason} en "
+          f"{excentrica.segundos:.3f} s")
+
+r = r_e + 300_000.0
+abierta = predecir_vida(config, (r, 0.0, 0.0, 1.5 * math.sqrt(2 * mu / r) / r,
+                                 masa))
+rechazos = 0
+for opciones in ({"fraccion": 0}, {"vida_maxima": -1}, {"puntos": 0}):
+    try:
+        predecir_vida(config, circular(300_000.0), **opciones)
+    except ValueError:
+        rechazos += 1
+if abierta.end_reason == "escape" and math.isinf(abierta.vida) \
+        and rechazos == 3:
+    print("  ✓ Las órbitas abiertas no decaen y se rechazan argumentos "
+          "inválidos")
+else:
+    print(f"  ✗ ERROR: órbita abierta {abierta.end_reason}, rechazos "
+          f"{rechazos}")
+
+print("="*70)
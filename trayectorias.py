@@ -0,0 +1,396 @@
+"""
+Trayectorias completas de un barrido, sin serializar las muestras.
+
+ejecutar_barrido devuelve resúmenes: devolver los historiales desde un
+pool de procesos los pasaría por pickle, millones de floats por corrida,
+y en un barrido de trayectorias la serialización dominaría el tiempo.
+recolectar_trayectorias reserva antes de lanzar el barrido un único
+bloque con lugar para la trayectoria de cada configuración:
+
+- memoria compartida (multiprocessing.shared_memory), o
+- un archivo mapeado en memoria, si se indica una carpeta (para
+  trayectorias que no entran en la memoria de la máquina)
+
+Cada trabajador registra sus historiales directamente en su región del
+bloque (historial.ColumnaCompartida) y devuelve solo el resumen; el
+proceso principal arma vistas sobre el mismo bloque, sin copias.
+
+La región de cada trayectoria tiene lugar para 2 + t_max/dt muestras
+(una por paso, la inicial y la del impacto) por columna, con el formato
+de config.historial (None = float64, cuyas columnas np.asarray devuelve
+como vistas sin copia).
+
+Uso:
+    with recolectar_trayectorias(configs, trabajadores=4) as trayectorias:
+        for trayectoria in trayectorias:
+            r = np.asarray(trayectoria.columnas["r"])   # vista, sin copia
+            trayectoria.resumen["end_reason"]
+
+Las vistas dejan de valer al cerrar el bloque: copiar lo que se quiera
+conservar (np.array, guardar_historiales) antes de salir del with.
+"""
+
+import mmap
+import os
+from typing import Dict, NamedTuple
+
+from barrido import ejecutar_barrido
+from cohete import Cohete
+from configuracion import ConfiguracionSimulacion
+from costos import modelo_por_defecto
+from historial import (
+    COLUMNAS, ESQUEMA_FLOAT64, ColumnaCompartida, EsquemaHistorial
+)
+from telemetria import Telemetria
+
+
+# Alineación (bytes) del comienzo de cada columna en el bloque
+ALINEACION = 8
+
+# Bloques abiertos en este proceso, por nombre: el que los crea los
+# registra y los trabajadores los reutilizan entre tareas
+_BLOQUES = {}
+
+
+class UbicacionTrayectoria(NamedTuple):
+    """
+    Región del bloque donde se registra una trayectoria.
+
+    Es lo único que viaja al trabajador junto con la configuración.
+
+    Args:
+        bloque (str): Nombre de la memoria compartida o ruta del archivo
+        archivo (bool): True si el bloque es un archivo mapeado
+        desplazamiento (int): Byte donde empieza la región
+        capacidad (int): Muestras por columna
+        esquema (EsquemaHistorial): Formato de las columnas
+    """
+    bloque: str
+    archivo: bool
+    desplazamiento: int
+    capacidad: int
+    esquema: EsquemaHistorial
+
+    @property
+    def tamano(self):
+        """int: Bytes de la región (las 8 columnas, alineadas)."""
+        return sum(_tamano_columna(formato, self.capacidad)
+                   for formato in self.esquema)
+
+    def columnas(self, bufer, muestras=0):
+        """
+        Columnas de la trayectoria sobre el búfer del bloque.
+
+        Args:
+            bufer (memoryview): Búfer del bloque completo
+            muestras (int): Muestras ya escritas en cada columna
+
+        Returns:
+            dict: Nombre de la columna -> ColumnaCompartida
+        """
+        columnas = {}
+        inicio = self.desplazamiento
+        for nombre, formato in zip(COLUMNAS, self.esquema):
+            fin = inicio + _tamano_columna(formato, self.capacidad)
+            columnas[nombre] = ColumnaCompartida(formato, bufer[inicio:fin],
+                                                 muestras)
+            inicio = fin
+        return columnas
+
+
+class Trayectoria(NamedTuple):
+    """
+    Resultado de una configuración de recolectar_trayectorias.
+
+    Args:
+        config (ConfiguracionSimulacion): Configuración simulada
+        resumen (dict): Resumen de la corrida (como correr_configuracion)
+        columnas (dict): Nombre de la columna -> ColumnaCompartida sobre
+            el bloque (vistas, válidas mientras el bloque esté abierto)
+    """
+    config: ConfiguracionSimulacion
+    resumen: dict
+    columnas: Dict[str, ColumnaCompartida]
+
+    def arreglos(self):
+        """
+        Columnas como arreglos de numpy.
+
+        Returns:
+            dict: Nombre de la columna -> np.ndarray float64 (vista sin
+                copia para las columnas float64 sin transformación)
+        """
+        import numpy as np
+
+        return {nombre: np.asarray(columna)
+                for nombre, columna in self.columnas.items()}
+
+
+class TrayectoriasCompartidas:
+    """
+    Trayectorias de un barrido y el bloque donde están registradas.
+
+    Se comporta como una lista de Trayectoria. Al cerrarla (o al salir
+    del with) se libera el bloque: la memoria compartida se desvincula y
+    el archivo mapeado se borra.
+
+    Args:
+        bloque (_Bloque): Bloque con los datos
+        trayectorias (list): Trayectoria de cada configuración, en orden
+    """
+
+    def __init__(self, bloque, trayectorias):
+        self.bloque = bloque
+        self.trayectorias = trayectorias
+
+    def __len__(self):
+        return len(self.trayectorias)
+
+    def __getitem__(self, indice):
+        return self.trayectorias[indice]
+
+    def __iter__(self):
+        return iter(self.trayectorias)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    @property
+    def nbytes(self):
+        """int: Bytes ocupados por las muestras registradas."""
+        return sum(columna.nbytes for trayectoria in self.trayectorias
+                   for columna in trayectoria.columnas.values())
+
+    def cerrar(self):
+        """
+        Libera el bloque.
+
+        Si quedan arreglos de numpy que apuntan al bloque, el mapeo sigue
+        vivo hasta que se descarten, pero el nombre o el archivo se
+        eliminan igual.
+        """
+        en_uso = False
+        for trayectoria in self.trayectorias:
+            for columna in trayectoria.columnas.values():
+                en_uso |= not columna.liberar()
+        self.bloque.cerrar(desmapear=not en_uso)
+
+
+class _Bloque:
+    """Memoria compartida o archivo mapeado con las trayectorias."""
+
+    __slots__ = ("nombre", "archivo", "recurso", "bufer")
+
+    def __init__(self, nombre, archivo, recurso, bufer):
+        self.nombre = nombre
+        self.archivo = archivo
+        self.recurso = recurso
+        self.bufer = bufer
+
+    @classmethod
+    def crear(cls, tamano, directorio=None):
+        """
+        Reserva un bloque nuevo y lo registra en este proceso.
+
+        Args:
+            tamano (int): Bytes del bloque
+            directorio (str): Carpeta del archivo mapeado (None =
+                memoria compartida)
+
+        Returns:
+            _Bloque: Bloque creado
+        """
+        tamano = max(1, tamano)
+        if directorio is None:
+            from multiprocessing.shared_memory import SharedMemory
+
+            segmento = SharedMemory(create=True, size=tamano)
+            bloque = cls(segmento.name, False, segmento, segmento.buf)
+        else:
+            import tempfile  # diferido: solo para el archivo mapeado
+
+            os.makedirs(directorio, exist_ok=True)
+            descriptor, ruta = tempfile.mkstemp(
+                prefix="trayectorias_", suffix=".bin", dir=directorio
+            )
+            try:
+                os.ftruncate(descriptor, tamano)
+                mapa = mmap.mmap(descriptor, tamano)
+            finally:
+                os.close(descriptor)
+            bloque = cls(ruta, True, mapa, memoryview(mapa))
+        _BLOQUES[bloque.nombre] = bloque
+        return bloque
+
+    @classmethod
+    def abrir(cls, nombre, archivo):
+        """
+        Bloque ya reservado, abierto una sola vez por proceso.
+
+        Los procesos creados con fork heredan el bloque del principal;
+        los demás lo abren por nombre sin hacerse dueños (no lo
+        desvinculan al terminar).
+
+        Args:
+            nombre (str): Nombre de la memoria compartida o ruta
+            archivo (bool): True si es un archivo mapeado
+
+        Returns:
+            _Bloque: Bloque abierto
+        """
+        if nombre in _BLOQUES:
+            return _BLOQUES[nombre]
+        if archivo:
+            with open(nombre, "r+b") as descriptor:
+                mapa = mmap.mmap(descriptor.fileno(), 0)
+            bloque = cls(nombre, True, mapa, memoryview(mapa))
+        else:
+            from multiprocessing.shared_memory import SharedMemory
+
+            try:
+                segmento = SharedMemory(name=nombre, track=False)
+            except TypeError:
+                # Python < 3.13: el segmento se registra al abrirlo y el
+                # resource_tracker lo borraría al salir el trabajador
+                from multiprocessing import resource_tracker
+
+                segmento = SharedMemory(name=nombre)
+                resource_tracker.unregister(segmento._name, "shared_memory")
+            bloque = cls(nombre, False, segmento, segmento.buf)
+        _BLOQUES[nombre] = bloque
+        return bloque
+
+    def cerrar(self, desmapear=True):
+        """
+        Elimina el bloque (nombre o archivo) y, si se puede, lo desmapea.
+
+        Args:
+            desmapear (bool): False si quedan vistas en uso
+        """
+        _BLOQUES.pop(self.nombre, None)
+        if desmapear:
+            try:
+                if self.archivo:
+                    self.bufer.release()
+                self.recurso.close()
+            except BufferError:
+                pass
+        if self.archivo:
+            if os.path.exists(self.nombre):
+                os.remove(self.nombre)
+        else:
+            self.recurso.unlink()
+
+
+def _tamano_columna(formato, capacidad):
+    """Bytes de una columna en el bloque, redondeados a ALINEACION."""
+    tamano = capacidad * formato.bytes_por_muestra
+    return -(-tamano // ALINEACION) * ALINEACION
+
+
+def capacidad_trayectoria(config):
+    """
+    Muestras por columna que puede registrar una corrida.
+
+    Args:
+        config (ConfiguracionSimulacion): Configuración
+
+    Returns:
+        int: Muestra inicial, una por paso y la del impacto
+    """
+    return max(1, int(config.t_max / config.dt)) + 2
+
+
+def ubicar_trayectorias(configs, bloque="", archivo=False):
+    """
+    Reparte un bloque entre las trayectorias de las configuraciones.
+
+    Args:
+        configs (sequence): Configuraciones
+        bloque (str): Nombre o ruta del bloque
+        archivo (bool): True si el bloque es un archivo mapeado
+
+    Returns:
+        tuple: (ubicaciones, bytes totales del bloque)
+    """
+    ubicaciones = []
+    desplazamiento = 0
+    for config in configs:
+        ubicacion = UbicacionTrayectoria(
+            bloque, archivo, desplazamiento, capacidad_trayectoria(config),
+            config.historial or ESQUEMA_FLOAT64,
+        )
+        ubicaciones.append(ubicacion)
+        desplazamiento += ubicacion.tamano
+    return ubicaciones, desplazamiento
+
+
+def correr_en_bloque(trabajo):
+    """
+    Simula una configuración registrando en su región del bloque.
+
+    Es una función de módulo para que los trabajadores la reciban por
+    pickle; solo viajan la configuración, la ubicación y el resumen.
+
+    Args:
+        trabajo (tuple): (ConfiguracionSimulacion, UbicacionTrayectoria)
+
+    Returns:
+        dict: Resumen de Cohete.simular más masa_final, huella y
+            muestras registradas
+    """
+    config, ubicacion = trabajo
+    bloque = _Bloque.abrir(ubicacion.bloque, ubicacion.archivo)
+    cohete = Cohete.desde_configuracion(config)
+    cohete.registrar_en(ubicacion.columnas(bloque.bufer))
+    resumen = cohete.simular(telemetria=Telemetria.nula())
+    resumen["masa_final"] = cohete.masa
+    resumen["huella"] = config.huella()
+    resumen["muestras"] = len(cohete.r_hist)
+    for columna in cohete.historiales().values():
+        columna.liberar()
+    return resumen
+
+
+def recolectar_trayectorias(configs, trabajadores=None, directorio=None,
+                            modelo_costo=None):
+    """
+    Simula las configuraciones y trae sus trayectorias sin copiarlas.
+
+    Args:
+        configs (sequence): Configuraciones a simular
+        trabajadores (int): Procesos a usar (ver ejecutar_barrido)
+        directorio (str): Carpeta para un archivo mapeado en lugar de
+            memoria compartida (None = memoria compartida)
+        modelo_costo (ModeloCosto): Modelo para ordenar los trabajos
+            (None = costos.modelo_por_defecto())
+
+    Returns:
+        TrayectoriasCompartidas: Trayectorias en el orden de configs;
+            hay que cerrarla para liberar el bloque
+    """
+    configs = list(configs)
+    ubicaciones, tamano = ubicar_trayectorias(configs)
+    bloque = _Bloque.crear(tamano, directorio)
+    ubicaciones = [ubicacion._replace(bloque=bloque.nombre,
+                                      archivo=bloque.archivo)
+                   for ubicacion in ubicaciones]
+    if modelo_costo is None:
+        modelo_costo = modelo_por_defecto()
+    try:
+        resumenes = ejecutar_barrido(
+            list(zip(configs, ubicaciones)), trabajadores,
+            funcion=correr_en_bloque,
+            costos=[modelo_costo.segundos(config) for config in configs],
+        )
+    except BaseException:
+        bloque.cerrar()
+        raise
+    return TrayectoriasCompartidas(bloque, [
+        Trayectoria(config, resumen,
+                    ubicacion.columnas(bloque.bufer, resumen["muestras"]))
+        for config, ubicacion, resumen in zip(configs, ubicaciones, resumenes)
+    ])
@@ -7,8 +7,8 @@ de consumo de combustible.
 """
 
 import math
-import numpy as np
-from constantes import G, M_EARTH, R_E
+from bisect import bisect_right
+from constantes import MU, R_E
 
 
 def calcular_gravedad(radio):
@@ -21,7 +21,7 @@ def calcular_gravedad(radio):
     Returns:
         float: Aceleración gravitacional (m/s²)
     """
-    return G * M_EARTH / (radio ** 2)
+    return MU / (radio ** 2)
 
 
 def calcular_velocidad(v_rad, v_ang, distancia_radial):
@@ -53,7 +53,55 @@ def calcular_area_frontal_esfera(radio):
     return math.pi * radio**2
 
 
-def calcular_beta_tiempo(tiempo_de_vuelo: float) -> float:
+def interpolar_lineal(x, xs, ys):
+    """
+    Interpolación lineal por tramos de un escalar (equivalente a np.interp).
+    
+    Fuera del rango de xs devuelve el valor del extremo más cercano. Da
+    los mismos resultados que np.interp sin importar numpy ni crear
+    arreglos, que para un solo punto es mucho más caro que interpolar.
+    x, xs e ys pueden ser números duales (duales.Dual).
+    
+    Args:
+        x (float): Punto a interpolar
+        xs (sequence): Abscisas de los puntos de control, crecientes
+        ys (sequence): Valores en los puntos de control
+        
+    Returns:
+        float: Valor interpolado
+    """
+    if x != x:
+        return x  # NaN
+    if x <= xs[0]:
+        extremo = ys[0]
+    elif x >= xs[-1]:
+        extremo = ys[-1]
+    else:
+        j = bisect_right(xs, x) - 1
+        pendiente = (ys[j + 1] - ys[j]) / (xs[j + 1] - xs[j])
+        return pendiente * (x - xs[j]) + ys[j]
+    try:
+        return float(extremo)
+    except TypeError:
+        return extremo  # con derivadas (duales.Dual)
+
+
+# Perfil de guiado en función del tiempo: puntos de control (s, grados).
+# Horizontal más temprano para reducir apogeo.
+TIEMPOS_BETA = (0.0, 30.0, 50.0, 69.0, 100.0, 150.0, 250.0, 400.0)
+BETAS_BETA = tuple(math.radians(g) for g in (0, 0, 30, 50, 80, 90, 90, 90))
+
+# Ángulos del perfil de guiado por altura (ver calcular_beta_altura)
+# PARA VELOCIDAD ORBITAL: horizontal desde ~55km (150km altura)
+# Objetivo: MÁXIMA aceleración tangencial en zona orbital
+# 89° en a7 (~64km altura = ~150km altitud) = casi todo horizontal
+BETAS_ALTURA = tuple(
+    math.radians(g) for g in (0, 3, 12, 28, 45, 62, 77, 88, 90)
+)
+
+
+def calcular_beta_tiempo(tiempo_de_vuelo: float, tiempos=TIEMPOS_BETA,
+                         betas=BETAS_BETA) -> float:
     """
     Calcula el ángulo de inclinación del empuje en función del tiempo.
     
@@ -69,15 +117,38 @@ def calcular_beta_tiempo(tiempo_de_vuelo: float) -> float:
     
     Args:
         tiempo_de_vuelo (float): Tiempo desde el despegue (s)
+        tiempos (sequence): Tiempos de los puntos de control (s)
+        betas (sequence): Ángulos en los puntos de control (rad)
         
     Returns:
         float: Ángulo beta (rad)
     """
-    # Horizontal más temprano para reducir apogeo
-    tiempos = np.array([0, 30, 50, 69, 100, 150, 250, 400], float)
-    betas = np.deg2rad([0, 0, 30, 50, 80, 90, 90, 90], dtype=float)
+    return interpolar_lineal(tiempo_de_vuelo, tiempos, betas)
+
+
+def discontinuidades_beta_tiempo(tiempos=TIEMPOS_BETA, betas=BETAS_BETA):
+    """
+    Devuelve los instantes en que calcular_beta_tiempo cambia de pendiente.
     
-    return float(np.interp(tiempo_de_vuelo, tiempos, betas))
+    Son los puntos de control interiores donde la interpolación lineal
+    tiene un quiebre; los puntos alineados con sus vecinos se omiten.
+    
+    Args:
+        tiempos (sequence): Tiempos de los puntos de control (s)
+        betas (sequence): Ángulos en los puntos de control (rad)
+    
+    Returns:
+        tuple: Tiempos de quiebre (s), en orden creciente
+    """
+    quiebres = []
+    for i in range(1, len(tiempos) - 1):
+        pendiente_izq = ((betas[i] - betas[i - 1])
+                         / (tiempos[i] - tiempos[i - 1]))
+        pendiente_der = ((betas[i + 1] - betas[i])
+                         / (tiempos[i + 1] - tiempos[i]))
+        if not math.isclose(pendiente_izq, pendiente_der, abs_tol=1e-15):
+            quiebres.append(float(tiempos[i]))
+    return tuple(quiebres)
 
 
 def calcular_beta_altura(altura: float, h_0: float, h_1: float, 
@@ -105,9 +176,13 @@ def calcular_beta_altura(altura: float, h_0: float, h_1: float,
     Returns:
         float: Ángulo beta (rad)
     """
-    h0 = float(h_0)
-    h1 = float(h_1)
-    h2 = float(h_2)
+    try:
+        h0 = float(h_0)
+        h1 = float(h_1)
+        h2 = float(h_2)
+    except TypeError:
+        # Alturas con derivadas (duales.Dual)
+        h0, h1, h2 = h_0, h_1, h_2
 
     # Puntos de control de altura - HORIZONTAL MÁS TEMPRANO
     # Objetivo: empuje horizontal completo desde 150 km para velocidad orbital
@@ -121,20 +196,24 @@ def calcular_beta_altura(altura: float, h_0: float, h_1: float,
     a7 = h1 + 0.60 * (h2 - h1)   # Casi horizontal (antes: 0.70)
     a8 = h2                       # Horizontal completo
 
-    alturas = np.array([a0, a1, a2, a3, a4, a5, a6, a7, a8], float)
-    # Ángulos PARA VELOCIDAD ORBITAL: horizontal desde ~55km (150km altura)
-    # Objetivo: MÁXIMA aceleración tangencial en zona orbital
-    # 89° en a7 (~64km altura = ~150km altitud) = casi todo horizontal
-    betas = np.deg2rad([0, 3, 12, 28, 45, 62, 77, 88, 90], dtype=float)
+    alturas = (a0, a1, a2, a3, a4, a5, a6, a7, a8)
     
     # Interpolación lineal
-    beta = float(np.interp(altura, alturas, betas))
+    beta = interpolar_lineal(altura, alturas, BETAS_ALTURA)
     
     # Limitar beta al rango válido
     return max(0.0, min(math.pi/2, beta))
 
 
-def calcular_mdot(tiempo: float) -> float:
+# Perfil de consumo por fases: (tiempo de fin de fase en s, mdot en kg/s).
+# Después de la última fase el consumo es nulo.
+FASES_MDOT = (
+    (69.0, 4492.0),   # Fase 1: ascenso según referencia
+    (280.0, 1118.0),  # Fase 2: circularización según referencia
+)
+
+
+def calcular_mdot(tiempo: float, fases=FASES_MDOT) -> float:
     """
     Calcula la tasa de consumo de combustible en función del TIEMPO.
     
@@ -150,13 +229,98 @@ def calcular_mdot(tiempo: float) -> float:
     
     Args:
         tiempo (float): Tiempo desde el despegue (s)
+        fases (sequence): Pares (tiempo de fin de fase, mdot)
         
     Returns:
         float: Tasa de consumo de combustible (kg/s)
     """
-    if tiempo < 69.0:
-        return 4492.0  # Fase 1: ascenso según referencia
-    elif tiempo < 280.0:
-        return 1118.0  # Fase 2: circularización según referencia
+    for t_fin, mdot in fases:
+        if tiempo < t_fin:
+            return mdot
+    return 0.0  # Fase 3: órbita libre
+
+
+def discontinuidades_mdot(fases=FASES_MDOT):
+    """
+    Devuelve los instantes en que calcular_mdot cambia de valor.
+    
+    Args:
+        fases (sequence): Pares (tiempo de fin de fase, mdot)
+    
+    Returns:
+        tuple: Tiempos de cambio de fase (s), en orden creciente
+    """
+    return tuple(t_fin for t_fin, _ in fases)
+
+
+def calcular_elementos_orbitales(distancia_radial, v_rad, v_ang, mu=MU):
+    """
+    Elementos de la órbita kepleriana que pasa por un estado.
+
+    A partir de la energía específica ε = v²/2 - μ/r y del momento
+    angular h = r²·v_ang:
+
+        a = -μ / (2ε),  e = sqrt(1 + 2εh²/μ²),  r_p = h² / (μ(1 + e))
+
+    Args:
+        distancia_radial (float): Distancia desde el centro de la Tierra (m)
+        v_rad (float): Velocidad radial (m/s)
+        v_ang (float): Velocidad angular (rad/s)
+        mu (float): Parámetro gravitacional (m³/s²)
+
+    Returns:
+        tuple: (semieje_mayor, excentricidad, radio_perigeo,
+            radio_apogeo) en m; el semieje es negativo y el apogeo
+            infinito si la órbita no es cerrada (e >= 1)
+    """
+    v2 = v_rad**2 + (v_ang * distancia_radial)**2
+    energia = v2 / 2 - mu / distancia_radial
+    h = distancia_radial**2 * v_ang
+    excentricidad = math.sqrt(max(0.0, 1 + 2 * energia * h**2 / mu**2))
+    semieje = -mu / (2 * energia) if energia != 0 else math.inf
+    radio_perigeo = h**2 / (mu * (1 + excentricidad))
+    if excentricidad < 1:
+        radio_apogeo = semieje * (1 + excentricidad)
     else:
-        return 0.0  # Fase 3: órbita libre
\ No newline at end of file
+        radio_apogeo = math.inf
+    return semieje, excentricidad, radio_perigeo, radio_apogeo
+
+
+def cholesky(matriz, semidefinida=False):
+    """
+    Factor triangular inferior L con L·Lᵀ = matriz.
+
+    Args:
+        matriz (list): Matriz simétrica (lista de filas)
+        semidefinida (bool): Aceptar matrices semidefinidas positivas:
+            los pivotes nulos (o negativos por redondeo) dan columnas de
+            ceros, como las filas de parámetros con desvío 0 de una
+            covarianza
+
+    Returns:
+        list: Filas de L
+
+    Raises:
+        ValueError: Si la matriz no es definida positiva (o semidefinida
+            positiva, con semidefinida=True)
+    """
+    n = len(matriz)
+    factor = [[0.0] * n for _ in range(n)]
+    for i in range(n):
+        fila_i = factor[i]
+        for j in range(i + 1):
+            fila_j = factor[j]
+            suma = matriz[i][j] - sum(fila_i[k] * fila_j[k] for k in range(j))
+            if i == j:
+                if semidefinida:
+                    if suma < -1e-12 * max(1.0, abs(matriz[i][i])):
+                        raise ValueError("La matriz no es semidefinida "
+                                         "positiva")
+                    fila_i[i] = math.sqrt(max(0.0, suma))
+                elif suma <= 0.0:
+                    raise ValueError("La matriz no es definida positiva")
+                else:
+                    fila_i[i] = math.sqrt(suma)
+            elif fila_j[j] > 0:
+                fila_i[j] = suma / fila_j[j]
+    return factor
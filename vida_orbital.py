@@ -0,0 +1,320 @@
+"""
+Decaimiento orbital y vida útil con arrastre promediado por órbita.
+
+Seguir una órbita de días o años paso a paso con Cohete.simular es
+imposible (millones de órbitas de miles de pasos). Mientras el perigeo
+está alto, el arrastre cambia la órbita muy poco en cada vuelta, así que
+alcanza con integrar la evolución secular de los elementos:
+
+1. El estado de inserción (el final de simular) se convierte en
+   semieje a y excentricidad e (calcular_elementos_orbitales)
+2. Las ecuaciones de Gauss para un arrastre opuesto a la velocidad,
+
+       da/dt = 2a²·v·f/μ,   de/dt = 2(e + cos ν)·f/v,   f = -k·ρ·v²
+
+   con k = 0.5·cd·área/masa, se promedian sobre una órbita con la regla
+   del trapecio en la anomalía excéntrica (exacta para funciones
+   periódicas suaves)
+3. (a, e) avanzan con RK4 en pasos de muchas órbitas, elegidos para que
+   el perigeo baje una fracción de la altura de escala de la densidad
+4. Cuando el paso sería menor que una órbita, o el perigeo baja de
+   ALTURA_REINGRESO, el promedio deja de valer y se vuelve a la
+   integración completa con Cohete.simular, en ventanas de
+   ORBITAS_REINGRESO órbitas
+5. Si la ventana termina sin choque (una órbita excéntrica cuyo perigeo
+   ya bajó pero cuyo apogeo sigue alto), el promedio sigue desde el
+   estado final, sin el piso de altura, y se alternan los dos tramos
+   hasta el choque
+
+La densidad del tramo promediado es la del modelo exponencial por capas
+de atmosfera.py (hasta 1000 km); la integración final usa la dinámica de
+siempre. La vida completa se calcula en décimas de segundo.
+
+Uso:
+    cohete.simular()
+    vida = predecir_vida(cohete.config, cohete.estado)
+    print(vida.describir())
+"""
+
+import math
+import time
+from dataclasses import replace
+from typing import NamedTuple
+
+from atmosfera import calcular_densidad_exponencial, capa_exponencial
+from dinamica import IDX_GAMMA, IDX_MASA, IDX_Q, IDX_R
+from utilidades import calcular_elementos_orbitales
+
+
+# Altura del perigeo (m) bajo la cual se vuelve a la integración completa
+ALTURA_REINGRESO = 120_000.0
+
+# Fracción de la altura de escala que puede bajar el perigeo en un paso
+FRACCION_ESCALA = 0.1
+
+# Puntos de la anomalía excéntrica con que se promedia cada órbita
+PUNTOS_ORBITA = 64
+
+# Corte del tramo promediado (s): unos cien años
+VIDA_MAXIMA = 100 * 365.25 * 86_400.0
+
+# Integración completa del reingreso: integrador, paso (s) y órbitas de
+# cada ventana (si no hay choque se vuelve al promedio)
+METODO_REINGRESO = "rk4"
+DT_REINGRESO = 1.0
+ORBITAS_REINGRESO = 2
+
+SEGUNDOS_DIA = 86_400.0
+
+
+def tasas_promedio(a, e, k, mu, r_e, puntos=PUNTOS_ORBITA):
+    """
+    Variación secular de semieje y excentricidad por el arrastre.
+
+    Args:
+        a (float): Semieje mayor (m)
+        e (float): Excentricidad (se toma como 0 si es negativa)
+        k (float): 0.5·cd·área/masa (m²/kg)
+        mu (float): Parámetro gravitacional (m³/s²)
+        r_e (float): Radio de la Tierra (m)
+        puntos (int): Puntos de la regla del trapecio
+
+    Returns:
+        tuple: (da/dt (m/s), de/dt (1/s)) promediados sobre una órbita
+    """
+    e = max(0.0, e)
+    suma_a = 0.0
+    suma_e = 0.0
+    for j in range(puntos):
+        cos_e = math.cos(2 * math.pi * j / puntos)
+        factor = 1 - e * cos_e          # r/a, y dt/dE en unidades de 1/n
+        r = a * factor
+        v2 = mu * (2 / r - 1 / a)
+        v = math.sqrt(v2)
+        f = -k * calcular_densidad_exponencial(r - r_e) * v2
+        cos_nu = (cos_e - e) / factor
+        suma_a += 2 * a * a * v * f / mu * factor
+        suma_e += 2 * (e + cos_nu) * f / v * factor
+    return suma_a / puntos, suma_e / puntos
+
+
+class ResultadoVida(NamedTuple):
+    """
+    Resultado de predecir_vida.
+
+    Args:
+        vida (float): Tiempo desde la inserción hasta el fin (s; inf si
+            la órbita es abierta)
+        end_reason (str): "hit_ground", "vida_maxima" (sigue en órbita
+            al corte), "escape" (e >= 1) o el motivo de fin de la
+            integración completa ("numerical_error"); nunca "t_max"
+        tiempo_promediado (float): Tiempo recorrido con el promedio (s)
+        pasos_promediados (int): Pasos del tramo promediado
+        pasos_integrados (int): Pasos de la integración completa
+        historial (tuple): (t (s), altura del perigeo (m), altura del
+            apogeo (m)) al inicio, en cada paso promediado y al final de
+            cada ventana de integración completa sin choque
+        segundos (float): Tiempo de pared del cálculo
+    """
+    vida: float
+    end_reason: str
+    tiempo_promediado: float
+    pasos_promediados: int
+    pasos_integrados: int
+    historial: tuple
+    segundos: float
+
+    @property
+    def dias(self):
+        """Vida en días."""
+        return self.vida / SEGUNDOS_DIA
+
+    def informe(self):
+        """
+        Resultado serializable a JSON.
+
+        Returns:
+            dict: Vida, motivo de fin, tramos e historial de los
+                elementos
+        """
+        return {
+            "vida_s": None if math.isinf(self.vida) else self.vida,
+            "vida_dias": None if math.isinf(self.vida) else self.dias,
+            "end_reason": self.end_reason,
+            "tiempo_promediado_s": self.tiempo_promediado,
+            "pasos_promediados": self.pasos_promediados,
+            "pasos_integrados": self.pasos_integrados,
+            "historial": [{"t_s": t, "perigeo_km": perigeo / 1000,
+                           "apogeo_km": None if math.isinf(apogeo)
+                           else apogeo / 1000}
+                          for t, perigeo, apogeo in self.historial],
+            "segundos": self.segundos,
+        }
+
+    def describir(self):
+        """
+        Resumen legible de la predicción.
+
+        Returns:
+            str: Vida, tramos y algunas alturas de perigeo y apogeo
+        """
+        if math.isinf(self.vida):
+            vida = "órbita abierta"
+        else:
+            vida = f"{self.dias:.2f} días ({self.vida / 3600:.1f} h)"
+        lineas = [
+            f"Vida orbital: {vida} ({self.end_reason})",
+            f"Promediado: {self.tiempo_promediado / SEGUNDOS_DIA:.2f} días "
+            f"en {self.pasos_promediados} pasos; integración completa: "
+            f"{(self.vida - self.tiempo_promediado) / 60:.1f} min en "
+            f"{self.pasos_integrados} pasos",
+            f"Cálculo: {self.segundos:.3f} s",
+        ]
+        if len(self.historial) > 1:
+            lineas.append("")
+            lineas.append(f"{'día':>10s} {'perigeo (km)':>13s} "
+                          f"{'apogeo (km)':>12s}")
+            salto = max(1, len(self.historial) // 10)
+            muestras = self.historial[::salto]
+            if muestras[-1] is not self.historial[-1]:
+                muestras += (self.historial[-1],)
+            for t, perigeo, apogeo in muestras:
+                lineas.append(f"{t / SEGUNDOS_DIA:10.2f} "
+                              f"{perigeo / 1000:13.1f} {apogeo / 1000:12.1f}")
+        return "\n".join(lineas)
+
+
+def predecir_vida(config, estado, altura_reingreso=ALTURA_REINGRESO,
+                  fraccion=FRACCION_ESCALA, vida_maxima=VIDA_MAXIMA,
+                  puntos=PUNTOS_ORBITA):
+    """
+    Predice cuánto dura una órbita desde el estado de inserción.
+
+    Args:
+        config (ConfiguracionSimulacion): Configuración (vehículo y
+            constantes físicas)
+        estado (tuple): Estado de inserción (r, q, theta, gamma, masa),
+            por ejemplo cohete.estado después de simular
+        altura_reingreso (float): Altura del perigeo (m) donde se pasa
+            por primera vez a la integración completa
+        fraccion (float): Fracción de la altura de escala que puede bajar
+            el perigeo en un paso promediado
+        vida_maxima (float): Corte de la predicción (s)
+        puntos (int): Puntos del promedio sobre cada órbita
+
+    Returns:
+        ResultadoVida: Vida, motivo de fin y evolución de los elementos
+
+    Raises:
+        ValueError: Si fraccion, vida_maxima o puntos no son positivos
+    """
+    from cohete import Cohete
+    from montecarlo import REGISTRO_MUESTRA
+    from telemetria import Telemetria
+
+    if fraccion <= 0 or vida_maxima <= 0 or puntos < 1:
+        raise ValueError(f"fraccion, vida_maxima y puntos deben ser "
+                         f"positivos ({fraccion}, {vida_maxima}, {puntos})")
+
+    inicio = time.perf_counter()
+    mu = config.mu
+    r_e = config.r_e
+    masa = estado[IDX_MASA]
+    k = config.parametros_dinamica().k_arrastre / masa
+    a, e, _, _ = calcular_elementos_orbitales(
+        estado[IDX_R], estado[IDX_Q], estado[IDX_GAMMA], mu
+    )
+
+    def resultado(vida, end_reason):
+        return ResultadoVida(
+            vida=vida, end_reason=end_reason,
+            tiempo_promediado=tiempo_promediado,
+            pasos_promediados=pasos_promediados,
+            pasos_integrados=pasos_integrados, historial=tuple(historial),
+            segundos=time.perf_counter() - inicio,
+        )
+
+    def alturas(t, a, e):
+        apogeo = a * (1 + e) - r_e if e < 1 else math.inf
+        return (t, a * (1 - e) - r_e, apogeo)
+
+    t = 0.0
+    tiempo_promediado = 0.0
+    pasos_promediados = 0
+    pasos_integrados = 0
+    historial = [alturas(t, a, e)]
+    if e >= 1:
+        return resultado(math.inf, "escape")
+
+    def derivadas(a, e):
+        return tasas_promedio(a, e, k, mu, r_e, puntos)
+
+    # Estado exacto desde el que integrar si no hubo pasos promediados
+    inicial = (estado[IDX_R], estado[IDX_Q], estado[IDX_GAMMA])
+    piso = altura_reingreso
+    while True:
+        # Tramo promediado
+        while a * (1 - e) - r_e > piso:
+            da, de = derivadas(a, e)
+            baja_perigeo = abs(da * (1 - e) - a * de)
+            baja_apogeo = abs(da * (1 + e) + a * de)
+            limite = fraccion * capa_exponencial(a * (1 - e) - r_e)[2]
+            paso = min(
+                limite / baja_perigeo if baja_perigeo else math.inf,
+                (limite + fraccion * 2 * a * e) / baja_apogeo
+                if baja_apogeo else math.inf,
+            )
+            if paso < 2 * math.pi * math.sqrt(a ** 3 / mu):
+                break
+            paso = min(paso, vida_maxima - t)
+            k1 = (da, de)
+            k2 = derivadas(a + paso / 2 * k1[0], e + paso / 2 * k1[1])
+            k3 = derivadas(a + paso / 2 * k2[0], e + paso / 2 * k2[1])
+            k4 = derivadas(a + paso * k3[0], e + paso * k3[1])
+            a += paso / 6 * (k1[0] + 2 * k2[0] + 2 * k3[0] + k4[0])
+            e = max(0.0,
+                    e + paso / 6 * (k1[1] + 2 * k2[1] + 2 * k3[1] + k4[1]))
+            t += paso
+            tiempo_promediado += paso
+            pasos_promediados += 1
+            inicial = None
+            historial.append(alturas(t, a, e))
+            if t >= vida_maxima:
+                return resultado(t, "vida_maxima")
+
+        # Integración completa desde el apogeo de la órbita media (o desde
+        # el último estado exacto si no hubo pasos promediados)
+        if inicial is not None:
+            r, q, gamma = inicial
+        else:
+            r = a * (1 + e)
+            q = 0.0
+            gamma = math.sqrt(mu * a * (1 - e * e)) / (r * r)
+        periodo = 2 * math.pi * math.sqrt(a ** 3 / mu)
+        reingreso = replace(
+            config, r_0=r, q_0=q, theta_0=0.0, gamma_0=gamma,
+            masa_cohete=masa, masa_fuel=0.0, metodo=METODO_REINGRESO,
+            dt=DT_REINGRESO, t_max=ORBITAS_REINGRESO * periodo,
+        )
+        cohete = Cohete.desde_configuracion(reingreso)
+        resumen = cohete.simular(telemetria=Telemetria.nula(),
+                                 presupuesto_memoria=REGISTRO_MUESTRA)
+        t += resumen["t_final"]
+        pasos_integrados += resumen["iter"]
+        if resumen["end_reason"] != "t_max":
+            return resultado(t, resumen["end_reason"])
+
+        # Sigue en órbita al final de la ventana: el perigeo bajó del piso
+        # pero la órbita todavía es excéntrica y decae despacio. Se vuelve
+        # al promedio desde el estado final, sin piso, hasta que el paso
+        # sea otra vez menor que una órbita
+        final = cohete.estado
+        inicial = (final[IDX_R], final[IDX_Q], final[IDX_GAMMA])
+        a, e, _, _ = calcular_elementos_orbitales(*inicial, mu)
+        historial.append(alturas(t, a, e))
+        if e >= 1:
+            return resultado(math.inf, "escape")
+        if t >= vida_maxima:
+            return resultado(t, "vida_maxima")
+        piso = 0.0
+